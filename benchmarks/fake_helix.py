@@ -0,0 +1,249 @@
+"""
+Serveur Twitch factice (OAuth + Helix) pour tester le suivi des streams hors ligne.
+
+Simule des milliers de streamers qui passent en live et hors ligne, la
+pagination des réponses, le seau de requêtes Helix (en-têtes ``Ratelimit-*``
+et réponses 429) ainsi que l'expiration des jetons d'application.
+
+Utilisation autonome :
+
+    python -m benchmarks.fake_helix --broadcasters 5000 --port 8080
+
+puis pointer le bot dessus avec TWITCH_API_URL=http://localhost:8080/helix et
+TWITCH_TOKEN_URL=http://localhost:8080/oauth2/token.
+"""
+import argparse
+import asyncio
+import random
+import time
+from collections import Counter
+from typing import Dict, List, Optional
+
+from aiohttp import web
+
+GAMES = ["Star Wars: The Old Republic", "Just Chatting", "World of Warcraft", "Elden Ring"]
+
+
+class FakeTwitch:
+    """
+    État simulé de Twitch.
+
+    Args:
+        broadcasters (int): Nombre de streamers existants (streamer00000, streamer00001, ...)
+        live_ratio (float): Proportion initiale de streamers en live
+        churn (float): Proportion de streamers changeant d'état à chaque tick
+        page_size (int): Nombre maximal de streams par page, quel que soit ``first``
+        rate_limit (int): Requêtes Helix autorisées par fenêtre
+        rate_window (float): Durée de la fenêtre du seau, en secondes
+        throttle_rate (float): Probabilité d'un 429 arbitraire sur une requête Helix
+        token_ttl (int): Durée de validité annoncée des jetons, en secondes
+        token_max_uses (Optional[int]): Nombre de requêtes après lequel un jeton est
+            révoqué avant son expiration annoncée (401)
+        seed (int): Graine du générateur aléatoire
+    """
+    def __init__(
+        self,
+        broadcasters: int = 5000,
+        live_ratio: float = 0.05,
+        churn: float = 0.01,
+        page_size: int = 100,
+        rate_limit: int = 800,
+        rate_window: float = 60.0,
+        throttle_rate: float = 0.0,
+        token_ttl: int = 3600,
+        token_max_uses: Optional[int] = None,
+        seed: int = 0
+    ):
+        self.logins = [f"streamer{index:05d}" for index in range(broadcasters)]
+        self.churn = churn
+        self.page_size = page_size
+        self.rate_limit = rate_limit
+        self.rate_window = rate_window
+        self.throttle_rate = throttle_rate
+        self.token_ttl = token_ttl
+        self.token_max_uses = token_max_uses
+        self._rng = random.Random(seed)
+        self._stream_ids = iter(range(1, 10 ** 12))
+        self.live: Dict[str, dict] = {}
+        # Date (time.monotonic) du passage en live, pour mesurer la latence des annonces
+        self.went_live_at: Dict[str, float] = {}
+        self._tokens: Dict[str, Dict[str, float]] = {}
+        self._bucket = rate_limit
+        self._bucket_reset = time.time() + rate_window
+        self.stats: Counter = Counter()
+
+        for login in self._rng.sample(self.logins, int(broadcasters * live_ratio)):
+            self._go_live(login)
+
+    def _go_live(self, login: str) -> None:
+        stream_id = str(next(self._stream_ids))
+        self.live[login] = {
+            "id": stream_id,
+            "user_id": str(int(login.removeprefix("streamer")) + 1),
+            "user_login": login,
+            "user_name": login.capitalize(),
+            "game_id": str(GAMES.index(game := self._rng.choice(GAMES)) + 1),
+            "game_name": game,
+            "type": "live",
+            "title": f"Stream {stream_id}",
+            "viewer_count": self._rng.randint(0, 5000),
+            "started_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "thumbnail_url": f"https://static-cdn.jtvnw.net/previews-ttv/live_user_{login}-{{width}}x{{height}}.jpg"
+        }
+        self.went_live_at[login] = time.monotonic()
+
+    def tick(self) -> None:
+        """Fait passer autant de streamers en live que hors ligne et varie les viewers"""
+        changes = int(len(self.logins) * self.churn)
+        for login in self._rng.sample(sorted(self.live), min(changes // 2, len(self.live))):
+            del self.live[login]
+            self.went_live_at.pop(login, None)
+        offline = [login for login in self.logins if login not in self.live]
+        for login in self._rng.sample(offline, min(changes - changes // 2, len(offline))):
+            self._go_live(login)
+        for stream in self.live.values():
+            stream["viewer_count"] = max(stream["viewer_count"] + self._rng.randint(-50, 50), 0)
+
+    # --- OAuth ---
+
+    async def token(self, request: web.Request) -> web.Response:
+        self.stats["token"] += 1
+        data = await request.post()
+        if data.get("grant_type") != "client_credentials" or not data.get("client_id"):
+            return web.json_response({"status": 400, "message": "invalid client"}, status=400)
+        token = f"fake-{self.stats['token']}"
+        self._tokens[token] = {"expires_at": time.monotonic() + self.token_ttl, "uses": 0}
+        return web.json_response({"access_token": token, "expires_in": self.token_ttl, "token_type": "bearer"})
+
+    def _authorize(self, request: web.Request) -> Optional[web.Response]:
+        token = request.headers.get("Authorization", "").removeprefix("Bearer ")
+        state = self._tokens.get(token)
+        if not request.headers.get("Client-ID") or state is None:
+            self.stats["unauthorized"] += 1
+            return web.json_response({"status": 401, "message": "Invalid OAuth token"}, status=401)
+        state["uses"] += 1
+        expired = time.monotonic() >= state["expires_at"]
+        if expired or (self.token_max_uses is not None and state["uses"] > self.token_max_uses):
+            del self._tokens[token]
+            self.stats["unauthorized"] += 1
+            return web.json_response({"status": 401, "message": "Invalid OAuth token"}, status=401)
+        return None
+
+    def _rate_limit_headers(self) -> Dict[str, str]:
+        return {
+            "Ratelimit-Limit": str(self.rate_limit),
+            "Ratelimit-Remaining": str(max(self._bucket, 0)),
+            "Ratelimit-Reset": str(int(self._bucket_reset))
+        }
+
+    def _consume(self) -> Optional[web.Response]:
+        now = time.time()
+        if now >= self._bucket_reset:
+            self._bucket = self.rate_limit
+            self._bucket_reset = now + self.rate_window
+        if self._bucket <= 0:
+            self.stats["throttled"] += 1
+            return web.json_response(
+                {"status": 429, "message": "Too Many Requests"},
+                status=429,
+                headers=self._rate_limit_headers()
+            )
+        if self._rng.random() < self.throttle_rate:
+            # 429 ponctuel (surcharge côté Twitch) : le seau est annoncé vide pour une seconde
+            self.stats["throttled"] += 1
+            headers = self._rate_limit_headers()
+            headers.update({"Ratelimit-Remaining": "0", "Ratelimit-Reset": str(int(now) + 1)})
+            return web.json_response({"status": 429, "message": "Too Many Requests"}, status=429, headers=headers)
+        self._bucket -= 1
+        return None
+
+    # --- Helix ---
+
+    async def streams(self, request: web.Request) -> web.Response:
+        self.stats["streams"] += 1
+        error = self._authorize(request) or self._consume()
+        if error is not None:
+            return error
+
+        logins = [login.lower() for login in request.query.getall("user_login", [])]
+        if len(logins) > 100:
+            return web.json_response({"status": 400, "message": "too many user_login"}, status=400)
+        game_ids = set(request.query.getall("game_id", []))
+        matches = [
+            self.live[login] for login in logins
+            if login in self.live and (not game_ids or self.live[login]["game_id"] in game_ids)
+        ]
+
+        first = min(int(request.query.get("first", 20)), self.page_size)
+        offset = int(request.query.get("after", 0))
+        page = matches[offset:offset + first]
+        pagination = {"cursor": str(offset + first)} if offset + first < len(matches) else {}
+        return web.json_response({"data": page, "pagination": pagination}, headers=self._rate_limit_headers())
+
+    async def games(self, request: web.Request) -> web.Response:
+        self.stats["games"] += 1
+        error = self._authorize(request) or self._consume()
+        if error is not None:
+            return error
+
+        data = [
+            {
+                "id": str(GAMES.index(name) + 1),
+                "name": name,
+                "box_art_url": f"https://static-cdn.jtvnw.net/ttv-boxart/{GAMES.index(name) + 1}-{{width}}x{{height}}.jpg"
+            }
+            for name in request.query.getall("name", []) if name in GAMES
+        ]
+        return web.json_response({"data": data}, headers=self._rate_limit_headers())
+
+    def make_app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_post("/oauth2/token", self.token)
+        app.router.add_get("/helix/streams", self.streams)
+        app.router.add_get("/helix/games", self.games)
+        return app
+
+
+async def serve(fake: FakeTwitch, host: str, port: int, tick_interval: float) -> None:
+    runner = web.AppRunner(fake.make_app())
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    print(f"Twitch factice sur http://{host}:{port} ({len(fake.logins)} streamers, {len(fake.live)} en live)")
+    try:
+        while True:
+            await asyncio.sleep(tick_interval)
+            fake.tick()
+    finally:
+        await runner.cleanup()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--broadcasters", type=int, default=5000)
+    parser.add_argument("--live-ratio", type=float, default=0.05)
+    parser.add_argument("--churn", type=float, default=0.01)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--rate-limit", type=int, default=800)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--token-ttl", type=int, default=3600)
+    parser.add_argument("--token-max-uses", type=int, default=None)
+    parser.add_argument("--tick", type=float, default=30.0, help="Intervalle entre deux changements d'état (s)")
+    args = parser.parse_args(argv)
+
+    fake = FakeTwitch(
+        broadcasters=args.broadcasters,
+        live_ratio=args.live_ratio,
+        churn=args.churn,
+        page_size=args.page_size,
+        rate_limit=args.rate_limit,
+        throttle_rate=args.throttle_rate,
+        token_ttl=args.token_ttl,
+        token_max_uses=args.token_max_uses
+    )
+    asyncio.run(serve(fake, args.host, args.port, args.tick))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+"""
+Test de charge du suivi des streams contre le serveur Twitch factice.
+
+Exécute le cycle de vérification réel du cog ``Streams`` (sondage Helix,
+annonces, éditions) sur un canal Discord simulé, puis rapporte par cycle le
+nombre de requêtes, la durée, la latence des annonces et la mémoire.
+
+    python -m benchmarks.stream_poller_load --broadcasters 5000 --cycles 20
+"""
+import argparse
+import asyncio
+import itertools
+import os
+import resource
+import statistics
+import time
+import tracemalloc
+from types import SimpleNamespace
+from typing import List, Optional
+
+from aiohttp import web
+
+from benchmarks.fake_helix import FakeTwitch
+
+CHANNEL_ID = 1
+GUILD_ID = 1
+
+
+class FakeMessage:
+    _ids = itertools.count(1)
+
+    def __init__(self, channel):
+        self.id = next(self._ids)
+        self.channel = channel
+
+    async def edit(self, embed=None):
+        self.channel.edits += 1
+
+
+class FakeChannel:
+    """Canal Discord simulé enregistrant l'heure de chaque annonce"""
+    def __init__(self, fake: FakeTwitch):
+        self.id = CHANNEL_ID
+        self.guild = SimpleNamespace(id=GUILD_ID)
+        self.fake = fake
+        self.edits = 0
+        self.latencies: List[float] = []
+
+    async def send(self, embed=None):
+        login = embed.url.rsplit("/", 1)[-1]
+        went_live_at = self.fake.went_live_at.get(login)
+        if went_live_at is not None:
+            self.latencies.append(time.monotonic() - went_live_at)
+        return FakeMessage(self)
+
+    def get_partial_message(self, message_id):
+        return FakeMessage(self)
+
+
+class FakeBot:
+    def __init__(self, channel: FakeChannel):
+        self.guilds = []
+        self._channel = channel
+
+    def get_channel(self, channel_id):
+        return self._channel if channel_id == CHANNEL_ID else None
+
+
+class NoMembers:
+    """Pas de base de données : seuls les comptes de TWITCH_USERNAME sont suivis"""
+    async def get_all_with_twitch(self):
+        return []
+
+
+class InMemoryGameFilters:
+    """Filtres de jeux sans base de données"""
+    def __init__(self, names: List[str]):
+        self.rows = [SimpleNamespace(game_name=name, game_id=None) for name in names]
+
+    async def get_for_guild(self, guild_id):
+        return self.rows
+
+    async def add(self, guild_id, game_name, game_id=None):
+        pass
+
+
+def percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * q), len(ordered) - 1)]
+
+
+async def run(args) -> None:
+    fake = FakeTwitch(
+        broadcasters=args.broadcasters,
+        live_ratio=args.live_ratio,
+        churn=args.churn,
+        page_size=args.page_size,
+        rate_limit=args.rate_limit,
+        throttle_rate=args.throttle_rate,
+        token_max_uses=args.token_max_uses
+    )
+    runner = web.AppRunner(fake.make_app())
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+
+    os.environ.update({
+        "TWITCH_CLIENT_ID": "load-test",
+        "TWITCH_CLIENT_SECRET": "load-test",
+        "TWITCH_API_URL": f"http://127.0.0.1:{port}/helix",
+        "TWITCH_TOKEN_URL": f"http://127.0.0.1:{port}/oauth2/token",
+        "TWITCH_USERNAME": ",".join(fake.logins),
+        "STREAM_CHANNEL_ID": str(CHANNEL_ID),
+        "STREAM_SHARDING": "false"
+    })
+    # Import après la configuration : le cog lit l'environnement à sa création
+    from cogs.streams import Streams
+
+    channel = FakeChannel(fake)
+    cog = Streams(FakeBot(channel))
+    cog.twitch.member_repository = NoMembers()
+    cog.game_filters.repository = InMemoryGameFilters(args.game)
+
+    tracemalloc.start()
+    durations: List[float] = []
+    initial_announcements = 0
+    print(f"{'cycle':>5} {'requêtes':>9} {'durée (ms)':>11} {'annonces':>9} {'éditions':>9} {'en live':>8}")
+    try:
+        for cycle in range(args.cycles):
+            if cycle:
+                fake.tick()
+            requests_before = fake.stats["streams"] + fake.stats["games"]
+            sent_before, edits_before = len(channel.latencies), channel.edits
+            start = time.perf_counter()
+            await cog.check_streams()
+            await cog.edits.flush(cog.edit_announcement)
+            durations.append(time.perf_counter() - start)
+            if cycle == 0:
+                # Le premier cycle annonce tous les streams déjà en cours : exclu de la latence
+                initial_announcements = len(channel.latencies)
+            print(
+                f"{cycle:>5} {fake.stats['streams'] + fake.stats['games'] - requests_before:>9} "
+                f"{durations[-1] * 1000:>11.1f} {len(channel.latencies) - sent_before:>9} "
+                f"{channel.edits - edits_before:>9} {len(fake.live):>8}"
+            )
+            if args.interval:
+                await asyncio.sleep(args.interval)
+    finally:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        await cog.helix.close()
+        await runner.cleanup()
+
+    latencies = channel.latencies[initial_announcements:]
+    print()
+    print(f"Requêtes Helix       : {fake.stats['streams']} streams, {fake.stats['games']} games, "
+          f"{fake.stats['token']} jeton(s), {fake.stats['throttled']} 429, {fake.stats['unauthorized']} 401")
+    print(f"Durée d'un cycle     : médiane {statistics.median(durations) * 1000:.1f} ms, "
+          f"p95 {percentile(durations, 0.95) * 1000:.1f} ms")
+    print(f"Latence d'annonce    : médiane {statistics.median(latencies or [0]) * 1000:.1f} ms, "
+          f"p95 {percentile(latencies, 0.95) * 1000:.1f} ms ({len(latencies)} annonces)")
+    print(f"Mémoire              : pic Python {peak / 1024 / 1024:.1f} Mio, "
+          f"RSS max {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.1f} Mio")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Test de charge du suivi des streams")
+    parser.add_argument("--broadcasters", type=int, default=5000)
+    parser.add_argument("--cycles", type=int, default=20)
+    parser.add_argument("--interval", type=float, default=0.0, help="Pause entre deux cycles (s)")
+    parser.add_argument("--live-ratio", type=float, default=0.05)
+    parser.add_argument("--churn", type=float, default=0.01)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--rate-limit", type=int, default=800)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--token-max-uses", type=int, default=None)
+    parser.add_argument("--game", action="append", default=[], help="N'annoncer que ce jeu (répétable)")
+    asyncio.run(run(parser.parse_args(argv)))
+
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,7 @@ import requests
 from bs4 import BeautifulSoup
 import os
 import logging
+from src.infrastructure.config import leadership
 
 
 
@@ -12,7 +13,8 @@ class News(commands.Cog):
     Cog gérant les fonctionnalités de news.
     
     Vérifie périodiquement les nouvelles actualités et les publie
-    dans le canal configuré.
+    dans le canal configuré. Avec plusieurs instances, seule l'instance
+    leader les publie.
     
     Attributes:
         bot (commands.Bot): Instance du bot Discord
@@ -37,6 +39,8 @@ class News(commands.Cog):
     async def check_news(self):
         """Vérifie les nouvelles de SWTOR toutes les 30 minutes"""
         try:
+            if not await leadership.confirm_leadership():
+                return
             news_items = await self.fetch_swtor_news()
             await self.send_news_to_channel(news_items)
         except Exception as e:
@@ -1,94 +1,440 @@
 import discord
+from discord import app_commands
 from discord.ext import commands, tasks
-import requests
 import os
 import logging
+from src.infrastructure.config import leadership
+from src.infrastructure.streaming import HelixClient, RequestPriority
+from src.infrastructure.streaming.announcements import (
+    PROVISIONAL_ID_PREFIX, Announcement, AnnouncementTracker, EditCoalescer, build_live_embed
+)
+from src.infrastructure.streaming.game_filters import GameFilterCache
+from src.infrastructure.streaming.games import GameCache
+from src.infrastructure.streaming.helix_client import HELIX_BATCH_SIZE
+from src.infrastructure.streaming.presence import (
+    STARTED, ENDED, detect_transition, stream_from_presence
+)
+from src.infrastructure.streaming.providers import TwitchProvider, YouTubeProvider
+from src.infrastructure.streaming.scheduler import PollScheduler
+from src.infrastructure.streaming.sharding import ShardCoordinator, default_replica_id
+from src.infrastructure.repositories.guild_member_repository import GuildMemberRepository
+from src.infrastructure.repositories.stream_repository import (
+    StreamAnnouncementRepository, StreamGameFilterRepository, StreamReplicaRepository
+)
+
+# Les membres suivis par présence ne sont sondés qu'un cycle sur N, pour rattraper
+# les streams sans activité Discord et obtenir l'identifiant Helix des annonces
+FULL_RECONCILE_EVERY = 10
+
+# Intervalle du heartbeat des instances lorsque le suivi est réparti (STREAM_SHARDING)
+HEARTBEAT_INTERVAL = 15
 
 
 class Streams(commands.Cog):
+    """
+    Cog gérant les annonces de streams.
+
+    Toutes les plateformes (Twitch, YouTube si YOUTUBE_CHANNEL_IDS est défini)
+    sont vérifiées depuis une seule boucle par un planificateur commun, qui
+    découpe les chaînes en lots et borne le nombre de lots simultanés
+    (STREAM_POLL_CONCURRENCY). Chaque sondage alimente à la fois les nouvelles
+    annonces, la mise à jour des annonces existantes et leur passage à l'état
+    terminé. Les éditions sont regroupées par canal.
+
+    Pour les membres inscrits et visibles par le bot, le début et la fin des
+    streams Twitch sont détectés par la présence Discord : Helix ne sert alors
+    qu'à enrichir l'embed et à une réconciliation espacée.
+
+    Les serveurs peuvent restreindre les annonces Twitch à certains jeux
+    (/stream-jeux) : le filtre est appliqué par Helix via ``game_id``.
+
+    Avec STREAM_SHARDING=true, plusieurs instances se répartissent les
+    chaînes ; sinon, seule l'instance leader vérifie les streams. Avec
+    plusieurs instances possibles, les annonces sont enregistrées en base
+    pour qu'une instance reprenant une chaîne (nouvelle répartition ou
+    nouveau leader) édite le message existant.
+
+    Attributes:
+        bot (commands.Bot): Instance du bot Discord
+        helix (HelixClient): Client de l'API Helix
+        twitch (TwitchProvider): Plateforme Twitch
+        providers (Dict[str, StreamProvider]): Plateformes suivies, par nom
+        trackers (Dict[str, AnnouncementTracker]): Annonces actives, par plateforme
+        scheduler (PollScheduler): Planificateur commun des vérifications
+        edits (EditCoalescer): File d'éditions regroupées par canal
+        games (GameCache): Cache des jeux Twitch (jaquettes, identifiants)
+        game_filters (GameFilterCache): Filtres de jeux par serveur
+        shards (Optional[ShardCoordinator]): Répartition entre instances, None si désactivée
+    """
     def __init__(self, bot):
         self.bot = bot
-        self.session = requests.Session()
-        self.stream_cache = set()
+        self.helix = HelixClient(
+            os.getenv('TWITCH_CLIENT_ID', ''),
+            os.getenv('TWITCH_CLIENT_SECRET', ''),
+            api_url=os.getenv('TWITCH_API_URL', HelixClient.API_URL),
+            token_url=os.getenv('TWITCH_TOKEN_URL', HelixClient.TOKEN_URL)
+        )
+        self.games = GameCache(self.helix)
+        self.game_filters = GameFilterCache(StreamGameFilterRepository(), self.games)
+        self.twitch = TwitchProvider(
+            self.helix,
+            self.games,
+            GuildMemberRepository(),
+            batch_size=int(os.getenv('TWITCH_BATCH_SIZE', str(HELIX_BATCH_SIZE)))
+        )
+        self.providers = {self.twitch.name: self.twitch}
+        youtube = YouTubeProvider.create_from_env()
+        if youtube is not None:
+            self.providers[youtube.name] = youtube
+        self.trackers = {name: AnnouncementTracker() for name in self.providers}
+        self.twitch.announced = self.tracker.announcements
+        self.scheduler = PollScheduler(int(os.getenv('STREAM_POLL_CONCURRENCY', '4')))
+        self.edits = EditCoalescer()
+        self._cycle = 0
+        self.shards = None
+        self._adopt_pending = False
+        self._leader = False
+        self.announcement_repository = StreamAnnouncementRepository()
+        if os.getenv('STREAM_SHARDING', 'false').lower() == 'true':
+            self.shards = ShardCoordinator(
+                default_replica_id(),
+                StreamReplicaRepository(),
+                ttl=float(os.getenv('STREAM_SHARD_TTL', str(HEARTBEAT_INTERVAL * 3)))
+            )
+
+    @property
+    def tracker(self):
+        """Annonces Twitch actives"""
+        return self.trackers[self.twitch.name]
+
+    @property
+    def opted_in(self):
+        """Logins Twitch des membres inscrits, par ID Discord"""
+        return self.twitch.opted_in
 
     @commands.Cog.listener()
     async def on_ready(self):
-        """Démarrer la tâche de vérification des streams une fois que le bot est prêt"""
-        self.check_streams.start()
+        """Démarrer les tâches de vérification des streams une fois que le bot est prêt"""
+        if not self.check_streams.is_running():
+            self.check_streams.start()
+        if not self.flush_edits.is_running():
+            self.flush_edits.start()
+        if self.shards is not None and not self.heartbeat.is_running():
+            self.heartbeat.start()
 
-    def cog_unload(self):
-        """Arrêter la tâche quand le cog est déchargé"""
+    async def cog_unload(self):
+        """Arrêter les tâches quand le cog est déchargé"""
         self.check_streams.cancel()
+        self.flush_edits.cancel()
+        if self.shards is not None:
+            self.heartbeat.cancel()
+            try:
+                await self.shards.leave()
+            except Exception as e:
+                logging.warning(f"Impossible de retirer l'instance {self.shards.replica_id} : {str(e)}")
+        for provider in self.providers.values():
+            await provider.close()
+
+    @property
+    def shared_announcements(self):
+        """Indique si d'autres instances peuvent reprendre les annonces (répartition ou élection d'un leader)"""
+        return self.shards is not None or leadership.election is not None
+
+    async def confirm_leadership(self):
+        """
+        Sans répartition, indique si l'instance est leader et suit les changements de leadership.
+
+        Un nouveau leader reprend les annonces enregistrées par le précédent ;
+        une instance qui perd le leadership oublie les siennes.
+        """
+        if self.shards is not None:
+            return True
+        leader = await leadership.confirm_leadership()
+        if leader != self._leader:
+            self._leader = leader
+            for tracker in self.trackers.values():
+                tracker.announcements.clear()
+            self._adopt_pending = leader and self.shared_announcements
+        return leader
+
+    def owns(self, login):
+        """Indique si la chaîne revient à cette instance (sans répartition : si elle est leader)"""
+        if self.shards is None:
+            return self._leader and leadership.is_leader()
+        return self.shards.owns(login)
+
+    @tasks.loop(seconds=HEARTBEAT_INTERVAL)
+    async def heartbeat(self):
+        """Publie le heartbeat de l'instance et suit les changements de répartition"""
+        try:
+            if await self.shards.heartbeat():
+                # Les annonces cédées sont oubliées, celles reprises chargées au prochain cycle
+                for tracker in self.trackers.values():
+                    for login in list(tracker.announcements):
+                        if not self.owns(login):
+                            tracker.end(login)
+                self._adopt_pending = True
+        except Exception as e:
+            logging.error(f"Erreur lors du heartbeat de l'instance : {str(e)}")
+
+    async def adopt_announcements(self, provider, logins):
+        """Charge les annonces publiées par d'autres instances pour les chaînes reprises"""
+        tracker = self.trackers[provider.name]
+        missing = [login.lower() for login in logins if login.lower() not in tracker.announcements]
+        for row in await self.announcement_repository.get_by_logins(missing, platform=provider.name):
+            tracker.adopt(Announcement(
+                login=row.login,
+                stream_id=row.stream_id,
+                channel_id=row.channel_id,
+                message_id=row.message_id,
+                stream=dict(row.stream),
+                provisional=row.stream_id.startswith(PROVISIONAL_ID_PREFIX)
+            ))
+
+    async def persist_announcement(self, announcement, provider=None):
+        """Enregistre une annonce en base pour les autres instances"""
+        if not self.shared_announcements:
+            return
+        try:
+            await self.announcement_repository.upsert(
+                announcement.login,
+                announcement.stream_id,
+                announcement.channel_id,
+                announcement.message_id,
+                announcement.stream,
+                platform=(provider or self.twitch).name
+            )
+        except Exception as e:
+            logging.warning(f"Impossible d'enregistrer l'annonce de {announcement.login} : {str(e)}")
+
+    async def forget_announcement(self, announcement, provider=None):
+        """Supprime en base l'annonce d'un stream terminé"""
+        if not self.shared_announcements:
+            return
+        try:
+            await self.announcement_repository.remove(announcement.login, platform=(provider or self.twitch).name)
+        except Exception as e:
+            logging.warning(f"Impossible de supprimer l'annonce de {announcement.login} : {str(e)}")
+
+    async def get_tracked_logins(self):
+        """Retourne les comptes Twitch suivis : TWITCH_USERNAME et membres ayant lié leur compte"""
+        return await self.twitch.get_tracked_channels()
+
+    def get_presence_covered_logins(self):
+        """Retourne les logins des membres inscrits dont le bot reçoit la présence"""
+        covered = set()
+        for discord_id, login in self.opted_in.items():
+            if any(guild.get_member(discord_id) for guild in self.bot.guilds):
+                covered.add(login)
+        return covered
+
+    def get_announcement_channel(self):
+        """Retourne le canal des annonces, None s'il n'est pas configuré ou introuvable"""
+        channel_id = int(os.getenv('STREAM_CHANNEL_ID', '0'))
+        if not channel_id:
+            logging.error("Configuration des streams manquante")
+            return None
+
+        channel = self.bot.get_channel(channel_id)
+        if not channel:
+            logging.error(f"Canal des streams non trouvé (ID: {channel_id})")
+        return channel
+
+    async def fetch_twitch_streams(self, usernames, priority=RequestPriority.RECONCILIATION):
+        """Récupère les streams en cours pour les comptes donnés, sans filtre de jeux"""
+        return await self.helix.get_streams(usernames, priority=priority)
+
+    async def refresh_game_filter(self, channel):
+        """Applique le filtre de jeux du serveur du canal d'annonces"""
+        guild = getattr(channel, 'guild', None)
+        if guild is None:
+            return
+        try:
+            self.twitch.game_filter = await self.game_filters.get(guild.id)
+        except Exception as e:
+            # Le filtre précédent reste en vigueur
+            logging.warning(f"Impossible de charger les filtres de jeux du serveur {guild.id} : {str(e)}")
 
-    async def fetch_twitch_streams(self, username):
-        client_id = os.getenv('TWITCH_CLIENT_ID')
-        client_secret = os.getenv('TWITCH_CLIENT_SECRET')
-        token_url = 'https://id.twitch.tv/oauth2/token'
-        token_data = {
-            'client_id': client_id,
-            'client_secret': client_secret,
-            'grant_type': 'client_credentials'
-        }
-        token_response = self.session.post(token_url, data=token_data)
-        token_response.raise_for_status()
-        access_token = token_response.json()['access_token']
-
-        headers = {
-            'Client-ID': client_id,
-            'Authorization': f'Bearer {access_token}'
-        }
-        streams_url = f'https://api.twitch.tv/helix/streams?user_login={username}'
-        streams_response = self.session.get(streams_url, headers=headers)
-        streams_response.raise_for_status()
-        streams_data = streams_response.json()['data']
-
-        return streams_data
+    async def get_assignments(self):
+        """Retourne les chaînes à vérifier à ce cycle, par plateforme"""
+        assignments = {}
+        for provider in self.providers.values():
+            channels = await provider.get_tracked_channels()
+            if self.shards is not None:
+                channels = self.shards.filter(channels)
+            if self._adopt_pending:
+                await self.adopt_announcements(provider, channels)
+            if provider is self.twitch and self._cycle % FULL_RECONCILE_EVERY != 0:
+                covered = self.get_presence_covered_logins()
+                channels = [login for login in channels if login not in covered]
+            if channels:
+                assignments[provider] = channels
+        self._adopt_pending = False
+        self._cycle += 1
+        return assignments
 
     @tasks.loop(seconds=60)
     async def check_streams(self):
-        """Vérifie les streams toutes les minutes"""
+        """Vérifie les streams de toutes les plateformes toutes les minutes"""
         try:
-            channel_id = int(os.getenv('STREAM_CHANNEL_ID'))
-            twitch_username = os.getenv('TWITCH_USERNAME')
-            
-            if not channel_id or not twitch_username:
-                logging.error("Configuration des streams manquante")
+            if not await self.confirm_leadership():
                 return
-                
-            channel = self.bot.get_channel(channel_id)
+
+            channel = self.get_announcement_channel()
             if not channel:
-                logging.error(f"Canal des streams non trouvé (ID: {channel_id})")
                 return
-                
-            streams = await self.fetch_twitch_streams(twitch_username)
-            await self.send_streams_to_channel(channel, streams)
+
+            await self.refresh_game_filter(channel)
+            assignments = await self.get_assignments()
+            if not assignments:
+                return
+
+            results = await self.scheduler.poll_all(assignments)
+            for provider in assignments:
+                result = results[provider.name]
+                await self.process_streams(channel, result.streams, result.polled, provider)
         except Exception as e:
             logging.error(f"Erreur lors de la vérification des streams : {str(e)}")
 
-    async def send_streams_to_channel(self, channel, streams):
-        """Envoie les notifications de stream dans le canal approprié"""
-        if not streams:
+    @tasks.loop(seconds=5)
+    async def flush_edits(self):
+        """Envoie les éditions d'annonces restées en attente faute de budget"""
+        try:
+            await self.edits.flush(self.edit_announcement)
+        except Exception as e:
+            logging.error(f"Erreur lors de l'édition des annonces : {str(e)}")
+
+    async def process_streams(self, channel, streams, polled_logins, provider=None):
+        """Publie les nouveaux streams et planifie la mise à jour des annonces existantes"""
+        provider = provider or self.twitch
+        tracker = self.trackers[provider.name]
+        started, updated, ended = tracker.reconcile(streams, polled_logins)
+
+        for stream in started:
+            await provider.enrich(stream)
+            message = await channel.send(embed=provider.build_live_embed(stream))
+            await self.persist_announcement(tracker.record(stream, message), provider)
+
+        for announcement, stream in updated:
+            await provider.enrich(stream)
+            announcement.stream = dict(stream)
+            self.edits.schedule(announcement.channel_id, announcement.message_id, provider.build_live_embed(stream))
+            await self.persist_announcement(announcement, provider)
+
+        for announcement in ended:
+            self.edits.schedule(
+                announcement.channel_id,
+                announcement.message_id,
+                provider.build_ended_embed(announcement.stream)
+            )
+            await self.forget_announcement(announcement, provider)
+
+        await self.edits.flush(self.edit_announcement)
+
+    @commands.Cog.listener()
+    async def on_presence_update(self, before, after):
+        """Annonce les streams des membres inscrits dès que leur présence change"""
+        try:
+            transition = detect_transition(before, after, self.opted_in, self.tracker.presence_live)
+            if transition is None:
+                return
+
+            kind, login, activity = transition
+            if not self.owns(login):
+                return
+            if kind == STARTED and login not in self.tracker.announcements:
+                game_filter = self.twitch.game_filter
+                if game_filter is not None and not game_filter.allows(activity.game):
+                    return
+                channel = self.get_announcement_channel()
+                if not channel:
+                    return
+                stream = await self.twitch.enrich(stream_from_presence(after, activity))
+                message = await channel.send(embed=self.twitch.build_live_embed(stream))
+                await self.persist_announcement(self.tracker.record(stream, message))
+            elif kind == ENDED:
+                announcement = self.tracker.end(login)
+                if announcement is not None:
+                    await self.forget_announcement(announcement)
+                    self.edits.schedule(
+                        announcement.channel_id,
+                        announcement.message_id,
+                        self.twitch.build_ended_embed(announcement.stream)
+                    )
+                    await self.edits.flush(self.edit_announcement)
+        except Exception as e:
+            logging.error(f"Erreur lors du traitement de la présence de {after} : {str(e)}")
+
+    async def edit_announcement(self, channel_id, message_id, embed):
+        """Édite un message d'annonce sans le récupérer au préalable"""
+        channel = self.bot.get_channel(channel_id)
+        if channel is None:
+            logging.warning(f"Canal d'annonce introuvable (ID: {channel_id})")
             return
+        await channel.get_partial_message(message_id).edit(embed=embed)
+
+    @app_commands.command(
+        name="live",
+        description="Indique si une chaîne Twitch est en live"
+    )
+    async def live(self, interaction: discord.Interaction, username: str):
+        """Recherche à la demande, prioritaire sur les vérifications périodiques"""
+        try:
+            await interaction.response.defer()
+            streams = await self.fetch_twitch_streams([username], priority=RequestPriority.USER)
+            if streams:
+                await interaction.followup.send(embed=build_live_embed(streams[0]))
+            else:
+                await interaction.followup.send(f"⚫ {username} n'est pas en live.")
+        except Exception as e:
+            logging.error(f"Erreur lors de la recherche du stream de {username} : {str(e)}")
+            await interaction.followup.send("❌ Une erreur est survenue lors de la recherche du stream !", ephemeral=True)
+
+    stream_games = app_commands.Group(
+        name="stream-jeux",
+        description="Jeux annoncés dans le canal des streams",
+        guild_only=True,
+        default_permissions=discord.Permissions(manage_guild=True)
+    )
+
+    @stream_games.command(name="ajouter", description="N'annoncer que les streams de ce jeu (et des autres jeux ajoutés)")
+    async def add_game(self, interaction: discord.Interaction, jeu: str):
+        try:
+            await interaction.response.defer(ephemeral=True)
+            game = await self.game_filters.add(interaction.guild_id, jeu)
+            if game is None:
+                await interaction.followup.send(f"❌ Jeu introuvable sur Twitch : {jeu}", ephemeral=True)
+                return
+            await interaction.followup.send(f"✅ Les streams de **{game['name']}** seront annoncés.", ephemeral=True)
+        except Exception as e:
+            logging.error(f"Erreur lors de l'ajout du filtre de jeu {jeu} : {str(e)}")
+            await interaction.followup.send("❌ Une erreur est survenue lors de l'ajout du jeu !", ephemeral=True)
+
+    @stream_games.command(name="retirer", description="Retirer un jeu des jeux annoncés")
+    async def remove_game(self, interaction: discord.Interaction, jeu: str):
+        try:
+            await interaction.response.defer(ephemeral=True)
+            if await self.game_filters.remove(interaction.guild_id, jeu):
+                await interaction.followup.send(f"✅ **{jeu}** retiré des jeux annoncés.", ephemeral=True)
+            else:
+                await interaction.followup.send(f"❌ **{jeu}** ne fait pas partie des jeux annoncés.", ephemeral=True)
+        except Exception as e:
+            logging.error(f"Erreur lors du retrait du filtre de jeu {jeu} : {str(e)}")
+            await interaction.followup.send("❌ Une erreur est survenue lors du retrait du jeu !", ephemeral=True)
 
-        for stream in streams:
-            stream_id = stream['id']
-            if stream_id not in self.stream_cache:
-                embed = discord.Embed(
-                    title=f"🎮 {stream['user_name']} est en live !",
-                    description=stream['title'],
-                    url=f"https://twitch.tv/{stream['user_login']}",
-                    color=discord.Color.purple()
-                )
-                
-                if stream.get('thumbnail_url'):
-                    thumbnail_url = stream['thumbnail_url'].replace('{width}', '1280').replace('{height}', '720')
-                    embed.set_image(url=thumbnail_url)
-                
-                embed.add_field(name="Jeu", value=stream['game_name'], inline=True)
-                embed.add_field(name="Viewers", value=str(stream['viewer_count']), inline=True)
-                
-                await channel.send(embed=embed)
-                self.stream_cache.add(stream_id)
+    @stream_games.command(name="liste", description="Afficher les jeux annoncés")
+    async def list_games(self, interaction: discord.Interaction):
+        try:
+            await interaction.response.defer(ephemeral=True)
+            game_filter = await self.game_filters.get(interaction.guild_id)
+            if game_filter is None:
+                await interaction.followup.send("Tous les jeux sont annoncés.", ephemeral=True)
+            else:
+                names = "\n".join(f"• {name}" for name in game_filter.names)
+                await interaction.followup.send(f"Jeux annoncés :\n{names}", ephemeral=True)
+        except Exception as e:
+            logging.error(f"Erreur lors de l'affichage des filtres de jeux : {str(e)}")
+            await interaction.followup.send("❌ Une erreur est survenue lors de l'affichage des jeux !", ephemeral=True)
 
 async def setup(bot):
     await bot.add_cog(Streams(bot))
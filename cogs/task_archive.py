@@ -0,0 +1,44 @@
+from discord.ext import commands, tasks
+import logging
+from src.infrastructure.config import leadership
+from src.application.services.task_archive_service import TaskArchiveService
+
+
+class TaskArchive(commands.Cog):
+    """
+    Cog gérant l'archivage périodique des tâches complétées.
+
+    Désactivé par défaut : définir TASK_ARCHIVE_AFTER_DAYS pour déplacer
+    vers tasks_archive les tâches complétées depuis plus de N jours.
+    Seule l'instance leader archive.
+
+    Attributes:
+        bot (commands.Bot): Instance du bot Discord
+        archive (Optional[TaskArchiveService]): Service d'archivage, None si désactivé
+    """
+    def __init__(self, bot):
+        self.bot = bot
+        self.archive = TaskArchiveService.create_from_env()
+
+    @commands.Cog.listener()
+    async def on_ready(self):
+        """Démarrer l'archivage une fois que le bot est prêt"""
+        if self.archive is not None and not self.archive_tasks.is_running():
+            self.archive_tasks.start()
+
+    def cog_unload(self):
+        """Arrêter la tâche quand le cog est déchargé"""
+        self.archive_tasks.cancel()
+
+    @tasks.loop(hours=1)
+    async def archive_tasks(self):
+        """Archive les tâches complétées depuis plus de TASK_ARCHIVE_AFTER_DAYS jours"""
+        try:
+            if not await leadership.confirm_leadership():
+                return
+            await self.archive.archive_completed()
+        except Exception as e:
+            logging.error(f"Erreur lors de l'archivage des tâches : {str(e)}")
+
+async def setup(bot):
+    await bot.add_cog(TaskArchive(bot))
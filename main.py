@@ -3,14 +3,17 @@ from discord.ext import commands
 import asyncio
 import logging
 from src.config.config import Config, load_config
+from src.infrastructure.config import database, invalidation, leadership
 from src.infrastructure.config.database import init_db
 from src.infrastructure.logging.logger import setup_logging
 import os
 from dotenv import load_dotenv
+from src.infrastructure.commands.base import CorrelatedCommandTree
 from src.infrastructure.commands.task_commands import TaskCommands
 from src.application.services.task_service import TaskService
 import sys
 from aiohttp import web
+from src.infrastructure.metrics import metrics
 
 # Configuration du logger
 logger = logging.getLogger()
@@ -28,7 +31,9 @@ class GuildeBot(commands.Bot):
         intents.message_content = True
         intents.members = True
         intents.guilds = True
-        super().__init__(command_prefix="!", intents=intents)
+        # Nécessaire pour détecter les streams des membres via leur présence
+        intents.presences = True
+        super().__init__(command_prefix="!", intents=intents, tree_cls=CorrelatedCommandTree)
     
     async def setup_hook(self) -> None:
         """Configure le bot avant son démarrage"""
@@ -59,6 +64,7 @@ class GuildeBot(commands.Bot):
             print(f"Members Intent: {self.intents.members}")
             print(f"Message Content Intent: {self.intents.message_content}")
             print(f"Guilds Intent: {self.intents.guilds}")
+            print(f"Presences Intent: {self.intents.presences}")
             
             print("\n=== COGS CHARGÉS ===")
             for cog in self.cogs:
@@ -93,10 +99,14 @@ async def start_server():
     app = web.Application()
     
     async def health_check(_):
-        return web.Response(text="Bot is running")
+        return web.json_response({"status": "running", "database_ready": database.ready})
+    
+    async def metrics_endpoint(_):
+        return web.Response(text=metrics.render(), content_type="text/plain")
     
     app.router.add_get("/", health_check)
     app.router.add_get("/health", health_check)
+    app.router.add_get("/metrics", metrics_endpoint)
     
     port = int(os.environ.get("PORT", 10000))
     logger.info(f"Démarrage du serveur sur le port {port}")
@@ -140,6 +150,9 @@ async def main():
                 await bot.start(token)
             finally:
                 await runner.cleanup()
+                await invalidation.stop_listener()
+                # Libère le leadership sans attendre la détection de la coupure
+                await leadership.stop_election()
             
     except Exception as e:
         logger.error(f"Erreur lors du démarrage du bot: {e}")
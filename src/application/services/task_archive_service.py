@@ -0,0 +1,73 @@
+from datetime import UTC, datetime, timedelta
+from typing import List, Optional
+import asyncio
+import logging
+import os
+from src.domain.entities.task import TaskArchive
+from src.infrastructure.metrics import metrics
+from src.infrastructure.repositories.task_archive_repository import TaskArchiveRepository
+
+logger = logging.getLogger(__name__)
+
+TASKS_ARCHIVED = metrics.counter(
+    "tasks_archived_total",
+    "Tâches complétées déplacées vers tasks_archive"
+)
+
+class TaskArchiveService:
+    """
+    Archivage des tâches complétées depuis plus de ``after_days`` jours.
+
+    Les tâches sont déplacées de tasks vers tasks_archive par lots de
+    ``batch_size``, chacun dans sa propre transaction : les verrous restent
+    courts et les requêtes des menus ne parcourent que les tâches vivantes.
+    Les tâches archivées restent consultables avec /archive.
+
+    Attributes:
+        after_days (int): Ancienneté de complétion au-delà de laquelle une tâche est archivée
+        batch_size (int): Tâches déplacées par transaction
+        pause (float): Attente entre deux lots, en secondes, pour laisser passer les interactions
+        repository (TaskArchiveRepository): Accès à la table tasks_archive
+    """
+    def __init__(self, after_days: int, batch_size: int = 500, pause: float = 0.1):
+        self.after_days = after_days
+        self.batch_size = batch_size
+        self.pause = pause
+        self.repository = TaskArchiveRepository()
+
+    @classmethod
+    def create_from_env(cls) -> Optional["TaskArchiveService"]:
+        """Crée le service depuis l'environnement, None si l'archivage est désactivé (TASK_ARCHIVE_AFTER_DAYS=0)"""
+        after_days = int(os.getenv('TASK_ARCHIVE_AFTER_DAYS', '0'))
+        if after_days <= 0:
+            return None
+        return cls(after_days, batch_size=int(os.getenv('TASK_ARCHIVE_BATCH_SIZE', '500')))
+
+    async def archive_completed(self) -> int:
+        """
+        Archive toutes les tâches éligibles, lot par lot.
+
+        Returns:
+            int: Nombre de tâches archivées
+        """
+        cutoff = datetime.now(UTC) - timedelta(days=self.after_days)
+        total = 0
+        while True:
+            archived = await self.repository.archive_batch(cutoff, self.batch_size)
+            total += archived
+            TASKS_ARCHIVED.inc(archived)
+            if archived < self.batch_size:
+                break
+            await asyncio.sleep(self.pause)
+        if total:
+            logger.info(f"{total} tâche(s) complétée(s) avant le {cutoff:%d/%m/%Y} archivée(s)")
+        return total
+
+    @staticmethod
+    async def get_user_archive(user_discord_id: int, limit: int = 25) -> List[TaskArchive]:
+        """Tâches archivées d'un utilisateur, les plus récemment complétées d'abord"""
+        try:
+            return await TaskArchiveRepository().get_user_archive(user_discord_id, limit)
+        except Exception as e:
+            logger.error(f"Erreur lors de la récupération des archives de {user_discord_id}: {str(e)}")
+            return []
@@ -0,0 +1,84 @@
+"""
+Cache en mémoire des en-têtes de listes de tâches, affichés par les menus.
+
+Une entrée par utilisateur, invalidée après validation des écritures publiées
+(voir invalidation), par utilisateur ou par ID de liste. Configuration :
+TASK_CACHE_TTL (secondes, 0 désactive le cache).
+"""
+import logging
+import os
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from src.infrastructure.config import invalidation
+
+logger = logging.getLogger(__name__)
+
+class TaskListHeaderCache:
+    """
+    Cache des en-têtes de listes (menus des tâches), par utilisateur.
+
+    Les entrées sont invalidées par les écritures publiées (voir invalidation),
+    y compris celles des autres instances ; ``ttl`` borne la durée de vie d'une
+    entrée si une écriture n'a pas été publiée (modification manuelle de la base).
+    Un chargement commencé avant une invalidation n'est pas mis en cache.
+
+    Args:
+        ttl (float): Durée de validité d'une entrée, en secondes (0 : cache désactivé)
+    """
+    def __init__(self, ttl: float = 30.0, clock: Callable[[], float] = time.monotonic):
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: Dict[int, Tuple[float, List]] = {}
+        # Propriétaire de chaque liste en cache, pour invalider par ID de liste
+        self._owners: Dict[int, int] = {}
+        self.generation = 0
+
+    def get(self, user_discord_id: int) -> Optional[List]:
+        """Listes en cache d'un utilisateur, None si absentes ou expirées"""
+        cached = self._entries.get(user_discord_id)
+        if cached is None:
+            return None
+        if self._clock() - cached[0] >= self.ttl:
+            self._drop(user_discord_id)
+            return None
+        return cached[1]
+
+    def put(self, user_discord_id: int, lists: List, generation: int) -> None:
+        """Met en cache les listes chargées, sauf si une invalidation a eu lieu depuis ``generation``"""
+        if self.ttl <= 0 or generation != self.generation:
+            return
+        self._drop(user_discord_id)
+        self._entries[user_discord_id] = (self._clock(), lists)
+        for task_list in lists:
+            self._owners[task_list.id] = user_discord_id
+
+    def invalidate_users(self, user_ids: Iterable[int]) -> None:
+        self.generation += 1
+        for user_discord_id in user_ids:
+            self._drop(user_discord_id)
+
+    def invalidate_lists(self, list_ids: Iterable[int]) -> None:
+        self.generation += 1
+        for list_id in list_ids:
+            owner = self._owners.get(list_id)
+            if owner is not None:
+                self._drop(owner)
+
+    def _drop(self, user_discord_id: int) -> None:
+        """Retire l'entrée d'un utilisateur et les propriétaires de ses listes"""
+        cached = self._entries.pop(user_discord_id, None)
+        if cached is None:
+            return
+        for task_list in cached[1]:
+            if self._owners.get(task_list.id) == user_discord_id:
+                del self._owners[task_list.id]
+
+    def clear(self) -> None:
+        self.generation += 1
+        self._entries.clear()
+        self._owners.clear()
+
+
+list_headers = TaskListHeaderCache(ttl=float(os.getenv("TASK_CACHE_TTL", "30")))
+invalidation.subscribe(invalidation.TASK_LISTS, list_headers.invalidate_lists, list_headers.clear)
+invalidation.subscribe(invalidation.USER_TASK_LISTS, list_headers.invalidate_users, list_headers.clear)
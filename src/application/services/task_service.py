@@ -1,14 +1,21 @@
 from typing import List, Optional, Tuple
 import logging
-from src.infrastructure.repositories.task_repository import TaskRepository
+from datetime import UTC, datetime
+from src.infrastructure.repositories.task_repository import TaskRepository, created_list, insert_list_statement
+from src.infrastructure.repositories.fast_task_repository import FastTaskRepository, task_repository_backend
 from src.domain.entities.task import Task, TaskList
 from src.infrastructure.config.database import init_db, async_session
 from src.config.config import load_config
 from src.infrastructure.config.db_state import DatabaseState
 from src.domain.exceptions import TaskNotFoundError, InvalidTaskStateError, DatabaseConnectionError
 from sqlalchemy.sql import select
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import raiseload, selectinload
 from src.infrastructure.config.database import get_session
+from src.infrastructure.config.read_routing import read_only
+from src.infrastructure.config.retry import retry_idempotent, retry_safe
+from src.infrastructure.config.invalidation import TASK_LISTS, USER_TASK_LISTS, publish
+from src.infrastructure.config.unit_of_work import current_unit_of_work
+from src.application.services.task_list_cache import list_headers
 
 # Configuration du logging
 logging.basicConfig(level=logging.INFO)
@@ -23,11 +30,14 @@ class TaskService:
     
     Attributes:
         repository (TaskRepository): Repository pour l'accès aux données
+        fast_repository (Optional[FastTaskRepository]): Chemin rapide des opérations
+            fréquentes (TASK_REPOSITORY=fast), None pour passer par l'ORM
         _initialized (bool): État d'initialisation du service
     """
     def __init__(self):
         self._initialized = True
         self.repository = TaskRepository()
+        self.fast_repository = FastTaskRepository() if task_repository_backend() == "fast" else None
         logger.debug("TaskService initialisé")
     
     async def _ensure_initialized(self):
@@ -38,101 +48,163 @@ class TaskService:
             await DatabaseState.ensure_initialized()
             self._initialized = True
     
-    async def create_list(self, user_discord_id: str, name: str) -> Tuple[bool, str, Optional[TaskList]]:
+    async def create_list(self, user_discord_id: int, name: str) -> Tuple[bool, str, Optional[TaskList]]:
         """Crée une nouvelle liste de tâches"""
         await self._ensure_initialized()
         try:
             async with get_session() as session:
-                task_list = TaskList(
-                    name=name,
-                    user_discord_id=user_discord_id,
-                    tasks=[]  # Initialisation explicite de la liste des tâches
-                )
-                session.add(task_list)
+                # ON CONFLICT : aucune ligne renvoyée si le nom est déjà pris
+                result = await session.execute(insert_list_statement(session, name, user_discord_id))
+                task_list = created_list(result.scalar_one_or_none())
+                if task_list is None:
+                    return False, "Une liste avec ce nom existe déjà", None
+                await publish(USER_TASK_LISTS, [user_discord_id], session)
                 await session.commit()
-                await session.refresh(task_list)
-                
-                # Requête explicite pour charger la liste avec ses tâches
-                query = select(TaskList).filter_by(id=task_list.id).options(
-                    selectinload(TaskList.tasks)
-                )
-                result = await session.execute(query)
-                task_list = result.scalar_one()
-                
                 return True, "Liste créée avec succès", task_list
         except Exception as e:
             logger.error(f"Erreur lors de la création de la liste: {str(e)}")
             return False, "Erreur lors de la création de la liste", None
     
-    async def get_user_lists(self, user_discord_id: str) -> List[TaskList]:
+    @read_only
+    async def get_user_lists(self, user_discord_id: int) -> List[TaskList]:
         """Récupère toutes les listes d'un utilisateur"""
         await self._ensure_initialized()
         try:
-            async with get_session() as session:
-                # Utiliser selectinload pour charger les tâches en même temps
-                query = select(TaskList).filter_by(user_discord_id=user_discord_id).options(
-                    selectinload(TaskList.tasks)
-                )
-                result = await session.execute(query)
-                return list(result.scalars().all())
+            if self.fast_repository is not None:
+                return await self.fast_repository.get_user_lists(user_discord_id)
+            return await self._load_user_lists(user_discord_id)
         except Exception as e:
             logger.error(f"Erreur lors de la récupération des listes: {str(e)}")
             return []
+
+    @retry_idempotent
+    async def _load_user_lists(self, user_discord_id: int) -> List[TaskList]:
+        async with get_session() as session:
+            # Utiliser selectinload pour charger les tâches en même temps
+            query = select(TaskList).filter_by(user_discord_id=user_discord_id).options(
+                selectinload(TaskList.tasks)
+            ).execution_options(populate_existing=True)
+            result = await session.execute(query)
+            return list(result.scalars().all())
+
+    @read_only
+    async def get_user_list_headers(self, user_discord_id: int) -> List[TaskList]:
+        """
+        Récupère les listes d'un utilisateur sans leurs tâches.
+
+        Les compteurs total_count et completed_count suffisent aux menus et
+        résumés ; les tâches d'une liste se chargent avec get_list(). Hors
+        UnitOfWork, les en-têtes sont servis par le cache (voir task_list_cache).
+        """
+        await self._ensure_initialized()
+        try:
+            # Une UnitOfWork peut lire ses propres écritures, pas encore validées : pas de cache
+            cacheable = current_unit_of_work() is None
+            if cacheable and (cached := list_headers.get(user_discord_id)) is not None:
+                return cached
+            generation = list_headers.generation
+            if self.fast_repository is not None:
+                lists = await self.fast_repository.get_user_list_headers(user_discord_id)
+            else:
+                lists = await self._load_user_list_headers(user_discord_id)
+            if cacheable:
+                list_headers.put(user_discord_id, lists, generation)
+            return lists
+        except Exception as e:
+            logger.error(f"Erreur lors de la récupération des listes: {str(e)}")
+            return []
+
+    @retry_idempotent
+    async def _load_user_list_headers(self, user_discord_id: int) -> List[TaskList]:
+        async with get_session() as session:
+            # populate_existing : au sein d'une UnitOfWork, les compteurs modifiés
+            # par les triggers remplacent ceux des listes déjà chargées
+            query = select(TaskList).filter_by(user_discord_id=user_discord_id).order_by(TaskList.id).options(
+                raiseload(TaskList.tasks)
+            ).execution_options(populate_existing=True)
+            result = await session.execute(query)
+            return list(result.scalars().all())
     
     async def add_task(self, description: str, task_list_id: int) -> Optional[Task]:
         """Ajoute une tâche à une liste"""
         await self._ensure_initialized()
         try:
-            async with get_session() as session:
-                task = Task(
-                    description=description,
-                    task_list_id=task_list_id
-                )
-                session.add(task)
-                await session.commit()
-                await session.refresh(task)
+            if self.fast_repository is not None:
+                task = await self.fast_repository.add_task(description, task_list_id)
+                if task is not None:
+                    await publish(TASK_LISTS, [task_list_id])
                 return task
+            return await self._insert_task(description, task_list_id)
         except Exception as e:
             logger.error(f"Erreur lors de l'ajout de la tâche: {str(e)}")
             return None
+
+    @retry_safe
+    async def _insert_task(self, description: str, task_list_id: int) -> Task:
+        async with get_session() as session:
+            task = Task(
+                description=description,
+                task_list_id=task_list_id
+            )
+            session.add(task)
+            await publish(TASK_LISTS, [task_list_id], session)
+            await session.commit()
+            await session.refresh(task)
+            return task
     
     async def toggle_task(self, task_id: int) -> Optional[Task]:
         """Change l'état d'une tâche (complétée/non complétée)"""
         await self._ensure_initialized()
         try:
-            async with get_session() as session:
-                query = select(Task).filter_by(id=task_id)
-                result = await session.execute(query)
-                task = result.scalar_one_or_none()
-                
-                if task:
-                    task.completed = not task.completed
-                    await session.commit()
-                    await session.refresh(task)
-                    
+            if self.fast_repository is not None:
+                task = await self.fast_repository.toggle_task(task_id)
+                if task is not None:
+                    await publish(TASK_LISTS, [task.task_list_id])
                 return task
+            return await self._toggle_task(task_id)
         except Exception as e:
             logger.error(f"Erreur lors du changement d'état de la tâche: {str(e)}")
             return None
+
+    @retry_safe
+    async def _toggle_task(self, task_id: int) -> Optional[Task]:
+        async with get_session() as session:
+            query = select(Task).filter_by(id=task_id)
+            result = await session.execute(query)
+            task = result.scalar_one_or_none()
+
+            if task:
+                task.completed = not task.completed
+                task.completed_at = datetime.now(UTC) if task.completed else None
+                await publish(TASK_LISTS, [task.task_list_id], session)
+                await session.commit()
+                await session.refresh(task)
+
+            return task
     
     async def update_task_description(self, task_id: int, new_description: str) -> Optional[Task]:
         """Met à jour la description d'une tâche"""
         await self._ensure_initialized()
         try:
-            async with get_session() as session:
-                query = select(Task).filter_by(id=task_id)
-                result = await session.execute(query)
-                task = result.scalar_one_or_none()
-                
-                if task:
-                    task.description = new_description
-                    await session.commit()
-                    await session.refresh(task)
-                    
-                return task
+            return await self._set_task_description(task_id, new_description)
         except Exception as e:
             logger.error(f"Erreur lors de la mise à jour de la description: {str(e)}")
             return None
+
+    @retry_idempotent
+    async def _set_task_description(self, task_id: int, new_description: str) -> Optional[Task]:
+        async with get_session() as session:
+            query = select(Task).filter_by(id=task_id)
+            result = await session.execute(query)
+            task = result.scalar_one_or_none()
+
+            if task:
+                task.description = new_description
+                await publish(TASK_LISTS, [task.task_list_id], session)
+                await session.commit()
+                await session.refresh(task)
+
+            return task
     
     async def delete_task(self, task_id: int) -> bool:
         """Supprime une tâche"""
@@ -145,6 +217,7 @@ class TaskService:
                 
                 if task:
                     await session.delete(task)
+                    await publish(TASK_LISTS, [task.task_list_id], session)
                     await session.commit()
                     return True
                     
@@ -156,7 +229,8 @@ class TaskService:
     async def check_database(self):
         """Vérifie l'état de la base de données."""
         try:
-            test_list = await self.repository.create_list("__test__", "__test__")
+            # Aucun snowflake Discord ne vaut 0 : la liste de test ne peut appartenir à un membre
+            test_list = await self.repository.create_list("__test__", 0)
             if test_list is None:
                 return False, "Erreur de base de données : impossible de créer une liste de test"
             
@@ -182,6 +256,7 @@ class TaskService:
                 
                 if task_list:
                     await session.delete(task_list)
+                    await publish(TASK_LISTS, [list_id], session)
                     await session.commit()
                     return True
                     
@@ -214,6 +289,7 @@ class TaskService:
                 for task in completed_tasks:
                     await session.delete(task)
 
+                await publish(TASK_LISTS, [task_list_id], session)
                 await session.commit()
                 return True
 
@@ -236,20 +312,25 @@ class TaskService:
             logger.error(f"Problème de base de données lors de la complétion de la tâche: {str(e)}")
             raise
 
+    @read_only
     async def get_list(self, list_id: int) -> Optional[TaskList]:
         """Récupère une liste par son ID"""
         await self._ensure_initialized()
         try:
-            async with get_session() as session:
-                query = select(TaskList).filter_by(id=list_id).options(
-                    selectinload(TaskList.tasks)
-                )
-                result = await session.execute(query)
-                return result.scalar_one_or_none()
+            return await self._load_list(list_id)
         except Exception as e:
             logger.error(f"Erreur lors de la récupération de la liste {list_id}: {str(e)}")
             return None
 
+    @retry_idempotent
+    async def _load_list(self, list_id: int) -> Optional[TaskList]:
+        async with get_session() as session:
+            query = select(TaskList).filter_by(id=list_id).options(
+                selectinload(TaskList.tasks)
+            ).execution_options(populate_existing=True)
+            result = await session.execute(query)
+            return result.scalar_one_or_none()
+
     async def get_all_tasks(self):
         try:
             return await self.repository.get_all()
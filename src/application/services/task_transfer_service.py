@@ -0,0 +1,82 @@
+from itertools import islice
+from typing import AsyncIterator, BinaryIO, Dict, Iterable, Iterator, List, Optional
+import asyncio
+import gzip
+import io
+import logging
+from src.infrastructure.repositories.task_transfer_repository import (
+    CHUNK_SIZE, FORMATS, ImportResult, TaskTransferRepository, read_records
+)
+
+logger = logging.getLogger(__name__)
+
+class TaskTransferService:
+    """
+    Export et import compressés (gzip) des listes et tâches.
+
+    Le fichier d'échange (NDJSON ou CSV, voir task_transfer_repository) est
+    écrit et lu au fil de l'eau : l'export d'une guilde entière, comme la
+    migration d'un backend vers un autre, ne charge jamais toutes les
+    données en mémoire.
+
+    Attributes:
+        repository (TaskTransferRepository): Accès en flux aux tables
+        chunk_size (int): Enregistrements chargés par lot à l'import
+    """
+    def __init__(self, repository: Optional[TaskTransferRepository] = None, chunk_size: int = CHUNK_SIZE):
+        self.repository = repository or TaskTransferRepository()
+        self.chunk_size = chunk_size
+
+    @staticmethod
+    def detect_format(filename: str) -> str:
+        """Format d'après l'extension (donnees.csv.gz : csv), NDJSON par défaut"""
+        name = filename.lower().removesuffix(".gz")
+        return "csv" if name.endswith(".csv") else "ndjson"
+
+    async def export(self, output: BinaryIO, fmt: str = "ndjson", user_ids: Optional[List[int]] = None) -> Dict[str, int]:
+        """
+        Exporte les listes et tâches compressées dans ``output``.
+
+        Args:
+            output (BinaryIO): Fichier binaire de destination
+            fmt (str): ndjson ou csv
+            user_ids (Optional[List[int]]): Propriétaires exportés, tous par défaut
+
+        Returns:
+            Dict[str, int]: Lignes exportées par table
+        """
+        with gzip.GzipFile(fileobj=output, mode="wb") as compressed:
+            counts = await self.repository.export(compressed, fmt, user_ids)
+        logger.info(f"Export {fmt} : {counts['task_lists']} liste(s), {counts['tasks']} tâche(s)")
+        return counts
+
+    async def _chunks(self, records: Iterator[Dict]) -> AsyncIterator[List[Dict]]:
+        # Lecture et décompression hors de la boucle d'événements, un lot à la fois
+        while True:
+            chunk = await asyncio.to_thread(lambda: list(islice(records, self.chunk_size)))
+            if not chunk:
+                return
+            yield chunk
+
+    async def import_(self, source: BinaryIO, fmt: str = "ndjson", user_ids: Optional[Iterable[int]] = None) -> ImportResult:
+        """
+        Importe un fichier d'échange compressé.
+
+        Args:
+            source (BinaryIO): Fichier binaire compressé
+            fmt (str): ndjson ou csv
+            user_ids (Optional[Iterable[int]]): Propriétaires acceptés, tous par défaut
+
+        Returns:
+            ImportResult: Listes importées et ignorées (nom déjà utilisé), tâches importées
+        """
+        if fmt not in FORMATS:
+            raise ValueError(f"Format inconnu : {fmt} (attendu : {', '.join(FORMATS)})")
+        with gzip.GzipFile(fileobj=source, mode="rb") as compressed:
+            records = read_records(io.TextIOWrapper(compressed, encoding="utf-8", newline=""), fmt)
+            result = await self.repository.import_records(self._chunks(records), user_ids)
+        logger.info(
+            f"Import {fmt} : {result.lists_imported} liste(s) et {result.tasks_imported} tâche(s) importée(s), "
+            f"{result.lists_skipped} liste(s) ignorée(s)"
+        )
+        return result
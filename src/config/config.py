@@ -11,17 +11,85 @@ logger = logging.getLogger(__name__)
 
 @dataclass
 class DatabaseConfig:
+    """
+    Configuration de la base de données et de son pool de connexions.
+
+    PostgreSQL est décrit par DB_HOST, DB_PORT, DB_NAME, DB_USER et DB_PASSWORD.
+    Une DATABASE_URL SQLite (sqlite:///chemin.db) sélectionne à la place le
+    backend embarqué, sans serveur.
+
+    Attributes:
+        pool_size (int): Connexions conservées ouvertes dans le pool
+        max_overflow (int): Connexions supplémentaires ouvertes en cas de pic
+        pool_timeout (float): Attente maximale d'une connexion libre, en secondes
+        pool_recycle (int): Âge maximal d'une connexion avant réouverture, en secondes
+        pool_pre_ping (bool): Vérifie une connexion avant de la fournir (connexions coupées par l'hébergeur)
+        pool_min_size (int): Connexions ouvertes et préchauffées au démarrage (0 pour désactiver)
+        slow_query_ms (float): Seuil du journal des requêtes lentes, en millisecondes
+        auto_migrate (bool): Applique les migrations Alembic manquantes au démarrage au lieu d'échouer
+        read_url (Optional[str]): Réplica en lecture seule pour les méthodes @read_only
+        read_max_lag (float): Retard de réplication toléré avant de lire sur le primaire, en secondes
+        interaction_timeout (float): Budget des accès à la base d'une interaction Discord, en secondes
+        pooler_mode (str): Pooler devant PostgreSQL : none, session ou transaction (PgBouncer)
+        direct_url (Optional[str]): Connexion sans pooler pour LISTEN et le verrou du leader (requise en mode transaction)
+    """
+    pool_size: int = 5
+    max_overflow: int = 10
+    pool_timeout: float = 30.0
+    pool_recycle: int = 1800
+    pool_pre_ping: bool = True
+    pool_min_size: int = 2
+    slow_query_ms: float = 200.0
+    auto_migrate: bool = False
+    read_url: Optional[str] = None
+    read_max_lag: float = 5.0
+    interaction_timeout: float = 10.0
+    pooler_mode: str = "none"
+    direct_url: Optional[str] = None
+
     def __post_init__(self):
+        if self.is_sqlite:
+            return
         # Vérifier que toutes les variables nécessaires sont définies
         required_vars = ['DB_HOST', 'DB_PORT', 'DB_NAME', 'DB_USER', 'DB_PASSWORD']
         missing_vars = [var for var in required_vars if not os.getenv(var)]
         if missing_vars:
             raise ValueError(f"Variables manquantes dans .env: {', '.join(missing_vars)}")
+        if self.pooler_mode not in ('none', 'session', 'transaction'):
+            raise ValueError(f"DB_POOLER_MODE invalide : {self.pooler_mode} (attendu : none, session ou transaction)")
+        if self.pooler_mode == 'transaction' and not self.direct_url:
+            raise ValueError("DB_DIRECT_URL est requise avec DB_POOLER_MODE=transaction (LISTEN et verrou du leader)")
     
+    @property
+    def is_sqlite(self) -> bool:
+        """Backend SQLite embarqué (DATABASE_URL en sqlite://)"""
+        return os.getenv('DATABASE_URL', '').startswith('sqlite')
+
     @property
     def url(self) -> str:
+        if self.is_sqlite:
+            return os.getenv('DATABASE_URL')
         return f"postgresql://{os.getenv('DB_USER')}:{os.getenv('DB_PASSWORD')}@{os.getenv('DB_HOST')}:{os.getenv('DB_PORT')}/{os.getenv('DB_NAME')}"
 
+    @classmethod
+    def create_from_env(cls) -> 'DatabaseConfig':
+        """Crée une configuration de base de données à partir des variables d'environnement"""
+        return cls(
+            pool_size=int(os.getenv('DB_POOL_SIZE', str(cls.pool_size))),
+            max_overflow=int(os.getenv('DB_MAX_OVERFLOW', str(cls.max_overflow))),
+            pool_timeout=float(os.getenv('DB_POOL_TIMEOUT', str(cls.pool_timeout))),
+            pool_recycle=int(os.getenv('DB_POOL_RECYCLE', str(cls.pool_recycle))),
+            pool_pre_ping=os.getenv('DB_POOL_PRE_PING', str(cls.pool_pre_ping)).lower() == 'true',
+            pool_min_size=int(os.getenv('DB_POOL_MIN_SIZE', str(cls.pool_min_size))),
+            slow_query_ms=float(os.getenv('DB_SLOW_QUERY_MS', str(cls.slow_query_ms))),
+            auto_migrate=os.getenv('DB_AUTO_MIGRATE', str(cls.auto_migrate)).lower() == 'true',
+            read_url=os.getenv('DB_READ_URL') or None,
+            read_max_lag=float(os.getenv('DB_READ_MAX_LAG_SECONDS', str(cls.read_max_lag))),
+            interaction_timeout=float(os.getenv('DB_INTERACTION_TIMEOUT', str(cls.interaction_timeout))),
+            pooler_mode=os.getenv('DB_POOLER_MODE', cls.pooler_mode).lower(),
+            direct_url=os.getenv('DB_DIRECT_URL') or None
+        )
+
 @dataclass
 class DiscordConfig:
     token: str
@@ -139,7 +207,7 @@ class Config:
 
     def _load_database_config(self) -> DatabaseConfig:
         """Charge la configuration de la base de données"""
-        return DatabaseConfig()
+        return DatabaseConfig.create_from_env()
 
     def _load_discord_config(self) -> DiscordConfig:
         """Charge la configuration Discord"""
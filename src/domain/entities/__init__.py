@@ -1,4 +1,4 @@
 # Vide, juste pour marquer le dossier comme un package Python
-from .task import Task, TaskList
+from .task import Task, TaskArchive, TaskList
 
-__all__ = ['Task', 'TaskList'] 
\ No newline at end of file
+__all__ = ['Task', 'TaskArchive', 'TaskList'] 
\ No newline at end of file
@@ -0,0 +1,75 @@
+from datetime import datetime, UTC
+from sqlalchemy import String, DateTime, BigInteger, JSON
+from sqlalchemy.orm import Mapped, mapped_column
+from src.infrastructure.config.database import Base
+
+class StreamReplica(Base):
+    """
+    Instance du bot participant au suivi des streams.
+
+    Chaque instance met à jour last_seen à intervalle régulier ; les instances
+    dont le heartbeat a expiré ne reçoivent plus de streamers à surveiller.
+
+    Attributes:
+        replica_id (str): Identifiant unique de l'instance
+        started_at (datetime): Date de démarrage de l'instance
+        last_seen (datetime): Date du dernier heartbeat
+    """
+    __tablename__ = "stream_replicas"
+
+    replica_id: Mapped[str] = mapped_column(String, primary_key=True)
+    started_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(UTC))
+    last_seen: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(UTC))
+
+    def __repr__(self):
+        return f"<StreamReplica(replica_id='{self.replica_id}', last_seen={self.last_seen})>"
+
+class StreamAnnouncement(Base):
+    """
+    Message Discord annonçant un stream en cours.
+
+    Partagé entre les instances pour qu'un streamer réattribué continue
+    d'être mis à jour dans le même message au lieu d'être annoncé à nouveau.
+
+    Attributes:
+        platform (str): Plateforme de streaming (twitch, youtube)
+        login (str): Chaîne suivie (login Twitch, identifiant de chaîne YouTube)
+        stream_id (str): Identifiant Helix (ou provisoire) du stream
+        channel_id (int): Canal Discord de l'annonce
+        message_id (int): Message Discord de l'annonce
+        stream (dict): Dernier payload affiché
+        updated_at (datetime): Date de dernière mise à jour
+    """
+    __tablename__ = "stream_announcements"
+
+    platform: Mapped[str] = mapped_column(String, primary_key=True, default="twitch")
+    login: Mapped[str] = mapped_column(String, primary_key=True)
+    stream_id: Mapped[str] = mapped_column(String, nullable=False)
+    channel_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    message_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    stream: Mapped[dict] = mapped_column(JSON, nullable=False, default=dict)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(UTC))
+
+    def __repr__(self):
+        return f"<StreamAnnouncement(platform='{self.platform}', login='{self.login}', message_id={self.message_id})>"
+
+class StreamGameFilter(Base):
+    """
+    Jeu autorisé dans les annonces de streams d'un serveur.
+
+    Lorsqu'un serveur a au moins un filtre, seuls les streams de ces jeux
+    sont annoncés. L'identifiant Helix est résolu une fois puis conservé.
+
+    Attributes:
+        guild_id (int): ID Discord du serveur
+        game_name (str): Nom du jeu sur Twitch
+        game_id (str): Identifiant Helix du jeu, None tant qu'il n'est pas résolu
+    """
+    __tablename__ = "stream_game_filters"
+
+    guild_id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    game_name: Mapped[str] = mapped_column(String, primary_key=True)
+    game_id: Mapped[str] = mapped_column(String, nullable=True)
+
+    def __repr__(self):
+        return f"<StreamGameFilter(guild_id={self.guild_id}, game_name='{self.game_name}')>"
@@ -1,21 +1,29 @@
 from datetime import datetime, UTC
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey
+from typing import Optional
+from sqlalchemy import DDL, BigInteger, Column, Index, Integer, String, Boolean, DateTime, ForeignKey, UniqueConstraint, event, text
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 from src.infrastructure.config.database import Base
 
 class TaskList(Base):
     """Représente une liste de tâches"""
     __tablename__ = "task_lists"
+    # Un nom de liste par utilisateur ; sert aussi l'index des recherches par utilisateur
+    __table_args__ = (UniqueConstraint("user_discord_id", "name", name="uq_task_lists_user_discord_id_name"),)
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     name: Mapped[str] = mapped_column(String, nullable=False)
-    user_discord_id: Mapped[str] = mapped_column(String, nullable=False)
+    # Snowflake Discord (entier 64 bits)
+    user_discord_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(UTC))
+    # Compteurs tenus à jour par les triggers de la table tasks (voir TASK_COUNT_TRIGGERS) :
+    # les menus affichent la progression sans charger les tâches
+    total_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    completed_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
     
     tasks = relationship("Task", back_populates="task_list", cascade="all, delete-orphan")
 
     def __repr__(self):
-        return f"<TaskList(id={self.id}, name='{self.name}', user_discord_id='{self.user_discord_id}')>"
+        return f"<TaskList(id={self.id}, name='{self.name}', user_discord_id={self.user_discord_id})>"
 
 class Task(Base):
     """
@@ -26,16 +34,22 @@ class Task(Base):
         description (str): Description de la tâche
         completed (bool): État de complétion de la tâche
         created_at (datetime): Date de création
+        completed_at (datetime): Date de complétion, None si la tâche n'est pas complétée
         task_list_id (int): ID de la liste parente
         task_list (TaskList): Relation vers la liste parente
     """
     __tablename__ = "tasks"
+    # Tâches candidates à l'archivage (voir TaskArchiveService)
+    __table_args__ = (
+        Index("ix_tasks_completed_at", "completed_at", postgresql_where=text("completed"), sqlite_where=text("completed")),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     description: Mapped[str] = mapped_column(String, nullable=False)
     completed: Mapped[bool] = mapped_column(Boolean, default=False)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(UTC))
-    task_list_id: Mapped[int] = mapped_column(Integer, ForeignKey("task_lists.id"), nullable=False)
+    completed_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    task_list_id: Mapped[int] = mapped_column(Integer, ForeignKey("task_lists.id"), nullable=False, index=True)
     task_list = relationship("TaskList", back_populates="tasks")
 
     def __repr__(self):
@@ -44,4 +58,114 @@ class Task(Base):
     def can_transition_to(self, new_status: str) -> bool:
         """Vérifie si la tâche peut passer au nouveau statut"""
         # Pour l'instant, on autorise toutes les transitions
-        return True 
\ No newline at end of file
+        return True
+
+class TaskArchive(Base):
+    """
+    Tâche complétée déplacée hors de la table tasks par l'archivage.
+
+    La liste d'origine peut avoir été supprimée depuis : son nom et son
+    propriétaire sont recopiés avec la tâche.
+
+    Attributes:
+        id (int): Identifiant de la tâche d'origine
+        description (str): Description de la tâche
+        created_at (datetime): Date de création de la tâche
+        completed_at (datetime): Date de complétion
+        archived_at (datetime): Date d'archivage
+        task_list_id (int): ID de la liste d'origine
+        list_name (str): Nom de la liste d'origine
+        user_discord_id (int): Propriétaire de la liste d'origine
+    """
+    __tablename__ = "tasks_archive"
+    __table_args__ = (Index("ix_tasks_archive_user_discord_id_completed_at", "user_discord_id", "completed_at"),)
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=False)
+    description: Mapped[str] = mapped_column(String, nullable=False)
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    completed_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    archived_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    task_list_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    list_name: Mapped[str] = mapped_column(String, nullable=False)
+    user_discord_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
+
+    def __repr__(self):
+        return f"<TaskArchive(id={self.id}, description='{self.description}', list_name='{self.list_name}')>"
+
+
+# Maintien de total_count / completed_count dans la transaction qui modifie les tâches,
+# quel que soit le chemin d'écriture (ORM, chemin rapide, suppressions en masse).
+# Les bases PostgreSQL existantes reçoivent les mêmes triggers par la migration 008.
+TASK_COUNT_TRIGGERS = {
+    "postgresql": [
+        """
+        CREATE OR REPLACE FUNCTION tasks_count_changes() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                UPDATE task_lists l SET total_count = l.total_count + c.total, completed_count = l.completed_count + c.completed
+                FROM (SELECT task_list_id, count(*) AS total, count(*) FILTER (WHERE completed) AS completed
+                      FROM new_tasks GROUP BY task_list_id) c
+                WHERE l.id = c.task_list_id;
+            ELSIF TG_OP = 'DELETE' THEN
+                UPDATE task_lists l SET total_count = l.total_count - c.total, completed_count = l.completed_count - c.completed
+                FROM (SELECT task_list_id, count(*) AS total, count(*) FILTER (WHERE completed) AS completed
+                      FROM old_tasks GROUP BY task_list_id) c
+                WHERE l.id = c.task_list_id;
+            ELSE
+                -- Seules les tâches dont l'état ou la liste change comptent
+                WITH moved AS (
+                    SELECT o.task_list_id AS old_list, coalesce(o.completed, false)::int AS old_completed,
+                           n.task_list_id AS new_list, coalesce(n.completed, false)::int AS new_completed
+                    FROM old_tasks o JOIN new_tasks n ON n.id = o.id
+                    WHERE n.completed IS DISTINCT FROM o.completed OR n.task_list_id IS DISTINCT FROM o.task_list_id
+                )
+                UPDATE task_lists l SET total_count = l.total_count + c.total, completed_count = l.completed_count + c.completed
+                FROM (SELECT task_list_id, sum(total) AS total, sum(completed) AS completed FROM (
+                          SELECT new_list AS task_list_id, 1 AS total, new_completed AS completed FROM moved
+                          UNION ALL
+                          SELECT old_list, -1, -old_completed FROM moved
+                      ) changes GROUP BY task_list_id) c
+                WHERE l.id = c.task_list_id AND (c.total <> 0 OR c.completed <> 0);
+            END IF;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+        """,
+        # Triggers par instruction : une suppression en masse ne met à jour chaque liste qu'une fois
+        "CREATE TRIGGER tasks_count_insert AFTER INSERT ON tasks REFERENCING NEW TABLE AS new_tasks "
+        "FOR EACH STATEMENT EXECUTE FUNCTION tasks_count_changes()",
+        "CREATE TRIGGER tasks_count_delete AFTER DELETE ON tasks REFERENCING OLD TABLE AS old_tasks "
+        "FOR EACH STATEMENT EXECUTE FUNCTION tasks_count_changes()",
+        # Pas de liste de colonnes (UPDATE OF ...) : incompatible avec les tables de transition
+        "CREATE TRIGGER tasks_count_update AFTER UPDATE ON tasks "
+        "REFERENCING OLD TABLE AS old_tasks NEW TABLE AS new_tasks "
+        "FOR EACH STATEMENT EXECUTE FUNCTION tasks_count_changes()",
+    ],
+    "sqlite": [
+        """
+        CREATE TRIGGER tasks_count_insert AFTER INSERT ON tasks BEGIN
+            UPDATE task_lists SET total_count = total_count + 1, completed_count = completed_count + coalesce(NEW.completed, 0)
+            WHERE id = NEW.task_list_id;
+        END
+        """,
+        """
+        CREATE TRIGGER tasks_count_delete AFTER DELETE ON tasks BEGIN
+            UPDATE task_lists SET total_count = total_count - 1, completed_count = completed_count - coalesce(OLD.completed, 0)
+            WHERE id = OLD.task_list_id;
+        END
+        """,
+        """
+        CREATE TRIGGER tasks_count_update AFTER UPDATE OF completed, task_list_id ON tasks BEGIN
+            UPDATE task_lists SET total_count = total_count - 1, completed_count = completed_count - coalesce(OLD.completed, 0)
+            WHERE id = OLD.task_list_id;
+            UPDATE task_lists SET total_count = total_count + 1, completed_count = completed_count + coalesce(NEW.completed, 0)
+            WHERE id = NEW.task_list_id;
+        END
+        """,
+    ],
+}
+
+for _dialect, _statements in TASK_COUNT_TRIGGERS.items():
+    for _statement in _statements:
+        # Schémas créés par create_all (SQLite embarqué, tests)
+        event.listen(Task.__table__, "after_create", DDL(_statement).execute_if(dialect=_dialect))
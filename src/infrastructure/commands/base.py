@@ -9,6 +9,9 @@ from functools import wraps
 from enum import Enum
 from ..errors.exceptions import CommandError, PermissionError, ValidationError
 from .aliases import AliasManager
+from ..config.deadline import bind_interaction_deadline
+from ..config.read_routing import begin_primary_scope
+from ..logging.correlation import bind_interaction
 import asyncio
 from discord.app_commands import CommandOnCooldown
 from discord.enums import AppCommandOptionType
@@ -456,4 +459,35 @@ class AliasedSlashCommandGroup(app_commands.Group):
     async def on_error(self, interaction: discord.Interaction, error: Exception):
         """Gère les erreurs des commandes du groupe"""
         if self.error_handler:
-            await self.error_handler(interaction, error) 
\ No newline at end of file
+            await self.error_handler(interaction, error) 
+
+def _bind(interaction: discord.Interaction) -> None:
+    """Identifiant de corrélation, échéance et routage des lectures de l'interaction"""
+    bind_interaction(interaction)
+    bind_interaction_deadline(interaction.created_at)
+    # Nouvelle interaction : l'épingle au primaire d'un traitement précédent ne la concerne pas
+    begin_primary_scope(clear=True)
+
+
+class CorrelatedCommandTree(app_commands.CommandTree):
+    """Arbre de commandes associant chaque commande slash à l'identifiant et à l'échéance de son interaction"""
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        _bind(interaction)
+        return True
+
+
+class CorrelatedView(discord.ui.View):
+    """Vue associant chaque clic ou sélection à l'identifiant et à l'échéance de son interaction"""
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        _bind(interaction)
+        return True
+
+
+class CorrelatedModal(discord.ui.Modal):
+    """Formulaire associant sa validation à l'identifiant et à l'échéance de son interaction"""
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        _bind(interaction)
+        return True
@@ -1,15 +1,23 @@
 import logging
-from typing import Optional, List
+import tempfile
+from typing import Literal, Optional, List
 import discord
 from discord import app_commands, ui
-from src.infrastructure.commands.base import BaseCommand
+from src.infrastructure.commands.base import BaseCommand, CorrelatedModal, CorrelatedView
 from src.application.services.task_service import TaskService
+from src.application.services.task_archive_service import TaskArchiveService
+from src.application.services.task_transfer_service import TaskTransferService
 from src.domain.entities.task import Task, TaskList
 from src.infrastructure.config.db_state import DatabaseState
+from src.infrastructure.config.deadline import INTERACTION_TOKEN_LIFETIME, bind_interaction_deadline
+from src.infrastructure.config.unit_of_work import UnitOfWork
 from sqlalchemy.exc import SQLAlchemyError
 
 logger = logging.getLogger(__name__)
 
+# Fichiers d'export et d'import gardés en mémoire jusqu'à cette taille, sur disque au-delà
+TRANSFER_SPOOL_SIZE = 1024 * 1024
+
 class TaskListSelect(ui.Select):
     """Menu déroulant pour la sélection d'une liste de tâches.
     
@@ -35,8 +43,8 @@ class TaskListSelect(ui.Select):
             )
         else:
             for task_list in valid_lists:
-                completed_tasks = sum(1 for task in task_list.tasks if task.completed)
-                total_tasks = len(task_list.tasks)
+                completed_tasks = task_list.completed_count
+                total_tasks = task_list.total_count
                 options.append(
                     discord.SelectOption(
                         label=task_list.name,
@@ -65,15 +73,13 @@ class TaskListSelect(ui.Select):
                 )
                 return
             
-            # Récupérer la liste sélectionnée
-            selected_list = next(
-                (lst for lst in self.task_lists if str(lst.id) == self.values[0]),
-                None
-            )
+            # Le menu ne contient que les en-têtes : les tâches de la liste choisie sont chargées ici
+            task_service = self.task_service or TaskService()
+            selected_list = await task_service.get_list(int(self.values[0]))
             
             if selected_list:
-                completed_tasks = sum(1 for task in selected_list.tasks if task.completed)
-                total_tasks = len(selected_list.tasks)
+                completed_tasks = selected_list.completed_count
+                total_tasks = selected_list.total_count
                 progress_bar = "▓" * completed_tasks + "░" * (total_tasks - completed_tasks)
                 
                 embed = discord.Embed(
@@ -153,8 +159,8 @@ class ShowListsButton(ui.Button):
         try:
             await interaction.response.defer()
             
-            lists = await self.task_service.get_user_lists(str(interaction.user.id))
-            view = discord.ui.View(timeout=None)
+            lists = await self.task_service.get_user_list_headers(interaction.user.id)
+            view = CorrelatedView(timeout=None)
             view.add_item(TaskListSelect(lists, self.task_service))
             view.add_item(CreateListButton(self.task_service))
             
@@ -168,7 +174,7 @@ class ShowListsButton(ui.Button):
             if lists:
                 lists_content = ""
                 for lst in lists:
-                    lists_content += f"• {lst.name} ({len(lst.tasks)} tâches)\n"
+                    lists_content += f"• {lst.name} ({lst.total_count} tâches)\n"
                 embed.add_field(name="Listes disponibles", value=lists_content, inline=False)
             else:
                 embed.add_field(
@@ -196,7 +202,7 @@ class CreateListButton(ui.Button):
         modal = CreateListModal(self.task_service)
         await interaction.response.send_modal(modal)
 
-class CreateListModal(ui.Modal, title="Créer une nouvelle liste"):
+class CreateListModal(CorrelatedModal, title="Créer une nouvelle liste"):
     name = ui.TextInput(
         label="Nom de la liste",
         placeholder="Par exemple : Courses, Tâches ménagères, etc.",
@@ -211,20 +217,21 @@ class CreateListModal(ui.Modal, title="Créer une nouvelle liste"):
     async def on_submit(self, interaction: discord.Interaction):
         try:
             await interaction.response.defer()
-            success, message, task_list = await self.task_service.create_list(str(interaction.user.id), str(self.name))
+            # Une seule connexion et une seule transaction pour la création et le rechargement
+            async with UnitOfWork():
+                success, message, task_list = await self.task_service.create_list(interaction.user.id, str(self.name))
+                lists = await self.task_service.get_user_list_headers(interaction.user.id) if success and task_list else []
             
             if success and task_list:
-                # Récupérer la liste mise à jour des listes
-                lists = await self.task_service.get_user_lists(str(interaction.user.id))
                 
                 # Créer une nouvelle vue avec le menu déroulant et le bouton de création
-                view = discord.ui.View(timeout=None)
+                view = CorrelatedView(timeout=None)
                 view.add_item(TaskListSelect(lists, self.task_service))
                 view.add_item(CreateListButton(self.task_service))
                 
                 # Créer l'embed pour la nouvelle liste
-                completed_tasks = sum(1 for task in task_list.tasks if task.completed)
-                total_tasks = len(task_list.tasks)
+                completed_tasks = task_list.completed_count
+                total_tasks = task_list.total_count
                 progress_bar = "▓" * completed_tasks + "░" * (total_tasks - completed_tasks)
                 
                 embed = discord.Embed(
@@ -267,15 +274,15 @@ class TaskButton(ui.Button):
             await interaction.response.defer()
             
             task_service = TaskService()
-            task = await task_service.toggle_task(self.task_id)
+            # Une seule connexion et une seule transaction pour le marquage et le rechargement
+            async with UnitOfWork():
+                task = await task_service.toggle_task(self.task_id)
+                task_list = await task_service.get_list(task.task_list_id) if task is not None else None
             
             if task is not None:
-                lists = await task_service.get_user_lists(str(interaction.user.id))
-                task_list = next((lst for lst in lists if any(t.id == task.id for t in lst.tasks)), None)
-                
                 if task_list:
-                    completed_tasks = sum(1 for task in task_list.tasks if task.completed)
-                    total_tasks = len(task_list.tasks)
+                    completed_tasks = task_list.completed_count
+                    total_tasks = task_list.total_count
                     progress_bar = "▓" * completed_tasks + "░" * (total_tasks - completed_tasks)
                     
                     embed = discord.Embed(
@@ -312,7 +319,7 @@ class TaskButton(ui.Button):
             logger.error(f"Erreur lors du marquage de la tâche: {str(e)}")
             await interaction.followup.send("❌ Une erreur est survenue !", ephemeral=True)
 
-class TaskListView(ui.View):
+class TaskListView(CorrelatedView):
     def __init__(self):
         super().__init__(timeout=None)
         self._next_button_id = 0
@@ -346,7 +353,7 @@ class AddTaskButton(ui.Button):
         modal = AddTaskModal(self.task_list_id)
         await interaction.response.send_modal(modal)
 
-class AddTaskModal(ui.Modal, title="Ajouter une tâche"):
+class AddTaskModal(CorrelatedModal, title="Ajouter une tâche"):
     description = ui.TextInput(
         label="Description de la tâche",
         placeholder="Par exemple : Faire les courses, Ranger ma chambre, etc.",
@@ -365,15 +372,15 @@ class AddTaskModal(ui.Modal, title="Ajouter une tâche"):
             
             if not self.task_service:
                 self.task_service = TaskService()
-            task = await self.task_service.add_task(str(self.description), self.task_list_id)
-            
-            # Récupérer la liste mise à jour
-            lists = await self.task_service.get_user_lists(str(interaction.user.id))
-            task_list = next((lst for lst in lists if lst.id == self.task_list_id), None)
+            async with UnitOfWork():
+                task = await self.task_service.add_task(str(self.description), self.task_list_id)
+                
+                # Récupérer la liste mise à jour
+                task_list = await self.task_service.get_list(self.task_list_id)
             
             if task_list:
-                completed_tasks = sum(1 for task in task_list.tasks if task.completed)
-                total_tasks = len(task_list.tasks)
+                completed_tasks = task_list.completed_count
+                total_tasks = task_list.total_count
                 progress_bar = "▓" * completed_tasks + "░" * (total_tasks - completed_tasks)
                 
                 embed = discord.Embed(
@@ -423,16 +430,15 @@ class DeleteCompletedButton(ui.Button):
             await interaction.response.defer()
             
             task_service = TaskService()
-            success = await task_service.delete_completed_tasks(self.task_list_id)
+            async with UnitOfWork():
+                success = await task_service.delete_completed_tasks(self.task_list_id)
+                # Récupérer la liste mise à jour
+                task_list = await task_service.get_list(self.task_list_id) if success else None
             
             if success:
-                # Récupérer la liste mise à jour
-                lists = await task_service.get_user_lists(str(interaction.user.id))
-                task_list = next((lst for lst in lists if lst.id == self.task_list_id), None)
-                
                 if task_list:
-                    completed_tasks = sum(1 for task in task_list.tasks if task.completed)
-                    total_tasks = len(task_list.tasks)
+                    completed_tasks = task_list.completed_count
+                    total_tasks = task_list.total_count
                     progress_bar = "▓" * completed_tasks + "░" * (total_tasks - completed_tasks)
                     
                     embed = discord.Embed(
@@ -493,7 +499,7 @@ class DeleteListButton(ui.Button):
             )
             logger.error(f"Erreur lors de la suppression de la liste {self.task_list_id}: {str(e)}")
 
-class ConfirmDeleteView(ui.View):
+class ConfirmDeleteView(CorrelatedView):
     """Vue de confirmation pour la suppression d'une liste"""
     def __init__(self, task_list_id: int):
         super().__init__(timeout=60)
@@ -508,19 +514,21 @@ class ConfirmDeleteView(ui.View):
             await DatabaseState.ensure_initialized()
             
             task_service = TaskService()
-            task_list = await task_service.get_list(self.task_list_id)
+            # Vérification, suppression et rechargement dans une seule transaction
+            async with UnitOfWork():
+                task_list = await task_service.get_list(self.task_list_id)
+                success = task_list is not None and await task_service.delete_list(self.task_list_id)
+                # Récupérer la liste mise à jour des listes
+                lists = await task_service.get_user_list_headers(interaction.user.id) if success else []
+
             if task_list is None:
                 await interaction.followup.send("❌ La liste n'existe pas.", ephemeral=True)
                 return
-                
-            success = await task_service.delete_list(self.task_list_id)
             
             if success:
-                # Récupérer la liste mise à jour des listes
-                lists = await task_service.get_user_lists(str(interaction.user.id))
                 
                 # Créer une nouvelle vue avec le menu déroulant et le bouton de création
-                view = discord.ui.View(timeout=None)
+                view = CorrelatedView(timeout=None)
                 view.add_item(TaskListSelect(lists, task_service))
                 view.add_item(CreateListButton(task_service))
                 
@@ -534,7 +542,7 @@ class ConfirmDeleteView(ui.View):
                 if lists:
                     lists_content = ""
                     for lst in lists:
-                        lists_content += f"• {lst.name} ({len(lst.tasks)} tâches)\n"
+                        lists_content += f"• {lst.name} ({lst.total_count} tâches)\n"
                     embed.add_field(name="Listes disponibles", value=lists_content, inline=False)
                 else:
                     embed.add_field(
@@ -563,7 +571,7 @@ class ConfirmDeleteView(ui.View):
             ephemeral=True
         )
 
-class MainMenuView(ui.View):
+class MainMenuView(CorrelatedView):
     def __init__(self, task_service: TaskService):
         super().__init__()
         self.task_service = task_service
@@ -573,7 +581,7 @@ class MainMenuView(ui.View):
     async def refresh_lists(self, interaction: discord.Interaction):
         """Rafraîchit l'affichage des listes"""
         try:
-            user_lists = await self.task_service.get_user_lists(str(interaction.user.id))
+            user_lists = await self.task_service.get_user_list_headers(interaction.user.id)
             
             # Créer un nouvel embed pour le menu principal
             embed = discord.Embed(
@@ -631,10 +639,10 @@ class TaskCommands(BaseCommand):
                 self._task_service = TaskService()
             
             # Récupérer les listes de l'utilisateur
-            lists = await self._task_service.get_user_lists(str(interaction.user.id))
+            lists = await self._task_service.get_user_list_headers(interaction.user.id)
             
             # Créer une vue avec le menu déroulant et le bouton de création
-            view = discord.ui.View(timeout=None)
+            view = CorrelatedView(timeout=None)
             view.add_item(TaskListSelect(lists, self._task_service))
             view.add_item(CreateListButton(self._task_service))
             
@@ -648,8 +656,8 @@ class TaskCommands(BaseCommand):
             if lists:
                 lists_content = ""
                 for lst in lists:
-                    completed_tasks = sum(1 for task in lst.tasks if task.completed)
-                    total_tasks = len(lst.tasks)
+                    completed_tasks = lst.completed_count
+                    total_tasks = lst.total_count
                     lists_content += f"• {lst.name} ({completed_tasks}/{total_tasks} tâches)\n"
                 embed.add_field(name="Listes disponibles", value=lists_content, inline=False)
             else:
@@ -665,6 +673,100 @@ class TaskCommands(BaseCommand):
             logger.error(f"Erreur lors de l'affichage des listes: {str(e)}")
             await interaction.followup.send("Une erreur est survenue lors de l'affichage des listes.", ephemeral=True)
 
+    @app_commands.command(
+        name="archive",
+        description="Affiche vos tâches complétées archivées"
+    )
+    async def show_archive(self, interaction: discord.Interaction):
+        """Affiche les tâches archivées de l'utilisateur (lues à la demande dans tasks_archive)"""
+        try:
+            await interaction.response.defer(ephemeral=True)
+            archived = await TaskArchiveService.get_user_archive(interaction.user.id)
+            
+            embed = discord.Embed(
+                title="🗄️ Tâches archivées",
+                description="Tâches complétées depuis longtemps, retirées de vos listes" if archived else "Aucune tâche archivée",
+                color=discord.Color.dark_grey()
+            )
+            
+            if archived:
+                archive_content = ""
+                for task in archived:
+                    completed_on = task.completed_at.strftime("%d/%m/%Y") if task.completed_at else "?"
+                    archive_content += f"✅ {task.description} — {task.list_name} ({completed_on})\n"
+                # Limite Discord de 1024 caractères par champ
+                embed.add_field(name=f"{len(archived)} dernière(s) tâche(s)", value=archive_content[:1024], inline=False)
+            
+            await interaction.followup.send(embed=embed, ephemeral=True)
+            
+        except Exception as e:
+            logger.error(f"Erreur lors de l'affichage des archives: {str(e)}")
+            await interaction.followup.send("❌ Une erreur est survenue lors de l'affichage des archives !", ephemeral=True)
+
+    tasks_transfer = app_commands.Group(
+        name="taches-transfert",
+        description="Export et import des listes de tâches des membres du serveur",
+        guild_only=True,
+        default_permissions=discord.Permissions(manage_guild=True)
+    )
+
+    @tasks_transfer.command(name="exporter", description="Exporte les listes de tâches des membres (ou d'un seul membre)")
+    async def export_tasks(
+        self,
+        interaction: discord.Interaction,
+        format: Literal["ndjson", "csv"] = "ndjson",
+        membre: Optional[discord.Member] = None
+    ):
+        """Exporte les listes et tâches des membres du serveur dans un fichier compressé"""
+        try:
+            await interaction.response.defer(ephemeral=True)
+            # Export volumineux : budget étendu jusqu'à l'expiration du jeton de l'interaction
+            bind_interaction_deadline(interaction.created_at, INTERACTION_TOKEN_LIFETIME.total_seconds())
+            user_ids = [membre.id] if membre else [member.id for member in interaction.guild.members]
+
+            with tempfile.SpooledTemporaryFile(max_size=TRANSFER_SPOOL_SIZE) as output:
+                counts = await TaskTransferService().export(output, format, user_ids)
+                if output.tell() > interaction.guild.filesize_limit:
+                    await interaction.followup.send(
+                        "❌ L'export dépasse la taille maximale d'un fichier sur ce serveur : utilisez task_transfer.py.",
+                        ephemeral=True
+                    )
+                    return
+                output.seek(0)
+                await interaction.followup.send(
+                    f"📦 {counts['task_lists']} liste(s) et {counts['tasks']} tâche(s) exportée(s).",
+                    file=discord.File(output, filename=f"taches-{interaction.guild_id}.{format}.gz"),
+                    ephemeral=True
+                )
+        except Exception as e:
+            logger.error(f"Erreur lors de l'export des tâches: {str(e)}")
+            await interaction.followup.send("❌ Une erreur est survenue lors de l'export des tâches !", ephemeral=True)
+
+    @tasks_transfer.command(name="importer", description="Importe un export (.ndjson.gz ou .csv.gz) pour les membres du serveur")
+    async def import_tasks(self, interaction: discord.Interaction, fichier: discord.Attachment):
+        """Importe les listes des membres du serveur ; les listes déjà présentes sont ignorées"""
+        try:
+            await interaction.response.defer(ephemeral=True)
+            bind_interaction_deadline(interaction.created_at, INTERACTION_TOKEN_LIFETIME.total_seconds())
+            # Seules les données des membres du serveur sont acceptées
+            user_ids = {member.id for member in interaction.guild.members}
+
+            with tempfile.SpooledTemporaryFile(max_size=TRANSFER_SPOOL_SIZE) as source:
+                await fichier.save(source)
+                source.seek(0)
+                result = await TaskTransferService().import_(
+                    source, TaskTransferService.detect_format(fichier.filename), user_ids
+                )
+            await interaction.followup.send(
+                f"✅ {result.lists_imported} liste(s) et {result.tasks_imported} tâche(s) importée(s)"
+                + (f", {result.lists_skipped} liste(s) ignorée(s) (nom déjà utilisé)" if result.lists_skipped else "")
+                + ".",
+                ephemeral=True
+            )
+        except Exception as e:
+            logger.error(f"Erreur lors de l'import des tâches: {str(e)}")
+            await interaction.followup.send("❌ Une erreur est survenue lors de l'import des tâches !", ephemeral=True)
+
     @app_commands.command(
         name="add_task",
         description="Ajoute une tâche à une liste"
@@ -723,14 +825,15 @@ class TaskCommands(BaseCommand):
             await interaction.response.defer()
             if not self._task_service:
                 self._task_service = TaskService()
-            success = await self._task_service.delete_list(list_id)
+            async with UnitOfWork():
+                success = await self._task_service.delete_list(list_id)
+                # Récupérer la liste mise à jour des listes
+                lists = await self._task_service.get_user_list_headers(interaction.user.id) if success else []
             
             if success:
-                # Récupérer la liste mise à jour des listes
-                lists = await self._task_service.get_user_lists(str(interaction.user.id))
                 
                 # Créer une nouvelle vue avec le menu déroulant et le bouton de création
-                view = discord.ui.View(timeout=None)
+                view = CorrelatedView(timeout=None)
                 view.add_item(TaskListSelect(lists, self._task_service))
                 view.add_item(CreateListButton(self._task_service))
                 
@@ -744,7 +847,7 @@ class TaskCommands(BaseCommand):
                 if lists:
                     lists_content = ""
                     for lst in lists:
-                        lists_content += f"• {lst.name} ({len(lst.tasks)} tâches)\n"
+                        lists_content += f"• {lst.name} ({lst.total_count} tâches)\n"
                     embed.add_field(name="Listes disponibles", value=lists_content, inline=False)
                 else:
                     embed.add_field(
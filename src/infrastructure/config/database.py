@@ -1,8 +1,17 @@
 import os
 import logging
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker, declarative_base
 from src.config.config import DatabaseConfig
+from src.infrastructure.config import deadline, invalidation, leadership
+from src.infrastructure.config.pooler import engine_options, uses_external_pool
+from src.infrastructure.config.read_routing import ReplicaHealth, mark_primary_used, should_use_replica
+from src.infrastructure.config.retry import RetryPolicy, connect_failure_reason
+from src.infrastructure.config.schema import check_schema_version
+from src.infrastructure.config.sqlite import LocalReaderHealth, create_sqlite_engines, create_sqlite_schema, is_sqlite_url
+from src.infrastructure.metrics.pool import checkout_timer, instrument_pool
+from src.infrastructure.metrics.sql import instrument_queries
 from contextlib import asynccontextmanager
 import asyncio
 import asyncpg
@@ -16,61 +25,65 @@ Base = declarative_base()
 engine = None
 async_session = None
 
+# Réplica en lecture seule (DB_READ_URL), None s'il n'est pas configuré
+read_engine = None
+read_session = None
+replica_health = None
+
+# Base initialisée et pool préchauffé (rapporté par /health)
+ready = False
+
 # Configuration du logging
 logger = logging.getLogger(__name__)
 
+# Test de connexion au démarrage : jusqu'à 3 tentatives, attentes de 1 à 4 secondes
+CONNECTION_RETRY = RetryPolicy(
+    max_attempts=3, base_delay=1.0, max_delay=4.0, max_elapsed=120.0, classify=connect_failure_reason
+)
+
+async def _ping(db_url: str) -> None:
+    # Parser l'URL pour extraire les composants
+    parsed = urlparse(db_url)
+    host = parsed.hostname
+    port = parsed.port or 5432
+    database = parsed.path.lstrip('/')
+    logger.info(f"Tentative de connexion à {host}:{port}/{database}")
+
+    # Tenter une connexion directe avec des timeouts plus longs
+    conn = await asyncpg.connect(
+        user=parsed.username,
+        password=parsed.password,
+        database=database,
+        host=host,
+        port=port,
+        ssl='require',
+        command_timeout=30,
+        timeout=30
+    )
+    try:
+        await conn.execute('SELECT 1')
+    finally:
+        await conn.close()
+
 async def test_connection(db_url: str) -> bool:
     """
     Teste la connexion à la base de données avec asyncpg directement.
-    Inclut un mécanisme de retry avec backoff exponentiel.
+    Les échecs réseau sont rejoués selon CONNECTION_RETRY (backoff exponentiel).
     """
-    max_retries = 3
-    for attempt in range(max_retries):
-        try:
-            # Parser l'URL pour extraire les composants
-            parsed = urlparse(db_url)
-            user = parsed.username
-            password = parsed.password
-            host = parsed.hostname
-            port = parsed.port or 5432
-            database = parsed.path.lstrip('/')
-
-            logger.info(f"Tentative {attempt + 1}/{max_retries} de connexion à {host}:{port}/{database}")
-            
-            # Tenter une connexion directe avec des timeouts plus longs
-            conn = await asyncpg.connect(
-                user=user,
-                password=password,
-                database=database,
-                host=host,
-                port=port,
-                ssl='require',
-                command_timeout=30,
-                timeout=30
-            )
-            
-            # Tester la connexion
-            await conn.execute('SELECT 1')
-            await conn.close()
-            
-            logger.info(f"Test de connexion réussi après {attempt + 1} tentative(s)")
-            return True
-            
-        except Exception as e:
-            logger.warning(f"Tentative {attempt + 1}/{max_retries} échouée: {str(e)}")
-            if attempt < max_retries - 1:
-                # Backoff exponentiel entre les tentatives
-                wait_time = 2 ** attempt
-                logger.info(f"Attente de {wait_time} secondes avant la prochaine tentative...")
-                await asyncio.sleep(wait_time)
-                continue
-            
-    logger.error("Échec de toutes les tentatives de connexion")
-    return False
+    try:
+        await CONNECTION_RETRY.call(_ping, db_url, operation="test_connection")
+        logger.info("Test de connexion réussi")
+        return True
+    except Exception as e:
+        logger.error(f"Échec de toutes les tentatives de connexion: {str(e)}")
+        return False
 
 async def init_db(config):
     """Initialise la connexion à la base de données."""
-    global engine, async_session
+    global engine, async_session, read_engine, read_session, replica_health, ready
+    ready = False
+    await invalidation.stop_listener()
+    await leadership.stop_election()
     
     try:
         # Construire l'URL de connexion à partir de la config
@@ -81,23 +94,52 @@ async def init_db(config):
         if not database_url:
             raise ValueError("L'URL de la base de données est vide")
             
-        # Ajouter le préfixe async si nécessaire
-        if not database_url.startswith('postgresql+asyncpg://'):
-            database_url = database_url.replace('postgresql://', 'postgresql+asyncpg://')
+        # Créer le moteur, avec un pool dimensionné par la configuration
+        pool_settings = {
+            "pool_size": getattr(config, 'pool_size', DatabaseConfig.pool_size),
+            "max_overflow": getattr(config, 'max_overflow', DatabaseConfig.max_overflow),
+            "pool_timeout": getattr(config, 'pool_timeout', DatabaseConfig.pool_timeout),
+            "pool_recycle": getattr(config, 'pool_recycle', DatabaseConfig.pool_recycle),
+            "pool_pre_ping": getattr(config, 'pool_pre_ping', DatabaseConfig.pool_pre_ping)
+        }
+        slow_query_seconds = getattr(config, 'slow_query_ms', DatabaseConfig.slow_query_ms) / 1000
+        deadline.interaction_timeout = getattr(config, 'interaction_timeout', DatabaseConfig.interaction_timeout)
+
+        if is_sqlite_url(database_url):
+            # Backend embarqué : écrivain unique, lectures sur un pool en lecture seule
+            logger.info(f"Base SQLite embarquée : {database_url}")
+            engine, read_engine = create_sqlite_engines(database_url, pool_settings)
+            _instrument(engine, slow_query_seconds)
+            _instrument(read_engine, slow_query_seconds)
+            await create_sqlite_schema(engine)
+            async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+            read_session = sessionmaker(read_engine, class_=AsyncSession, expire_on_commit=False)
+            replica_health = LocalReaderHealth(read_engine)
+            await _warm_up(config)
+            ready = True
+            logger.info("Base de données initialisée avec succès")
+            return engine, async_session
+
+        database_url = _async_url(database_url)
             
         logger.info(f"URL de la base de données : {database_url}")
         
-        # Créer le moteur
+        # Pool SQLAlchemy, ou délégué à PgBouncer en mode transaction (DB_POOLER_MODE)
+        pooler_mode = getattr(config, 'pooler_mode', DatabaseConfig.pooler_mode)
         engine = create_async_engine(
             database_url,
             echo=False,
-            pool_size=5,
-            max_overflow=10
+            pool_logging_name="primary",
+            **engine_options(pooler_mode, pool_settings)
         )
+        _instrument(engine, slow_query_seconds)
+        if uses_external_pool(engine):
+            logger.info(f"Pool de connexions délégué au pooler externe (mode {pooler_mode})")
+        else:
+            logger.info(f"Pool de connexions : {pool_settings}")
         
-        # Créer les tables
-        async with engine.begin() as conn:
-            await conn.run_sync(Base.metadata.create_all)
+        # Le schéma est géré par les migrations Alembic : une seule requête de vérification
+        await check_schema_version(engine, auto_migrate=getattr(config, 'auto_migrate', False))
         
         # Créer la session factory
         async_session = sessionmaker(
@@ -106,6 +148,35 @@ async def init_db(config):
             expire_on_commit=False
         )
         
+        # Réplica optionnel pour les lectures
+        read_url = getattr(config, 'read_url', None)
+        if read_url:
+            read_engine = create_async_engine(
+                _async_url(read_url),
+                echo=False,
+                pool_logging_name="replica",
+                **engine_options(pooler_mode, pool_settings)
+            )
+            _instrument(read_engine, slow_query_seconds)
+            read_session = sessionmaker(read_engine, class_=AsyncSession, expire_on_commit=False)
+            replica_health = ReplicaHealth(
+                read_engine,
+                max_lag=getattr(config, 'read_max_lag', DatabaseConfig.read_max_lag)
+            )
+            logger.info(f"Réplica en lecture configuré (retard maximal {replica_health.max_lag}s)")
+        else:
+            read_engine = read_session = replica_health = None
+
+        await _warm_up(config)
+        # LISTEN et verrou consultatif exigent une session serveur : connexion directe derrière un pooler
+        direct_url = getattr(config, 'direct_url', None)
+        session_url = make_url(_async_url(direct_url)) if direct_url else engine.url
+        # Caches en mémoire invalidés par les écritures des autres instances
+        invalidation.start_listener(session_url)
+        # Tâches périodiques uniques : exécutées par la seule instance leader
+        leadership.start_election(session_url)
+        ready = True
+
         logger.info("Base de données initialisée avec succès")
         return engine, async_session
         
@@ -113,14 +184,70 @@ async def init_db(config):
         logger.error(f"Erreur lors de l'initialisation de la base de données: {str(e)}")
         raise
 
+def _instrument(target, slow_query_seconds: float) -> None:
+    """Métriques du pool et des requêtes, échéance des requêtes"""
+    instrument_pool(target.sync_engine)
+    instrument_queries(target.sync_engine, slow_query_seconds)
+    deadline.apply_statement_deadlines(target.sync_engine)
+
+async def _warm_up(config) -> None:
+    """Préchauffe les pools ; un échec ralentit seulement les premières interactions"""
+    from src.infrastructure.config.warmup import warm_up_pool
+
+    size = getattr(config, 'pool_min_size', DatabaseConfig.pool_min_size)
+    if uses_external_pool(engine):
+        # NullPool : les connexions préchauffées seraient fermées aussitôt
+        return
+    try:
+        await warm_up_pool(engine, size)
+        if read_engine is not None:
+            await warm_up_pool(read_engine, size, include_writes=False)
+    except Exception as e:
+        logger.warning(f"Préchauffage du pool interrompu: {str(e)}")
+
+def _async_url(database_url: str) -> str:
+    """Ajoute le pilote asyncpg à une URL PostgreSQL si nécessaire"""
+    if not database_url.startswith('postgresql+asyncpg://'):
+        database_url = database_url.replace('postgresql://', 'postgresql+asyncpg://')
+    return database_url
+
 @asynccontextmanager
-async def get_session() -> AsyncGenerator[AsyncSession, None]:
-    """Fournit une session de base de données dans un contexte async."""
+async def get_session(savepoint: bool = False) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Fournit une session de base de données dans un contexte async.
+
+    Au sein d'une UnitOfWork, la session (et la transaction) de l'unité est
+    réutilisée ; elle est validée à la sortie de l'unité et non ici. Les
+    méthodes marquées @read_only peuvent recevoir une session du réplica.
+
+    Args:
+        savepoint (bool): Dans une UnitOfWork, isole le bloc dans un SAVEPOINT
+            (une erreur n'annule que le bloc) ; sans effet hors d'une unité
+    """
+    from src.infrastructure.config.unit_of_work import current_unit_of_work
+
+    if await should_use_replica():
+        async with read_session() as session:
+            # Connexion empruntée d'emblée : l'attente du pool est mesurée ici
+            with checkout_timer(read_engine):
+                await session.connection()
+            yield session
+        return
+
+    mark_primary_used()
+    unit = current_unit_of_work()
+    if unit is not None:
+        async with unit.session_scope(savepoint=savepoint) as session:
+            yield session
+        return
+
     if async_session is None:
         raise RuntimeError("La base de données n'a pas été initialisée")
         
     session = async_session()
     try:
+        with checkout_timer(engine):
+            await session.connection()
         yield session
         await session.commit()
     except Exception as e:
@@ -0,0 +1,128 @@
+"""
+Échéance du traitement en cours.
+
+Discord accorde 3 secondes pour accuser réception d'une interaction (les
+gestionnaires diffèrent leur réponse d'emblée) puis 15 minutes pour les
+réponses de suivi. Une échéance est fixée au début de chaque interaction,
+bornée par ``interaction_timeout`` (DB_INTERACTION_TIMEOUT) et par
+l'expiration du jeton de l'interaction. Elle borne :
+
+- les nouvelles tentatives (voir retry) ;
+- la durée des requêtes : sur PostgreSQL, ``SET LOCAL statement_timeout``
+  reçoit le temps restant, et le serveur annule la requête au-delà. Une
+  requête lente ne peut ainsi pas retenir indéfiniment une connexion du pool.
+"""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import UTC, datetime, timedelta
+from typing import Generator, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from src.infrastructure.errors.exceptions import DatabaseError
+from src.infrastructure.metrics import metrics
+
+DEADLINE_EXCEEDED = metrics.counter(
+    "db_deadline_exceeded_total",
+    "Requêtes refusées car l'échéance du traitement était dépassée"
+)
+
+# Durée de validité du jeton d'une interaction Discord
+INTERACTION_TOKEN_LIFETIME = timedelta(minutes=15)
+
+# Budget des accès à la base d'une interaction, en secondes (configuré par init_db)
+interaction_timeout: float = 10.0
+
+_deadline: ContextVar[Optional[float]] = ContextVar("deadline", default=None)
+
+
+class DeadlineExceededError(DatabaseError):
+    """L'échéance du traitement est dépassée : la requête n'est pas envoyée"""
+    pass
+
+
+def set_deadline(seconds: Optional[float]) -> None:
+    """Fixe l'échéance de la tâche en cours à ``seconds`` secondes (None : aucune)"""
+    _deadline.set(time.monotonic() + seconds if seconds is not None else None)
+
+
+def remaining() -> Optional[float]:
+    """Temps restant avant l'échéance, en secondes (négatif si dépassée, None sans échéance)"""
+    deadline = _deadline.get()
+    return deadline - time.monotonic() if deadline is not None else None
+
+
+@contextmanager
+def deadline_scope(seconds: float) -> Generator[None, None, None]:
+    """Applique une échéance le temps d'un bloc, sans jamais repousser une échéance plus proche"""
+    current = remaining()
+    token = _deadline.set(time.monotonic() + (seconds if current is None else min(seconds, current)))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def bind_interaction_deadline(created_at: datetime, timeout: Optional[float] = None) -> float:
+    """
+    Fixe l'échéance d'une interaction Discord.
+
+    Args:
+        created_at (datetime): Création de l'interaction (interaction.created_at)
+        timeout (Optional[float]): Budget en secondes, interaction_timeout par défaut
+
+    Returns:
+        float: Budget accordé, en secondes
+    """
+    budget = interaction_timeout if timeout is None else timeout
+    token_left = (created_at + INTERACTION_TOKEN_LIFETIME - datetime.now(UTC)).total_seconds()
+    budget = max(0.0, min(budget, token_left))
+    set_deadline(budget)
+    return budget
+
+
+def statement_timeout_ms(seconds: float) -> int:
+    """Temps restant converti pour statement_timeout (0 désactiverait la limite)"""
+    return max(1, int(seconds * 1000))
+
+
+def apply_statement_deadlines(engine: Engine) -> None:
+    """
+    Borne chaque requête d'un moteur par l'échéance du traitement en cours.
+
+    Une requête émise après l'échéance lève DeadlineExceededError sans être
+    envoyée. Sur PostgreSQL, ``SET LOCAL statement_timeout`` n'est réémis dans
+    une transaction que lorsque le temps restant a nettement diminué depuis
+    la dernière fois (10 %, au moins 250 ms), pour éviter un aller-retour
+    par requête.
+
+    Args:
+        engine (Engine): Moteur synchrone (engine.sync_engine pour un moteur async)
+    """
+    postgres = engine.dialect.name == "postgresql"
+
+    # insert=True : avant l'instrumentation des requêtes, qui ne verrait pas l'annulation
+    @event.listens_for(engine, "before_cursor_execute", insert=True)
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        left = remaining()
+        if left is None:
+            return
+        if left <= 0:
+            DEADLINE_EXCEEDED.inc()
+            raise DeadlineExceededError(
+                "Échéance du traitement dépassée, requête annulée",
+                {"statement": statement[:200]}
+            )
+        if not postgres:
+            return
+
+        timeout = statement_timeout_ms(left)
+        transaction = conn.get_transaction()
+        applied = conn.info.get("statement_timeout")
+        if applied is not None and applied[0] is transaction and applied[1] - timeout <= max(250, applied[1] // 10):
+            return
+        # SET LOCAL : la limite disparaît avec la transaction, avant le retour au pool
+        cursor.execute(f"SET LOCAL statement_timeout = {timeout}")
+        conn.info["statement_timeout"] = (transaction, timeout)
@@ -0,0 +1,264 @@
+"""
+Invalidation des caches en mémoire entre instances (PostgreSQL LISTEN/NOTIFY).
+
+Un cache local (menus des tâches, filtres de jeux par serveur) devient
+périmé dès qu'une autre instance, ou l'API d'administration, écrit en base.
+Chaque écriture publie donc les clés modifiées :
+
+- les caches de l'instance sont invalidés après la validation de la
+  transaction de l'écriture (une invalidation plus tôt laisserait une lecture
+  concurrente remettre en cache les anciennes lignes) ;
+- sur PostgreSQL, un ``NOTIFY`` est émis dans la transaction de l'écriture :
+  il n'est délivré qu'à sa validation, et jamais si elle est annulée. Il est
+  aussi reçu par l'instance émettrice, ce qui couvre les écritures dont la
+  validation ne peut pas être observée (connexion fournie par l'appelant).
+
+Chaque instance garde une connexion asyncpg dédiée, à l'écoute du canal.
+Les notifications reçues pendant une coupure sont perdues : à chaque
+(re)connexion, tous les caches abonnés sont vidés. Avec SQLite (une seule
+instance), seule l'invalidation locale a lieu.
+"""
+import asyncio
+import json
+import logging
+import uuid
+import weakref
+from typing import Callable, Dict, Iterable, List, Optional
+
+from sqlalchemy import event, func, select
+from sqlalchemy.engine import URL
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.infrastructure.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "cache_invalidation"
+
+# Entités publiées et clés associées
+TASK_LISTS = "task_lists"  # ID des listes
+USER_TASK_LISTS = "user_task_lists"  # ID Discord des propriétaires
+STREAM_GAME_FILTERS = "stream_game_filters"  # ID des serveurs
+
+# Charge utile d'un NOTIFY limitée à 8000 octets : les clés sont réparties en plusieurs messages
+MAX_PAYLOAD_BYTES = 7500
+
+# Instance émettrice (ses propres notifications sont comptées comme locales)
+ORIGIN = uuid.uuid4().hex
+
+CACHE_INVALIDATIONS = metrics.counter(
+    "cache_invalidations_total",
+    "Clés de cache invalidées, par entité et origine (local, remote)"
+)
+CACHE_FLUSHES = metrics.counter(
+    "cache_flushes_total",
+    "Vidages complets des caches (connexion ou reconnexion de l'écoute)"
+)
+LISTENER_CONNECTED = metrics.gauge(
+    "cache_listener_connected",
+    "Connexion d'écoute des invalidations établie (1) ou non (0)"
+)
+
+# Références faibles vers les méthodes des caches : un cache abandonné n'est pas retenu
+_handlers: Dict[str, List[Callable[[], Optional[Callable]]]] = {}
+_flush_handlers: List[Callable[[], Optional[Callable]]] = []
+
+
+def _ref(func: Callable) -> Callable[[], Optional[Callable]]:
+    return weakref.WeakMethod(func) if hasattr(func, "__self__") else (lambda: func)
+
+
+def _alive(refs: List[Callable[[], Optional[Callable]]]) -> List[Callable]:
+    funcs = [ref() for ref in refs]
+    refs[:] = [ref for ref, func in zip(refs, funcs) if func is not None]
+    return [func for func in funcs if func is not None]
+
+
+def subscribe(entity: str, handler: Callable[[List], None], flush: Callable[[], None]) -> None:
+    """
+    Abonne un cache aux invalidations d'une entité.
+
+    Args:
+        entity (str): Entité publiée (TASK_LISTS, USER_TASK_LISTS...)
+        handler (Callable[[List], None]): Oublie les clés reçues
+        flush (Callable[[], None]): Vide tout le cache
+    """
+    _handlers.setdefault(entity, []).append(_ref(handler))
+    if flush not in _alive(_flush_handlers):
+        _flush_handlers.append(_ref(flush))
+
+
+def invalidate(entity: str, keys: List, source: str = "local") -> None:
+    """Invalide les clés d'une entité dans les caches de cette instance"""
+    for handler in _alive(_handlers.get(entity, [])):
+        handler(keys)
+    CACHE_INVALIDATIONS.inc(len(keys), labels={"entity": entity, "source": source})
+
+
+def flush_all() -> None:
+    """Vide tous les caches abonnés"""
+    for flush in _alive(_flush_handlers):
+        flush()
+    CACHE_FLUSHES.inc()
+
+
+def _payloads(entity: str, keys: List) -> Iterable[str]:
+    """Messages NOTIFY d'au plus MAX_PAYLOAD_BYTES portant les clés"""
+    chunk: List = []
+    for key in keys:
+        candidate = json.dumps({"origin": ORIGIN, "entity": entity, "keys": chunk + [key]})
+        if chunk and len(candidate.encode()) > MAX_PAYLOAD_BYTES:
+            yield json.dumps({"origin": ORIGIN, "entity": entity, "keys": chunk})
+            chunk = []
+        chunk.append(key)
+    if chunk:
+        yield json.dumps({"origin": ORIGIN, "entity": entity, "keys": chunk})
+
+
+async def publish(entity: str, keys: Iterable, executor=None) -> None:
+    """
+    Signale la modification d'entités aux caches de toutes les instances.
+
+    Args:
+        entity (str): Entité modifiée
+        keys (Iterable): Clés modifiées (doublons et None ignorés)
+        executor: Session ou connexion de l'écriture, pour un NOTIFY dans sa
+            transaction et une invalidation locale après sa validation ; à
+            défaut, celle de l'UnitOfWork active, ou une transaction dédiée
+            (écriture déjà validée)
+    """
+    from src.infrastructure.config import database
+    from src.infrastructure.config.unit_of_work import current_unit_of_work
+
+    keys = list(dict.fromkeys(key for key in keys if key is not None))
+    if not keys:
+        return
+
+    unit = current_unit_of_work()
+    if unit is not None and (executor is None or executor is unit.session or executor is unit.connection):
+        # Validée à la sortie de l'unité seulement
+        unit.after_commit(lambda: invalidate(entity, keys))
+        executor = await unit.get_connection()
+    elif isinstance(executor, AsyncSession):
+        event.listen(executor.sync_session, "after_commit", lambda session: invalidate(entity, keys), once=True)
+    else:
+        # Écriture déjà validée ; ou connexion de l'appelant, dont la validation n'est pas
+        # observable : le NOTIFY reçu par cette instance invalidera à nouveau après validation
+        invalidate(entity, keys)
+
+    bind = executor.get_bind() if isinstance(executor, AsyncSession) else (executor or database.engine)
+    if bind is None or bind.dialect.name != "postgresql":
+        return
+
+    statements = [select(func.pg_notify(CHANNEL, payload)) for payload in _payloads(entity, keys)]
+    if executor is not None:
+        for statement in statements:
+            await executor.execute(statement)
+    else:
+        async with database.engine.begin() as connection:
+            for statement in statements:
+                await connection.execute(statement)
+
+
+def _on_notification(connection, pid, channel, payload) -> None:
+    try:
+        message = json.loads(payload)
+        source = "local" if message.get("origin") == ORIGIN else "remote"
+        invalidate(message["entity"], message["keys"], source=source)
+    except Exception as e:
+        # Message illisible : les caches ne peuvent plus être considérés à jour
+        logger.warning(f"Notification d'invalidation illisible ({str(e)}), vidage des caches")
+        flush_all()
+
+
+def connect_args(url: URL) -> Dict:
+    """Paramètres asyncpg.connect() équivalents à l'URL SQLAlchemy du moteur"""
+    args = {"user": url.username, "password": url.password, "host": url.host, "port": url.port, "database": url.database}
+    if "ssl" in url.query:
+        args["ssl"] = url.query["ssl"]
+    return {name: value for name, value in args.items() if value is not None}
+
+
+class InvalidationListener:
+    """
+    Connexion asyncpg dédiée à l'écoute des invalidations.
+
+    La connexion est testée toutes les ``check_interval`` secondes (une
+    connexion à moitié ouverte ne reçoit plus rien sans erreur) et rouverte
+    après ``retry_delay`` secondes en cas de coupure. Les caches sont vidés à
+    chaque connexion établie.
+
+    Args:
+        connect (Callable): Coroutine ouvrant une connexion asyncpg
+        check_interval (float): Intervalle du test de la connexion, en secondes
+        retry_delay (float): Attente avant une reconnexion, en secondes
+    """
+    def __init__(self, connect: Callable, check_interval: float = 30.0, retry_delay: float = 5.0):
+        self._connect = connect
+        self.check_interval = check_interval
+        self.retry_delay = retry_delay
+        self._task: Optional[asyncio.Task] = None
+        self.connected = asyncio.Event()
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name="cache-invalidation-listener")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            connection = None
+            try:
+                connection = await self._connect()
+                await connection.add_listener(CHANNEL, _on_notification)
+                # Notifications éventuellement manquées avant l'écoute
+                flush_all()
+                LISTENER_CONNECTED.set(1)
+                self.connected.set()
+                logger.info(f"Écoute des invalidations de cache sur le canal {CHANNEL}")
+                while True:
+                    await asyncio.sleep(self.check_interval)
+                    await connection.fetchval("SELECT 1")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Écoute des invalidations interrompue: {str(e)}")
+            finally:
+                LISTENER_CONNECTED.set(0)
+                self.connected.clear()
+                if connection is not None and not connection.is_closed():
+                    try:
+                        await connection.close(timeout=5)
+                    except Exception:
+                        connection.terminate()
+            await asyncio.sleep(self.retry_delay)
+
+
+listener: Optional[InvalidationListener] = None
+
+
+def start_listener(url: URL) -> InvalidationListener:
+    """Démarre l'écoute des invalidations ; ``url`` doit viser une session serveur (pas de pooler en mode transaction)"""
+    import asyncpg
+
+    global listener
+    args = connect_args(url)
+    listener = InvalidationListener(lambda: asyncpg.connect(**args))
+    listener.start()
+    return listener
+
+
+async def stop_listener() -> None:
+    """Arrête l'écoute des invalidations"""
+    global listener
+    if listener is not None:
+        await listener.stop()
+        listener = None
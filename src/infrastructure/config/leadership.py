@@ -0,0 +1,210 @@
+"""
+Élection d'une instance leader pour les tâches périodiques uniques.
+
+Les boucles qui publient sur Discord (news, annonces de streams sans
+répartition, archivage) ne doivent tourner que sur une instance. Chaque
+instance tente de prendre un verrou consultatif PostgreSQL
+(``pg_try_advisory_lock``) sur une connexion asyncpg dédiée : celle qui le
+tient est leader tant que sa connexion reste ouverte.
+
+Bascule : si le leader s'arrête ou perd sa connexion, PostgreSQL libère le
+verrou et une autre instance le prend à sa tentative suivante (toutes les
+``check_interval`` secondes). Les keepalives TCP de la connexion bornent le
+délai de détection d'un leader injoignable.
+
+Fencing : une instance qui se croit leader (connexion coupée sans qu'elle le
+sache encore) vérifie auprès du serveur qu'elle détient toujours le verrou
+avant chaque exécution d'une boucle (``confirm_leadership``) ; en cas de doute,
+elle se retire.
+
+Sans PostgreSQL (SQLite, base non initialisée), l'instance est seule et donc leader.
+"""
+import asyncio
+import hashlib
+import logging
+from typing import Callable, Optional
+
+from sqlalchemy.engine import URL
+
+from src.infrastructure.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+LEADER_LOCK = "guilde_bot:background"
+
+# Le verrou est-il toujours détenu par cette session ? Une clé bigint positive
+# est rangée dans pg_locks en deux moitiés (classid, objid) avec objsubid = 1.
+_HOLDS_LOCK = """
+SELECT EXISTS (
+    SELECT 1 FROM pg_locks
+    WHERE locktype = 'advisory' AND granted AND pid = pg_backend_pid()
+      AND objsubid = 1 AND ((classid::bigint << 32) | objid::bigint) = $1
+)
+"""
+
+# Détection d'un client disparu par le serveur, pour libérer le verrou rapidement
+KEEPALIVE_SETTINGS = {
+    "tcp_keepalives_idle": "10",
+    "tcp_keepalives_interval": "5",
+    "tcp_keepalives_count": "3",
+}
+
+LEADER = metrics.gauge(
+    "background_leader",
+    "Instance leader des tâches périodiques (1) ou non (0), par instance"
+)
+LEADER_ACQUISITIONS = metrics.counter(
+    "background_leader_acquisitions_total",
+    "Prises du leadership des tâches périodiques par cette instance"
+)
+
+
+def lock_key(name: str) -> int:
+    """Clé bigint positive et stable du verrou consultatif d'un nom"""
+    return int.from_bytes(hashlib.md5(name.encode("utf-8")).digest()[:8], "big") & 0x7FFF_FFFF_FFFF_FFFF
+
+
+class LeaderElection:
+    """
+    Candidature au leadership par verrou consultatif sur une connexion dédiée.
+
+    Args:
+        connect (Callable): Coroutine ouvrant une connexion asyncpg
+        replica_id (str): Identifiant de l'instance (label de la métrique)
+        key (int): Clé du verrou consultatif
+        check_interval (float): Intervalle des tentatives et des vérifications, en secondes
+        retry_delay (float): Attente avant une reconnexion, en secondes
+        confirm_timeout (float): Délai maximal de la vérification du verrou, en secondes
+    """
+    def __init__(
+        self,
+        connect: Callable,
+        replica_id: str,
+        key: int = lock_key(LEADER_LOCK),
+        check_interval: float = 5.0,
+        retry_delay: float = 5.0,
+        confirm_timeout: float = 5.0
+    ):
+        self._connect = connect
+        self.replica_id = replica_id
+        self.key = key
+        self.check_interval = check_interval
+        self.retry_delay = retry_delay
+        self.confirm_timeout = confirm_timeout
+        self.is_leader = False
+        self._connection = None
+        # Une connexion asyncpg n'exécute qu'une requête à la fois
+        self._query_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        LEADER.set(0, labels={"replica": replica_id})
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name="leader-election")
+
+    async def stop(self) -> None:
+        """Arrête la candidature ; la fermeture de la connexion libère le verrou"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _fetch(self, query: str):
+        async with self._query_lock, asyncio.timeout(self.confirm_timeout):
+            return await self._connection.fetchval(query, self.key)
+
+    def _elect(self) -> None:
+        self.is_leader = True
+        LEADER.set(1, labels={"replica": self.replica_id})
+        LEADER_ACQUISITIONS.inc()
+        logger.info(f"Instance {self.replica_id} leader des tâches périodiques")
+
+    def _step_down(self, reason: str) -> None:
+        if self.is_leader:
+            logger.warning(f"Instance {self.replica_id} n'est plus leader des tâches périodiques : {reason}")
+        self.is_leader = False
+        LEADER.set(0, labels={"replica": self.replica_id})
+
+    async def confirm(self) -> bool:
+        """
+        Vérifie auprès du serveur que le verrou est toujours détenu.
+
+        Returns:
+            bool: True si l'instance est leader ; sinon elle se retire
+        """
+        if not self.is_leader:
+            return False
+        try:
+            held = await self._fetch(_HOLDS_LOCK)
+        except Exception as e:
+            self._step_down(f"vérification du verrou impossible ({str(e)})")
+            return False
+        if not held:
+            self._step_down("verrou perdu")
+        return bool(held)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                self._connection = await self._connect()
+                while True:
+                    if not self.is_leader:
+                        if await self._fetch("SELECT pg_try_advisory_lock($1)"):
+                            self._elect()
+                    else:
+                        # Un verrou perdu est retenté au tour suivant, une connexion coupée rouverte
+                        await self.confirm()
+                    await asyncio.sleep(self.check_interval)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Candidature au leadership interrompue: {str(e)}")
+            finally:
+                self._step_down("connexion fermée")
+                connection, self._connection = self._connection, None
+                if connection is not None and not connection.is_closed():
+                    try:
+                        await connection.close(timeout=5)
+                    except Exception:
+                        connection.terminate()
+            await asyncio.sleep(self.retry_delay)
+
+
+election: Optional[LeaderElection] = None
+
+
+def start_election(url: URL) -> LeaderElection:
+    """Démarre la candidature de l'instance ; ``url`` doit viser une session serveur (pas de pooler en mode transaction)"""
+    import asyncpg
+    from src.infrastructure.config.invalidation import connect_args
+    from src.infrastructure.streaming.sharding import default_replica_id
+
+    global election
+    args = connect_args(url)
+    election = LeaderElection(
+        lambda: asyncpg.connect(**args, server_settings=KEEPALIVE_SETTINGS),
+        default_replica_id()
+    )
+    election.start()
+    return election
+
+
+async def stop_election() -> None:
+    """Arrête la candidature et libère le leadership"""
+    global election
+    if election is not None:
+        await election.stop()
+        election = None
+
+
+def is_leader() -> bool:
+    """Leadership connu de l'instance, sans vérification auprès du serveur"""
+    return election is None or election.is_leader
+
+
+async def confirm_leadership() -> bool:
+    """Indique si l'instance est leader, après vérification du verrou (à appeler avant chaque tour de boucle)"""
+    return election is None or await election.confirm()
@@ -0,0 +1,65 @@
+"""
+Compatibilité avec un pooler de connexions externe (PgBouncer).
+
+DB_POOLER_MODE décrit ce qui se trouve entre le bot et PostgreSQL :
+
+- ``none`` (défaut) : connexion directe, pool SQLAlchemy ;
+- ``session`` : PgBouncer en mode session, transparent pour le bot (une
+  connexion serveur par connexion cliente) : pool SQLAlchemy inchangé ;
+- ``transaction`` : PgBouncer en mode transaction, la connexion serveur peut
+  changer à chaque transaction.
+
+En mode transaction, les instructions préparées ne sont plus mises en cache,
+ni par asyncpg ni par le dialecte asyncpg de SQLAlchemy (son propre cache LRU) :
+elles vivraient sur une connexion serveur qui n'est plus la nôtre. Elles
+reçoivent des noms uniques, pour ne jamais entrer en collision avec celles
+d'un autre client sur la même connexion serveur. Le pool est délégué à
+PgBouncer (NullPool) : chaque session ouvre une connexion vers PgBouncer,
+peu coûteuse, et de nombreuses instances se partagent un petit budget de
+connexions serveur.
+
+Les fonctionnalités liées à une session serveur (LISTEN des invalidations,
+verrou consultatif du leader) passent par DB_DIRECT_URL. ``SET LOCAL
+statement_timeout`` (voir deadline) reste valable : sa portée est la transaction.
+"""
+import uuid
+from typing import Any, Dict
+
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool
+
+POOLER_MODES = ("none", "session", "transaction")
+
+
+def unique_statement_name() -> str:
+    """Nom d'instruction préparée unique, sans collision entre clients d'une même connexion serveur"""
+    return f"__asyncpg_{uuid.uuid4().hex}__"
+
+
+def engine_options(pooler_mode: str, pool_settings: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Paramètres de create_async_engine() selon le pooler placé devant PostgreSQL.
+
+    Args:
+        pooler_mode (str): none, session ou transaction
+        pool_settings (Dict[str, Any]): Dimensionnement du pool SQLAlchemy (ignoré en mode transaction)
+
+    Returns:
+        Dict[str, Any]: Classe de pool et paramètres de connexion asyncpg
+    """
+    if pooler_mode not in POOLER_MODES:
+        raise ValueError(f"DB_POOLER_MODE invalide : {pooler_mode} (attendu : {', '.join(POOLER_MODES)})")
+    if pooler_mode == "transaction":
+        return {
+            "poolclass": NullPool,
+            "connect_args": {
+                "statement_cache_size": 0,
+                "prepared_statement_cache_size": 0,
+                "prepared_statement_name_func": unique_statement_name
+            }
+        }
+    return {"poolclass": AsyncAdaptedQueuePool, **pool_settings}
+
+
+def uses_external_pool(engine) -> bool:
+    """Le moteur délègue-t-il le pool au pooler externe (rien à préchauffer côté bot) ?"""
+    return isinstance(engine.pool, NullPool)
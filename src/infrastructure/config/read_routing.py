@@ -0,0 +1,148 @@
+"""
+Routage des lectures vers le réplica en lecture seule.
+
+Les méthodes décorées par ``@read_only`` peuvent être servies par le réplica
+(DB_READ_URL). Les lectures restent sur le primaire lorsque :
+
+- aucun réplica n'est configuré ;
+- le traitement en cours (interaction) a utilisé le primaire depuis moins de
+  DB_READ_MAX_LAG_SECONDS, pour lire ses propres écritures ; l'épingle prend
+  fin avec l'unité de travail qui l'a posée et à chaque nouvelle interaction ;
+- le retard de réplication dépasse la borne configurée (DB_READ_MAX_LAG_SECONDS).
+"""
+import functools
+import logging
+import time
+from contextvars import ContextVar, Token
+from typing import Callable, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.infrastructure.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+REPLICA_LAG = metrics.gauge(
+    "db_replica_lag_seconds",
+    "Retard de réplication mesuré sur le réplica en lecture"
+)
+READS_ROUTED = metrics.counter(
+    "db_reads_routed_total",
+    "Lectures en lecture seule, par base utilisée"
+)
+
+# Retard nul si tout le WAL reçu est rejoué, sinon âge de la dernière transaction rejouée
+LAG_QUERY = text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+)
+
+_read_only: ContextVar[bool] = ContextVar("read_only", default=False)
+# Dernier accès du traitement en cours au primaire (time.monotonic()), None sinon
+_primary_used: ContextVar[Optional[float]] = ContextVar("primary_used", default=None)
+
+
+def read_only(func):
+    """Marque une méthode de lecture : ses sessions peuvent être servies par le réplica"""
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        token = _read_only.set(True)
+        try:
+            return await func(*args, **kwargs)
+        finally:
+            _read_only.reset(token)
+    return wrapper
+
+
+def in_read_only() -> bool:
+    """Indique si l'appel en cours provient d'une méthode marquée @read_only"""
+    return _read_only.get()
+
+
+def mark_primary_used() -> None:
+    """Épingle le traitement en cours au primaire (lecture de ses propres écritures)"""
+    _primary_used.set(time.monotonic())
+
+
+def begin_primary_scope(clear: bool = False) -> Token:
+    """
+    Ouvre une portée d'épingle au primaire, refermée par end_primary_scope().
+
+    Args:
+        clear (bool): Repart sans épingle (nouvelle interaction) au lieu de
+            conserver celle du traitement englobant
+
+    Returns:
+        Token: Jeton restaurant l'épingle d'avant la portée
+    """
+    return _primary_used.set(None if clear else _primary_used.get())
+
+
+def end_primary_scope(token: Token) -> None:
+    """Referme une portée : les épingles posées depuis begin_primary_scope() sont oubliées"""
+    _primary_used.reset(token)
+
+
+def _pinned_to_primary(max_lag: float) -> bool:
+    # Au-delà du retard toléré, le réplica a rejoué les écritures du traitement
+    used_at = _primary_used.get()
+    return used_at is not None and time.monotonic() - used_at < max_lag
+
+
+class ReplicaHealth:
+    """
+    Suivi du retard de réplication, mesuré au plus une fois par intervalle.
+
+    Args:
+        engine (AsyncEngine): Moteur du réplica
+        max_lag (float): Retard maximal toléré, en secondes
+        check_interval (float): Durée de validité d'une mesure, en secondes
+    """
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        max_lag: float = 5.0,
+        check_interval: float = 5.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.engine = engine
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self._clock = clock
+        self._lag: Optional[float] = None
+        self._checked_at: Optional[float] = None
+
+    async def measure_lag(self) -> float:
+        async with self.engine.connect() as conn:
+            return float((await conn.execute(LAG_QUERY)).scalar() or 0.0)
+
+    async def is_fresh(self) -> bool:
+        """Indique si le réplica est assez à jour ; un réplica injoignable ne l'est pas"""
+        now = self._clock()
+        if self._checked_at is None or now - self._checked_at >= self.check_interval:
+            self._checked_at = now
+            try:
+                self._lag = await self.measure_lag()
+                REPLICA_LAG.set(self._lag)
+            except Exception as e:
+                logger.warning(f"Mesure du retard du réplica impossible: {str(e)}")
+                self._lag = None
+            if self._lag is not None and self._lag > self.max_lag:
+                logger.warning(f"Réplica en retard de {self._lag:.1f}s (borne {self.max_lag}s), lectures sur le primaire")
+        return self._lag is not None and self._lag <= self.max_lag
+
+
+async def should_use_replica() -> bool:
+    """Décide si la lecture en cours peut être servie par le réplica"""
+    from src.infrastructure.config import database
+    from src.infrastructure.config.unit_of_work import current_unit_of_work
+
+    if not _read_only.get() or database.replica_health is None:
+        return False
+
+    unit = current_unit_of_work()
+    pinned = _pinned_to_primary(database.replica_health.max_lag) or (unit is not None and unit.connection is not None)
+    use_replica = not pinned and await database.replica_health.is_fresh()
+    READS_ROUTED.inc(labels={"target": "replica" if use_replica else "primary"})
+    return use_replica
@@ -0,0 +1,188 @@
+"""
+Nouvelles tentatives des opérations de base de données.
+
+Une connexion coupée (redémarrage, bascule, pgbouncer) ou un conflit de
+sérialisation fait échouer une opération alors qu'une seconde tentative
+aurait réussi. Les erreurs sont classées d'après leur SQLSTATE :
+
+- erreurs « sûres » : la transaction n'a pas été validée (conflit de
+  sérialisation, interblocage, connexion jamais établie). Toute opération
+  peut être rejouée ;
+- connexion perdue en cours de route : le résultat est inconnu, seules les
+  opérations idempotentes (lectures, affectations) sont rejouées.
+
+Avec le backend SQLite, une base verrouillée par un autre processus
+(« database is locked ») est traitée comme une erreur sûre.
+
+L'attente entre deux tentatives suit un backoff exponentiel à gigue complète.
+La durée totale est bornée par ``max_elapsed`` et par l'échéance de
+l'interaction en cours (voir deadline). Au sein d'une UnitOfWork, rien n'est
+rejoué : la transaction de l'unité est perdue, c'est à l'appelant de la rejouer.
+"""
+import asyncio
+import functools
+import logging
+import random
+import sqlite3
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Iterator, Optional
+
+from sqlalchemy.exc import DBAPIError
+
+from src.infrastructure.config.deadline import remaining
+from src.infrastructure.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+DB_RETRIES = metrics.counter(
+    "db_retries_total",
+    "Nouvelles tentatives d'opérations de base de données, par opération et cause"
+)
+DB_RETRIES_EXHAUSTED = metrics.counter(
+    "db_retries_exhausted_total",
+    "Opérations de base de données abandonnées après une erreur transitoire"
+)
+
+# La transaction n'a pas été validée : toute opération peut être rejouée
+SAFE_SQLSTATES = {
+    "40001",  # serialization_failure
+    "40P01",  # deadlock_detected
+    "53300",  # too_many_connections
+    "57P03",  # cannot_connect_now
+    "08001",  # sqlclient_unable_to_establish_sqlconnection
+    "08004",  # sqlserver_rejected_establishment_of_sqlconnection
+}
+
+# Connexion perdue en cours d'opération : seules les opérations idempotentes sont rejouées
+CONNECTION_LOST_SQLSTATES = {
+    "57P01",  # admin_shutdown
+    "57P02",  # crash_shutdown
+}
+CONNECTION_LOST_CLASS = "08"  # connection_exception
+
+# SQLITE_BUSY : l'instruction n'a pas été exécutée
+SQLITE_BUSY_MESSAGES = ("database is locked", "database is busy")
+
+
+def _error_chain(exc: BaseException) -> Iterator[BaseException]:
+    seen = set()
+    while exc is not None and id(exc) not in seen:
+        seen.add(id(exc))
+        yield exc
+        exc = getattr(exc, "orig", None) or exc.__cause__
+
+
+def sqlstate_of(exc: BaseException) -> Optional[str]:
+    """SQLSTATE d'une erreur (asyncpg, ou adaptée par SQLAlchemy), None si absent"""
+    for error in _error_chain(exc):
+        code = getattr(error, "sqlstate", None) or getattr(error, "pgcode", None)
+        if isinstance(code, str):
+            return code
+    return None
+
+
+def transient_reason(exc: BaseException, idempotent: bool = True) -> Optional[str]:
+    """
+    Cause d'une erreur transitoire, None si l'opération ne doit pas être rejouée.
+
+    Args:
+        exc (BaseException): Erreur levée par l'opération
+        idempotent (bool): L'opération peut être rejouée même si elle a pu aboutir
+    """
+    code = sqlstate_of(exc)
+    if code in SAFE_SQLSTATES:
+        return code
+    if any(isinstance(error, ConnectionRefusedError) for error in _error_chain(exc)):
+        return "connection_refused"
+    if any(
+        isinstance(error, sqlite3.OperationalError) and str(error).startswith(SQLITE_BUSY_MESSAGES)
+        for error in _error_chain(exc)
+    ):
+        return "sqlite_busy"
+    if not idempotent:
+        return None
+    if code is not None and (code in CONNECTION_LOST_SQLSTATES or code.startswith(CONNECTION_LOST_CLASS)):
+        return code
+    if isinstance(exc, DBAPIError) and exc.connection_invalidated:
+        return "connection_invalidated"
+    if any(isinstance(error, ConnectionError) for error in _error_chain(exc)):
+        return "connection_lost"
+    return None
+
+
+def connect_failure_reason(exc: BaseException, idempotent: bool = True) -> Optional[str]:
+    """Classement des échecs d'ouverture de connexion : réseau et délai dépassé sont transitoires"""
+    if isinstance(exc, (OSError, asyncio.TimeoutError)):
+        return type(exc).__name__
+    return transient_reason(exc, idempotent)
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """
+    Politique de nouvelles tentatives.
+
+    Attributes:
+        max_attempts (int): Nombre maximal de tentatives, la première comprise
+        base_delay (float): Attente de référence avant la deuxième tentative, en secondes
+        max_delay (float): Attente maximale entre deux tentatives, en secondes
+        max_elapsed (float): Durée totale maximale, en secondes (bornée aussi par l'échéance)
+        idempotent (bool): L'opération peut être rejouée après une connexion perdue
+        classify (Callable): Renvoie la cause d'une erreur transitoire, None sinon
+    """
+    max_attempts: int = 3
+    base_delay: float = 0.05
+    max_delay: float = 1.0
+    max_elapsed: float = 2.0
+    idempotent: bool = True
+    classify: Callable[[BaseException, bool], Optional[str]] = transient_reason
+
+    def backoff(self, attempt: int) -> float:
+        """Attente avant la tentative ``attempt + 1`` (gigue complète)"""
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** (attempt - 1))))
+
+    def _budget(self, started: float) -> float:
+        budget = self.max_elapsed - (time.monotonic() - started)
+        deadline = remaining()
+        return budget if deadline is None else min(budget, deadline)
+
+    async def call(self, func: Callable[..., Awaitable[Any]], *args, operation: Optional[str] = None, **kwargs) -> Any:
+        """Exécute ``func`` en la rejouant sur les erreurs transitoires"""
+        from src.infrastructure.config.unit_of_work import current_unit_of_work
+
+        operation = operation or getattr(func, "__qualname__", repr(func))
+        started = time.monotonic()
+        attempt = 1
+        while True:
+            try:
+                return await func(*args, **kwargs)
+            except Exception as e:
+                reason = self.classify(e, self.idempotent)
+                if reason is None or current_unit_of_work() is not None:
+                    raise
+                delay = self.backoff(attempt)
+                if attempt >= self.max_attempts or delay >= self._budget(started):
+                    DB_RETRIES_EXHAUSTED.inc(labels={"operation": operation})
+                    logger.error(f"{operation} abandonnée après {attempt} tentative(s) ({reason}): {str(e)}")
+                    raise
+                DB_RETRIES.inc(labels={"operation": operation, "reason": reason})
+                logger.warning(
+                    f"{operation} : tentative {attempt}/{self.max_attempts} échouée ({reason}), "
+                    f"nouvel essai dans {delay * 1000:.0f} ms"
+                )
+                await asyncio.sleep(delay)
+                attempt += 1
+
+    def __call__(self, func):
+        """Utilisation comme décorateur d'une coroutine"""
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            return await self.call(func, *args, operation=func.__qualname__, **kwargs)
+        return wrapper
+
+
+# Lectures et affectations : rejouées aussi après une connexion perdue
+retry_idempotent = RetryPolicy()
+# Écritures non idempotentes (ajout, bascule) : rejouées seulement si rien n'a été validé
+retry_safe = RetryPolicy(idempotent=False)
@@ -0,0 +1,123 @@
+"""
+Vérification de la version du schéma au démarrage.
+
+Le schéma est géré uniquement par les migrations Alembic. Au démarrage, une
+seule requête lit ``alembic_version`` et la compare à la tête attendue, lue
+localement dans les scripts de migration. En cas d'écart, le démarrage échoue,
+sauf si la migration automatique est activée (DB_AUTO_MIGRATE).
+"""
+import logging
+import time
+from pathlib import Path
+from typing import Optional, Set
+
+from alembic import command
+from alembic.config import Config as AlembicConfig
+from alembic.script import ScriptDirectory
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import OperationalError, ProgrammingError
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.infrastructure.errors.exceptions import DatabaseError
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_PATH = Path(__file__).resolve().parents[1] / "migrations"
+
+
+class SchemaVersionError(DatabaseError):
+    """Le schéma de la base ne correspond pas aux migrations du code"""
+    def __init__(self, current: Set[str], expected: Set[str], message: str):
+        super().__init__(message, {"current": sorted(current), "expected": sorted(expected)})
+        self.current = current
+        self.expected = expected
+
+
+def alembic_config(connection: Optional[Connection] = None) -> AlembicConfig:
+    """Configuration Alembic pointant vers les migrations du projet, sans alembic.ini"""
+    config = AlembicConfig()
+    config.set_main_option("script_location", str(MIGRATIONS_PATH))
+    if connection is not None:
+        # Repris par migrations/env.py à la place de DATABASE_URL
+        config.attributes["connection"] = connection
+    return config
+
+
+def expected_heads() -> Set[str]:
+    """Révision(s) de tête des scripts de migration"""
+    return set(ScriptDirectory.from_config(alembic_config()).get_heads())
+
+
+def known_revisions() -> Set[str]:
+    """Toutes les révisions connues des scripts de migration"""
+    script = ScriptDirectory.from_config(alembic_config())
+    return {revision.revision for revision in script.walk_revisions()}
+
+
+async def get_current_revisions(engine: AsyncEngine) -> Set[str]:
+    """Lit alembic_version ; ensemble vide si la base n'a jamais été migrée"""
+    try:
+        async with engine.connect() as conn:
+            result = await conn.execute(text("SELECT version_num FROM alembic_version"))
+            return {row[0] for row in result}
+    except (OperationalError, ProgrammingError):
+        # Table absente : base vierge
+        return set()
+
+
+def _upgrade(connection: Connection) -> None:
+    command.upgrade(alembic_config(connection), "head")
+
+
+async def upgrade_to_head(engine: AsyncEngine) -> None:
+    """
+    Applique les migrations manquantes, chacune dans sa transaction.
+
+    Alembic ouvre lui-même les transactions : les index créés CONCURRENTLY
+    doivent l'être hors transaction (autocommit_block).
+    """
+    async with engine.connect() as conn:
+        await conn.run_sync(_upgrade)
+        await conn.commit()
+
+
+async def check_schema_version(engine: AsyncEngine, auto_migrate: bool = False) -> None:
+    """
+    Vérifie que la base est à la tête des migrations.
+
+    Args:
+        engine (AsyncEngine): Moteur de la base
+        auto_migrate (bool): Applique les migrations manquantes au lieu d'échouer
+
+    Raises:
+        SchemaVersionError: Si la base n'est pas à jour (et que la migration
+            automatique est désactivée) ou si elle est plus récente que le code
+    """
+    start = time.perf_counter()
+    expected = expected_heads()
+    current = await get_current_revisions(engine)
+    if current == expected:
+        logger.info(f"Schéma à jour ({', '.join(sorted(current))}), vérifié en {time.perf_counter() - start:.3f}s")
+        return
+
+    unknown = current - known_revisions()
+    if unknown:
+        raise SchemaVersionError(
+            current, expected,
+            f"Révision(s) de la base inconnue(s) du code : {', '.join(sorted(unknown))}"
+        )
+
+    if not auto_migrate:
+        raise SchemaVersionError(
+            current, expected,
+            f"Schéma en retard ({', '.join(sorted(current)) or 'aucune migration'}, attendu "
+            f"{', '.join(sorted(expected))}) : lancer 'alembic upgrade head' ou définir DB_AUTO_MIGRATE=true"
+        )
+
+    logger.warning(f"Migration automatique de {', '.join(sorted(current)) or 'base vierge'} vers {', '.join(sorted(expected))}")
+    await upgrade_to_head(engine)
+    current = await get_current_revisions(engine)
+    if current != expected:
+        raise SchemaVersionError(current, expected, "Schéma toujours en retard après migration")
+    logger.info(f"Migration terminée en {time.perf_counter() - start:.3f}s")
@@ -0,0 +1,142 @@
+"""
+Backend SQLite embarqué (aiosqlite) pour les déploiements sur un seul nœud.
+
+Pour une petite guilde, l'aller-retour réseau vers un PostgreSQL distant
+domine la latence des interactions. Avec DATABASE_URL=sqlite:///chemin.db,
+la base est un fichier local :
+
+- mode WAL : les lecteurs ne bloquent pas l'écrivain et inversement ;
+- pragmas réglés à chaque connexion (synchronous=NORMAL, busy_timeout,
+  clés étrangères, cache, mmap) ;
+- écrivain unique : SQLite n'accepte qu'une transaction d'écriture à la fois.
+  Le moteur principal n'a qu'une connexion, et la file d'attente du pool
+  sérialise les écritures au lieu de les faire échouer (« database is
+  locked »). Les lectures @read_only passent par un second pool, en lecture
+  seule (query_only), via le routage des lectures (voir read_routing).
+
+Les migrations Alembic visent PostgreSQL : le schéma SQLite est créé à partir
+des modèles au démarrage.
+"""
+import logging
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from src.infrastructure.config.read_routing import ReplicaHealth
+
+logger = logging.getLogger(__name__)
+
+# Appliqués à chaque nouvelle connexion, dans cet ordre
+PRAGMAS: Dict[str, Any] = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",  # Sûr en mode WAL : seule la dernière transaction peut être perdue
+    "busy_timeout": 5000,  # ms, si un autre processus tient le verrou
+    "foreign_keys": "ON",
+    "cache_size": -16000,  # Ko (valeur négative), soit 16 Mo par connexion
+    "temp_store": "MEMORY",
+    "mmap_size": 134217728,  # 128 Mo
+}
+
+
+def is_sqlite_url(url: str) -> bool:
+    """Indique si une URL de base de données désigne SQLite"""
+    return url.startswith("sqlite")
+
+
+def configure_sqlite(engine: Engine, read_only: bool = False) -> None:
+    """
+    Applique les pragmas à chaque connexion ouverte par un moteur.
+
+    Les transactions sont ouvertes explicitement (BEGIN) et non plus par le
+    pilote sqlite3, qui ne les démarre qu'à la première écriture : sans cela,
+    un SAVEPOINT (voir UnitOfWork.session_scope(savepoint=True)) ouvrirait sa propre
+    transaction et serait validé à sa libération.
+
+    Args:
+        engine (Engine): Moteur synchrone (engine.sync_engine pour un moteur async)
+        read_only (bool): Connexions en lecture seule (pragma query_only)
+    """
+    pragmas = dict(PRAGMAS, **({"query_only": "ON"} if read_only else {}))
+
+    @event.listens_for(engine, "connect")
+    def set_pragmas(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
+    @event.listens_for(engine, "begin")
+    def begin(connection):
+        # Directement sur la connexion DBAPI, comme le BEGIN implicite des autres
+        # pilotes : il n'est pas compté parmi les requêtes (voir metrics.sql)
+        cursor = connection.connection.cursor()
+        try:
+            cursor.execute("BEGIN")
+        finally:
+            cursor.close()
+
+
+def create_sqlite_engines(url: str, pool_settings: Optional[Dict[str, Any]] = None) -> Tuple[AsyncEngine, AsyncEngine]:
+    """
+    Crée le moteur écrivain (une seule connexion) et le moteur lecteur d'une base SQLite.
+
+    Args:
+        url (str): URL SQLite (sqlite:/// ou sqlite+aiosqlite:///), vers un fichier
+        pool_settings (Optional[Dict[str, Any]]): Réglages du pool lecteur
+            (pool_size, max_overflow, pool_timeout...) ; pool_timeout vaut aussi
+            pour l'attente de l'écrivain
+
+    Returns:
+        Tuple[AsyncEngine, AsyncEngine]: Moteurs écrivain et lecteur
+
+    Raises:
+        ValueError: Pour une base en mémoire, propre à chaque connexion
+    """
+    parsed = make_url(url)
+    if parsed.drivername in ("sqlite", "sqlite+pysqlite"):
+        parsed = parsed.set(drivername="sqlite+aiosqlite")
+    if parsed.database in (None, "", ":memory:"):
+        raise ValueError("SQLite en mémoire non supporté : chaque connexion verrait une base distincte")
+
+    settings = dict(pool_settings or {})
+    # Une connexion coupée n'existe pas pour un fichier local
+    settings.pop("pool_pre_ping", None)
+    writer = create_async_engine(
+        parsed,
+        poolclass=AsyncAdaptedQueuePool,
+        pool_logging_name="writer",
+        **dict(settings, pool_size=1, max_overflow=0)
+    )
+    reader = create_async_engine(
+        parsed,
+        poolclass=AsyncAdaptedQueuePool,
+        pool_logging_name="reader",
+        **settings
+    )
+    configure_sqlite(writer.sync_engine)
+    configure_sqlite(reader.sync_engine, read_only=True)
+    return writer, reader
+
+
+async def create_sqlite_schema(engine: AsyncEngine) -> None:
+    """Crée les tables manquantes à partir des modèles"""
+    # Les modèles doivent être importés pour être enregistrés dans Base.metadata
+    from src.domain.entities import guild_member, stream, task, user  # noqa: F401
+    from src.infrastructure.config.database import Base
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    logger.info(f"Schéma SQLite prêt ({engine.url.database})")
+
+
+class LocalReaderHealth(ReplicaHealth):
+    """Le lecteur SQLite lit le même fichier que l'écrivain : il n'est jamais en retard"""
+
+    async def measure_lag(self) -> float:
+        return 0.0
@@ -0,0 +1,169 @@
+"""
+Unité de travail partagée par tous les accès à la base d'un même traitement.
+
+Une UnitOfWork emprunte une seule connexion au pool et y ouvre une seule
+transaction. Tant qu'elle est active (contextvar), ``get_session()`` renvoie
+la même session au lieu d'en ouvrir une nouvelle : tous les services et
+repositories appelés par un gestionnaire d'interaction partagent ainsi la
+connexion, et la transaction n'est validée qu'à la sortie du bloc.
+"""
+import functools
+import logging
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import AsyncGenerator, Callable, List, Optional
+
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+
+from src.infrastructure.config import database
+from src.infrastructure.config.read_routing import begin_primary_scope, end_primary_scope
+from src.infrastructure.metrics.pool import checkout_timer
+
+logger = logging.getLogger(__name__)
+
+_current: ContextVar[Optional["UnitOfWork"]] = ContextVar("unit_of_work", default=None)
+
+
+def current_unit_of_work() -> Optional["UnitOfWork"]:
+    """Retourne l'unité de travail active dans le contexte courant, s'il y en a une"""
+    return _current.get()
+
+
+class UnitOfWork:
+    """
+    Connexion et transaction uniques pour un traitement (ex: un clic sur un bouton).
+
+    La connexion n'est empruntée qu'au premier accès à la base. Les ``commit()``
+    des services se limitent alors à un flush : seule la sortie du bloc valide la
+    transaction (ou l'annule en cas d'exception). Une erreur dans un
+    ``get_session()`` condamne toute l'unité, sauf dans un
+    ``get_session(savepoint=True)`` : seul ce bloc est alors annulé (SAVEPOINT),
+    une étape en échec rattrapée par un service ne fait pas perdre les précédentes.
+
+    Une UnitOfWork ouverte alors qu'une autre est active se contente de
+    réutiliser celle-ci. La session partagée ne doit pas être utilisée par
+    plusieurs coroutines en parallèle (asyncio.gather).
+
+    Utilisation :
+        async with UnitOfWork():
+            task = await task_service.toggle_task(task_id)
+            lists = await task_service.get_user_lists(user_id)
+    """
+    def __init__(self):
+        self.connection: Optional[AsyncConnection] = None
+        self.session: Optional[AsyncSession] = None
+        self._outer: Optional["UnitOfWork"] = None
+        self._token = None
+        self._primary_scope = None
+        self._after_commit: List[Callable[[], None]] = []
+
+    async def __aenter__(self) -> "UnitOfWork":
+        self._outer = _current.get()
+        if self._outer is not None:
+            return self._outer
+        self._token = _current.set(self)
+        # Les lectures sur le primaire dues à l'unité prennent fin avec elle
+        self._primary_scope = begin_primary_scope()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        if self._outer is not None:
+            return
+        committed = False
+        try:
+            if self.connection is not None:
+                if exc_type is None and self.connection.in_transaction():
+                    await self.connection.commit()
+                    committed = True
+                elif self.connection.in_transaction():
+                    await self.connection.rollback()
+        finally:
+            await self._release()
+            end_primary_scope(self._primary_scope)
+            _current.reset(self._token)
+        if committed:
+            for callback in self._after_commit:
+                try:
+                    callback()
+                except Exception as e:
+                    logger.error(f"Erreur après la validation de l'unité de travail: {str(e)}")
+        self._after_commit.clear()
+
+    def after_commit(self, callback: Callable[[], None]) -> None:
+        """Exécute ``callback`` une fois la transaction de l'unité validée (jamais si elle est annulée)"""
+        self._after_commit.append(callback)
+
+    async def _release(self) -> None:
+        if self.session is not None:
+            await self.session.close()
+        if self.connection is not None:
+            await self.connection.close()
+        self.session = None
+        self.connection = None
+
+    async def get_connection(self) -> AsyncConnection:
+        """Retourne la connexion de l'unité, transaction ouverte, en l'empruntant au premier appel"""
+        if self.connection is None:
+            if database.engine is None:
+                raise RuntimeError("La base de données n'a pas été initialisée")
+            with checkout_timer(database.engine):
+                self.connection = await database.engine.connect()
+            await self.connection.begin()
+        return self.connection
+
+    async def get_session(self) -> AsyncSession:
+        """Retourne la session de l'unité, en empruntant la connexion au premier appel"""
+        if self.session is None:
+            await self.get_connection()
+            # rollback_only : les commit() de la session ne valident pas la transaction
+            # de la connexion, qui reste sous le contrôle de l'unité de travail
+            self.session = AsyncSession(
+                bind=self.connection,
+                expire_on_commit=False,
+                join_transaction_mode="rollback_only"
+            )
+        return self.session
+
+    @asynccontextmanager
+    async def session_scope(self, savepoint: bool = False) -> AsyncGenerator[AsyncSession, None]:
+        """
+        Équivalent de get_session() au sein de l'unité : ni commit final, ni fermeture.
+
+        Par défaut, le bloc travaille dans la transaction partagée. Avec
+        ``savepoint=True``, il s'exécute dans un SAVEPOINT : une erreur (ou un
+        rollback() d'un repository) n'annule que le travail du bloc, celui des
+        étapes précédentes de l'unité est conservé.
+        """
+        session = await self.get_session()
+        if not savepoint:
+            try:
+                yield session
+                await session.flush()
+            except Exception:
+                await session.rollback()
+                raise
+            return
+        if session.in_transaction():
+            # La session doit rejoindre le SAVEPOINT ouvert ci-dessous (rollback_only :
+            # ce commit se limite à un flush)
+            await session.commit()
+        savepoint = await self.connection.begin_nested()
+        try:
+            yield session
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            if savepoint.is_active:
+                await savepoint.rollback()
+            raise
+        if savepoint.is_active:
+            await savepoint.commit()
+
+
+def unit_of_work(func):
+    """Décorateur exécutant une coroutine dans une UnitOfWork"""
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        async with UnitOfWork():
+            return await func(*args, **kwargs)
+    return wrapper
@@ -0,0 +1,91 @@
+"""
+Préchauffage du pool de connexions au démarrage.
+
+Sans préchauffage, la première interaction après un déploiement paie
+l'ouverture de la connexion (TCP, TLS, authentification) puis la préparation
+de ses requêtes, souvent au-delà des 3 secondes accordées par Discord. Les
+connexions minimales du pool sont donc ouvertes en parallèle et les requêtes
+fréquentes y sont exécutées une fois : le pilote asyncpg garde leurs
+instructions préparées en cache sur chaque connexion.
+"""
+import asyncio
+import logging
+import time
+from typing import Any, Dict, List, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from src.domain.entities.task import Task, TaskList
+from src.infrastructure.metrics import metrics
+from src.infrastructure.repositories import fast_task_repository as fast
+
+logger = logging.getLogger(__name__)
+
+WARMUP_DURATION = metrics.gauge(
+    "db_pool_warmup_seconds",
+    "Durée du préchauffage du pool au démarrage"
+)
+
+# Paramètres ne correspondant à aucune ligne : les requêtes sont préparées sans effet
+_NO_USER = -1
+_NO_ID = -1
+
+# Lectures fréquentes de l'interface des tâches (ORM et chemin rapide)
+READ_QUERIES: List[Tuple[Any, Dict[str, Any]]] = [
+    (select(TaskList).filter_by(user_discord_id=_NO_USER), {}),
+    (select(TaskList).filter_by(id=_NO_ID), {}),
+    (select(Task).filter_by(id=_NO_ID), {}),
+    (fast._SELECT_USER_LISTS, {"user_discord_id": _NO_USER}),
+    (fast._SELECT_USER_LIST_HEADERS, {"user_discord_id": _NO_USER})
+]
+
+# Écritures du chemin rapide, exécutées dans une transaction annulée
+WRITE_QUERIES: List[Tuple[Any, Dict[str, Any]]] = [
+    (fast._TOGGLE_TASK, {"task_id": _NO_ID, "completed_at": None}),
+    (fast._INSERT_TASK, {"description": "", "task_list_id": _NO_ID, "created_at": None})
+]
+
+
+async def _prime(connection: AsyncConnection, include_writes: bool) -> None:
+    queries = READ_QUERIES + (WRITE_QUERIES if include_writes else [])
+    async with connection.begin() as transaction:
+        for statement, params in queries:
+            await connection.execute(statement, params)
+        await transaction.rollback()
+
+
+async def warm_up_pool(engine: AsyncEngine, size: int, include_writes: bool = True) -> float:
+    """
+    Ouvre ``size`` connexions en parallèle et y prépare les requêtes fréquentes.
+
+    Les connexions sont ensuite rendues au pool, qui les conserve.
+
+    Args:
+        engine (AsyncEngine): Moteur à préchauffer
+        size (int): Nombre de connexions à ouvrir (borné par pool_size)
+        include_writes (bool): Prépare aussi les écritures (faux pour un réplica)
+
+    Returns:
+        float: Durée du préchauffage, en secondes
+    """
+    start = time.perf_counter()
+    size = min(size, engine.pool.size()) if hasattr(engine.pool, "size") else size
+    if size <= 0:
+        return 0.0
+
+    results = await asyncio.gather(*(engine.connect() for _ in range(size)), return_exceptions=True)
+    connections = [result for result in results if isinstance(result, AsyncConnection)]
+    errors = [result for result in results if isinstance(result, BaseException)]
+    try:
+        await asyncio.gather(*(_prime(connection, include_writes) for connection in connections))
+    finally:
+        for connection in connections:
+            await connection.close()
+
+    if errors:
+        logger.warning(f"{len(errors)}/{size} connexion(s) non ouverte(s) au préchauffage: {str(errors[0])}")
+    elapsed = time.perf_counter() - start
+    WARMUP_DURATION.set(elapsed, labels={"pool": engine.pool.logging_name or "primary"})
+    logger.info(f"Pool préchauffé : {len(connections)} connexion(s) en {elapsed:.3f}s")
+    return elapsed
@@ -0,0 +1,32 @@
+"""
+Identifiant de corrélation du traitement en cours.
+
+Chaque interaction Discord s'exécute dans sa propre tâche asyncio : son
+identifiant, placé dans une ContextVar au début du traitement, est repris par
+les logs (``%(correlation_id)s``) et par le journal des requêtes lentes.
+"""
+from contextvars import ContextVar
+from typing import Optional
+
+import discord
+
+NO_CORRELATION_ID = "N/A"
+
+_correlation_id: ContextVar[Optional[str]] = ContextVar("correlation_id", default=None)
+
+
+def get_correlation_id() -> str:
+    """Retourne l'identifiant de corrélation courant, N/A hors interaction"""
+    return _correlation_id.get() or NO_CORRELATION_ID
+
+
+def set_correlation_id(correlation_id: Optional[str]) -> None:
+    """Définit l'identifiant de corrélation de la tâche en cours"""
+    _correlation_id.set(correlation_id)
+
+
+def bind_interaction(interaction: discord.Interaction) -> str:
+    """Utilise l'identifiant d'une interaction Discord comme identifiant de corrélation"""
+    correlation_id = str(interaction.id)
+    _correlation_id.set(correlation_id)
+    return correlation_id
@@ -6,6 +6,7 @@ from pathlib import Path
 from typing import Optional
 from datetime import datetime
 from src.config.config import Config, Environment
+from src.infrastructure.logging.correlation import get_correlation_id
 import os
 from logging.handlers import RotatingFileHandler
 
@@ -63,7 +64,7 @@ def setup_logging(is_development: bool = True) -> None:
     class CorrelationFormatter(logging.Formatter):
         def format(self, record):
             if not hasattr(record, 'correlation_id'):
-                record.correlation_id = 'N/A'
+                record.correlation_id = get_correlation_id()
             return super().format(record)
     
     formatter = CorrelationFormatter(log_format, date_format)
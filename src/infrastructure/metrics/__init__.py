@@ -0,0 +1,7 @@
+"""
+Module de métriques pour le bot Discord
+"""
+
+from .registry import metrics, MetricsRegistry, Counter, Gauge, Histogram
+
+__all__ = ['metrics', 'MetricsRegistry', 'Counter', 'Gauge', 'Histogram']
@@ -0,0 +1,131 @@
+"""
+Métriques du pool de connexions SQLAlchemy.
+
+L'occupation du pool (connexions utilisées, libres, en débordement), les
+ouvertures en débordement et les invalidations sont suivies par les événements
+publics du pool (connect, checkout, checkin, close...) : elles valent pour
+toute classe de pool (QueuePool, NullPool, StaticPool). Le temps d'attente
+d'une connexion est mesuré autour de son emprunt (engine.connect(), voir
+checkout_timer).
+"""
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import Pool, QueuePool
+
+from src.infrastructure.metrics.registry import metrics
+
+POOL_CHECKOUT_WAIT = metrics.histogram(
+    "db_pool_checkout_wait_seconds",
+    "Attente d'une connexion du pool (ouverture éventuelle comprise)",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0, 30.0)
+)
+POOL_IN_USE = metrics.gauge(
+    "db_pool_connections_in_use",
+    "Connexions du pool actuellement empruntées"
+)
+POOL_IDLE = metrics.gauge(
+    "db_pool_connections_idle",
+    "Connexions ouvertes disponibles dans le pool"
+)
+POOL_OVERFLOW = metrics.gauge(
+    "db_pool_connections_overflow",
+    "Connexions ouvertes au-delà de pool_size"
+)
+POOL_OVERFLOW_OPENED = metrics.counter(
+    "db_pool_overflow_connections_total",
+    "Connexions de débordement ouvertes faute de connexion libre"
+)
+POOL_TIMEOUTS = metrics.counter(
+    "db_pool_checkout_timeouts_total",
+    "Emprunts abandonnés après pool_timeout"
+)
+POOL_INVALIDATED = metrics.counter(
+    "db_pool_connections_invalidated_total",
+    "Connexions invalidées (coupées, échec du pre-ping)"
+)
+
+
+def _labels(pool: Pool) -> dict:
+    return {"pool": pool.logging_name or "primary"}
+
+
+@contextmanager
+def checkout_timer(engine) -> Iterator[None]:
+    """
+    Mesure l'attente d'une connexion empruntée dans le bloc (ouverture éventuelle comprise) :
+
+        with checkout_timer(engine):
+            connection = await engine.connect()
+
+    Args:
+        engine: Moteur (async ou synchrone) dont le pool fournit la connexion
+    """
+    labels = _labels(engine.pool)
+    start = time.perf_counter()
+    try:
+        yield
+    except exc.TimeoutError:
+        POOL_TIMEOUTS.inc(labels=labels)
+        raise
+    finally:
+        POOL_CHECKOUT_WAIT.observe(time.perf_counter() - start, labels=labels)
+
+
+def instrument_pool(engine: Engine) -> None:
+    """
+    Suit l'occupation du pool d'un moteur, ses débordements et ses invalidations.
+
+    Les écouteurs sont posés sur le moteur : ils suivent le pool recréé par
+    SQLAlchemy après un dispose().
+
+    Args:
+        engine (Engine): Moteur synchrone (engine.sync_engine pour un moteur async)
+    """
+    # Connexions (enregistrements du pool) ouvertes et empruntées : un StaticPool
+    # prête la même connexion à plusieurs emprunts, rendue une seule fois
+    opened, in_use = set(), set()
+
+    def overflow(pool: Pool) -> int:
+        # Seul un QueuePool a une taille au-delà de laquelle il déborde
+        return max(len(opened) - pool.size(), 0) if isinstance(pool, QueuePool) else 0
+
+    def publish() -> None:
+        pool = engine.pool
+        labels = _labels(pool)
+        POOL_IN_USE.set(len(in_use), labels=labels)
+        POOL_IDLE.set(len(opened - in_use), labels=labels)
+        POOL_OVERFLOW.set(overflow(pool), labels=labels)
+
+    def on_connect(dbapi_connection, record):
+        opened.add(record)
+        if overflow(engine.pool) > 0:
+            POOL_OVERFLOW_OPENED.inc(labels=_labels(engine.pool))
+        publish()
+
+    def on_close(dbapi_connection, record):
+        opened.discard(record)
+        in_use.discard(record)
+        publish()
+
+    def on_checkout(dbapi_connection, record, proxy):
+        in_use.add(record)
+        publish()
+
+    def on_checkin(dbapi_connection, record):
+        in_use.discard(record)
+        publish()
+
+    def on_invalidate(*_):
+        POOL_INVALIDATED.inc(labels=_labels(engine.pool))
+
+    event.listen(engine, "connect", on_connect)
+    # Une connexion détachée (detach()) ne fait plus partie du pool
+    event.listen(engine, "close", on_close)
+    event.listen(engine, "detach", on_close)
+    event.listen(engine, "checkout", on_checkout)
+    event.listen(engine, "checkin", on_checkin)
+    event.listen(engine, "invalidate", on_invalidate)
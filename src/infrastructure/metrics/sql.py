@@ -0,0 +1,135 @@
+"""
+Instrumentation des requêtes SQL.
+
+Les événements ``before_cursor_execute`` / ``after_cursor_execute`` du moteur
+mesurent chaque requête. Les durées alimentent un histogramme par requête
+normalisée (valeurs et paramètres remplacés par ``?``) ; les requêtes dépassant
+le seuil sont écrites dans le journal des requêtes lentes avec l'identifiant
+de corrélation de l'interaction.
+"""
+import logging
+import re
+import time
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Generator, List
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from src.infrastructure.logging.correlation import get_correlation_id
+from src.infrastructure.metrics.registry import metrics
+
+slow_query_logger = logging.getLogger("src.infrastructure.metrics.sql.slow")
+
+QUERY_DURATION = metrics.histogram(
+    "db_query_duration_seconds",
+    "Durée des requêtes SQL, par requête normalisée",
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+)
+SLOW_QUERIES = metrics.counter(
+    "db_slow_queries_total",
+    "Requêtes SQL ayant dépassé le seuil du journal des requêtes lentes"
+)
+
+# Longueur maximale d'une requête normalisée (libellé de métrique)
+MAX_STATEMENT_LENGTH = 200
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_PARAMETER = re.compile(r"\$\d+|%\(\w+\)s|%s|(?<!:):\w+|\?")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\bIN\s*\(\s*\?(?:\s*,\s*\?)+\s*\)", re.IGNORECASE)
+_CAST = re.compile(r"::\w+(?:\(\d+(?:,\s*\d+)?\))?(?:\s+WITH(?:OUT)?\s+TIME\s+ZONE)?(?:\[\])?", re.IGNORECASE)
+_SPACES = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=1024)
+def normalize_statement(statement: str) -> str:
+    """
+    Réduit une requête à sa forme générique.
+
+    Les chaînes, nombres et paramètres deviennent ``?``, les listes IN
+    une seule valeur, et les conversions de type asyncpg
+    (``$1::VARCHAR``) disparaissent.
+    """
+    normalized = _CAST.sub("", statement)
+    normalized = _STRING.sub("?", normalized)
+    normalized = _PARAMETER.sub("?", normalized)
+    normalized = _NUMBER.sub("?", normalized)
+    normalized = _IN_LIST.sub("IN (?)", normalized)
+    normalized = _SPACES.sub(" ", normalized).strip()
+    if len(normalized) > MAX_STATEMENT_LENGTH:
+        normalized = normalized[:MAX_STATEMENT_LENGTH - 3] + "..."
+    return normalized
+
+
+def instrument_queries(engine: Engine, slow_query_seconds: float = 0.2) -> None:
+    """
+    Mesure les requêtes d'un moteur et journalise les plus lentes.
+
+    Args:
+        engine (Engine): Moteur synchrone (engine.sync_engine pour un moteur async)
+        slow_query_seconds (float): Seuil du journal des requêtes lentes
+    """
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info.get("query_started_at")
+        if not started:
+            return
+        elapsed = time.perf_counter() - started.pop()
+        normalized = normalize_statement(statement)
+        QUERY_DURATION.observe(elapsed, labels={"statement": normalized})
+        if elapsed >= slow_query_seconds:
+            SLOW_QUERIES.inc()
+            slow_query_logger.warning(
+                f"Requête lente ({elapsed * 1000:.0f} ms) : {normalized}",
+                extra={"correlation_id": get_correlation_id()}
+            )
+
+    @event.listens_for(engine, "handle_error")
+    def handle_error(context):
+        # Une requête en échec n'atteint pas after_cursor_execute
+        started = context.connection.info.get("query_started_at") if context.connection is not None else None
+        if started:
+            started.pop()
+
+
+class QueryCounter:
+    """
+    Requêtes exécutées sur un moteur pendant un bloc ``count_queries``.
+
+    Attributes:
+        statements (List[str]): Requêtes exécutées, dans l'ordre
+    """
+    def __init__(self):
+        self.statements: List[str] = []
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+
+@contextmanager
+def count_queries(engine: Engine) -> Generator[QueryCounter, None, None]:
+    """
+    Compte les requêtes exécutées sur un moteur pendant le bloc.
+
+    Utilisation :
+        with count_queries(database.engine.sync_engine) as counter:
+            await service.get_user_lists(user_id)
+        assert counter.count <= 2
+    """
+    counter = QueryCounter()
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        counter.statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield counter
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
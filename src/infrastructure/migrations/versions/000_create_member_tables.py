@@ -0,0 +1,54 @@
+"""create guild_members and users tables
+
+Revision ID: 000_create_member_tables
+Revises: 
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '000_create_member_tables'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Ces tables n'étaient créées que par create_all au démarrage : les bases
+    # existantes les ont déjà, une base vierge les reçoit ici
+    inspector = sa.inspect(op.get_bind())
+
+    if not inspector.has_table('guild_members'):
+        op.create_table(
+            'guild_members',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('discord_id', sa.BigInteger(), nullable=True),
+            sa.Column('username', sa.String(), nullable=True),
+            sa.Column('joined_at', sa.DateTime(), nullable=True),
+            sa.Column('twitch_username', sa.String(), nullable=True),
+            sa.Column('social_role_id', sa.BigInteger(), nullable=True),
+            sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index('ix_guild_members_id', 'guild_members', ['id'])
+        op.create_index('ix_guild_members_discord_id', 'guild_members', ['discord_id'], unique=True)
+        op.create_index('ix_guild_members_username', 'guild_members', ['username'])
+
+    if not inspector.has_table('users'):
+        op.create_table(
+            'users',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('username', sa.String(), nullable=True),
+            sa.Column('email', sa.String(), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+            sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index('ix_users_id', 'users', ['id'])
+        op.create_index('ix_users_username', 'users', ['username'], unique=True)
+        op.create_index('ix_users_email', 'users', ['email'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_table('users')
+    op.drop_table('guild_members')
@@ -1,7 +1,7 @@
 """Migration pour ajouter le support des timezones aux colonnes de timestamp
 
 Revision ID: 001_add_timezone_to_timestamps
-Revises: 
+Revises: 000_create_member_tables
 Create Date: 2024-01-25 16:24:38.383612
 
 """
@@ -11,11 +11,15 @@ from datetime import datetime, UTC
 
 # revision identifiers, used by Alembic.
 revision = '001_add_timezone_to_timestamps'
-down_revision = None
+down_revision = '000_create_member_tables'
 branch_labels = None
 depends_on = None
 
 def upgrade() -> None:
+    # Base vierge : les tables sont créées par la migration suivante, déjà avec timezone
+    if not sa.inspect(op.get_bind()).has_table('task_lists'):
+        return
+
     # Mettre à jour la colonne created_at de task_lists
     op.alter_column('task_lists', 'created_at',
                     type_=sa.DateTime(timezone=True),
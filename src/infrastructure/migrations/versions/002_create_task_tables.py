@@ -16,6 +16,10 @@ branch_labels = None
 depends_on = None
 
 def upgrade() -> None:
+    # Bases créées avant les migrations (create_all au démarrage) : tables déjà présentes
+    if sa.inspect(op.get_bind()).has_table('task_lists'):
+        return
+
     # Créer la table task_lists
     op.create_table(
         'task_lists',
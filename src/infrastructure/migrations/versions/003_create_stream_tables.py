@@ -0,0 +1,42 @@
+"""create stream replica and announcement tables
+
+Revision ID: 003_create_stream_tables
+Revises: 002_create_task_tables
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '003_create_stream_tables'
+down_revision = '002_create_task_tables'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    # Heartbeat des instances se partageant le suivi des streams
+    op.create_table(
+        'stream_replicas',
+        sa.Column('replica_id', sa.String(), nullable=False),
+        sa.Column('started_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.text('now()')),
+        sa.Column('last_seen', sa.DateTime(timezone=True), nullable=False, server_default=sa.text('now()')),
+        sa.PrimaryKeyConstraint('replica_id')
+    )
+    op.create_index('ix_stream_replicas_last_seen', 'stream_replicas', ['last_seen'])
+
+    # Annonces de streams en cours, partagées entre les instances
+    op.create_table(
+        'stream_announcements',
+        sa.Column('login', sa.String(), nullable=False),
+        sa.Column('stream_id', sa.String(), nullable=False),
+        sa.Column('channel_id', sa.BigInteger(), nullable=False),
+        sa.Column('message_id', sa.BigInteger(), nullable=False),
+        sa.Column('stream', sa.JSON(), nullable=False, server_default=sa.text("'{}'")),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.text('now()')),
+        sa.PrimaryKeyConstraint('login')
+    )
+
+def downgrade() -> None:
+    op.drop_table('stream_announcements')
+    op.drop_index('ix_stream_replicas_last_seen', table_name='stream_replicas')
+    op.drop_table('stream_replicas')
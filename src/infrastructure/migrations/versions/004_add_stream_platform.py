@@ -0,0 +1,29 @@
+"""add platform to stream announcements
+
+Revision ID: 004_add_stream_platform
+Revises: 003_create_stream_tables
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '004_add_stream_platform'
+down_revision = '003_create_stream_tables'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    # Les annonces existantes concernent toutes Twitch
+    op.add_column(
+        'stream_announcements',
+        sa.Column('platform', sa.String(), nullable=False, server_default='twitch')
+    )
+    op.drop_constraint('stream_announcements_pkey', 'stream_announcements', type_='primary')
+    op.create_primary_key('stream_announcements_pkey', 'stream_announcements', ['platform', 'login'])
+
+def downgrade() -> None:
+    op.execute("DELETE FROM stream_announcements WHERE platform <> 'twitch'")
+    op.drop_constraint('stream_announcements_pkey', 'stream_announcements', type_='primary')
+    op.create_primary_key('stream_announcements_pkey', 'stream_announcements', ['login'])
+    op.drop_column('stream_announcements', 'platform')
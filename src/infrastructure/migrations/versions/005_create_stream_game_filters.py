@@ -0,0 +1,26 @@
+"""create stream game filters table
+
+Revision ID: 005_create_stream_game_filters
+Revises: 004_add_stream_platform
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '005_create_stream_game_filters'
+down_revision = '004_add_stream_platform'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    op.create_table(
+        'stream_game_filters',
+        sa.Column('guild_id', sa.BigInteger(), nullable=False),
+        sa.Column('game_name', sa.String(), nullable=False),
+        sa.Column('game_id', sa.String(), nullable=True),
+        sa.PrimaryKeyConstraint('guild_id', 'game_name')
+    )
+
+def downgrade() -> None:
+    op.drop_table('stream_game_filters')
@@ -0,0 +1,50 @@
+"""add task indexes and unique list names
+
+Revision ID: 006_add_task_indexes
+Revises: 005_create_stream_game_filters
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '006_add_task_indexes'
+down_revision = '005_create_stream_game_filters'
+branch_labels = None
+depends_on = None
+
+UNIQUE_LIST_NAME = 'uq_task_lists_user_discord_id_name'
+TASK_LIST_INDEX = 'ix_tasks_task_list_id'
+
+
+def upgrade() -> None:
+    # Doublons antérieurs à la contrainte : les listes les plus récentes sont renommées
+    op.execute(
+        "UPDATE task_lists SET name = name || ' (' || id || ')' "
+        "WHERE id IN (SELECT id FROM (SELECT id, row_number() OVER "
+        "(PARTITION BY user_discord_id, name ORDER BY id) AS rank FROM task_lists) ranked WHERE rank > 1)"
+    )
+
+    # CONCURRENTLY : les tables restent accessibles en écriture pendant la construction,
+    # hors transaction. Un index laissé invalide par une tentative interrompue est
+    # supprimé avant d'être reconstruit.
+    with op.get_context().autocommit_block():
+        for index in (UNIQUE_LIST_NAME, TASK_LIST_INDEX):
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {index}")
+        # L'index unique sert aussi les recherches par utilisateur (première colonne)
+        op.create_index(
+            UNIQUE_LIST_NAME, 'task_lists', ['user_discord_id', 'name'],
+            unique=True, postgresql_concurrently=True
+        )
+        op.create_index(TASK_LIST_INDEX, 'tasks', ['task_list_id'], postgresql_concurrently=True)
+
+    # Contrainte adossée à l'index existant : aucun parcours de la table sous verrou
+    op.execute(
+        f"ALTER TABLE task_lists ADD CONSTRAINT {UNIQUE_LIST_NAME} UNIQUE USING INDEX {UNIQUE_LIST_NAME}"
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint(UNIQUE_LIST_NAME, 'task_lists', type_='unique')
+    with op.get_context().autocommit_block():
+        op.drop_index(TASK_LIST_INDEX, table_name='tasks', postgresql_concurrently=True)
@@ -0,0 +1,110 @@
+"""store discord user ids as bigint
+
+Revision ID: 007_discord_ids_to_bigint
+Revises: 006_add_task_indexes
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '007_discord_ids_to_bigint'
+down_revision = '006_add_task_indexes'
+branch_labels = None
+depends_on = None
+
+UNIQUE_LIST_NAME = 'uq_task_lists_user_discord_id_name'
+NEW_UNIQUE_LIST_NAME = 'uq_task_lists_user_discord_id_new_name'
+SYNC_FUNCTION = 'task_lists_sync_user_discord_id'
+NOT_NULL_CHECK = 'ck_task_lists_user_discord_id_new_not_null'
+
+SENTINEL_LIST = "name = '__test__' AND user_discord_id = '__test__'"
+
+# Lignes recopiées par transaction lors du remplissage de la nouvelle colonne
+BATCH_SIZE = 5000
+
+
+def upgrade() -> None:
+    """
+    Conversion en ligne : ALTER COLUMN ... TYPE réécrirait la table sous verrou
+    exclusif. Une colonne BIGINT est ajoutée, tenue à jour par un trigger,
+    remplie par lots puis indexée CONCURRENTLY ; seul l'échange final des
+    colonnes prend un verrou, le temps de quelques opérations sur le catalogue.
+    """
+    # Liste laissée par l'ancienne vérification de la base (TaskService), seul ID non numérique connu
+    op.execute(f"DELETE FROM tasks WHERE task_list_id IN (SELECT id FROM task_lists WHERE {SENTINEL_LIST})")
+    op.execute(f"DELETE FROM task_lists WHERE {SENTINEL_LIST}")
+
+    # Tout autre ID non numérique est une donnée utilisateur : la migration s'arrête
+    # plutôt que de la supprimer (le script --sql échouera au remplissage)
+    if not op.get_context().as_sql:
+        invalid = op.get_bind().execute(sa.text(
+            "SELECT id, user_discord_id FROM task_lists WHERE user_discord_id !~ '^[0-9]+$' ORDER BY id LIMIT 10"
+        )).all()
+        if invalid:
+            listed = ", ".join(f"liste {row.id} ({row.user_discord_id!r})" for row in invalid)
+            raise RuntimeError(
+                f"Identifiants Discord non numériques dans task_lists : {listed}. "
+                "Corrigez ou déplacez ces lignes avant de relancer la migration."
+            )
+
+    op.add_column('task_lists', sa.Column('user_discord_id_new', sa.BigInteger(), nullable=True))
+    op.execute(f"""
+        CREATE OR REPLACE FUNCTION {SYNC_FUNCTION}() RETURNS trigger AS $$
+        BEGIN
+            NEW.user_discord_id_new := NEW.user_discord_id::bigint;
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute(
+        f"CREATE TRIGGER {SYNC_FUNCTION} BEFORE INSERT OR UPDATE OF user_discord_id ON task_lists "
+        f"FOR EACH ROW EXECUTE FUNCTION {SYNC_FUNCTION}()"
+    )
+
+    with op.get_context().autocommit_block():
+        # Remplissage par lots, chacun dans sa propre transaction
+        backfill = (
+            "UPDATE task_lists SET user_discord_id_new = user_discord_id::bigint "
+            "WHERE id IN (SELECT id FROM task_lists WHERE user_discord_id_new IS NULL LIMIT {batch})"
+        )
+        if op.get_context().as_sql:
+            # Script SQL (--sql) : un seul lot, le nombre de lignes n'est pas connu
+            op.execute(backfill.format(batch="ALL"))
+        else:
+            while op.get_bind().execute(sa.text(backfill.format(batch=BATCH_SIZE))).rowcount:
+                pass
+        op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {NEW_UNIQUE_LIST_NAME}")
+        op.create_index(
+            NEW_UNIQUE_LIST_NAME, 'task_lists', ['user_discord_id_new', 'name'],
+            unique=True, postgresql_concurrently=True
+        )
+        # NOT NULL sans parcours de la table sous verrou exclusif : la contrainte
+        # est validée dans sa propre transaction (verrou compatible avec les écritures)
+        op.execute(
+            f"ALTER TABLE task_lists ADD CONSTRAINT {NOT_NULL_CHECK} "
+            f"CHECK (user_discord_id_new IS NOT NULL) NOT VALID"
+        )
+        op.execute(f"ALTER TABLE task_lists VALIDATE CONSTRAINT {NOT_NULL_CHECK}")
+
+    # Échange des colonnes (catalogue uniquement ; SET NOT NULL s'appuie sur la contrainte validée)
+    op.execute(f"DROP TRIGGER {SYNC_FUNCTION} ON task_lists")
+    op.execute(f"DROP FUNCTION {SYNC_FUNCTION}()")
+    op.alter_column('task_lists', 'user_discord_id_new', nullable=False)
+    op.drop_constraint(NOT_NULL_CHECK, 'task_lists', type_='check')
+    op.drop_constraint(UNIQUE_LIST_NAME, 'task_lists', type_='unique')
+    op.drop_column('task_lists', 'user_discord_id')
+    op.alter_column('task_lists', 'user_discord_id_new', new_column_name='user_discord_id')
+    op.execute(f"ALTER INDEX {NEW_UNIQUE_LIST_NAME} RENAME TO {UNIQUE_LIST_NAME}")
+    op.execute(
+        f"ALTER TABLE task_lists ADD CONSTRAINT {UNIQUE_LIST_NAME} UNIQUE USING INDEX {UNIQUE_LIST_NAME}"
+    )
+
+
+def downgrade() -> None:
+    op.alter_column(
+        'task_lists', 'user_discord_id',
+        type_=sa.String(),
+        existing_type=sa.BigInteger(),
+        postgresql_using='user_discord_id::text'
+    )
@@ -0,0 +1,105 @@
+"""add task counters to task lists
+
+Revision ID: 008_add_task_list_counters
+Revises: 007_discord_ids_to_bigint
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '008_add_task_list_counters'
+down_revision = '007_discord_ids_to_bigint'
+branch_labels = None
+depends_on = None
+
+COUNT_FUNCTION = 'tasks_count_changes'
+COUNT_TRIGGERS = ('tasks_count_insert', 'tasks_count_delete', 'tasks_count_update')
+
+# Listes recalculées par transaction lors du remplissage des compteurs
+BATCH_SIZE = 5000
+
+
+def upgrade() -> None:
+    # Valeur par défaut constante : ajout sans réécriture de la table
+    op.add_column('task_lists', sa.Column('total_count', sa.Integer(), nullable=False, server_default='0'))
+    op.add_column('task_lists', sa.Column('completed_count', sa.Integer(), nullable=False, server_default='0'))
+
+    op.execute(f"""
+        CREATE OR REPLACE FUNCTION {COUNT_FUNCTION}() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                UPDATE task_lists l SET total_count = l.total_count + c.total, completed_count = l.completed_count + c.completed
+                FROM (SELECT task_list_id, count(*) AS total, count(*) FILTER (WHERE completed) AS completed
+                      FROM new_tasks GROUP BY task_list_id) c
+                WHERE l.id = c.task_list_id;
+            ELSIF TG_OP = 'DELETE' THEN
+                UPDATE task_lists l SET total_count = l.total_count - c.total, completed_count = l.completed_count - c.completed
+                FROM (SELECT task_list_id, count(*) AS total, count(*) FILTER (WHERE completed) AS completed
+                      FROM old_tasks GROUP BY task_list_id) c
+                WHERE l.id = c.task_list_id;
+            ELSE
+                -- Seules les tâches dont l'état ou la liste change comptent
+                WITH moved AS (
+                    SELECT o.task_list_id AS old_list, coalesce(o.completed, false)::int AS old_completed,
+                           n.task_list_id AS new_list, coalesce(n.completed, false)::int AS new_completed
+                    FROM old_tasks o JOIN new_tasks n ON n.id = o.id
+                    WHERE n.completed IS DISTINCT FROM o.completed OR n.task_list_id IS DISTINCT FROM o.task_list_id
+                )
+                UPDATE task_lists l SET total_count = l.total_count + c.total, completed_count = l.completed_count + c.completed
+                FROM (SELECT task_list_id, sum(total) AS total, sum(completed) AS completed FROM (
+                          SELECT new_list AS task_list_id, 1 AS total, new_completed AS completed FROM moved
+                          UNION ALL
+                          SELECT old_list, -1, -old_completed FROM moved
+                      ) changes GROUP BY task_list_id) c
+                WHERE l.id = c.task_list_id AND (c.total <> 0 OR c.completed <> 0);
+            END IF;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute(
+        f"CREATE TRIGGER tasks_count_insert AFTER INSERT ON tasks REFERENCING NEW TABLE AS new_tasks "
+        f"FOR EACH STATEMENT EXECUTE FUNCTION {COUNT_FUNCTION}()"
+    )
+    op.execute(
+        f"CREATE TRIGGER tasks_count_delete AFTER DELETE ON tasks REFERENCING OLD TABLE AS old_tasks "
+        f"FOR EACH STATEMENT EXECUTE FUNCTION {COUNT_FUNCTION}()"
+    )
+    op.execute(
+        # Pas de liste de colonnes (UPDATE OF ...) : incompatible avec les tables de transition
+        f"CREATE TRIGGER tasks_count_update AFTER UPDATE ON tasks "
+        f"REFERENCING OLD TABLE AS old_tasks NEW TABLE AS new_tasks "
+        f"FOR EACH STATEMENT EXECUTE FUNCTION {COUNT_FUNCTION}()"
+    )
+
+    # Les triggers sont actifs avant le remplissage : chaque lot verrouille ses listes
+    # (les triggers concurrents attendent) puis compte les tâches avec un nouvel
+    # instantané, qui inclut les écritures validées avant le verrou.
+    backfill = """
+        DO $$
+        BEGIN
+            PERFORM 1 FROM task_lists WHERE {bounds} FOR UPDATE;
+            UPDATE task_lists l SET
+                total_count = (SELECT count(*) FROM tasks t WHERE t.task_list_id = l.id),
+                completed_count = (SELECT count(*) FROM tasks t WHERE t.task_list_id = l.id AND t.completed)
+            WHERE {bounds};
+        END
+        $$
+    """
+    with op.get_context().autocommit_block():
+        if op.get_context().as_sql:
+            # Script SQL (--sql) : un seul lot, les IDs ne sont pas connus
+            op.execute(backfill.format(bounds="true"))
+        else:
+            max_id = op.get_bind().execute(sa.text("SELECT coalesce(max(id), 0) FROM task_lists")).scalar()
+            for start in range(0, max_id, BATCH_SIZE):
+                op.execute(backfill.format(bounds=f"id > {start} AND id <= {start + BATCH_SIZE}"))
+
+
+def downgrade() -> None:
+    for trigger in COUNT_TRIGGERS:
+        op.execute(f"DROP TRIGGER IF EXISTS {trigger} ON tasks")
+    op.execute(f"DROP FUNCTION IF EXISTS {COUNT_FUNCTION}()")
+    op.drop_column('task_lists', 'completed_count')
+    op.drop_column('task_lists', 'total_count')
@@ -0,0 +1,69 @@
+"""create tasks archive and track completion dates
+
+Revision ID: 009_create_tasks_archive
+Revises: 008_add_task_list_counters
+Create Date: 2026-10-19 16:00:00.000000
+
+Les tâches déjà complétées n'ont pas de date de complétion connue : completed_at
+est rempli avec la date de la migration (now()), et non leur date de création,
+pour que la rétention de l'archivage parte de la mise à jour au lieu d'archiver
+d'un coup toutes les anciennes tâches.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '009_create_tasks_archive'
+down_revision = '008_add_task_list_counters'
+branch_labels = None
+depends_on = None
+
+COMPLETED_AT_INDEX = 'ix_tasks_completed_at'
+
+# Tâches mises à jour par transaction lors du remplissage de completed_at
+BATCH_SIZE = 5000
+
+
+def upgrade() -> None:
+    op.add_column('tasks', sa.Column('completed_at', sa.DateTime(timezone=True), nullable=True))
+    op.create_table(
+        'tasks_archive',
+        sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('description', sa.String(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('completed_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('archived_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('task_list_id', sa.Integer(), nullable=False),
+        sa.Column('list_name', sa.String(), nullable=False),
+        sa.Column('user_discord_id', sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(
+        'ix_tasks_archive_user_discord_id_completed_at', 'tasks_archive', ['user_discord_id', 'completed_at']
+    )
+
+    with op.get_context().autocommit_block():
+        # Date de complétion inconnue des tâches déjà complétées : date de la migration
+        backfill = (
+            "UPDATE tasks SET completed_at = now() "
+            "WHERE id IN (SELECT id FROM tasks WHERE completed AND completed_at IS NULL LIMIT {batch})"
+        )
+        if op.get_context().as_sql:
+            # Script SQL (--sql) : un seul lot, le nombre de lignes n'est pas connu
+            op.execute(backfill.format(batch="ALL"))
+        else:
+            while op.get_bind().execute(sa.text(backfill.format(batch=BATCH_SIZE))).rowcount:
+                pass
+        # Index partiel des tâches archivables : seules les tâches complétées y figurent
+        op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {COMPLETED_AT_INDEX}")
+        op.create_index(
+            COMPLETED_AT_INDEX, 'tasks', ['completed_at'],
+            postgresql_where=sa.text('completed'), postgresql_concurrently=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(COMPLETED_AT_INDEX, table_name='tasks', postgresql_concurrently=True)
+    op.drop_index('ix_tasks_archive_user_discord_id_completed_at', table_name='tasks_archive')
+    op.drop_table('tasks_archive')
+    op.drop_column('tasks', 'completed_at')
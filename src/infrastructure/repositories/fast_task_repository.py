@@ -0,0 +1,220 @@
+"""
+Chemin rapide pour les opérations les plus fréquentes de l'interface des tâches.
+
+Basculer une tâche, ajouter une tâche et charger les listes d'un utilisateur
+(complètes ou en-têtes seuls) passent ici par des requêtes SQL construites une
+seule fois, sans session ORM : ni identity map, ni ``refresh()``, ni
+chargement de relations. Le pilote
+asyncpg exécute chaque requête comme une instruction préparée, mise en cache
+sur la connexion. Les résultats sont de simples objets à slots exposant les
+mêmes attributs que les entités ``Task`` et ``TaskList``.
+
+Le backend est choisi par déploiement avec TASK_REPOSITORY (orm ou fast).
+"""
+import logging
+import os
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from typing import AsyncGenerator, List, Optional
+
+from sqlalchemy import bindparam, case, insert, literal, null, select, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from src.domain.entities.task import Task, TaskList
+from src.infrastructure.config import database
+from src.infrastructure.config.read_routing import mark_primary_used, read_only, should_use_replica
+from src.infrastructure.config.retry import retry_idempotent, retry_safe
+from src.infrastructure.metrics.pool import checkout_timer
+
+logger = logging.getLogger(__name__)
+
+TASK_REPOSITORY_BACKENDS = ("orm", "fast")
+
+_tasks = Task.__table__
+_lists = TaskList.__table__
+_TASK_COLUMNS = (_tasks.c.id, _tasks.c.description, _tasks.c.completed, _tasks.c.created_at, _tasks.c.task_list_id)
+_LIST_COLUMNS = (
+    _lists.c.id, _lists.c.name, _lists.c.user_discord_id, _lists.c.created_at,
+    _lists.c.total_count, _lists.c.completed_count
+)
+
+# Une seule requête : les listes et leurs tâches, dans l'ordre de création
+_SELECT_USER_LISTS = (
+    select(
+        *_LIST_COLUMNS,
+        _tasks.c.id.label("task_id"), _tasks.c.description, _tasks.c.completed,
+        _tasks.c.created_at.label("task_created_at")
+    )
+    .select_from(_lists.outerjoin(_tasks, _tasks.c.task_list_id == _lists.c.id))
+    .where(_lists.c.user_discord_id == bindparam("user_discord_id"))
+    .order_by(_lists.c.id, _tasks.c.id)
+)
+
+# En-têtes seuls (compteurs compris) pour les menus et résumés
+_SELECT_USER_LIST_HEADERS = (
+    select(*_LIST_COLUMNS)
+    .where(_lists.c.user_discord_id == bindparam("user_discord_id"))
+    .order_by(_lists.c.id)
+)
+
+# L'insertion ne se fait que si la liste existe (aucune ligne renvoyée sinon)
+_INSERT_TASK = (
+    insert(_tasks)
+    .from_select(
+        ["description", "completed", "created_at", "task_list_id"],
+        select(
+            bindparam("description", type_=_tasks.c.description.type),
+            literal(False),
+            bindparam("created_at", type_=_tasks.c.created_at.type),
+            _lists.c.id
+        ).where(_lists.c.id == bindparam("task_list_id"))
+    )
+    .returning(*_TASK_COLUMNS)
+)
+
+_TOGGLE_TASK = (
+    update(_tasks)
+    .where(_tasks.c.id == bindparam("task_id"))
+    .values(
+        completed=~_tasks.c.completed,
+        # Expressions évaluées sur l'ancienne valeur de completed
+        completed_at=case((_tasks.c.completed, null()), else_=bindparam("completed_at", type_=_tasks.c.completed_at.type))
+    )
+    .returning(*_TASK_COLUMNS)
+)
+
+
+@dataclass(slots=True)
+class TaskRow:
+    """Tâche lue par le chemin rapide (mêmes attributs que Task)"""
+    id: int
+    description: str
+    completed: bool
+    created_at: Optional[datetime]
+    task_list_id: int
+
+
+@dataclass(slots=True)
+class TaskListRow:
+    """Liste de tâches lue par le chemin rapide (mêmes attributs que TaskList)"""
+    id: int
+    name: str
+    user_discord_id: int
+    created_at: Optional[datetime]
+    total_count: int = 0
+    completed_count: int = 0
+    tasks: List[TaskRow] = field(default_factory=list)
+
+
+def task_repository_backend() -> str:
+    """Backend des opérations fréquentes sur les tâches, lu dans TASK_REPOSITORY"""
+    backend = os.getenv("TASK_REPOSITORY", "orm").strip().lower()
+    if backend not in TASK_REPOSITORY_BACKENDS:
+        logger.warning(f"TASK_REPOSITORY inconnu ({backend}), utilisation de l'ORM")
+        return "orm"
+    return backend
+
+
+class FastTaskRepository:
+    """
+    Accès direct aux tâches pour les chemins critiques de l'interface.
+
+    Au sein d'une UnitOfWork, les requêtes utilisent la connexion et la
+    transaction de l'unité ; sinon, chaque opération emprunte une connexion
+    et valide sa propre transaction. Les lectures peuvent être servies par le
+    réplica (voir read_routing). Les erreurs transitoires sont rejouées hors
+    UnitOfWork (voir retry) ; les écritures, non idempotentes, seulement si
+    rien n'a pu être validé.
+    """
+
+    @asynccontextmanager
+    async def _connection(self, writes: bool = False) -> AsyncGenerator[AsyncConnection, None]:
+        from src.infrastructure.config.unit_of_work import current_unit_of_work
+
+        if not writes and await should_use_replica():
+            with checkout_timer(database.read_engine):
+                connection = await database.read_engine.connect()
+            try:
+                yield connection
+            finally:
+                await connection.close()
+            return
+
+        mark_primary_used()
+        unit = current_unit_of_work()
+        if unit is not None:
+            yield await unit.get_connection()
+            if writes and unit.session is not None:
+                # Les entités déjà chargées par l'ORM dans l'unité sont périmées
+                unit.session.expire_all()
+            return
+
+        if database.engine is None:
+            raise RuntimeError("La base de données n'a pas été initialisée")
+        with checkout_timer(database.engine):
+            connection = await database.engine.connect()
+        try:
+            async with connection.begin():
+                yield connection
+        finally:
+            await connection.close()
+
+    @read_only
+    @retry_idempotent
+    async def get_user_lists(self, user_discord_id: int) -> List[TaskListRow]:
+        """Récupère les listes d'un utilisateur avec leurs tâches"""
+        try:
+            async with self._connection() as connection:
+                result = await connection.execute(_SELECT_USER_LISTS, {"user_discord_id": user_discord_id})
+                rows = result.all()
+        except SQLAlchemyError as e:
+            logger.error(f"Erreur lors de la récupération des listes pour l'utilisateur {user_discord_id}: {str(e)}")
+            raise
+
+        lists: List[TaskListRow] = []
+        for row in rows:
+            if not lists or lists[-1].id != row.id:
+                lists.append(TaskListRow(*row[:len(_LIST_COLUMNS)]))
+            if row.task_id is not None:
+                lists[-1].tasks.append(
+                    TaskRow(row.task_id, row.description, row.completed, row.task_created_at, row.id)
+                )
+        return lists
+
+    @read_only
+    @retry_idempotent
+    async def get_user_list_headers(self, user_discord_id: int) -> List[TaskListRow]:
+        """Récupère les listes d'un utilisateur avec leurs compteurs, sans les tâches"""
+        try:
+            async with self._connection() as connection:
+                result = await connection.execute(_SELECT_USER_LIST_HEADERS, {"user_discord_id": user_discord_id})
+                return [TaskListRow(*row) for row in result]
+        except SQLAlchemyError as e:
+            logger.error(f"Erreur lors de la récupération des listes pour l'utilisateur {user_discord_id}: {str(e)}")
+            raise
+
+    @retry_safe
+    async def add_task(self, description: str, task_list_id: int) -> Optional[TaskRow]:
+        """Ajoute une tâche à une liste, None si la liste n'existe pas"""
+        params = {"description": description, "task_list_id": task_list_id, "created_at": datetime.now(UTC)}
+        try:
+            async with self._connection(writes=True) as connection:
+                row = (await connection.execute(_INSERT_TASK, params)).first()
+        except SQLAlchemyError as e:
+            logger.error(f"Erreur lors de l'ajout de la tâche à la liste {task_list_id}: {str(e)}")
+            raise
+        return TaskRow(*row) if row is not None else None
+
+    @retry_safe
+    async def toggle_task(self, task_id: int) -> Optional[TaskRow]:
+        """Inverse l'état d'une tâche en une requête, None si elle n'existe pas"""
+        try:
+            async with self._connection(writes=True) as connection:
+                params = {"task_id": task_id, "completed_at": datetime.now(UTC)}
+                row = (await connection.execute(_TOGGLE_TASK, params)).first()
+        except SQLAlchemyError as e:
+            logger.error(f"Erreur lors du basculement de la tâche {task_id}: {str(e)}")
+            raise
+        return TaskRow(*row) if row is not None else None
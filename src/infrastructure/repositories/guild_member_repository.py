@@ -10,7 +10,7 @@ class GuildMemberRepository(PostgresRepository[GuildMember]):
     def __init__(self):
         super().__init__(GuildMember)
     
-    async def get_by_discord_id(self, discord_id: str) -> Optional[GuildMember]:
+    async def get_by_discord_id(self, discord_id: int) -> Optional[GuildMember]:
         """Récupère un membre par son ID Discord"""
         query = select(GuildMember).filter_by(discord_id=discord_id)
         result = await self.db.execute(query)
@@ -18,11 +18,12 @@ class GuildMemberRepository(PostgresRepository[GuildMember]):
     
     async def get_all_with_twitch(self) -> List[GuildMember]:
         """Récupère tous les membres qui ont un compte Twitch associé"""
-        query = select(GuildMember).filter(GuildMember.twitch_username.isnot(None))
-        result = await self.db.execute(query)
-        return result.scalars().all()
+        async with self._get_session() as session:
+            query = select(GuildMember).filter(GuildMember.twitch_username.isnot(None))
+            result = await session.execute(query)
+            return list(result.scalars().all())
     
-    async def link_twitch_account(self, discord_id: str, twitch_username: str) -> GuildMember:
+    async def link_twitch_account(self, discord_id: int, twitch_username: str) -> GuildMember:
         """Associe un compte Twitch à un membre"""
         try:
             # Récupérer le membre
@@ -39,7 +40,7 @@ class GuildMemberRepository(PostgresRepository[GuildMember]):
             await self.db.rollback()
             raise
     
-    async def unlink_twitch_account(self, discord_id: str) -> GuildMember:
+    async def unlink_twitch_account(self, discord_id: int) -> GuildMember:
         """Dissocie le compte Twitch d'un membre"""
         try:
             # Récupérer le membre
@@ -3,7 +3,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from sqlalchemy.exc import SQLAlchemyError
 from src.domain.interfaces.repository import Repository
-from src.infrastructure.config.database import get_session, init_db, async_session
+from src.infrastructure.config import database
+from src.infrastructure.config.database import get_session, init_db
 from src.config.config import load_config
 import logging
 from contextlib import asynccontextmanager
@@ -33,7 +34,7 @@ class PostgresRepository(Repository[T]):
     async def _ensure_initialized(self):
         """S'assure que la base de données est initialisée"""
         if not self._initialized:
-            if not async_session:
+            if not database.async_session:
                 config = load_config()
                 await init_db(config.database)
             self._initialized = True
@@ -41,16 +42,12 @@ class PostgresRepository(Repository[T]):
     @asynccontextmanager
     async def _get_session(self):
         """Récupère une session de base de données dans un contexte"""
-        await self._ensure_initialized()
-        
         if self._db is not None:
             yield self._db
         else:
-            session = await get_session()
-            try:
+            await self._ensure_initialized()
+            async with get_session() as session:
                 yield session
-            finally:
-                await session.close()
 
     async def get(self, id: int) -> Optional[T]:
         async with self._get_session() as session:
@@ -0,0 +1,140 @@
+from datetime import timedelta
+from typing import List, Optional, Sequence
+from sqlalchemy import select, update, delete, func
+from src.infrastructure.repositories.postgres_repository import PostgresRepository
+from src.domain.entities.stream import StreamReplica, StreamAnnouncement, StreamGameFilter
+
+class StreamReplicaRepository(PostgresRepository[StreamReplica]):
+    """Repository du heartbeat des instances qui se partagent le suivi des streams"""
+
+    def __init__(self):
+        super().__init__(StreamReplica)
+
+    async def heartbeat(self, replica_id: str) -> None:
+        """
+        Signale que l'instance est vivante.
+
+        L'horodatage est celui du serveur de base de données, afin que le
+        décalage d'horloge entre instances n'influe pas sur leur expiration.
+        """
+        async with self._get_session() as session:
+            result = await session.execute(
+                update(StreamReplica)
+                .where(StreamReplica.replica_id == replica_id)
+                .values(last_seen=func.now())
+            )
+            if result.rowcount == 0:
+                session.add(StreamReplica(replica_id=replica_id, started_at=func.now(), last_seen=func.now()))
+            await session.commit()
+
+    async def get_live_replicas(self, ttl_seconds: float) -> List[str]:
+        """Retourne les instances dont le dernier heartbeat date de moins de ttl_seconds"""
+        async with self._get_session() as session:
+            query = (
+                select(StreamReplica.replica_id)
+                .where(StreamReplica.last_seen >= func.now() - timedelta(seconds=ttl_seconds))
+                .order_by(StreamReplica.replica_id)
+            )
+            result = await session.execute(query)
+            return list(result.scalars().all())
+
+    async def remove(self, replica_id: str) -> None:
+        """Retire une instance, pour que ses streamers soient réattribués sans attendre l'expiration"""
+        async with self._get_session() as session:
+            await session.execute(delete(StreamReplica).where(StreamReplica.replica_id == replica_id))
+            await session.commit()
+
+class StreamAnnouncementRepository(PostgresRepository[StreamAnnouncement]):
+    """Repository des annonces de streams partagées entre les instances"""
+
+    def __init__(self):
+        super().__init__(StreamAnnouncement)
+
+    async def get_by_logins(self, logins: Sequence[str], platform: str = "twitch") -> List[StreamAnnouncement]:
+        """Récupère les annonces actives des chaînes données"""
+        if not logins:
+            return []
+        async with self._get_session() as session:
+            query = select(StreamAnnouncement).where(
+                StreamAnnouncement.platform == platform,
+                StreamAnnouncement.login.in_(list(logins))
+            )
+            result = await session.execute(query)
+            return list(result.scalars().all())
+
+    async def upsert(
+        self,
+        login: str,
+        stream_id: str,
+        channel_id: int,
+        message_id: int,
+        stream: dict,
+        platform: str = "twitch"
+    ) -> None:
+        """Enregistre ou met à jour l'annonce d'une chaîne"""
+        async with self._get_session() as session:
+            announcement = await session.get(StreamAnnouncement, (platform, login))
+            if announcement is None:
+                session.add(StreamAnnouncement(
+                    platform=platform,
+                    login=login,
+                    stream_id=stream_id,
+                    channel_id=channel_id,
+                    message_id=message_id,
+                    stream=stream
+                ))
+            else:
+                announcement.stream_id = stream_id
+                announcement.channel_id = channel_id
+                announcement.message_id = message_id
+                announcement.stream = stream
+                announcement.updated_at = func.now()
+            await session.commit()
+
+    async def remove(self, login: str, platform: str = "twitch") -> Optional[StreamAnnouncement]:
+        """Supprime l'annonce d'une chaîne dont le stream est terminé"""
+        async with self._get_session() as session:
+            announcement = await session.get(StreamAnnouncement, (platform, login))
+            if announcement is not None:
+                await session.delete(announcement)
+                await session.commit()
+            return announcement
+
+class StreamGameFilterRepository(PostgresRepository[StreamGameFilter]):
+    """Repository des filtres de jeux des annonces de streams"""
+
+    def __init__(self):
+        super().__init__(StreamGameFilter)
+
+    async def get_for_guild(self, guild_id: int) -> List[StreamGameFilter]:
+        """Récupère les filtres de jeux d'un serveur"""
+        async with self._get_session() as session:
+            query = (
+                select(StreamGameFilter)
+                .where(StreamGameFilter.guild_id == guild_id)
+                .order_by(StreamGameFilter.game_name)
+            )
+            result = await session.execute(query)
+            return list(result.scalars().all())
+
+    async def add(self, guild_id: int, game_name: str, game_id: Optional[str] = None) -> None:
+        """Ajoute un jeu aux filtres d'un serveur, ou met à jour son identifiant"""
+        async with self._get_session() as session:
+            game_filter = await session.get(StreamGameFilter, (guild_id, game_name))
+            if game_filter is None:
+                session.add(StreamGameFilter(guild_id=guild_id, game_name=game_name, game_id=game_id))
+            else:
+                game_filter.game_id = game_id
+            await session.commit()
+
+    async def remove(self, guild_id: int, game_name: str) -> bool:
+        """Retire un jeu des filtres d'un serveur (nom insensible à la casse)"""
+        async with self._get_session() as session:
+            result = await session.execute(
+                delete(StreamGameFilter).where(
+                    StreamGameFilter.guild_id == guild_id,
+                    func.lower(StreamGameFilter.game_name) == game_name.strip().lower()
+                )
+            )
+            await session.commit()
+            return result.rowcount > 0
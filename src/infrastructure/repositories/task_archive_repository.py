@@ -0,0 +1,83 @@
+from datetime import UTC, datetime
+from typing import List
+import logging
+from sqlalchemy import bindparam, delete, insert, select
+from sqlalchemy.exc import SQLAlchemyError
+from src.domain.entities.task import Task, TaskArchive, TaskList
+from src.infrastructure.repositories.postgres_repository import PostgresRepository
+from src.infrastructure.config.read_routing import read_only
+from src.infrastructure.config.invalidation import TASK_LISTS, publish
+from src.infrastructure.config.retry import retry_safe
+
+logger = logging.getLogger(__name__)
+
+_tasks = Task.__table__
+_lists = TaskList.__table__
+
+# Tâches complétées avant la date limite, les plus anciennes d'abord. SKIP LOCKED :
+# les tâches qu'un utilisateur est en train de modifier seront archivées au passage suivant.
+_ARCHIVABLE = (
+    select(_tasks.c.id)
+    .where(_tasks.c.completed, _tasks.c.completed_at < bindparam("cutoff"))
+    .order_by(_tasks.c.completed_at)
+    .limit(bindparam("batch_size"))
+    .with_for_update(skip_locked=True)
+)
+
+# Suppression d'un lot ; les lignes supprimées, complétées du nom et du
+# propriétaire de leur liste, alimentent l'INSERT dans tasks_archive
+_DELETE_ARCHIVABLE = (
+    delete(_tasks)
+    .where(_tasks.c.id.in_(_ARCHIVABLE))
+    .returning(
+        _tasks.c.id, _tasks.c.description, _tasks.c.created_at, _tasks.c.completed_at, _tasks.c.task_list_id,
+        select(_lists.c.name).where(_lists.c.id == _tasks.c.task_list_id).correlate(_tasks)
+        .scalar_subquery().label("list_name"),
+        select(_lists.c.user_discord_id).where(_lists.c.id == _tasks.c.task_list_id).correlate(_tasks)
+        .scalar_subquery().label("user_discord_id")
+    )
+)
+
+class TaskArchiveRepository(PostgresRepository[TaskArchive]):
+    """Repository des tâches archivées (table tasks_archive)"""
+
+    def __init__(self):
+        super().__init__(TaskArchive)
+
+    @retry_safe
+    async def archive_batch(self, cutoff: datetime, batch_size: int) -> int:
+        """
+        Déplace un lot de tâches complétées avant ``cutoff`` vers tasks_archive.
+
+        La suppression et l'insertion partagent une transaction : une tâche
+        n'est jamais perdue ni présente dans les deux tables.
+
+        Returns:
+            int: Nombre de tâches archivées
+        """
+        try:
+            async with self._get_session() as session:
+                result = await session.execute(_DELETE_ARCHIVABLE, {"cutoff": cutoff, "batch_size": batch_size})
+                archived_at = datetime.now(UTC)
+                rows = [dict(row._mapping, archived_at=archived_at) for row in result]
+                if rows:
+                    await session.execute(insert(TaskArchive.__table__), rows)
+                    await publish(TASK_LISTS, [row["task_list_id"] for row in rows], session)
+                await session.commit()
+                return len(rows)
+        except SQLAlchemyError as e:
+            logger.error(f"Erreur lors de l'archivage des tâches complétées avant {cutoff}: {str(e)}")
+            raise
+
+    @read_only
+    async def get_user_archive(self, user_discord_id: int, limit: int = 25) -> List[TaskArchive]:
+        """Tâches archivées d'un utilisateur, les plus récemment complétées d'abord"""
+        async with self._get_session() as session:
+            query = (
+                select(TaskArchive)
+                .where(TaskArchive.user_discord_id == user_discord_id)
+                .order_by(TaskArchive.completed_at.desc(), TaskArchive.id.desc())
+                .limit(limit)
+            )
+            result = await session.execute(query)
+            return list(result.scalars().all())
@@ -1,18 +1,44 @@
 from typing import List, Optional
 import logging
 from datetime import datetime, UTC
-from sqlalchemy import select, and_
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Insert
 from sqlalchemy.orm import joinedload
+from sqlalchemy.orm.attributes import set_committed_value
 from src.domain.entities.task import Task, TaskList
 from src.infrastructure.repositories.postgres_repository import PostgresRepository
 from src.infrastructure.config.database import get_session
+from src.infrastructure.config.read_routing import read_only
 from src.domain.exceptions import TaskNotFoundError, DatabaseConnectionError, InvalidTaskStateError
 from sqlalchemy.exc import SQLAlchemyError
 
 # Configuration du logging
 logger = logging.getLogger(__name__)
 
+def insert_list_statement(session: AsyncSession, name: str, user_discord_id: int) -> Insert:
+    """
+    INSERT d'une liste ignoré si l'utilisateur a déjà une liste de ce nom.
+
+    Repose sur la contrainte unique (user_discord_id, name) : la requête
+    renvoie la liste créée, ou aucune ligne en cas de doublon.
+    """
+    dialect = sqlite if session.get_bind().dialect.name == "sqlite" else postgresql
+    return (
+        dialect.insert(TaskList)
+        .values(name=name, user_discord_id=user_discord_id, created_at=datetime.now(UTC))
+        .on_conflict_do_nothing(index_elements=["user_discord_id", "name"])
+        .returning(TaskList)
+    )
+
+
+def created_list(task_list: Optional[TaskList]) -> Optional[TaskList]:
+    """Une liste tout juste insérée n'a pas de tâches : la relation est marquée chargée, sans requête"""
+    if task_list is not None:
+        set_committed_value(task_list, "tasks", [])
+    return task_list
+
 class TaskRepository(PostgresRepository[Task]):
     """
     Repository pour la gestion des tâches en base de données.
@@ -27,7 +53,8 @@ class TaskRepository(PostgresRepository[Task]):
         super().__init__(Task)
         self._db = db
     
-    async def get_user_lists(self, user_discord_id: str) -> List[TaskList]:
+    @read_only
+    async def get_user_lists(self, user_discord_id: int) -> List[TaskList]:
         session = self._db if self._db is not None else await get_session()
         try:
             query = select(TaskList).options(
@@ -43,34 +70,17 @@ class TaskRepository(PostgresRepository[Task]):
             if self._db is None and session is not None:
                 await session.close()
     
-    async def create_list(self, name: str, user_discord_id: str) -> TaskList:
+    async def create_list(self, name: str, user_discord_id: int) -> TaskList:
         session = self._db if self._db is not None else await get_session()
         try:
-            # Vérifier si une liste avec le même nom existe déjà
-            query = select(TaskList).where(
-                and_(
-                    TaskList.name == name,
-                    TaskList.user_discord_id == user_discord_id
-                )
-            )
-            result = await session.execute(query)
-            existing_list = result.scalar_one_or_none()
-            
-            if existing_list is not None:
+            # Une seule requête : la contrainte unique détecte un nom déjà utilisé
+            result = await session.execute(insert_list_statement(session, name, user_discord_id))
+            task_list = created_list(result.scalar_one_or_none())
+
+            if task_list is None:
                 raise ValueError(f"Une liste avec le nom '{name}' existe déjà")
 
-            task_list = TaskList(name=name, user_discord_id=user_discord_id)
-            session.add(task_list)
             await session.commit()
-            await session.refresh(task_list)
-            
-            # Recharger la liste avec ses relations
-            query = select(TaskList).options(
-                joinedload(TaskList.tasks)
-            ).where(TaskList.id == task_list.id)
-            result = await session.execute(query)
-            task_list = result.unique().scalar_one()
-            
             return task_list
         except SQLAlchemyError as e:
             await session.rollback()
@@ -115,6 +125,7 @@ class TaskRepository(PostgresRepository[Task]):
                 raise ValueError(f"La tâche avec l'ID {task_id} n'existe pas")
 
             task.completed = not task.completed
+            task.completed_at = datetime.now(UTC) if task.completed else None
             await session.commit()
             await session.refresh(task)
             return task
@@ -198,6 +209,7 @@ class TaskRepository(PostgresRepository[Task]):
             if self._db is None and session is not None:
                 await session.close()
 
+    @read_only
     async def get_list(self, list_id: int) -> Optional[TaskList]:
         session = self._db if self._db is not None else await get_session()
         try:
@@ -213,6 +225,7 @@ class TaskRepository(PostgresRepository[Task]):
             if self._db is None and session is not None:
                 await session.close()
 
+    @read_only
     async def get_task_by_id(self, task_id: str) -> Task:
         session = self._db if self._db is not None else await get_session()
         try:
@@ -261,6 +274,7 @@ class TaskRepository(PostgresRepository[Task]):
             if self._db is None and session is not None:
                 await session.close()
 
+    @read_only
     async def get_list_by_id(self, list_id: int) -> Optional[TaskList]:
         session = self._db if self._db is not None else await get_session()
         try:
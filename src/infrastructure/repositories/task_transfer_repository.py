@@ -0,0 +1,344 @@
+"""
+Export et import en flux des listes et des tâches.
+
+Le format d'échange porte les deux tables dans un seul fichier, un
+enregistrement par ligne, avec une colonne ``table`` :
+
+- ``ndjson`` : un objet JSON par ligne, limité aux colonnes de sa table ;
+- ``csv`` : en-tête puis l'union des colonnes (CSV_COLUMNS), vides si absentes.
+
+Sur PostgreSQL, l'export est produit par le serveur (``COPY ... TO STDOUT``)
+et transmis par morceaux au fichier de sortie ; l'import charge des tables
+temporaires par ``COPY FROM`` (binaire), lot par lot. Sur SQLite, les mêmes
+étapes passent par des lectures en flux et des insertions par lots. La
+mémoire utilisée ne dépend que de la taille des lots, jamais du volume.
+
+Les identifiants ne sont pas conservés : les listes reçoivent de nouveaux ID
+et leurs tâches y sont rattachées. Une liste portant déjà le même nom chez le
+même utilisateur est ignorée avec ses tâches : importer deux fois le même
+fichier ne duplique rien. Les compteurs des listes sont recalculés par les
+triggers de la table tasks.
+"""
+import asyncio
+import csv
+import io
+import json
+import logging
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from typing import Any, AsyncIterable, BinaryIO, Dict, Iterable, Iterator, List, Optional, Sequence, TextIO
+
+from sqlalchemy import (
+    BigInteger, Boolean, Column, DateTime, Integer, MetaData, String, Table, and_, distinct, exists, func, insert,
+    not_, select, text, true, update
+)
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from src.domain.entities.task import Task, TaskList
+from src.infrastructure.config import database
+from src.infrastructure.config.invalidation import USER_TASK_LISTS, publish
+
+logger = logging.getLogger(__name__)
+
+FORMATS = ("ndjson", "csv")
+
+# Lignes lues ou chargées par lot : borne la mémoire de l'export et de l'import
+CHUNK_SIZE = 5000
+
+# Colonnes échangées par table ; les compteurs des listes ne sont pas exportés
+COLUMNS: Dict[str, Sequence[str]] = {
+    "task_lists": ("id", "name", "user_discord_id", "created_at"),
+    "tasks": ("id", "task_list_id", "description", "completed", "created_at", "completed_at"),
+}
+CSV_COLUMNS = (
+    "table", "id", "task_list_id", "user_discord_id", "name", "description", "completed", "created_at", "completed_at"
+)
+
+_tasks = Task.__table__
+_lists = TaskList.__table__
+
+# Tables de transit, propres à la transaction d'import
+_staging = MetaData()
+_STAGING = {
+    "task_lists": Table(
+        "transfer_task_lists", _staging,
+        Column("id", Integer),
+        Column("name", String),
+        Column("user_discord_id", BigInteger),
+        Column("created_at", DateTime(timezone=True)),
+        Column("imported", Boolean),
+        prefixes=["TEMPORARY"]
+    ),
+    "tasks": Table(
+        "transfer_tasks", _staging,
+        Column("id", Integer),
+        Column("task_list_id", Integer),
+        Column("description", String),
+        Column("completed", Boolean),
+        Column("created_at", DateTime(timezone=True)),
+        Column("completed_at", DateTime(timezone=True)),
+        prefixes=["TEMPORARY"]
+    ),
+}
+
+_TEXT_COLUMNS = {"name", "description"}
+_INT_COLUMNS = {"id", "task_list_id", "user_discord_id"}
+
+# Filtre des propriétaires ($1 : tableau d'ID Discord, NULL pour tous)
+_OWNER_FILTER = "($1::bigint[] IS NULL OR user_discord_id = ANY($1::bigint[]))"
+_PG_SOURCES = {
+    "task_lists": f"FROM task_lists WHERE {_OWNER_FILTER} ORDER BY id",
+    "tasks": f"FROM tasks WHERE task_list_id IN (SELECT id FROM task_lists WHERE {_OWNER_FILTER}) ORDER BY id",
+}
+
+
+@dataclass
+class ImportResult:
+    """Bilan d'un import"""
+    lists_imported: int = 0
+    lists_skipped: int = 0
+    tasks_imported: int = 0
+
+
+def _pg_export_query(table: str, fmt: str) -> str:
+    """Requête COPY d'une table : JSON construit par le serveur, ou colonnes CSV"""
+    columns = COLUMNS[table]
+    if fmt == "ndjson":
+        fields = ", ".join(f"'{column}', {column}" for column in columns)
+        projection = f"json_build_object('table', '{table}', {fields})::text"
+    else:
+        # Colonnes nommées : l'en-tête écrit par COPY reprend ces noms
+        values = (
+            f"'{table}'" if column == "table" else column if column in columns else "NULL"
+            for column in CSV_COLUMNS
+        )
+        projection = ", ".join(f'{value} AS "{column}"' for value, column in zip(values, CSV_COLUMNS))
+    return f"SELECT {projection} {_PG_SOURCES[table]}"
+
+
+def _encode(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def _csv_value(value: Any) -> Any:
+    """Valeur CSV au format de COPY : vide pour NULL, t/f pour les booléens"""
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    return _encode(value)
+
+
+def _encode_rows(table: str, rows: Iterable, fmt: str) -> bytes:
+    """Sérialise des lignes lues en Python (SQLite), au même format que COPY"""
+    columns = COLUMNS[table]
+    if fmt == "ndjson":
+        lines = (json.dumps({"table": table, **{c: _encode(v) for c, v in zip(columns, row)}}) for row in rows)
+        return "".join(f"{line}\n" for line in lines).encode("utf-8")
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    for row in rows:
+        values = dict(zip(columns, row), table=table)
+        writer.writerow(_csv_value(values.get(column)) for column in CSV_COLUMNS)
+    return buffer.getvalue().encode("utf-8")
+
+
+def read_records(source: TextIO, fmt: str) -> Iterator[Dict[str, Any]]:
+    """Enregistrements d'un fichier d'échange, lus au fil de l'eau"""
+    if fmt not in FORMATS:
+        raise ValueError(f"Format inconnu : {fmt} (attendu : {', '.join(FORMATS)})")
+    if fmt == "csv":
+        yield from csv.DictReader(source)
+        return
+    for line in source:
+        if line.strip():
+            yield json.loads(line)
+
+
+def _convert(column: str, value: Any) -> Any:
+    """Valeur typée pour la table de transit (CSV : tout est texte, vide = NULL hors colonnes texte)"""
+    if column in _TEXT_COLUMNS:
+        return value
+    if value is None or value == "":
+        return None
+    if column in _INT_COLUMNS:
+        return int(value)
+    if column == "completed":
+        return value if isinstance(value, bool) else value.lower() in ("t", "true", "1")
+    moment = datetime.fromisoformat(value)
+    return moment if moment.tzinfo is not None else moment.replace(tzinfo=UTC)
+
+
+def _staging_row(table: str, record: Dict[str, Any], now: datetime) -> tuple:
+    row = {column: _convert(column, record.get(column)) for column in COLUMNS[table]}
+    row["created_at"] = row["created_at"] or now
+    if table == "tasks":
+        row["completed"] = bool(row["completed"])
+    return tuple(row[column] for column in COLUMNS[table])
+
+
+class TaskTransferRepository:
+    """
+    Export et import en flux des tables task_lists et tasks.
+
+    Args:
+        engine (Optional[AsyncEngine]): Base visée, celle de l'application par défaut
+    """
+
+    def __init__(self, engine: Optional[AsyncEngine] = None):
+        self._engine = engine
+
+    @property
+    def engine(self) -> AsyncEngine:
+        engine = self._engine or database.engine
+        if engine is None:
+            raise RuntimeError("La base de données n'a pas été initialisée")
+        return engine
+
+    async def export(self, output: BinaryIO, fmt: str = "ndjson", user_ids: Optional[List[int]] = None) -> Dict[str, int]:
+        """
+        Écrit les listes puis les tâches dans ``output``, depuis un même instantané de la base.
+
+        Args:
+            output (BinaryIO): Fichier binaire de sortie (éventuellement compressé)
+            fmt (str): ndjson ou csv
+            user_ids (Optional[List[int]]): Propriétaires exportés, tous par défaut
+
+        Returns:
+            Dict[str, int]: Lignes exportées par table
+        """
+        if fmt not in FORMATS:
+            raise ValueError(f"Format inconnu : {fmt} (attendu : {', '.join(FORMATS)})")
+        async with self.engine.connect() as conn:
+            if conn.dialect.name == "postgresql":
+                conn = await conn.execution_options(isolation_level="REPEATABLE READ")
+                async with conn.begin():
+                    return await self._copy_out(conn, output, fmt, user_ids)
+            async with conn.begin():
+                return await self._stream_out(conn, output, fmt, user_ids)
+
+    async def _copy_out(self, conn: AsyncConnection, output: BinaryIO, fmt: str, user_ids) -> Dict[str, int]:
+        # Dates en UTC, au format ISO, quel que soit le réglage du serveur
+        await conn.execute(text("SET LOCAL TimeZone = 'UTC'"))
+        raw = (await conn.get_raw_connection()).driver_connection
+        counts = {}
+        for index, table in enumerate(COLUMNS):
+            if fmt == "ndjson":
+                # Une ligne JSON par enregistrement : ni guillemets ni délimiteur CSV possibles
+                options = {"format": "csv", "quote": "\x01", "delimiter": "\x02"}
+            else:
+                options = {"format": "csv", "header": index == 0}
+            status = await raw.copy_from_query(_pg_export_query(table, fmt), user_ids, output=output, **options)
+            counts[table] = int(status.split()[-1])
+        return counts
+
+    async def _stream_out(self, conn: AsyncConnection, output: BinaryIO, fmt: str, user_ids) -> Dict[str, int]:
+        owned = _lists.c.user_discord_id.in_(user_ids) if user_ids is not None else true()
+        queries = {
+            "task_lists": select(*(_lists.c[c] for c in COLUMNS["task_lists"])).where(owned).order_by(_lists.c.id),
+            "tasks": select(*(_tasks.c[c] for c in COLUMNS["tasks"]))
+                .where(_tasks.c.task_list_id.in_(select(_lists.c.id).where(owned)))
+                .order_by(_tasks.c.id),
+        }
+        if fmt == "csv":
+            await asyncio.to_thread(output.write, (",".join(CSV_COLUMNS) + "\n").encode("utf-8"))
+        counts = {}
+        for table, query in queries.items():
+            counts[table] = 0
+            result = await conn.stream(query.execution_options(yield_per=CHUNK_SIZE))
+            async for rows in result.partitions():
+                await asyncio.to_thread(output.write, _encode_rows(table, rows, fmt))
+                counts[table] += len(rows)
+        return counts
+
+    async def import_records(
+        self,
+        chunks: AsyncIterable[List[Dict[str, Any]]],
+        user_ids: Optional[Iterable[int]] = None
+    ) -> ImportResult:
+        """
+        Importe des enregistrements, lot par lot, dans une seule transaction.
+
+        Args:
+            chunks (AsyncIterable[List[Dict[str, Any]]]): Lots d'enregistrements (voir read_records)
+            user_ids (Optional[Iterable[int]]): Propriétaires acceptés, tous par défaut
+
+        Returns:
+            ImportResult: Listes importées et ignorées, tâches importées
+        """
+        allowed = set(user_ids) if user_ids is not None else None
+        now = datetime.now(UTC)
+        async with self.engine.begin() as conn:
+            await conn.run_sync(lambda sync_conn: _staging.create_all(sync_conn, checkfirst=False))
+            async for chunk in chunks:
+                rows = {table: [] for table in COLUMNS}
+                for record in chunk:
+                    table = record.get("table")
+                    if table not in COLUMNS:
+                        raise ValueError(f"Enregistrement sans table connue : {record}")
+                    row = _staging_row(table, record, now)
+                    if table == "task_lists" and allowed is not None and row[2] not in allowed:
+                        continue
+                    rows[table].append(row)
+                for table, table_rows in rows.items():
+                    if table_rows:
+                        await self._load(conn, table, table_rows)
+            result = await self._merge(conn)
+            await conn.run_sync(lambda sync_conn: _staging.drop_all(sync_conn, checkfirst=False))
+        return result
+
+    async def _load(self, conn: AsyncConnection, table: str, rows: List[tuple]) -> None:
+        staging = _STAGING[table]
+        columns = list(COLUMNS[table])
+        if conn.dialect.name == "postgresql":
+            raw = (await conn.get_raw_connection()).driver_connection
+            await raw.copy_records_to_table(staging.name, records=rows, columns=columns)
+        else:
+            await conn.execute(insert(staging), [dict(zip(columns, row)) for row in rows])
+
+    async def _merge(self, conn: AsyncConnection) -> ImportResult:
+        """Insère les listes absentes puis leurs tâches depuis les tables de transit"""
+        staged_lists, staged_tasks = _STAGING["task_lists"], _STAGING["tasks"]
+        taken = exists().where(
+            _lists.c.user_discord_id == staged_lists.c.user_discord_id,
+            _lists.c.name == staged_lists.c.name
+        )
+        await conn.execute(update(staged_lists).values(imported=not_(taken)))
+
+        lists = await conn.execute(
+            insert(_lists).from_select(
+                ["name", "user_discord_id", "created_at"],
+                select(staged_lists.c.name, staged_lists.c.user_discord_id, staged_lists.c.created_at)
+                .where(staged_lists.c.imported)
+                .order_by(staged_lists.c.id)
+            )
+        )
+        tasks = await conn.execute(
+            insert(_tasks).from_select(
+                ["description", "completed", "created_at", "completed_at", "task_list_id"],
+                select(
+                    staged_tasks.c.description, staged_tasks.c.completed, staged_tasks.c.created_at,
+                    staged_tasks.c.completed_at, _lists.c.id
+                )
+                .select_from(
+                    staged_tasks
+                    .join(staged_lists, and_(staged_lists.c.id == staged_tasks.c.task_list_id, staged_lists.c.imported))
+                    .join(_lists, and_(
+                        _lists.c.user_discord_id == staged_lists.c.user_discord_id,
+                        _lists.c.name == staged_lists.c.name
+                    ))
+                )
+                .order_by(staged_tasks.c.id)
+            )
+        )
+        skipped = (await conn.execute(
+            select(func.count()).select_from(staged_lists).where(not_(staged_lists.c.imported))
+        )).scalar()
+        owners = (await conn.execute(
+            select(distinct(staged_lists.c.user_discord_id)).where(staged_lists.c.imported)
+        )).scalars().all()
+        await publish(USER_TASK_LISTS, owners, conn)
+        return ImportResult(lists_imported=lists.rowcount, lists_skipped=skipped, tasks_imported=tasks.rowcount)
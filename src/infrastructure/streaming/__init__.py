@@ -0,0 +1,8 @@
+"""
+Module de suivi des streams pour le bot Discord
+"""
+
+from .rate_limiter import HelixRateLimiter, RequestPriority
+from .helix_client import HelixClient
+
+__all__ = ['HelixRateLimiter', 'RequestPriority', 'HelixClient']
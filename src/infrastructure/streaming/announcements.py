@@ -0,0 +1,269 @@
+"""
+Suivi des annonces de stream et regroupement des éditions de messages.
+
+Chaque stream annoncé est associé au message Discord qui l'annonce. À chaque
+cycle de vérification, l'embed est mis à jour (viewers, titre, jeu) puis passe
+à l'état « terminé » lorsque le stream s'arrête. Les éditions sont regroupées
+par canal pour respecter le budget d'éditions de Discord.
+"""
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+import discord
+
+from src.infrastructure.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+EDITS_SENT = metrics.counter(
+    "stream_announcement_edits_total",
+    "Éditions de messages d'annonce envoyées à Discord"
+)
+EDITS_COALESCED = metrics.counter(
+    "stream_announcement_edits_coalesced_total",
+    "Éditions remplacées par une version plus récente avant envoi"
+)
+EDITS_PENDING = metrics.gauge(
+    "stream_announcement_edits_pending",
+    "Éditions en attente d'un créneau sur leur canal"
+)
+
+# Champs du payload Helix affichés dans l'embed
+DISPLAYED_FIELDS = ("title", "game_name", "viewer_count")
+
+# Préfixe des identifiants provisoires des streams détectés sans Helix
+PROVISIONAL_ID_PREFIX = "presence:"
+
+
+@dataclass
+class Announcement:
+    """
+    Annonce publiée pour un stream en cours.
+
+    Attributes:
+        login (str): Nom de connexion Twitch du streamer
+        stream_id (str): Identifiant Helix du stream
+        channel_id (int): Canal Discord de l'annonce
+        message_id (int): Message Discord de l'annonce
+        stream (Dict[str, Any]): Dernier payload Helix affiché
+        provisional (bool): Stream détecté par la présence Discord, sans identifiant Helix
+    """
+    login: str
+    stream_id: str
+    channel_id: int
+    message_id: int
+    stream: Dict[str, Any] = field(default_factory=dict)
+    provisional: bool = False
+
+    def has_changed(self, stream: Dict[str, Any]) -> bool:
+        """Indique si les champs affichés diffèrent du dernier payload"""
+        return any(self.stream.get(key) != stream.get(key) for key in DISPLAYED_FIELDS)
+
+
+def stream_url(stream: Dict[str, Any]) -> str:
+    """URL du stream : fournie par la plateforme, à défaut la chaîne Twitch"""
+    return stream.get('url') or f"https://twitch.tv/{stream['user_login']}"
+
+
+def build_live_embed(stream: Dict[str, Any], color: Optional[discord.Color] = None) -> discord.Embed:
+    """Construit l'embed d'un stream en cours"""
+    embed = discord.Embed(
+        title=f"🎮 {stream['user_name']} est en live !",
+        description=stream['title'],
+        url=stream_url(stream),
+        color=color or discord.Color.purple()
+    )
+
+    if stream.get('thumbnail_url'):
+        thumbnail_url = stream['thumbnail_url'].replace('{width}', '1280').replace('{height}', '720')
+        embed.set_image(url=thumbnail_url)
+
+    if stream.get('box_art_url'):
+        embed.set_thumbnail(url=stream['box_art_url'])
+
+    embed.add_field(name="Jeu", value=stream.get('game_name') or "Inconnu", inline=True)
+    if stream.get('viewer_count') is not None:
+        embed.add_field(name="Viewers", value=str(stream['viewer_count']), inline=True)
+    return embed
+
+
+def build_ended_embed(stream: Dict[str, Any]) -> discord.Embed:
+    """Construit l'embed d'un stream terminé"""
+    embed = discord.Embed(
+        title=f"⚫ {stream['user_name']} était en live",
+        description=stream.get('title', ''),
+        url=stream_url(stream),
+        color=discord.Color.dark_grey()
+    )
+    embed.add_field(name="Jeu", value=stream.get('game_name') or "Inconnu", inline=True)
+    embed.add_field(name="Statut", value="Stream terminé", inline=True)
+    return embed
+
+
+class AnnouncementTracker:
+    """
+    Associe chaque streamer suivi au message qui annonce son stream.
+
+    Attributes:
+        announcements (Dict[str, Announcement]): Annonces actives par login Twitch
+        presence_live (Set[str]): Logins en live d'après la présence Discord,
+            toutes guildes confondues (voir presence.detect_transition)
+    """
+    def __init__(self):
+        self.announcements: Dict[str, Announcement] = {}
+        self.presence_live: Set[str] = set()
+
+    def reconcile(
+        self,
+        streams: Iterable[Dict[str, Any]],
+        polled_logins: Optional[Iterable[str]] = None
+    ) -> Tuple[List[Dict[str, Any]], List[Tuple[Announcement, Dict[str, Any]]], List[Announcement]]:
+        """
+        Compare le résultat d'un sondage Helix aux annonces actives.
+
+        Args:
+            streams (Iterable[Dict[str, Any]]): Streams en cours renvoyés par Helix
+            polled_logins (Optional[Iterable[str]]): Logins couverts par le sondage ;
+                seules leurs annonces peuvent être déclarées terminées
+
+        Returns:
+            Tuple: (streams à annoncer, annonces à mettre à jour, annonces terminées)
+        """
+        live = {stream['user_login'].lower(): stream for stream in streams}
+        polled = {login.lower() for login in polled_logins} if polled_logins is not None else None
+
+        started: List[Dict[str, Any]] = []
+        updated: List[Tuple[Announcement, Dict[str, Any]]] = []
+        ended: List[Announcement] = []
+
+        for login, stream in live.items():
+            announcement = self.announcements.get(login)
+            if announcement is not None and announcement.provisional:
+                # Le stream annoncé via la présence reçoit son identifiant Helix
+                announcement.stream_id = stream['id']
+                announcement.provisional = False
+                updated.append((announcement, stream))
+            elif announcement is None or announcement.stream_id != stream['id']:
+                if announcement is not None:
+                    ended.append(self.announcements.pop(login))
+                started.append(stream)
+            elif announcement.has_changed(stream):
+                updated.append((announcement, stream))
+
+        for login in list(self.announcements):
+            if login in live or (polled is not None and login not in polled):
+                continue
+            ended.append(self.announcements.pop(login))
+
+        return started, updated, ended
+
+    def record(self, stream: Dict[str, Any], message: discord.Message) -> Announcement:
+        """Enregistre le message publié pour un nouveau stream"""
+        announcement = Announcement(
+            login=stream['user_login'].lower(),
+            stream_id=stream['id'],
+            channel_id=message.channel.id,
+            message_id=message.id,
+            stream=dict(stream),
+            provisional=str(stream['id']).startswith(PROVISIONAL_ID_PREFIX)
+        )
+        self.announcements[announcement.login] = announcement
+        return announcement
+
+    def adopt(self, announcement: Announcement) -> None:
+        """Reprend une annonce publiée par une autre instance"""
+        self.announcements[announcement.login] = announcement
+
+    def end(self, login: str) -> Optional[Announcement]:
+        """Retire l'annonce d'un streamer dont le stream s'est arrêté"""
+        return self.announcements.pop(login.lower(), None)
+
+
+class EditCoalescer:
+    """
+    File d'éditions de messages regroupées par canal.
+
+    Une nouvelle édition d'un message remplace celle qui n'a pas encore été
+    envoyée. Chaque canal dispose de son propre budget glissant d'éditions ;
+    les éditions hors budget restent en attente jusqu'au prochain flush.
+
+    Args:
+        edits_per_window (int): Nombre d'éditions autorisées par canal et par fenêtre
+        window (float): Durée de la fenêtre, en secondes
+    """
+    def __init__(
+        self,
+        edits_per_window: int = 4,
+        window: float = 5.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.edits_per_window = edits_per_window
+        self.window = window
+        self._clock = clock
+        self._pending: Dict[int, "OrderedDict[int, discord.Embed]"] = {}
+        self._sent: Dict[int, List[float]] = {}
+        self._lock = asyncio.Lock()
+
+    @property
+    def pending_count(self) -> int:
+        return sum(len(edits) for edits in self._pending.values())
+
+    def schedule(self, channel_id: int, message_id: int, embed: discord.Embed) -> None:
+        """Planifie l'édition d'un message, en remplaçant une édition en attente"""
+        edits = self._pending.setdefault(channel_id, OrderedDict())
+        if message_id in edits:
+            EDITS_COALESCED.inc()
+        edits[message_id] = embed
+        EDITS_PENDING.set(self.pending_count)
+
+    def _budget(self, channel_id: int) -> int:
+        now = self._clock()
+        sent = [t for t in self._sent.get(channel_id, []) if now - t < self.window]
+        self._sent[channel_id] = sent
+        return max(self.edits_per_window - len(sent), 0)
+
+    async def flush(self, edit: Callable[[int, int, discord.Embed], Awaitable[None]]) -> int:
+        """
+        Envoie les éditions en attente dans la limite du budget de chaque canal.
+
+        Les flushs concurrents (boucle périodique, sondage, présence) sont
+        sérialisés ; le budget est réservé avant chaque envoi. Une erreur
+        inattendue remet l'édition en attente, sauf si une plus récente l'a
+        remplacée entre-temps, puis est propagée.
+
+        Args:
+            edit: Coroutine (channel_id, message_id, embed) réalisant l'édition
+
+        Returns:
+            int: Nombre d'éditions envoyées
+        """
+        sent_count = 0
+        async with self._lock:
+            try:
+                for channel_id in list(self._pending):
+                    while self._pending.get(channel_id) and self._budget(channel_id):
+                        message_id, embed = self._pending[channel_id].popitem(last=False)
+                        self._sent[channel_id].append(self._clock())
+                        try:
+                            await edit(channel_id, message_id, embed)
+                            sent_count += 1
+                            EDITS_SENT.inc()
+                        except discord.NotFound:
+                            logger.info(f"Message d'annonce {message_id} supprimé, édition ignorée")
+                        except discord.HTTPException as e:
+                            logger.warning(f"Échec de l'édition du message {message_id}: {str(e)}")
+                        except BaseException:
+                            edits = self._pending.setdefault(channel_id, OrderedDict())
+                            if message_id not in edits:
+                                edits[message_id] = embed
+                                edits.move_to_end(message_id, last=False)
+                            raise
+                    if not self._pending.get(channel_id, True):
+                        self._pending.pop(channel_id, None)
+            finally:
+                EDITS_PENDING.set(self.pending_count)
+        return sent_count
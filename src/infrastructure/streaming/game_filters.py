@@ -0,0 +1,118 @@
+"""
+Filtres de jeux des annonces de streams, par serveur.
+
+Les noms de jeux configurés sont résolus une seule fois vers leur
+identifiant Helix, conservé en base, puis envoyés comme paramètres
+``game_id`` : Twitch ne renvoie que les streams des jeux retenus.
+"""
+import logging
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+from src.infrastructure.config.invalidation import STREAM_GAME_FILTERS, publish, subscribe
+from src.infrastructure.streaming.games import GameCache
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class GuildGameFilter:
+    """
+    Filtre de jeux résolu d'un serveur.
+
+    Attributes:
+        names (Tuple[str, ...]): Noms des jeux autorisés
+        game_ids (Tuple[str, ...]): Identifiants Helix résolus
+    """
+    names: Tuple[str, ...]
+    game_ids: Tuple[str, ...]
+
+    def allows(self, game_name: Optional[str]) -> bool:
+        """Indique si un jeu (par son nom) est autorisé"""
+        return bool(game_name) and game_name.strip().lower() in {name.lower() for name in self.names}
+
+
+class GameFilterCache:
+    """
+    Cache des filtres de jeux par serveur.
+
+    Les filtres sont relus en base au plus une fois par ttl secondes, ou dès
+    qu'une instance les modifie (voir invalidation) ; les noms sans
+    identifiant connu sont résolus via le GameCache (mémoïsé) puis
+    l'identifiant est enregistré.
+
+    Args:
+        repository: Repository des filtres (get_for_guild, add, remove)
+        games (GameCache): Cache des jeux Twitch
+        ttl (float): Durée de validité d'un filtre en cache, en secondes
+    """
+    def __init__(
+        self,
+        repository,
+        games: GameCache,
+        ttl: float = 300.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.repository = repository
+        self.games = games
+        self.ttl = ttl
+        self._clock = clock
+        self._filters: Dict[int, Tuple[float, Optional[GuildGameFilter]]] = {}
+        subscribe(STREAM_GAME_FILTERS, self._forget, self.invalidate)
+
+    async def get(self, guild_id: int) -> Optional[GuildGameFilter]:
+        """Retourne le filtre d'un serveur, None s'il annonce tous les jeux"""
+        cached = self._filters.get(guild_id)
+        if cached is not None and self._clock() - cached[0] < self.ttl:
+            return cached[1]
+
+        rows = await self.repository.get_for_guild(guild_id)
+        unresolved = [row.game_name for row in rows if not row.game_id]
+        if unresolved:
+            resolved = await self.games.resolve(unresolved)
+            for row in rows:
+                game = resolved.get(row.game_name.strip().lower())
+                if not row.game_id and game is not None:
+                    row.game_id = game["id"]
+                    await self.repository.add(guild_id, row.game_name, game["id"])
+
+        game_filter = None
+        if rows:
+            game_filter = GuildGameFilter(
+                names=tuple(row.game_name for row in rows),
+                game_ids=tuple(row.game_id for row in rows if row.game_id)
+            )
+        self._filters[guild_id] = (self._clock(), game_filter)
+        return game_filter
+
+    async def add(self, guild_id: int, name: str) -> Optional[dict]:
+        """
+        Ajoute un jeu au filtre d'un serveur.
+
+        Returns:
+            Optional[dict]: Jeu Helix ajouté, None si Twitch ne le connaît pas
+        """
+        game = (await self.games.resolve([name])).get(name.strip().lower())
+        if game is None:
+            return None
+        await self.repository.add(guild_id, game["name"], game["id"])
+        await publish(STREAM_GAME_FILTERS, [guild_id])
+        return game
+
+    async def remove(self, guild_id: int, name: str) -> bool:
+        """Retire un jeu du filtre d'un serveur"""
+        removed = await self.repository.remove(guild_id, name)
+        await publish(STREAM_GAME_FILTERS, [guild_id])
+        return removed
+
+    def _forget(self, guild_ids: List[int]) -> None:
+        for guild_id in guild_ids:
+            self._filters.pop(guild_id, None)
+
+    def invalidate(self, guild_id: Optional[int] = None) -> None:
+        """Oublie le filtre d'un serveur, ou tous les filtres"""
+        if guild_id is None:
+            self._filters.clear()
+        else:
+            self._filters.pop(guild_id, None)
@@ -0,0 +1,78 @@
+"""
+Cache des catégories (jeux) Twitch.
+
+Les noms de jeux sont résolus une seule fois vers leur identifiant Helix et
+leur jaquette, puis servis depuis la mémoire aux cycles suivants.
+"""
+import logging
+from typing import Dict, Iterable, Optional
+
+from src.infrastructure.streaming.helix_client import HelixClient
+from src.infrastructure.streaming.rate_limiter import RequestPriority
+
+logger = logging.getLogger(__name__)
+
+
+class GameCache:
+    """
+    Mémoïse les recherches de jeux Helix par nom.
+
+    Les noms inconnus de Twitch sont également mémorisés (valeur None) afin de
+    ne pas être recherchés à chaque cycle.
+
+    Args:
+        helix (HelixClient): Client Helix utilisé pour les recherches
+    """
+    def __init__(self, helix: HelixClient):
+        self.helix = helix
+        self._games: Dict[str, Optional[dict]] = {}
+
+    @staticmethod
+    def _key(name: str) -> str:
+        return name.strip().lower()
+
+    def get_cached(self, name: str) -> Optional[dict]:
+        """Retourne le jeu en cache sans appel réseau"""
+        return self._games.get(self._key(name))
+
+    async def resolve(
+        self,
+        names: Iterable[str],
+        priority: RequestPriority = RequestPriority.ENRICHMENT
+    ) -> Dict[str, dict]:
+        """
+        Résout des noms de jeux, en n'interrogeant Helix que pour les noms inconnus.
+
+        Args:
+            names (Iterable[str]): Noms des jeux
+            priority (RequestPriority): Priorité des éventuelles requêtes
+
+        Returns:
+            Dict[str, dict]: Jeux trouvés, indexés par nom normalisé
+        """
+        wanted = {self._key(name): name.strip() for name in names if name and name.strip()}
+        missing = [original for key, original in wanted.items() if key not in self._games]
+        if missing:
+            games = await self.helix.get_games(missing, priority=priority)
+            found = {self._key(game["name"]): game for game in games}
+            for name in missing:
+                self._games[self._key(name)] = found.get(self._key(name))
+            logger.info(f"{len(found)}/{len(missing)} jeu(x) Twitch résolu(s)")
+        return {key: self._games[key] for key in wanted if self._games.get(key) is not None}
+
+    async def box_art_url(self, name: str, width: int = 144, height: int = 192) -> Optional[str]:
+        """Retourne l'URL de la jaquette d'un jeu, None si inconnue"""
+        if not name:
+            return None
+        games = await self.resolve([name])
+        game = games.get(self._key(name))
+        if not game or not game.get("box_art_url"):
+            return None
+        return game["box_art_url"].replace("{width}", str(width)).replace("{height}", str(height))
+
+    def invalidate(self, name: Optional[str] = None) -> None:
+        """Oublie un jeu, ou tout le cache si aucun nom n'est donné"""
+        if name is None:
+            self._games.clear()
+        else:
+            self._games.pop(self._key(name), None)
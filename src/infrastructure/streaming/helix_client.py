@@ -0,0 +1,217 @@
+"""
+Client asynchrone pour l'API Helix de Twitch.
+"""
+import asyncio
+import logging
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import aiohttp
+
+from src.infrastructure.errors.exceptions import APIError
+from src.infrastructure.streaming.rate_limiter import HelixRateLimiter, RequestPriority
+
+logger = logging.getLogger(__name__)
+
+# Nombre maximal d'identifiants acceptés par Helix dans une même requête
+HELIX_BATCH_SIZE = 100
+
+ParamsType = Union[Dict[str, Any], Sequence[Tuple[str, Any]]]
+
+
+class HelixClient:
+    """
+    Client de l'API Helix de Twitch.
+
+    Gère le jeton d'application (client credentials), le respect des quotas via
+    un HelixRateLimiter partagé et les nouvelles tentatives après un 429.
+
+    Args:
+        client_id (str): Identifiant de l'application Twitch
+        client_secret (str): Secret de l'application Twitch
+        rate_limiter (Optional[HelixRateLimiter]): Limiteur de débit à utiliser
+        session (Optional[aiohttp.ClientSession]): Session HTTP partagée
+        api_url (str): URL de base de l'API Helix
+        token_url (str): URL d'obtention du jeton OAuth
+        max_retries (int): Nombre maximal de nouvelles tentatives après un 429
+    """
+    API_URL = "https://api.twitch.tv/helix"
+    TOKEN_URL = "https://id.twitch.tv/oauth2/token"
+
+    def __init__(
+        self,
+        client_id: str,
+        client_secret: str,
+        rate_limiter: Optional[HelixRateLimiter] = None,
+        session: Optional[aiohttp.ClientSession] = None,
+        api_url: str = API_URL,
+        token_url: str = TOKEN_URL,
+        max_retries: int = 3
+    ):
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.rate_limiter = rate_limiter or HelixRateLimiter()
+        self.api_url = api_url.rstrip("/")
+        self.token_url = token_url
+        self.max_retries = max_retries
+        self._session = session
+        self._owns_session = session is None
+        self._token: Optional[str] = None
+        self._token_expires_at = 0.0
+        self._token_lock = asyncio.Lock()
+
+    def _get_http(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=10))
+            self._owns_session = True
+        return self._session
+
+    async def close(self) -> None:
+        """Ferme la session HTTP si elle appartient au client"""
+        if self._owns_session and self._session is not None and not self._session.closed:
+            await self._session.close()
+
+    async def _get_token(self) -> str:
+        """Récupère un jeton d'application, renouvelé avant son expiration"""
+        async with self._token_lock:
+            if self._token and time.monotonic() < self._token_expires_at:
+                return self._token
+
+            data = {
+                "client_id": self.client_id,
+                "client_secret": self.client_secret,
+                "grant_type": "client_credentials"
+            }
+            async with self._get_http().post(self.token_url, data=data) as response:
+                if response.status >= 400:
+                    raise APIError("Twitch", self.token_url, response.status, await response.text())
+                payload = await response.json()
+
+            self._token = payload["access_token"]
+            # Marge d'une minute pour ne jamais utiliser un jeton sur le point d'expirer
+            self._token_expires_at = time.monotonic() + max(payload.get("expires_in", 3600) - 60, 0)
+            logger.info("Nouveau jeton d'application Twitch obtenu")
+            return self._token
+
+    def _invalidate_token(self) -> None:
+        self._token = None
+        self._token_expires_at = 0.0
+
+    async def request(
+        self,
+        endpoint: str,
+        params: Optional[ParamsType] = None,
+        priority: RequestPriority = RequestPriority.RECONCILIATION,
+        method: str = "GET"
+    ) -> Dict[str, Any]:
+        """
+        Exécute une requête Helix en respectant la limite de débit.
+
+        Args:
+            endpoint (str): Chemin de l'endpoint (ex: "streams")
+            params (Optional[ParamsType]): Paramètres de la requête
+            priority (RequestPriority): Priorité dans la file du limiteur
+            method (str): Méthode HTTP
+
+        Returns:
+            Dict[str, Any]: Corps JSON de la réponse
+
+        Raises:
+            APIError: Si Twitch renvoie une erreur ou si les tentatives sont épuisées
+        """
+        url = f"{self.api_url}/{endpoint.lstrip('/')}"
+        token_refreshed = False
+        attempt = 0
+        while True:
+            token = await self._get_token()
+            await self.rate_limiter.acquire(priority)
+            headers = {"Client-ID": self.client_id, "Authorization": f"Bearer {token}"}
+            async with self._get_http().request(method, url, params=params, headers=headers) as response:
+                self.rate_limiter.update_from_headers(response.headers)
+
+                if response.status == 401 and not token_refreshed:
+                    logger.info("Jeton Twitch refusé, renouvellement")
+                    self._invalidate_token()
+                    token_refreshed = True
+                    continue
+
+                if response.status == 429:
+                    if attempt >= self.max_retries:
+                        raise APIError("Twitch", endpoint, response.status, await response.text())
+                    self.rate_limiter.backoff(attempt, response.headers)
+                    attempt += 1
+                    continue
+
+                if response.status >= 400:
+                    raise APIError("Twitch", endpoint, response.status, await response.text())
+
+                return await response.json()
+
+    async def get_streams(
+        self,
+        user_logins: Sequence[str],
+        priority: RequestPriority = RequestPriority.RECONCILIATION,
+        game_ids: Optional[Sequence[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Récupère les streams en cours pour une liste de comptes Twitch.
+
+        Les identifiants sont regroupés par lots de 100, la taille maximale
+        acceptée par Helix, et la pagination est suivie pour chaque lot.
+
+        Args:
+            user_logins (Sequence[str]): Noms de connexion Twitch
+            priority (RequestPriority): Priorité des requêtes
+            game_ids (Optional[Sequence[str]]): Jeux retenus (100 au plus) ; filtrage fait par Twitch
+
+        Returns:
+            List[Dict[str, Any]]: Streams en cours
+        """
+        logins = list(dict.fromkeys(login.lower() for login in user_logins if login))
+        streams: List[Dict[str, Any]] = []
+        for start in range(0, len(logins), HELIX_BATCH_SIZE):
+            batch = logins[start:start + HELIX_BATCH_SIZE]
+            params: List[Tuple[str, Any]] = [("user_login", login) for login in batch]
+            params.extend(("game_id", game_id) for game_id in (game_ids or [])[:HELIX_BATCH_SIZE])
+            params.append(("first", HELIX_BATCH_SIZE))
+            streams.extend(await self._paginate("streams", params, priority))
+        return streams
+
+    async def get_games(
+        self,
+        names: Sequence[str],
+        priority: RequestPriority = RequestPriority.ENRICHMENT
+    ) -> List[Dict[str, Any]]:
+        """
+        Récupère les catégories (jeux) Helix correspondant à des noms exacts.
+
+        Args:
+            names (Sequence[str]): Noms des jeux
+            priority (RequestPriority): Priorité des requêtes
+
+        Returns:
+            List[Dict[str, Any]]: Jeux trouvés (id, name, box_art_url)
+        """
+        unique = list(dict.fromkeys(name for name in names if name))
+        games: List[Dict[str, Any]] = []
+        for start in range(0, len(unique), HELIX_BATCH_SIZE):
+            params = [("name", name) for name in unique[start:start + HELIX_BATCH_SIZE]]
+            payload = await self.request("games", params, priority)
+            games.extend(payload.get("data", []))
+        return games
+
+    async def _paginate(
+        self,
+        endpoint: str,
+        params: List[Tuple[str, Any]],
+        priority: RequestPriority
+    ) -> List[Dict[str, Any]]:
+        results: List[Dict[str, Any]] = []
+        cursor = None
+        while True:
+            page_params = params + ([("after", cursor)] if cursor else [])
+            payload = await self.request(endpoint, page_params, priority)
+            results.extend(payload.get("data", []))
+            cursor = payload.get("pagination", {}).get("cursor")
+            if not cursor or not payload.get("data"):
+                return results
@@ -0,0 +1,111 @@
+"""
+Détection des streams Twitch à partir de la présence Discord.
+
+Discord transmet une activité ``discord.Streaming`` (avec l'URL Twitch) dans
+les mises à jour de présence. Pour les membres ayant lié leur compte Twitch,
+cela suffit à détecter le début et la fin d'un stream sans appel à Helix.
+
+Seule une activité pointant vers la chaîne liée par le membre compte (un
+membre peut relayer la chaîne d'un autre). Un membre présent sur plusieurs
+guildes produit une mise à jour par guilde : les transitions sont dédoublonnées
+par login avec l'ensemble des streams en cours vus via la présence.
+"""
+import re
+from typing import Any, Dict, Optional, Set, Tuple
+
+import discord
+
+from src.infrastructure.streaming.announcements import PROVISIONAL_ID_PREFIX
+
+# Aperçu public d'un stream, accessible sans appel à l'API
+PREVIEW_URL = "https://static-cdn.jtvnw.net/previews-ttv/live_user_{login}-{width}x{height}.jpg"
+
+_TWITCH_URL = re.compile(r"twitch\.tv/([A-Za-z0-9_]+)", re.IGNORECASE)
+
+STARTED = "started"
+ENDED = "ended"
+
+
+def twitch_login_from_activity(activity: discord.Streaming) -> Optional[str]:
+    """Extrait le login Twitch d'une activité de streaming, None si ce n'est pas Twitch"""
+    if activity.twitch_name:
+        return activity.twitch_name.lower()
+    match = _TWITCH_URL.search(activity.url or "")
+    return match.group(1).lower() if match else None
+
+
+def find_twitch_activity(member: discord.Member, login: Optional[str] = None) -> Optional[discord.Streaming]:
+    """
+    Retourne l'activité de streaming Twitch d'un membre, s'il en a une.
+
+    Args:
+        member (discord.Member): Membre dont on examine les activités
+        login (Optional[str]): Ne retient que l'activité de cette chaîne (sans tenir compte de la casse)
+    """
+    for activity in getattr(member, "activities", ()) or ():
+        if not isinstance(activity, discord.Streaming):
+            continue
+        activity_login = twitch_login_from_activity(activity)
+        if activity_login and (login is None or activity_login == login.lower()):
+            return activity
+    return None
+
+
+def stream_from_presence(member: discord.Member, activity: discord.Streaming) -> Dict[str, Any]:
+    """
+    Construit un payload au format Helix à partir d'une activité de streaming.
+
+    L'identifiant est provisoire : il sera remplacé par l'identifiant Helix lors
+    du prochain sondage de réconciliation.
+    """
+    login = twitch_login_from_activity(activity)
+    return {
+        "id": f"{PROVISIONAL_ID_PREFIX}{login}",
+        "user_login": login,
+        "user_name": activity.twitch_name or member.display_name,
+        "title": activity.details or activity.name or "",
+        "game_name": activity.game,
+        "viewer_count": None,
+        "thumbnail_url": PREVIEW_URL.format(login=login, width="{width}", height="{height}")
+    }
+
+
+def detect_transition(
+    before: discord.Member,
+    after: discord.Member,
+    opted_in: Dict[int, str],
+    live: Optional[Set[str]] = None
+) -> Optional[Tuple[str, str, Optional[discord.Streaming]]]:
+    """
+    Détecte le début ou la fin d'un stream entre deux présences d'un membre.
+
+    Args:
+        before (discord.Member): Présence précédente
+        after (discord.Member): Nouvelle présence
+        opted_in (Dict[int, str]): Logins Twitch des membres inscrits, par ID Discord
+        live (Optional[Set[str]]): Logins en live vus via la présence, tenu à jour
+            ici : une transition déjà vue depuis une autre guilde est ignorée
+
+    Returns:
+        Optional[Tuple]: (STARTED ou ENDED, login, activité) ou None sans transition
+    """
+    login = opted_in.get(after.id)
+    if login is None:
+        return None
+    login = login.lower()
+
+    was_streaming = find_twitch_activity(before, login)
+    streaming = find_twitch_activity(after, login)
+    if streaming and not was_streaming:
+        if live is not None:
+            if login in live:
+                return None
+            live.add(login)
+        return STARTED, login, streaming
+    if was_streaming and not streaming:
+        if live is not None:
+            if login not in live:
+                return None
+            live.discard(login)
+        return ENDED, login, None
+    return None
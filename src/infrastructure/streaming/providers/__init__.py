@@ -0,0 +1,9 @@
+"""
+Plateformes de streaming suivies par le bot
+"""
+
+from .base import PartialPollError, StreamProvider
+from .twitch import TwitchProvider
+from .youtube import YouTubeProvider
+
+__all__ = ['PartialPollError', 'StreamProvider', 'TwitchProvider', 'YouTubeProvider']
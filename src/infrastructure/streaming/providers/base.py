@@ -0,0 +1,80 @@
+"""
+Interface commune des plateformes de streaming.
+"""
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Sequence
+
+import discord
+
+from src.infrastructure.streaming.announcements import build_ended_embed, build_live_embed
+
+
+class PartialPollError(Exception):
+    """
+    Lot vérifié en partie : certaines chaînes n'ont pas pu l'être.
+
+    Le planificateur garde les streams trouvés et exclut les chaînes en échec
+    des chaînes vérifiées, pour que leurs annonces ne soient pas terminées.
+
+    Attributes:
+        streams (List[Dict[str, Any]]): Streams en cours parmi les chaînes vérifiées
+        failed (List[str]): Chaînes qui n'ont pas pu être vérifiées
+    """
+    def __init__(self, streams: List[Dict[str, Any]], failed: Sequence[str]):
+        super().__init__(f"{len(failed)} chaîne(s) non vérifiée(s) : {', '.join(failed)}")
+        self.streams = streams
+        self.failed = list(failed)
+
+
+class StreamProvider(ABC):
+    """
+    Plateforme de streaming interrogée par le planificateur commun.
+
+    Les streams sont renvoyés dans un format commun calqué sur Helix :
+    ``id`` (identifiant du stream), ``user_login`` (chaîne suivie),
+    ``user_name``, ``title``, ``game_name``, ``viewer_count`` (None si
+    inconnu), ``thumbnail_url`` et, hors Twitch, ``url``.
+
+    Attributes:
+        name (str): Identifiant de la plateforme
+        batch_size (int): Nombre de chaînes vérifiées par appel à fetch_live
+    """
+    name: str = ""
+    batch_size: int = 50
+
+    @abstractmethod
+    async def get_tracked_channels(self) -> List[str]:
+        """Retourne les chaînes suivies sur la plateforme"""
+        pass  # pragma: no cover
+
+    @abstractmethod
+    async def fetch_live(self, channels: Sequence[str]) -> List[Dict[str, Any]]:
+        """
+        Vérifie un lot de chaînes (au plus batch_size) et retourne les streams en cours.
+
+        Args:
+            channels (Sequence[str]): Chaînes à vérifier
+
+        Returns:
+            List[Dict[str, Any]]: Streams en cours, au format commun
+
+        Raises:
+            PartialPollError: Si une partie seulement des chaînes a pu être vérifiée
+        """
+        pass  # pragma: no cover
+
+    async def enrich(self, stream: Dict[str, Any]) -> Dict[str, Any]:
+        """Complète un stream avant son affichage (sans effet par défaut)"""
+        return stream
+
+    def build_live_embed(self, stream: Dict[str, Any]) -> discord.Embed:
+        """Construit l'annonce d'un stream en cours"""
+        return build_live_embed(stream)
+
+    def build_ended_embed(self, stream: Dict[str, Any]) -> discord.Embed:
+        """Construit l'annonce d'un stream terminé"""
+        return build_ended_embed(stream)
+
+    async def close(self) -> None:
+        """Libère les ressources de la plateforme (sans effet par défaut)"""
+        return None
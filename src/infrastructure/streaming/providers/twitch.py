@@ -0,0 +1,91 @@
+"""
+Plateforme Twitch, interrogée via l'API Helix.
+"""
+import logging
+import os
+from typing import Any, Collection, Dict, List, Optional, Sequence
+
+from src.infrastructure.streaming.game_filters import GuildGameFilter
+from src.infrastructure.streaming.games import GameCache
+from src.infrastructure.streaming.helix_client import HELIX_BATCH_SIZE, HelixClient
+from src.infrastructure.streaming.providers.base import PartialPollError, StreamProvider
+from src.infrastructure.streaming.rate_limiter import RequestPriority
+
+logger = logging.getLogger(__name__)
+
+
+class TwitchProvider(StreamProvider):
+    """
+    Streams Twitch des comptes de TWITCH_USERNAME et des membres ayant lié leur compte.
+
+    Args:
+        helix (HelixClient): Client de l'API Helix
+        games (GameCache): Cache des jeux Twitch (jaquettes)
+        member_repository: Repository des membres (get_all_with_twitch)
+        batch_size (int): Nombre de comptes par lot, au plus 100
+
+    Attributes:
+        opted_in (Dict[int, str]): Logins Twitch des membres inscrits, par ID Discord
+        game_filter (Optional[GuildGameFilter]): Jeux annoncés, None pour tous les jeux
+        announced (Collection[str]): Logins déjà annoncés, suivis quel que soit leur jeu
+    """
+    name = "twitch"
+
+    def __init__(self, helix: HelixClient, games: GameCache, member_repository, batch_size: int = HELIX_BATCH_SIZE):
+        self.helix = helix
+        self.games = games
+        self.member_repository = member_repository
+        self.batch_size = min(batch_size, HELIX_BATCH_SIZE)
+        self.opted_in: Dict[int, str] = {}
+        self.game_filter: Optional[GuildGameFilter] = None
+        self.announced: Collection[str] = ()
+
+    async def get_tracked_channels(self) -> List[str]:
+        usernames = os.getenv('TWITCH_USERNAME', '')
+        logins = [name.strip() for name in usernames.split(',') if name.strip()]
+        try:
+            members = await self.member_repository.get_all_with_twitch()
+            self.opted_in = {
+                int(member.discord_id): member.twitch_username.lower()
+                for member in members if member.discord_id
+            }
+            logins.extend(member.twitch_username for member in members)
+        except Exception as e:
+            logger.warning(f"Impossible de récupérer les comptes Twitch des membres : {str(e)}")
+        return list(dict.fromkeys(login.lower() for login in logins))
+
+    async def fetch_live(
+        self,
+        channels: Sequence[str],
+        priority: RequestPriority = RequestPriority.RECONCILIATION
+    ) -> List[Dict[str, Any]]:
+        if self.game_filter is None:
+            return await self.helix.get_streams(channels, priority=priority)
+
+        # Le filtre ne vaut que pour les nouvelles annonces : un streamer déjà
+        # annoncé qui change de jeu reste suivi jusqu'à la fin de son stream
+        announced = [login for login in channels if login in self.announced]
+        candidates = [login for login in channels if login not in self.announced]
+        streams = await self.helix.get_streams(announced, priority=priority) if announced else []
+        if not candidates:
+            return streams
+        if not self.game_filter.game_ids:
+            # Aucun des jeux filtrés n'est résolu : ces chaînes ne sont pas vérifiées
+            raise PartialPollError(streams, candidates)
+        streams.extend(
+            await self.helix.get_streams(candidates, priority=priority, game_ids=self.game_filter.game_ids)
+        )
+        return streams
+
+    async def enrich(self, stream: Dict[str, Any]) -> Dict[str, Any]:
+        """Ajoute la jaquette du jeu (mise en cache) au payload d'un stream"""
+        try:
+            box_art_url = await self.games.box_art_url(stream.get('game_name'))
+            if box_art_url:
+                stream['box_art_url'] = box_art_url
+        except Exception as e:
+            logger.warning(f"Impossible d'enrichir le stream de {stream['user_login']} : {str(e)}")
+        return stream
+
+    async def close(self) -> None:
+        await self.helix.close()
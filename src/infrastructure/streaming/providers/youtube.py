@@ -0,0 +1,156 @@
+"""
+Plateforme YouTube : détection des lives à partir des flux RSS des chaînes.
+
+Le flux RSS public d'une chaîne liste ses dernières vidéos, lives compris,
+sans consommer de quota. Les vidéos récentes de tout un lot de chaînes sont
+ensuite vérifiées en une seule requête ``videos.list`` de l'API Data, qui
+indique lesquelles sont en direct.
+"""
+import logging
+import os
+import xml.etree.ElementTree as ET
+from typing import Any, Dict, List, Optional, Sequence
+
+import aiohttp
+import discord
+
+from src.infrastructure.errors.exceptions import APIError
+from src.infrastructure.streaming.announcements import build_live_embed
+from src.infrastructure.streaming.providers.base import PartialPollError, StreamProvider
+
+logger = logging.getLogger(__name__)
+
+# Nombre maximal d'identifiants acceptés par videos.list
+VIDEOS_BATCH_SIZE = 50
+
+_NAMESPACES = {
+    "atom": "http://www.w3.org/2005/Atom",
+    "yt": "http://www.youtube.com/xml/schemas/2015"
+}
+
+
+def parse_feed(xml: str, limit: int) -> List[str]:
+    """Extrait les identifiants des vidéos les plus récentes d'un flux RSS de chaîne"""
+    root = ET.fromstring(xml)
+    video_ids = [
+        entry.findtext("yt:videoId", namespaces=_NAMESPACES)
+        for entry in root.findall("atom:entry", _NAMESPACES)
+    ]
+    return [video_id for video_id in video_ids if video_id][:limit]
+
+
+def stream_from_video(video: Dict[str, Any]) -> Dict[str, Any]:
+    """Convertit une vidéo de l'API Data au format commun des streams"""
+    snippet = video.get("snippet", {})
+    details = video.get("liveStreamingDetails", {})
+    thumbnails = snippet.get("thumbnails", {})
+    thumbnail = thumbnails.get("maxres") or thumbnails.get("high") or thumbnails.get("default") or {}
+    viewers = details.get("concurrentViewers")
+    return {
+        "id": video["id"],
+        "user_login": snippet.get("channelId", ""),
+        "user_name": snippet.get("channelTitle", ""),
+        "title": snippet.get("title", ""),
+        "game_name": None,
+        "viewer_count": int(viewers) if viewers is not None else None,
+        "thumbnail_url": thumbnail.get("url"),
+        "url": f"https://www.youtube.com/watch?v={video['id']}"
+    }
+
+
+class YouTubeProvider(StreamProvider):
+    """
+    Lives YouTube des chaînes de YOUTUBE_CHANNEL_IDS.
+
+    Args:
+        api_key (str): Clé de l'API YouTube Data
+        channel_ids (Sequence[str]): Identifiants des chaînes suivies (UC...)
+        batch_size (int): Nombre de chaînes par lot
+        recent_videos (int): Nombre de vidéos récentes vérifiées par chaîne
+        session (Optional[aiohttp.ClientSession]): Session HTTP partagée
+    """
+    name = "youtube"
+    FEED_URL = "https://www.youtube.com/feeds/videos.xml"
+    API_URL = "https://www.googleapis.com/youtube/v3"
+
+    def __init__(
+        self,
+        api_key: str,
+        channel_ids: Sequence[str],
+        batch_size: int = 10,
+        recent_videos: int = 5,
+        session: Optional[aiohttp.ClientSession] = None,
+        feed_url: str = FEED_URL,
+        api_url: str = API_URL
+    ):
+        self.api_key = api_key
+        self.channel_ids = list(dict.fromkeys(channel_ids))
+        # Chaque chaîne apporte au plus recent_videos vidéos à la requête groupée
+        self.batch_size = max(min(batch_size, VIDEOS_BATCH_SIZE // recent_videos), 1)
+        self.recent_videos = recent_videos
+        self.feed_url = feed_url
+        self.api_url = api_url.rstrip("/")
+        self._session = session
+        self._owns_session = session is None
+
+    @classmethod
+    def create_from_env(cls) -> Optional["YouTubeProvider"]:
+        """Crée la plateforme depuis l'environnement, None si aucune chaîne n'est suivie"""
+        channel_ids = [c.strip() for c in os.getenv('YOUTUBE_CHANNEL_IDS', '').split(',') if c.strip()]
+        if not channel_ids:
+            return None
+        api_key = os.getenv('YOUTUBE_API_KEY', '')
+        if not api_key:
+            logger.error("YOUTUBE_CHANNEL_IDS est défini sans YOUTUBE_API_KEY, suivi YouTube désactivé")
+            return None
+        return cls(api_key, channel_ids, batch_size=int(os.getenv('YOUTUBE_BATCH_SIZE', '10')))
+
+    def _get_http(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=10))
+            self._owns_session = True
+        return self._session
+
+    async def close(self) -> None:
+        if self._owns_session and self._session is not None and not self._session.closed:
+            await self._session.close()
+
+    async def get_tracked_channels(self) -> List[str]:
+        return list(self.channel_ids)
+
+    async def _recent_videos(self, channel_id: str) -> List[str]:
+        async with self._get_http().get(self.feed_url, params={"channel_id": channel_id}) as response:
+            if response.status >= 400:
+                raise APIError("YouTube", "feeds/videos.xml", response.status, await response.text())
+            return parse_feed(await response.text(), self.recent_videos)
+
+    async def fetch_live(self, channels: Sequence[str]) -> List[Dict[str, Any]]:
+        video_ids: List[str] = []
+        failed: List[str] = []
+        for channel_id in channels:
+            try:
+                video_ids.extend(await self._recent_videos(channel_id))
+            except (APIError, ET.ParseError) as e:
+                logger.warning(f"Flux YouTube illisible pour la chaîne {channel_id} : {str(e)}")
+                failed.append(channel_id)
+
+        streams: List[Dict[str, Any]] = []
+        if video_ids:
+            params = {
+                "part": "snippet,liveStreamingDetails",
+                "id": ",".join(video_ids[:VIDEOS_BATCH_SIZE]),
+                "key": self.api_key
+            }
+            async with self._get_http().get(f"{self.api_url}/videos", params=params) as response:
+                if response.status >= 400:
+                    raise APIError("YouTube", "videos", response.status, await response.text())
+                payload = await response.json()
+            streams = [
+                stream_from_video(video) for video in payload.get("items", [])
+                if video.get("snippet", {}).get("liveBroadcastContent") == "live"
+            ]
+
+        # Chaînes au flux illisible : leurs annonces en cours ne doivent pas être terminées
+        if failed:
+            raise PartialPollError(streams, failed)
+        return streams
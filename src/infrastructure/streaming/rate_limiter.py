@@ -0,0 +1,205 @@
+"""
+Limiteur de débit pour l'API Helix de Twitch.
+
+Maintient un seau de jetons synchronisé avec les en-têtes ``Ratelimit-*``
+renvoyés par Twitch et sert les requêtes en attente par ordre de priorité.
+"""
+import asyncio
+import heapq
+import itertools
+import logging
+import random
+import time
+from enum import IntEnum
+from typing import Callable, List, Mapping, Optional, Tuple
+
+from src.infrastructure.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+RATELIMIT_BUDGET = metrics.gauge(
+    "twitch_helix_ratelimit_remaining",
+    "Jetons Helix restants dans le seau courant"
+)
+RATELIMIT_QUEUE = metrics.gauge(
+    "twitch_helix_queue_depth",
+    "Requêtes Helix en attente d'un jeton"
+)
+RATELIMIT_THROTTLED = metrics.counter(
+    "twitch_helix_throttled_total",
+    "Réponses 429 reçues de l'API Helix"
+)
+
+
+class RequestPriority(IntEnum):
+    """Priorité d'une requête Helix (plus petit = plus prioritaire)"""
+    USER = 0
+    ENRICHMENT = 5
+    RECONCILIATION = 10
+
+
+class HelixRateLimiter:
+    """
+    Seau de jetons aligné sur les quotas Helix.
+
+    Le nombre de jetons est resynchronisé à chaque réponse à partir des en-têtes
+    ``Ratelimit-Limit``, ``Ratelimit-Remaining`` et ``Ratelimit-Reset``. Entre deux
+    réponses, le limiteur décompte localement les requêtes émises et considère le
+    seau plein une fois la date de réinitialisation passée.
+
+    Les appelants sont servis par priorité croissante puis par ordre d'arrivée :
+    une recherche déclenchée par un utilisateur passe devant les sondages de
+    réconciliation en file d'attente.
+
+    Args:
+        capacity (int): Taille du seau avant la première réponse de Twitch
+        refill_period (float): Délai de réinitialisation supposé sans en-tête, en secondes
+        base_backoff (float): Délai de base du backoff après un 429
+        max_backoff (float): Délai maximal du backoff après un 429
+    """
+    def __init__(
+        self,
+        capacity: int = 800,
+        refill_period: float = 60.0,
+        base_backoff: float = 1.0,
+        max_backoff: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+        wall_clock: Callable[[], float] = time.time,
+        rng: Optional[random.Random] = None
+    ):
+        self.capacity = capacity
+        self.refill_period = refill_period
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self._clock = clock
+        self._wall_clock = wall_clock
+        self._rng = rng or random.Random()
+        self._tokens = float(capacity)
+        self._reset_at: Optional[float] = None
+        self._blocked_until = 0.0
+        self._queue: List[Tuple[int, int]] = []
+        self._sequence = itertools.count()
+        self._changed = asyncio.Event()
+        RATELIMIT_BUDGET.set(self._tokens)
+
+    @property
+    def remaining(self) -> int:
+        """Nombre de jetons actuellement disponibles"""
+        self._refill()
+        return int(self._tokens)
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._queue)
+
+    def _refill(self) -> None:
+        now = self._clock()
+        if self._reset_at is not None and now >= self._reset_at:
+            self._tokens = float(self.capacity)
+            self._reset_at = None
+            RATELIMIT_BUDGET.set(self._tokens)
+
+    def _notify(self) -> None:
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    def _wait_time(self) -> Optional[float]:
+        """Temps à attendre avant qu'un jeton ne soit disponible, None si inconnu"""
+        now = self._clock()
+        if now < self._blocked_until:
+            return self._blocked_until - now
+        if self._tokens >= 1:
+            return 0.0
+        if self._reset_at is None:
+            self._reset_at = now + self.refill_period
+        return max(self._reset_at - now, 0.0)
+
+    async def acquire(self, priority: RequestPriority = RequestPriority.RECONCILIATION) -> None:
+        """
+        Attend qu'un jeton soit disponible puis le consomme.
+
+        Args:
+            priority (RequestPriority): Priorité de la requête
+        """
+        entry = (int(priority), next(self._sequence))
+        heapq.heappush(self._queue, entry)
+        RATELIMIT_QUEUE.set(len(self._queue))
+        try:
+            while True:
+                self._refill()
+                changed = self._changed
+                timeout = None
+                if self._queue[0] == entry:
+                    wait = self._wait_time()
+                    if wait == 0.0:
+                        heapq.heappop(self._queue)
+                        self._tokens -= 1
+                        RATELIMIT_BUDGET.set(self._tokens)
+                        self._notify()
+                        return
+                    timeout = wait
+                try:
+                    await asyncio.wait_for(changed.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+        except BaseException:
+            if entry in self._queue:
+                self._queue.remove(entry)
+                heapq.heapify(self._queue)
+                self._notify()
+            raise
+        finally:
+            RATELIMIT_QUEUE.set(len(self._queue))
+
+    def update_from_headers(self, headers: Mapping[str, str]) -> None:
+        """
+        Resynchronise le seau à partir des en-têtes d'une réponse Helix.
+
+        Args:
+            headers (Mapping[str, str]): En-têtes de la réponse HTTP
+        """
+        try:
+            limit = headers.get("Ratelimit-Limit")
+            remaining = headers.get("Ratelimit-Remaining")
+            reset = headers.get("Ratelimit-Reset")
+            if limit is not None:
+                self.capacity = int(limit)
+            if remaining is not None:
+                self._tokens = float(int(remaining))
+            if reset is not None:
+                delay = max(float(reset) - self._wall_clock(), 0.0)
+                self._reset_at = self._clock() + delay
+        except (TypeError, ValueError):
+            logger.warning(f"En-têtes de limite de débit Helix invalides: {dict(headers)}")
+            return
+        RATELIMIT_BUDGET.set(self._tokens)
+        self._notify()
+
+    def backoff(self, attempt: int, headers: Optional[Mapping[str, str]] = None) -> float:
+        """
+        Enregistre une réponse 429 et bloque le seau pendant un délai aléatoire.
+
+        Le délai suit un backoff exponentiel avec jitter complet, sans jamais
+        être inférieur au temps restant avant la réinitialisation annoncée.
+
+        Args:
+            attempt (int): Numéro de la tentative (0 pour la première)
+            headers (Optional[Mapping[str, str]]): En-têtes de la réponse 429
+
+        Returns:
+            float: Délai de blocage appliqué, en secondes
+        """
+        RATELIMIT_THROTTLED.inc()
+        if headers:
+            self.update_from_headers(headers)
+        self._tokens = 0.0
+        ceiling = min(self.max_backoff, self.base_backoff * (2 ** attempt))
+        delay = self._rng.uniform(0, ceiling)
+        now = self._clock()
+        if self._reset_at is not None:
+            delay = max(delay, self._reset_at - now)
+        self._blocked_until = max(self._blocked_until, now + delay)
+        RATELIMIT_BUDGET.set(self._tokens)
+        logger.warning(f"Limite de débit Helix atteinte, pause de {delay:.2f}s (tentative {attempt + 1})")
+        self._notify()
+        return delay
@@ -0,0 +1,120 @@
+"""
+Planificateur commun des vérifications de streams.
+
+Toutes les plateformes sont interrogées depuis une seule boucle : les
+chaînes de chaque plateforme sont découpées en lots de la taille propre à la
+plateforme, et une limite globale borne le nombre de lots en cours, toutes
+plateformes confondues.
+"""
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Mapping, Sequence
+
+from src.infrastructure.metrics import metrics
+from src.infrastructure.streaming.providers.base import PartialPollError, StreamProvider
+
+logger = logging.getLogger(__name__)
+
+POLL_IN_FLIGHT = metrics.gauge(
+    "stream_poll_batches_in_flight",
+    "Lots de vérification de streams en cours, toutes plateformes confondues"
+)
+POLL_DURATION = metrics.histogram(
+    "stream_poll_batch_duration_seconds",
+    "Durée de vérification d'un lot de chaînes"
+)
+POLL_FAILURES = metrics.counter(
+    "stream_poll_batch_failures_total",
+    "Lots de vérification de streams en échec"
+)
+
+
+@dataclass
+class PollResult:
+    """
+    Résultat de la vérification des chaînes d'une plateforme.
+
+    Attributes:
+        streams (List[Dict[str, Any]]): Streams en cours
+        polled (List[str]): Chaînes effectivement vérifiées (hors lots en échec)
+        failed (List[str]): Chaînes des lots en échec
+    """
+    streams: List[Dict[str, Any]] = field(default_factory=list)
+    polled: List[str] = field(default_factory=list)
+    failed: List[str] = field(default_factory=list)
+
+
+class PollScheduler:
+    """
+    Exécute les lots de vérification sous une limite de concurrence globale.
+
+    Args:
+        max_concurrency (int): Nombre maximal de lots en cours simultanément
+    """
+    def __init__(self, max_concurrency: int = 4):
+        self.max_concurrency = max_concurrency
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._in_flight = 0
+
+    async def _run_batch(self, provider: StreamProvider, batch: Sequence[str]) -> List[Dict[str, Any]]:
+        async with self._semaphore:
+            self._in_flight += 1
+            POLL_IN_FLIGHT.set(self._in_flight)
+            start = time.monotonic()
+            try:
+                return await provider.fetch_live(batch)
+            finally:
+                POLL_DURATION.observe(time.monotonic() - start)
+                self._in_flight -= 1
+                POLL_IN_FLIGHT.set(self._in_flight)
+
+    async def poll(self, provider: StreamProvider, channels: Sequence[str]) -> PollResult:
+        """
+        Vérifie les chaînes d'une plateforme par lots de provider.batch_size.
+
+        Un lot en échec n'interrompt pas les autres ; ses chaînes sont exclues
+        de ``polled`` pour que leurs annonces ne soient pas déclarées terminées.
+        Un lot vérifié en partie (PartialPollError) n'en exclut que les chaînes
+        en échec.
+        """
+        batches = [
+            list(channels[start:start + provider.batch_size])
+            for start in range(0, len(channels), provider.batch_size)
+        ]
+        outcomes = await asyncio.gather(
+            *(self._run_batch(provider, batch) for batch in batches),
+            return_exceptions=True
+        )
+
+        result = PollResult()
+        for batch, outcome in zip(batches, outcomes):
+            if isinstance(outcome, PartialPollError):
+                logger.warning(f"Vérification partielle d'un lot {provider.name} : {str(outcome)}")
+                failed = set(outcome.failed)
+                result.streams.extend(outcome.streams)
+                result.polled.extend(channel for channel in batch if channel not in failed)
+                result.failed.extend(channel for channel in batch if channel in failed)
+            elif isinstance(outcome, BaseException):
+                POLL_FAILURES.inc()
+                logger.error(f"Échec de la vérification d'un lot {provider.name} ({len(batch)} chaînes) : {str(outcome)}")
+                result.failed.extend(batch)
+            else:
+                result.streams.extend(outcome)
+                result.polled.extend(batch)
+        return result
+
+    async def poll_all(self, assignments: Mapping[StreamProvider, Sequence[str]]) -> Dict[str, PollResult]:
+        """
+        Vérifie toutes les plateformes en parallèle, sous la même limite globale.
+
+        Args:
+            assignments (Mapping[StreamProvider, Sequence[str]]): Chaînes à vérifier par plateforme
+
+        Returns:
+            Dict[str, PollResult]: Résultats indexés par nom de plateforme
+        """
+        providers = list(assignments)
+        results = await asyncio.gather(*(self.poll(p, list(assignments[p])) for p in providers))
+        return {provider.name: result for provider, result in zip(providers, results)}
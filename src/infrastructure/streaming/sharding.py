@@ -0,0 +1,128 @@
+"""
+Répartition du suivi des streams entre plusieurs instances du bot.
+
+Chaque instance publie un heartbeat dans la base de données. Les streamers
+sont répartis entre les instances vivantes par hachage cohérent : chaque
+instance ne sonde et n'annonce que sa part, et seule la part d'une instance
+disparue change de propriétaire.
+"""
+import bisect
+import hashlib
+import logging
+import os
+import socket
+from typing import Iterable, List, Optional, Sequence
+
+from src.infrastructure.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+SHARD_REPLICAS = metrics.gauge(
+    "stream_shard_replicas",
+    "Instances vivantes se partageant le suivi des streams"
+)
+SHARD_REBALANCES = metrics.counter(
+    "stream_shard_rebalances_total",
+    "Changements de la liste des instances vivantes"
+)
+
+
+def default_replica_id() -> str:
+    """Identifiant de l'instance : REPLICA_ID, à défaut hôte et PID"""
+    return os.getenv("REPLICA_ID") or f"{socket.gethostname()}-{os.getpid()}"
+
+
+def _hash(key: str) -> int:
+    # Hachage stable entre processus, contrairement à hash()
+    return int.from_bytes(hashlib.md5(key.encode("utf-8")).digest()[:8], "big")
+
+
+class HashRing:
+    """
+    Anneau de hachage cohérent.
+
+    Args:
+        nodes (Iterable[str]): Identifiants des instances
+        vnodes (int): Nombre de points par instance sur l'anneau, pour lisser la répartition
+    """
+    def __init__(self, nodes: Iterable[str] = (), vnodes: int = 64):
+        self.vnodes = vnodes
+        self.nodes = sorted(set(nodes))
+        points = sorted(
+            (_hash(f"{node}#{index}"), node)
+            for node in self.nodes
+            for index in range(vnodes)
+        )
+        self._keys = [point for point, _ in points]
+        self._owners = [node for _, node in points]
+
+    def owner(self, key: str) -> Optional[str]:
+        """Retourne l'instance propriétaire d'une clé, None si l'anneau est vide"""
+        if not self._keys:
+            return None
+        index = bisect.bisect(self._keys, _hash(key)) % len(self._keys)
+        return self._owners[index]
+
+
+class ShardCoordinator:
+    """
+    Tient à jour l'appartenance de l'instance et la part de streamers qui lui revient.
+
+    Tant qu'aucun heartbeat n'a abouti, l'instance ne possède aucun streamer :
+    mieux vaut retarder une annonce que la publier en double.
+
+    Args:
+        replica_id (str): Identifiant de l'instance
+        repository: Repository du heartbeat (heartbeat, get_live_replicas, remove)
+        ttl (float): Délai sans heartbeat au-delà duquel une instance est considérée morte
+        vnodes (int): Nombre de points par instance sur l'anneau
+    """
+    def __init__(self, replica_id: str, repository, ttl: float = 45.0, vnodes: int = 64):
+        self.replica_id = replica_id
+        self.repository = repository
+        self.ttl = ttl
+        self.vnodes = vnodes
+        self.ring = HashRing(vnodes=vnodes)
+
+    @property
+    def replicas(self) -> List[str]:
+        return list(self.ring.nodes)
+
+    async def heartbeat(self) -> bool:
+        """
+        Publie le heartbeat et recalcule l'anneau à partir des instances vivantes.
+
+        Returns:
+            bool: True si la liste des instances a changé
+        """
+        await self.repository.heartbeat(self.replica_id)
+        live = set(await self.repository.get_live_replicas(self.ttl))
+        live.add(self.replica_id)
+        if sorted(live) == self.ring.nodes:
+            return False
+
+        previous = set(self.ring.nodes)
+        self.ring = HashRing(live, vnodes=self.vnodes)
+        SHARD_REPLICAS.set(len(live))
+        SHARD_REBALANCES.inc()
+        joined = sorted(live - previous - {self.replica_id})
+        left = sorted(previous - live)
+        logger.info(
+            f"Répartition des streams recalculée : {len(live)} instance(s)"
+            + (f", arrivée(s) : {', '.join(joined)}" if joined else "")
+            + (f", départ(s) : {', '.join(left)}" if left else "")
+        )
+        return True
+
+    def owns(self, login: str) -> bool:
+        """Indique si le streamer revient à cette instance"""
+        return self.ring.owner(login.lower()) == self.replica_id
+
+    def filter(self, logins: Sequence[str]) -> List[str]:
+        """Ne garde que les streamers revenant à cette instance"""
+        return [login for login in logins if self.owns(login)]
+
+    async def leave(self) -> None:
+        """Retire l'instance pour que sa part soit reprise sans attendre l'expiration"""
+        await self.repository.remove(self.replica_id)
+        self.ring = HashRing(vnodes=self.vnodes)
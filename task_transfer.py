@@ -0,0 +1,79 @@
+"""
+Export et import des listes de tâches (fichiers NDJSON ou CSV compressés).
+
+Exporte les données d'un ou plusieurs utilisateurs, ou de toute la base, et
+les réimporte dans la même base ou dans une autre, y compris d'un backend à
+l'autre (PostgreSQL vers SQLite embarqué, par exemple). Le format est déduit
+de l'extension (.ndjson.gz ou .csv.gz) sauf --format explicite.
+
+    python task_transfer.py export taches.ndjson.gz --user 123456789012345678
+    python task_transfer.py export guilde.csv.gz
+    python task_transfer.py import taches.ndjson.gz --database-url sqlite:///data/guilde_bot.db
+"""
+import argparse
+import asyncio
+import os
+
+from dotenv import load_dotenv
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from src.application.services.task_transfer_service import TaskTransferService
+from src.config.config import DatabaseConfig
+from src.infrastructure.config.pooler import engine_options
+from src.infrastructure.config.sqlite import create_sqlite_engines, create_sqlite_schema, is_sqlite_url
+from src.infrastructure.repositories.task_transfer_repository import FORMATS, TaskTransferRepository
+
+
+async def open_engine(url: str):
+    """Moteur de la base visée ; une base SQLite est créée si besoin"""
+    if is_sqlite_url(url):
+        engine, read_engine = create_sqlite_engines(url)
+        await read_engine.dispose()
+        await create_sqlite_schema(engine)
+        return engine
+    return create_async_engine(
+        make_url(url).set(drivername="postgresql+asyncpg"),
+        **engine_options(os.getenv("DB_POOLER_MODE", "none").lower(), {})
+    )
+
+
+async def run(args) -> None:
+    url = args.database_url or os.getenv("DATABASE_URL") or DatabaseConfig.create_from_env().url
+    fmt = args.format or TaskTransferService.detect_format(args.file)
+    engine = await open_engine(url)
+    service = TaskTransferService(TaskTransferRepository(engine))
+    try:
+        if args.command == "export":
+            with open(args.file, "wb") as output:
+                counts = await service.export(output, fmt, args.user)
+            print(f"{counts['task_lists']} liste(s) et {counts['tasks']} tâche(s) exportée(s) dans {args.file}")
+        else:
+            with open(args.file, "rb") as source:
+                result = await service.import_(source, fmt, args.user)
+            print(
+                f"{result.lists_imported} liste(s) et {result.tasks_imported} tâche(s) importée(s), "
+                f"{result.lists_skipped} liste(s) ignorée(s) (nom déjà utilisé)"
+            )
+    finally:
+        await engine.dispose()
+
+
+def main() -> None:
+    load_dotenv()
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("command", choices=["export", "import"])
+    parser.add_argument("file", help="Fichier compressé (.ndjson.gz ou .csv.gz)")
+    parser.add_argument("--format", choices=FORMATS, help="Format du fichier, déduit de l'extension par défaut")
+    parser.add_argument(
+        "--user",
+        type=int,
+        action="append",
+        help="ID Discord d'un propriétaire à exporter ou importer (répétable, tous par défaut)"
+    )
+    parser.add_argument("--database-url", help="Base visée, DATABASE_URL ou DB_HOST... par défaut")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,26 @@
+import os
 import pytest
-from sqlalchemy.ext.asyncio import AsyncSession
+from contextlib import contextmanager
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, func, insert, select, text
+from src.infrastructure.config import database, invalidation
 from src.infrastructure.config.database import Base, get_session
+from src.infrastructure.config.sqlite import LocalReaderHealth, create_sqlite_engines, create_sqlite_schema
 from src.config.config import Config
 from src.domain.entities.guild_member import GuildMember
+from src.infrastructure.metrics.sql import count_queries
 
 # Override de la configuration de base de données pour les tests
 @pytest.fixture(autouse=True)
 def override_db_config(monkeypatch):
     monkeypatch.setenv('DATABASE_URL', 'sqlite:///./test.db')
 
+@pytest.fixture(autouse=True)
+def flush_caches():
+    """Caches en mémoire (menus, filtres) vidés entre les tests"""
+    invalidation.flush_all()
+
 @pytest.fixture(scope="session")
 def test_db():
     """Crée une base de données de test"""
@@ -43,4 +53,87 @@ def test_session(test_engine):
     try:
         yield session
     finally:
-        session.close() 
\ No newline at end of file
+        session.close() 
+@pytest.fixture
+def assert_max_queries():
+    """
+    Vérifie qu'un bloc n'exécute pas plus de N requêtes (détection des N+1) :
+
+        with assert_max_queries(engine, 2):
+            await service.get_user_lists("1")
+    """
+    @contextmanager
+    def check(engine, maximum):
+        sync_engine = getattr(engine, "sync_engine", engine)
+        with count_queries(sync_engine) as counter:
+            yield counter
+        assert counter.count <= maximum, (
+            f"{counter.count} requêtes exécutées (maximum {maximum}) :\n" + "\n".join(counter.statements)
+        )
+    return check
+
+@pytest.fixture(scope="session")
+def postgres_url(tmp_path_factory):
+    """
+    URL de la base PostgreSQL des tests : TEST_POSTGRES_URL, sinon un serveur
+    embarqué (paquet pgserver) démarré pour la session, sinon None.
+    """
+    url = os.getenv("TEST_POSTGRES_URL")
+    if url:
+        yield url
+        return
+    try:
+        import pgserver
+    except ImportError:
+        yield None
+        return
+    server = pgserver.get_server(tmp_path_factory.mktemp("pgdata"), cleanup_mode="delete")
+    yield server.get_uri().replace("postgresql://", "postgresql+asyncpg://", 1)
+    server.cleanup()
+
+@pytest.fixture(params=["sqlite", "postgresql"])
+async def database_backend(request, tmp_path, monkeypatch, postgres_url):
+    """
+    Base réelle pour les tests des repositories, sur chaque backend supporté :
+
+    - sqlite : backend embarqué (WAL, écrivain unique, lecteur en lecture seule) ;
+    - postgresql : base jetable de postgres_url (test ignoré sans serveur disponible).
+
+    Renvoie le nom du backend ; database.engine et les sessions pointent vers la base.
+    """
+    if request.param == "postgresql":
+        if not postgres_url:
+            pytest.skip("Ni TEST_POSTGRES_URL ni pgserver disponibles")
+        engine, read_engine = create_async_engine(postgres_url), None
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+            await conn.run_sync(Base.metadata.create_all)
+    else:
+        engine, read_engine = create_sqlite_engines(f"sqlite+aiosqlite:///{tmp_path / 'backend.db'}")
+        await create_sqlite_schema(engine)
+
+    monkeypatch.setattr(database, "engine", engine)
+    monkeypatch.setattr(database, "async_session", sessionmaker(engine, class_=AsyncSession, expire_on_commit=False))
+    monkeypatch.setattr(database, "read_engine", read_engine)
+    monkeypatch.setattr(database, "read_session", read_engine and sessionmaker(read_engine, class_=AsyncSession, expire_on_commit=False))
+    monkeypatch.setattr(database, "replica_health", read_engine and LocalReaderHealth(read_engine))
+    yield request.param
+    for target in (engine, read_engine):
+        if target is not None:
+            await target.dispose()
+
+@pytest.fixture
+def seed_rows():
+    """Insère des lignes aux IDs explicites, en recalant la séquence PostgreSQL des IDs"""
+    async def seed(entity, rows):
+        table = entity.__table__
+        async with database.engine.begin() as conn:
+            await conn.execute(insert(table), rows)
+            if conn.dialect.name == "postgresql":
+                max_id = (await conn.execute(select(func.max(table.c.id)))).scalar()
+                await conn.execute(
+                    text("SELECT setval(pg_get_serial_sequence(:table, 'id'), :max_id)"),
+                    {"table": table.name, "max_id": max_id}
+                )
+    return seed
+
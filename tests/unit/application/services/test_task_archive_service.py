@@ -0,0 +1,58 @@
+from datetime import UTC, datetime, timedelta
+import pytest
+from sqlalchemy import select
+from src.application.services.task_archive_service import TASKS_ARCHIVED, TaskArchiveService
+from src.domain.entities.task import Task, TaskArchive, TaskList
+from src.infrastructure.config.database import get_session
+
+@pytest.fixture
+async def archive_db(database_backend, seed_rows):
+    """Liste 1 : 5 tâches complétées il y a 60 jours, une récente, une en cours"""
+    old = datetime.now(UTC) - timedelta(days=60)
+    await seed_rows(TaskList, [{"id": 1, "name": "Courses", "user_discord_id": 42}])
+    await seed_rows(Task, [
+        {"id": i, "description": f"Ancienne {i}", "completed": True, "completed_at": old + timedelta(minutes=i),
+         "created_at": old, "task_list_id": 1}
+        for i in range(1, 6)
+    ] + [
+        {"id": 6, "description": "Récente", "completed": True, "completed_at": datetime.now(UTC),
+         "created_at": old, "task_list_id": 1},
+        {"id": 7, "description": "En cours", "completed": False, "completed_at": None, "created_at": old, "task_list_id": 1}
+    ])
+
+async def test_archive_completed_moves_old_tasks_in_batches(archive_db):
+    """Les tâches complétées depuis plus de N jours quittent tasks, par lots, avec leur liste d'origine"""
+    before = TASKS_ARCHIVED.value()
+
+    assert await TaskArchiveService(after_days=30, batch_size=2, pause=0).archive_completed() == 5
+    assert TASKS_ARCHIVED.value() - before == 5
+
+    async with get_session() as session:
+        remaining = (await session.execute(select(Task.id).order_by(Task.id))).scalars().all()
+        task_list = (await session.execute(select(TaskList))).scalar_one()
+        archived = (await session.execute(select(TaskArchive).order_by(TaskArchive.id))).scalars().all()
+    assert remaining == [6, 7]
+    assert (task_list.total_count, task_list.completed_count) == (2, 1)
+    assert [(a.id, a.list_name, a.user_discord_id) for a in archived] == [(i, "Courses", 42) for i in range(1, 6)]
+    assert all(a.archived_at is not None and a.completed_at is not None for a in archived)
+
+    # Rien de plus à archiver
+    assert await TaskArchiveService(after_days=30, batch_size=2, pause=0).archive_completed() == 0
+
+async def test_get_user_archive(archive_db):
+    """Les archives d'un utilisateur sont lues à la demande, les plus récentes d'abord"""
+    await TaskArchiveService(after_days=30, pause=0).archive_completed()
+
+    archive = await TaskArchiveService.get_user_archive(42, limit=3)
+    assert [task.description for task in archive] == ["Ancienne 5", "Ancienne 4", "Ancienne 3"]
+    assert await TaskArchiveService.get_user_archive(1) == []
+
+def test_create_from_env(monkeypatch):
+    """L'archivage est désactivé tant que TASK_ARCHIVE_AFTER_DAYS n'est pas défini"""
+    monkeypatch.delenv("TASK_ARCHIVE_AFTER_DAYS", raising=False)
+    assert TaskArchiveService.create_from_env() is None
+
+    monkeypatch.setenv("TASK_ARCHIVE_AFTER_DAYS", "90")
+    monkeypatch.setenv("TASK_ARCHIVE_BATCH_SIZE", "100")
+    service = TaskArchiveService.create_from_env()
+    assert (service.after_days, service.batch_size) == (90, 100)
@@ -0,0 +1,77 @@
+import pytest
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from src.application.services.task_service import TaskService
+from src.domain.entities.task import Task, TaskList
+from src.infrastructure.config import database
+from src.infrastructure.config.database import Base
+
+@pytest.fixture
+async def sqlite_db(tmp_path, monkeypatch):
+    """Base SQLite temporaire : 5 listes de 10 tâches pour l'utilisateur 1"""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'queries.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(insert(TaskList), [{"id": i, "name": f"Liste {i}", "user_discord_id": 1} for i in range(1, 6)])
+        await conn.execute(insert(Task), [
+            {"description": f"Tâche {n}", "task_list_id": i} for i in range(1, 6) for n in range(10)
+        ])
+    monkeypatch.setattr(database, "engine", engine)
+    monkeypatch.setattr(database, "async_session", sessionmaker(engine, class_=AsyncSession, expire_on_commit=False))
+    yield engine
+    await engine.dispose()
+
+@pytest.mark.parametrize("backend", ["orm", "fast"])
+async def test_get_user_lists_loads_tasks_without_n_plus_one(sqlite_db, assert_max_queries, monkeypatch, backend):
+    """Le nombre de requêtes ne dépend pas du nombre de listes (pas de chargement paresseux de TaskList.tasks)"""
+    monkeypatch.setenv("TASK_REPOSITORY", backend)
+    service = TaskService()
+
+    with assert_max_queries(sqlite_db, 2 if backend == "orm" else 1):
+        lists = await service.get_user_lists(1)
+        assert sum(len(lst.tasks) for lst in lists) == 50
+
+@pytest.mark.parametrize("backend", ["orm", "fast"])
+async def test_get_user_list_headers_skips_tasks(sqlite_db, assert_max_queries, monkeypatch, backend):
+    """Les menus n'ont besoin que des compteurs : une requête, aucune tâche chargée"""
+    monkeypatch.setenv("TASK_REPOSITORY", backend)
+    service = TaskService()
+
+    with assert_max_queries(sqlite_db, 1) as counter:
+        lists = await service.get_user_list_headers(1)
+    assert [(lst.total_count, lst.completed_count) for lst in lists] == [(10, 0)] * 5
+    assert "tasks" not in " ".join(counter.statements).replace("task_lists", "")
+
+@pytest.mark.parametrize("backend, maximum", [("orm", 3), ("fast", 1)])
+async def test_toggle_task_query_budget(sqlite_db, assert_max_queries, monkeypatch, backend, maximum):
+    monkeypatch.setenv("TASK_REPOSITORY", backend)
+    service = TaskService()
+
+    with assert_max_queries(sqlite_db, maximum):
+        assert (await service.toggle_task(1)).completed is True
+
+@pytest.mark.parametrize("backend, maximum", [("orm", 2), ("fast", 1)])
+async def test_add_task_query_budget(sqlite_db, assert_max_queries, monkeypatch, backend, maximum):
+    monkeypatch.setenv("TASK_REPOSITORY", backend)
+    service = TaskService()
+
+    with assert_max_queries(sqlite_db, maximum):
+        assert (await service.add_task("Nouvelle", 1)) is not None
+
+async def test_get_list_query_budget(sqlite_db, assert_max_queries):
+    with assert_max_queries(sqlite_db, 2):
+        task_list = await TaskService().get_list(1)
+        assert len(task_list.tasks) == 10
+
+async def test_create_list_query_budget(sqlite_db, assert_max_queries):
+    """Création en une requête (INSERT ... ON CONFLICT ... RETURNING), doublon compris"""
+    service = TaskService()
+
+    with assert_max_queries(sqlite_db, 1):
+        success, _, task_list = await service.create_list(1, "Nouvelle")
+    assert success and task_list.name == "Nouvelle" and task_list.tasks == []
+
+    with assert_max_queries(sqlite_db, 1):
+        success, message, task_list = await service.create_list(1, "Nouvelle")
+    assert not success and task_list is None and "existe déjà" in message
@@ -0,0 +1,91 @@
+from datetime import UTC, datetime
+import gzip
+import io
+import json
+import pytest
+from sqlalchemy import delete, select
+from src.application.services.task_transfer_service import TaskTransferService
+from src.domain.entities.task import Task, TaskList
+from src.infrastructure.config.database import get_session
+
+CREATED = datetime(2024, 3, 1, 12, 30, tzinfo=UTC)
+
+@pytest.fixture
+async def transfer_db(database_backend, seed_rows):
+    """Utilisateur 1 : deux listes (dont une vide) ; utilisateur 2 : une liste"""
+    await seed_rows(TaskList, [
+        {"id": 1, "name": "Courses", "user_discord_id": 1, "created_at": CREATED},
+        {"id": 2, "name": "Vide", "user_discord_id": 1, "created_at": CREATED},
+        {"id": 3, "name": "Raid", "user_discord_id": 2, "created_at": CREATED},
+    ])
+    await seed_rows(Task, [
+        {"id": 1, "description": "Pain, \"frais\"\net beurre", "completed": True, "completed_at": CREATED,
+         "created_at": CREATED, "task_list_id": 1},
+        {"id": 2, "description": "", "completed": False, "completed_at": None, "created_at": CREATED, "task_list_id": 1},
+        {"id": 3, "description": "Boss", "completed": False, "completed_at": None, "created_at": CREATED, "task_list_id": 3},
+    ])
+
+async def user_lists(user_discord_id):
+    async with get_session() as session:
+        lists = (await session.execute(
+            select(TaskList).where(TaskList.user_discord_id == user_discord_id).order_by(TaskList.name)
+        )).scalars().all()
+        tasks = (await session.execute(
+            select(Task.description, Task.completed, Task.completed_at, TaskList.name)
+            .join(TaskList).where(TaskList.user_discord_id == user_discord_id).order_by(Task.description)
+        )).all()
+    return [(l.name, l.total_count, l.completed_count) for l in lists], [
+        (description, completed, completed_at is not None, name) for description, completed, completed_at, name in tasks
+    ]
+
+@pytest.mark.parametrize("fmt", ["ndjson", "csv"])
+async def test_round_trip_restores_user_data(transfer_db, fmt):
+    """Export d'un utilisateur, suppression, import : listes, tâches et compteurs identiques"""
+    service = TaskTransferService(chunk_size=2)
+    before = await user_lists(1)
+
+    exported = io.BytesIO()
+    assert await service.export(exported, fmt, user_ids=[1]) == {"task_lists": 2, "tasks": 2}
+
+    async with get_session() as session:
+        await session.execute(delete(Task).where(Task.task_list_id.in_([1, 2])))
+        await session.execute(delete(TaskList).where(TaskList.user_discord_id == 1))
+    exported.seek(0)
+    result = await service.import_(exported, fmt)
+
+    assert (result.lists_imported, result.lists_skipped, result.tasks_imported) == (2, 0, 2)
+    assert await user_lists(1) == before
+    assert await user_lists(2) == ([("Raid", 1, 0)], [("Boss", False, False, "Raid")])
+
+async def test_import_is_idempotent_and_filters_owners(transfer_db):
+    """Les listes déjà présentes sont ignorées ; seuls les propriétaires acceptés sont importés"""
+    service = TaskTransferService()
+    exported = io.BytesIO()
+    await service.export(exported)
+
+    exported.seek(0)
+    result = await service.import_(exported)
+    assert (result.lists_imported, result.lists_skipped, result.tasks_imported) == (0, 3, 0)
+
+    async with get_session() as session:
+        await session.execute(delete(Task))
+        await session.execute(delete(TaskList))
+    exported.seek(0)
+    result = await service.import_(exported, user_ids=[2])
+    assert (result.lists_imported, result.tasks_imported) == (1, 1)
+    assert await user_lists(1) == ([], [])
+
+async def test_export_format(transfer_db):
+    """Une ligne JSON par enregistrement, listes puis tâches, avec la table d'origine"""
+    exported = io.BytesIO()
+    await TaskTransferService().export(exported, "ndjson", user_ids=[2])
+
+    records = [json.loads(line) for line in gzip.decompress(exported.getvalue()).decode().splitlines()]
+    assert [record["table"] for record in records] == ["task_lists", "tasks"]
+    assert records[0]["name"] == "Raid" and records[0]["user_discord_id"] == 2
+    assert records[1]["description"] == "Boss" and records[1]["task_list_id"] == 3
+    assert datetime.fromisoformat(records[1]["created_at"]).replace(tzinfo=UTC) == CREATED
+
+def test_detect_format():
+    assert TaskTransferService.detect_format("taches.CSV.gz") == "csv"
+    assert TaskTransferService.detect_format("taches.ndjson.gz") == "ndjson"
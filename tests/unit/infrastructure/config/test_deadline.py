@@ -0,0 +1,84 @@
+import sqlite3
+import pytest
+from datetime import UTC, datetime, timedelta
+from sqlalchemy import create_engine, text
+from src.infrastructure.config import deadline
+from src.infrastructure.config.deadline import (
+    DeadlineExceededError, apply_statement_deadlines, bind_interaction_deadline, deadline_scope, remaining, set_deadline
+)
+
+executed = []
+
+class RecordingCursor(sqlite3.Cursor):
+    """Curseur SQLite enregistrant les SET LOCAL (syntaxe PostgreSQL) sans les exécuter"""
+    def execute(self, sql, parameters=()):
+        if sql.startswith("SET LOCAL"):
+            executed.append(sql)
+            return self
+        return super().execute(sql, parameters)
+
+class RecordingConnection(sqlite3.Connection):
+    def cursor(self, factory=RecordingCursor):
+        return super().cursor(factory)
+
+@pytest.fixture
+def engine():
+    """Moteur SQLite se présentant comme PostgreSQL lors de l'enregistrement des échéances"""
+    executed.clear()
+    engine = create_engine("sqlite://", connect_args={"factory": RecordingConnection})
+    engine.dialect.name = "postgresql"
+    apply_statement_deadlines(engine)
+    del engine.dialect.name
+    yield engine
+    engine.dispose()
+    set_deadline(None)
+
+def test_no_deadline_no_timeout(engine):
+    with engine.begin() as conn:
+        conn.execute(text("SELECT 1"))
+    assert executed == []
+
+def test_statement_timeout_set_once_per_transaction(engine):
+    with deadline_scope(5.0):
+        with engine.begin() as conn:
+            for _ in range(3):
+                conn.execute(text("SELECT 1"))
+        assert len(executed) == 1
+        assert 4000 < int(executed[0].rsplit(" ", 1)[1]) <= 5000
+
+        # SET LOCAL disparaît avec la transaction : réémis dans la suivante
+        with engine.begin() as conn:
+            conn.execute(text("SELECT 1"))
+        assert len(executed) == 2
+
+def test_statement_timeout_tightened_when_budget_shrinks(engine):
+    with deadline_scope(5.0):
+        with engine.begin() as conn:
+            conn.execute(text("SELECT 1"))
+            with deadline_scope(1.0):
+                conn.execute(text("SELECT 1"))
+    assert len(executed) == 2
+    assert int(executed[1].rsplit(" ", 1)[1]) <= 1000
+
+def test_query_refused_past_deadline(engine):
+    with deadline_scope(0.0):
+        with engine.connect() as conn:
+            with pytest.raises(DeadlineExceededError):
+                conn.execute(text("SELECT 1"))
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT 1")).scalar() == 1
+
+def test_deadline_scope_never_extends_a_closer_deadline():
+    with deadline_scope(1.0):
+        with deadline_scope(60.0):
+            assert remaining() <= 1.0
+    assert remaining() is None
+
+def test_interaction_deadline(monkeypatch):
+    monkeypatch.setattr(deadline, "interaction_timeout", 10.0)
+    assert 9.0 < bind_interaction_deadline(datetime.now(UTC)) <= 10.0
+    # Jeton bientôt expiré : le budget se limite à sa durée de validité
+    almost_expired = datetime.now(UTC) - timedelta(minutes=14, seconds=58)
+    assert bind_interaction_deadline(almost_expired) <= 2.0
+    assert bind_interaction_deadline(datetime.now(UTC) - timedelta(minutes=20)) == 0.0
+    set_deadline(None)
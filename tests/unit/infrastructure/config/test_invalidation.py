@@ -0,0 +1,188 @@
+import asyncio
+import json
+from types import SimpleNamespace
+import pytest
+from sqlalchemy import select
+from src.application.services.task_list_cache import TaskListHeaderCache
+from src.application.services.task_service import TaskService
+from src.infrastructure.config import invalidation
+from src.infrastructure.config.invalidation import (
+    CHANNEL, ORIGIN, TASK_LISTS, InvalidationListener, _on_notification, _payloads, publish, subscribe
+)
+
+class RecordingCache:
+    def __init__(self):
+        self.forgotten = []
+        self.flushes = 0
+
+    def forget(self, keys):
+        self.forgotten.extend(keys)
+
+    def flush(self):
+        self.flushes += 1
+
+@pytest.fixture
+def cache():
+    cache = RecordingCache()
+    subscribe("test_entity", cache.forget, cache.flush)
+    return cache
+
+class PostgresConnection:
+    """Connexion factice : enregistre les NOTIFY émis"""
+    dialect = SimpleNamespace(name="postgresql")
+
+    def __init__(self):
+        self.payloads = []
+
+    async def execute(self, statement):
+        self.payloads.append(statement.compile().params)
+
+async def test_publish_invalidates_locally_and_notifies(cache):
+    """Les caches locaux sont invalidés tout de suite, les autres instances par NOTIFY dans la transaction"""
+    connection = PostgresConnection()
+
+    await publish("test_entity", [1, 2, 2, None], connection)
+
+    assert cache.forgotten == [1, 2]
+    [params] = connection.payloads
+    channel, payload = params.values()
+    assert channel == CHANNEL
+    assert json.loads(payload) == {"origin": ORIGIN, "entity": "test_entity", "keys": [1, 2]}
+
+async def test_publish_without_postgres_is_local_only(cache):
+    """Sans PostgreSQL (SQLite, base non initialisée), seule l'invalidation locale a lieu"""
+    await publish("test_entity", [3])
+    assert cache.forgotten == [3]
+
+def test_payloads_respect_notify_limit():
+    """Les clés nombreuses sont réparties en messages de moins de 8000 octets"""
+    keys = list(range(10 ** 12, 10 ** 12 + 2000))
+    payloads = list(_payloads(TASK_LISTS, keys))
+
+    assert len(payloads) > 1
+    assert all(len(payload.encode()) <= invalidation.MAX_PAYLOAD_BYTES for payload in payloads)
+    assert [key for payload in payloads for key in json.loads(payload)["keys"]] == keys
+
+def test_notifications_invalidate_after_commit(cache):
+    """Toute notification invalide, y compris celles de l'instance (reçues après validation) ; un message illisible vide tout"""
+    _on_notification(None, 1, CHANNEL, json.dumps({"origin": "autre", "entity": "test_entity", "keys": [7]}))
+    _on_notification(None, 1, CHANNEL, json.dumps({"origin": ORIGIN, "entity": "test_entity", "keys": [8]}))
+    assert cache.forgotten == [7, 8]
+
+    _on_notification(None, 1, CHANNEL, "{illisible")
+    assert cache.flushes == 1
+
+class FlakyConnection:
+    """Connexion d'écoute qui se coupe au premier test de vie"""
+    def __init__(self):
+        self.channels = []
+        self.closed = False
+
+    async def add_listener(self, channel, callback):
+        self.channels.append(channel)
+
+    async def fetchval(self, query):
+        raise ConnectionError("connexion perdue")
+
+    def is_closed(self):
+        return self.closed
+
+    async def close(self, timeout=None):
+        self.closed = True
+
+async def test_listener_flushes_caches_on_every_connection(cache):
+    """Les notifications manquées pendant une coupure sont compensées par un vidage à la reconnexion"""
+    connections = []
+
+    async def connect():
+        connections.append(FlakyConnection())
+        return connections[-1]
+
+    listener = InvalidationListener(connect, check_interval=0.001, retry_delay=0.001)
+    listener.start()
+    while len(connections) < 3:
+        await asyncio.sleep(0.001)
+    await listener.stop()
+
+    assert all(c.channels == [CHANNEL] for c in connections)
+    assert all(c.closed for c in connections[:-1])
+    assert cache.flushes >= 2
+
+def test_task_list_header_cache():
+    """Invalidation par liste (via le propriétaire) ; un chargement concurrent d'une invalidation n'est pas conservé"""
+    cache = TaskListHeaderCache(ttl=30)
+    lists = [SimpleNamespace(id=10), SimpleNamespace(id=11)]
+
+    cache.put(1, lists, cache.generation)
+    assert cache.get(1) is lists
+    cache.invalidate_lists([11])
+    assert cache.get(1) is None
+
+    generation = cache.generation
+    cache.invalidate_users([2])
+    cache.put(1, lists, generation)
+    assert cache.get(1) is None
+
+def test_task_list_header_cache_forgets_owners_of_dropped_entries():
+    """Les propriétaires des listes ne survivent pas à l'entrée remplacée, invalidée ou expirée"""
+    now = [0.0]
+    cache = TaskListHeaderCache(ttl=30, clock=lambda: now[0])
+
+    cache.put(1, [SimpleNamespace(id=10), SimpleNamespace(id=11)], cache.generation)
+    cache.put(1, [SimpleNamespace(id=11)], cache.generation)
+    assert cache._owners == {11: 1}
+
+    cache.put(2, [SimpleNamespace(id=20)], cache.generation)
+    cache.invalidate_users([1])
+    assert cache._owners == {20: 2}
+
+    now[0] = 30.0
+    assert cache.get(2) is None
+    assert cache._owners == {} and cache._entries == {}
+
+async def test_local_invalidation_waits_for_commit(database_backend):
+    """Un chargement concurrent d'une écriture non validée est invalidé à la validation"""
+    from src.infrastructure.config import database
+    from src.infrastructure.config.unit_of_work import UnitOfWork
+
+    headers = TaskListHeaderCache(ttl=30)
+    subscribe("test_entity", headers.invalidate_users, headers.clear)
+    stale = [SimpleNamespace(id=10)]
+
+    async def concurrent_load():
+        # Lecture entre la publication et la validation : anciennes lignes
+        headers.put(1, stale, headers.generation)
+
+    async with database.async_session() as session:
+        await session.execute(select(1))
+        await publish("test_entity", [1], session)
+        await concurrent_load()
+        assert headers.get(1) is stale
+        await session.commit()
+    assert headers.get(1) is None
+
+    async with UnitOfWork():
+        await publish("test_entity", [1])
+        await concurrent_load()
+    assert headers.get(1) is None
+
+    with pytest.raises(RuntimeError):
+        async with UnitOfWork():
+            await publish("test_entity", [1])
+            await concurrent_load()
+            raise RuntimeError("boom")
+    # Écriture annulée : les lignes chargées restent valables
+    assert headers.get(1) is stale
+
+async def test_service_writes_invalidate_cached_headers(database_backend, seed_rows):
+    """Les écritures du service invalident les en-têtes mis en cache"""
+    from src.domain.entities.task import TaskList
+
+    await seed_rows(TaskList, [{"id": 1, "name": "Courses", "user_discord_id": 1}])
+    service = TaskService()
+
+    assert [lst.total_count for lst in await service.get_user_list_headers(1)] == [0]
+    await service.add_task("Pain", 1)
+    assert [lst.total_count for lst in await service.get_user_list_headers(1)] == [1]
+    await service.create_list(1, "Travail")
+    assert [lst.name for lst in await service.get_user_list_headers(1)] == ["Courses", "Travail"]
@@ -0,0 +1,103 @@
+import asyncio
+import pytest
+from src.infrastructure.config import leadership
+from src.infrastructure.config.leadership import LEADER, LeaderElection, lock_key
+
+class FakeServer:
+    """Serveur factice : un verrou consultatif, libéré à la fermeture de la connexion qui le détient"""
+    def __init__(self):
+        self.holder = None
+
+class FakeConnection:
+    def __init__(self, server):
+        self.server = server
+        self.broken = False
+        self.closed = False
+
+    async def fetchval(self, query, key):
+        if self.broken:
+            raise ConnectionError("connexion perdue")
+        if "pg_try_advisory_lock" in query:
+            if self.server.holder is None:
+                self.server.holder = self
+            return self.server.holder is self
+        return self.server.holder is self
+
+    def is_closed(self):
+        return self.closed
+
+    async def close(self, timeout=None):
+        self.closed = True
+        if self.server.holder is self:
+            self.server.holder = None
+
+    def break_(self):
+        """Coupure : le serveur libère le verrou, le client ne le sait pas encore"""
+        self.broken = True
+        self.server.holder = None
+
+def candidate(server, replica_id):
+    connections = []
+
+    async def connect():
+        connections.append(FakeConnection(server))
+        return connections[-1]
+
+    election = LeaderElection(connect, replica_id, check_interval=0.001, retry_delay=0.001)
+    return election, connections
+
+async def wait_for(predicate):
+    for _ in range(1000):
+        if predicate():
+            return
+        await asyncio.sleep(0.001)
+    raise AssertionError("condition jamais atteinte")
+
+async def test_single_leader_and_failover():
+    """Une seule instance est leader ; son arrêt libère le verrou pour une autre"""
+    server = FakeServer()
+    first, _ = candidate(server, "a")
+    second, _ = candidate(server, "b")
+    first.start()
+    await wait_for(lambda: first.is_leader)
+    second.start()
+    await asyncio.sleep(0.01)
+    assert not second.is_leader
+    assert LEADER.value(labels={"replica": "a"}) == 1
+    assert LEADER.value(labels={"replica": "b"}) == 0
+
+    await first.stop()
+    await wait_for(lambda: second.is_leader)
+    assert LEADER.value(labels={"replica": "a"}) == 0
+    assert LEADER.value(labels={"replica": "b"}) == 1
+    await second.stop()
+
+async def test_confirm_fences_a_leader_that_lost_its_lock():
+    """Un leader dont la connexion est coupée se retire à la vérification, avant d'exécuter une boucle"""
+    server = FakeServer()
+    first, connections = candidate(server, "a")
+    first.check_interval = 60
+    second, _ = candidate(server, "b")
+    first.start()
+    await wait_for(lambda: first.is_leader)
+    second.start()
+
+    connections[0].break_()
+    assert first.is_leader
+    assert not await first.confirm()
+    assert not first.is_leader
+    await wait_for(lambda: second.is_leader)
+
+    await first.stop()
+    await second.stop()
+
+async def test_single_instance_without_election_is_leader(monkeypatch):
+    """Sans PostgreSQL, aucune élection : l'instance est seule et donc leader"""
+    monkeypatch.setattr(leadership, "election", None)
+    assert leadership.is_leader()
+    assert await leadership.confirm_leadership()
+
+def test_lock_key_is_stable_positive_bigint():
+    key = lock_key(leadership.LEADER_LOCK)
+    assert key == lock_key("guilde_bot:background")
+    assert 0 < key < 2 ** 63
@@ -0,0 +1,96 @@
+import asyncio
+import os
+import pytest
+from sqlalchemy import select, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool
+from src.domain.entities.task import TaskList
+from src.infrastructure.config.database import Base
+from src.infrastructure.config.pooler import engine_options, unique_statement_name, uses_external_pool
+
+POOL_SETTINGS = {"pool_size": 5, "max_overflow": 10, "pool_pre_ping": True}
+
+# CAST(... AS ...) et non ::bigint, que text() confond avec un paramètre nommé
+VALUE_QUERY = text("SELECT CAST(:value AS BIGINT)")
+
+def test_transaction_mode_delegates_pool_and_disables_statement_cache():
+    """Mode transaction : NullPool, pas de cache d'instructions préparées, noms uniques"""
+    options = engine_options("transaction", POOL_SETTINGS)
+
+    assert options["poolclass"] is NullPool
+    assert "pool_size" not in options
+    connect_args = options["connect_args"]
+    assert connect_args["statement_cache_size"] == 0
+    assert connect_args["prepared_statement_cache_size"] == 0
+    names = {connect_args["prepared_statement_name_func"]() for _ in range(100)}
+    assert len(names) == 100
+
+@pytest.mark.parametrize("mode", ["none", "session"])
+def test_session_modes_keep_sqlalchemy_pool(mode):
+    """Sans pooler ou en mode session, le pool SQLAlchemy est conservé tel quel"""
+    assert engine_options(mode, POOL_SETTINGS) == {"poolclass": AsyncAdaptedQueuePool, **POOL_SETTINGS}
+
+def test_unknown_mode_is_rejected():
+    with pytest.raises(ValueError, match="DB_POOLER_MODE invalide"):
+        engine_options("statement", POOL_SETTINGS)
+
+async def test_external_pool_detection():
+    """Le préchauffage du pool est ignoré quand PgBouncer gère le pool"""
+    pooled = create_async_engine("postgresql+asyncpg://u:p@localhost/db", **engine_options("none", POOL_SETTINGS))
+    external = create_async_engine("postgresql+asyncpg://u:p@localhost/db", **engine_options("transaction", POOL_SETTINGS))
+
+    assert not uses_external_pool(pooled)
+    assert uses_external_pool(external)
+    assert unique_statement_name().startswith("__asyncpg_")
+    await pooled.dispose()
+    await external.dispose()
+
+def test_value_query_sends_a_bind_parameter():
+    """La requête du test PgBouncer transmet bien un paramètre à asyncpg"""
+    assert str(VALUE_QUERY.compile(dialect=postgresql.asyncpg.dialect())) == "SELECT CAST($1 AS BIGINT)"
+
+async def test_transaction_mode_leaves_no_prepared_statement_on_server(postgres_url):
+    """
+    Sans PgBouncer disponible, sur PostgreSQL directement : aucune instruction
+    préparée ne survit sur la connexion serveur, qu'un autre client recevrait
+    d'un pooler en mode transaction.
+    """
+    if not postgres_url:
+        pytest.skip("Ni TEST_POSTGRES_URL ni pgserver disponibles")
+    engine = create_async_engine(postgres_url, **engine_options("transaction", {}))
+    try:
+        async with engine.connect() as conn:
+            for value in range(3):
+                assert (await conn.execute(VALUE_QUERY, {"value": value})).scalar() == value
+            await conn.commit()
+            prepared = (await conn.execute(text("SELECT statement FROM pg_prepared_statements"))).scalars().all()
+    finally:
+        await engine.dispose()
+    # Seule la requête en cours d'exécution est préparée
+    assert len(prepared) == 1 and "pg_prepared_statements" in prepared[0]
+
+async def test_concurrent_transactions_through_pgbouncer():
+    """
+    PgBouncer en mode transaction (TEST_PGBOUNCER_URL, test ignoré sinon) :
+    des transactions concurrentes partagent les connexions serveur sans
+    collision d'instructions préparées.
+    """
+    url = os.getenv("TEST_PGBOUNCER_URL")
+    if not url:
+        pytest.skip("TEST_PGBOUNCER_URL non définie")
+    engine = create_async_engine(url.replace("postgresql://", "postgresql+asyncpg://"), **engine_options("transaction", {}))
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async def client(index):
+        for attempt in range(5):
+            async with engine.begin() as conn:
+                value = index * 10 + attempt
+                assert (await conn.execute(VALUE_QUERY, {"value": value})).scalar() == value
+                await conn.execute(select(TaskList.id).where(TaskList.user_discord_id == index).limit(1))
+
+    try:
+        await asyncio.gather(*(client(index) for index in range(20)))
+    finally:
+        await engine.dispose()
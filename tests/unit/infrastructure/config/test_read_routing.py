@@ -0,0 +1,123 @@
+import asyncio
+import pytest
+from datetime import UTC, datetime
+from types import SimpleNamespace
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from src.domain.entities.task import TaskList
+from src.infrastructure.commands.base import CorrelatedView
+from src.infrastructure.config import database
+from src.infrastructure.config.database import Base, get_session
+from src.infrastructure.config.read_routing import ReplicaHealth, read_only
+from src.infrastructure.config.unit_of_work import UnitOfWork
+from src.infrastructure.repositories.fast_task_repository import FastTaskRepository
+
+class StubHealth(ReplicaHealth):
+    """Retard de réplication fixé par le test"""
+    def __init__(self, engine, lag, **kwargs):
+        super().__init__(engine, **kwargs)
+        self.lag = lag
+        self.measures = 0
+
+    async def measure_lag(self):
+        self.measures += 1
+        if isinstance(self.lag, Exception):
+            raise self.lag
+        return self.lag
+
+@pytest.fixture
+async def databases(tmp_path, monkeypatch):
+    """Primaire et réplica SQLite distincts : chaque base contient une liste portant son nom"""
+    engines = {}
+    for name in ("primaire", "replica"):
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / name}.db")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+            await conn.execute(insert(TaskList), [{"name": name, "user_discord_id": 1}])
+        engines[name] = engine
+    monkeypatch.setattr(database, "engine", engines["primaire"])
+    monkeypatch.setattr(database, "async_session", sessionmaker(engines["primaire"], class_=AsyncSession, expire_on_commit=False))
+    monkeypatch.setattr(database, "read_engine", engines["replica"])
+    monkeypatch.setattr(database, "read_session", sessionmaker(engines["replica"], class_=AsyncSession, expire_on_commit=False))
+    health = StubHealth(engines["replica"], lag=0.0, max_lag=5.0)
+    monkeypatch.setattr(database, "replica_health", health)
+    yield health
+    for engine in engines.values():
+        await engine.dispose()
+
+async def source():
+    async with get_session() as session:
+        return (await session.execute(select(TaskList.name))).scalar_one()
+
+read_source = read_only(source)
+
+def in_new_task(coro_func):
+    """Chaque interaction Discord s'exécute dans sa propre tâche (contexte isolé)"""
+    return asyncio.create_task(coro_func())
+
+async def test_read_only_methods_use_replica(databases):
+    assert await in_new_task(read_source) == "replica"
+    assert await in_new_task(source) == "primaire"
+
+async def test_reads_after_primary_use_stay_on_primary(databases):
+    """Lire ses propres écritures : une interaction ayant utilisé le primaire y reste"""
+    async def interaction():
+        await source()
+        return await read_source()
+    assert await in_new_task(interaction) == "primaire"
+    # Une autre interaction n'est pas concernée
+    assert await in_new_task(read_source) == "replica"
+
+async def test_unit_of_work_pins_to_primary_after_first_primary_access(databases):
+    async def interaction():
+        async with UnitOfWork():
+            before = await read_source()
+            await source()
+            return before, await read_source()
+    assert await in_new_task(interaction) == ("replica", "primaire")
+
+async def test_primary_pin_ends_with_its_scope(databases):
+    """Les lectures retournent au réplica à la sortie de l'unité et à la nouvelle interaction"""
+    async def interaction():
+        async with UnitOfWork():
+            await source()
+            inside = await read_source()
+        after_unit = await read_source()
+        await source()
+        pinned = await read_source()
+        await CorrelatedView(timeout=None).interaction_check(SimpleNamespace(id=1, created_at=datetime.now(UTC)))
+        return inside, after_unit, pinned, await read_source()
+    assert await in_new_task(interaction) == ("primaire", "replica", "primaire", "replica")
+
+async def test_primary_pin_expires_after_lag_window(databases):
+    """Passé le retard toléré, le réplica a rejoué les écritures : l'épingle expire"""
+    databases.max_lag = 0.05
+
+    async def interaction():
+        await source()
+        pinned = await read_source()
+        await asyncio.sleep(0.1)
+        return pinned, await read_source()
+    assert await in_new_task(interaction) == ("primaire", "replica")
+
+async def test_lagging_or_unreachable_replica_is_skipped(databases):
+    databases.lag = 30.0
+    assert await in_new_task(read_source) == "primaire"
+
+    databases.lag = ConnectionError("injoignable")
+    databases._checked_at = None
+    assert await in_new_task(read_source) == "primaire"
+
+async def test_lag_is_measured_once_per_interval(databases):
+    for _ in range(3):
+        await in_new_task(read_source)
+    assert databases.measures == 1
+
+async def test_no_replica_configured(databases, monkeypatch):
+    monkeypatch.setattr(database, "replica_health", None)
+    assert await in_new_task(read_source) == "primaire"
+
+async def test_fast_repository_reads_from_replica(databases):
+    lists = await in_new_task(lambda: FastTaskRepository().get_user_lists(1))
+    assert [lst.name for lst in lists] == ["replica"]
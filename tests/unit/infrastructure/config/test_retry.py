@@ -0,0 +1,122 @@
+import asyncio
+import pytest
+from sqlalchemy.exc import DBAPIError, OperationalError
+from src.infrastructure.config import retry as retry_module
+from src.infrastructure.config.deadline import deadline_scope
+from src.infrastructure.config.retry import (
+    DB_RETRIES, DB_RETRIES_EXHAUSTED, RetryPolicy, connect_failure_reason, sqlstate_of, transient_reason
+)
+from src.infrastructure.config.unit_of_work import UnitOfWork
+
+class AdaptedError(Exception):
+    """Erreur du pilote adaptée par SQLAlchemy (attributs sqlstate/pgcode)"""
+    def __init__(self, sqlstate):
+        super().__init__(f"sqlstate {sqlstate}")
+        self.sqlstate = self.pgcode = sqlstate
+
+def db_error(sqlstate, invalidated=False):
+    return DBAPIError("SELECT 1", {}, AdaptedError(sqlstate), connection_invalidated=invalidated)
+
+@pytest.fixture(autouse=True)
+def no_sleep(monkeypatch):
+    delays = []
+    async def fake_sleep(delay):
+        delays.append(delay)
+    monkeypatch.setattr(retry_module.asyncio, "sleep", fake_sleep)
+    return delays
+
+def flaky(errors, result="ok"):
+    """Coroutine levant successivement les erreurs données, puis renvoyant le résultat"""
+    calls = []
+    async def operation():
+        calls.append(1)
+        if len(calls) <= len(errors):
+            raise errors[len(calls) - 1]
+        return result
+    operation.calls = calls
+    return operation
+
+def test_sqlstate_of_follows_the_driver_error():
+    assert sqlstate_of(db_error("40001")) == "40001"
+    cause = AdaptedError("40P01")
+    wrapped = RuntimeError("adapté")
+    wrapped.__cause__ = cause
+    assert sqlstate_of(wrapped) == "40P01"
+    assert sqlstate_of(ValueError()) is None
+
+def test_classification():
+    # Conflit de sérialisation : rien n'a été validé, toute opération est rejouable
+    assert transient_reason(db_error("40001"), idempotent=False) == "40001"
+    # Connexion perdue : résultat inconnu, seules les opérations idempotentes sont rejouées
+    assert transient_reason(db_error("08006"), idempotent=True) == "08006"
+    assert transient_reason(db_error("08006"), idempotent=False) is None
+    assert transient_reason(db_error(None, invalidated=True)) == "connection_invalidated"
+    # Erreurs définitives
+    assert transient_reason(db_error("23505")) is None
+    assert transient_reason(OperationalError("SELECT 1", {}, Exception("syntax"))) is None
+    assert connect_failure_reason(ConnectionRefusedError()) is not None
+    assert connect_failure_reason(asyncio.TimeoutError()) is not None
+
+async def test_retries_transient_errors_then_succeeds(no_sleep):
+    operation = flaky([db_error("40001"), db_error("57P01")])
+    before = DB_RETRIES.value({"operation": "op", "reason": "40001"})
+    result = await RetryPolicy(max_attempts=3).call(operation, operation="op")
+    assert result == "ok"
+    assert len(operation.calls) == 3
+    assert len(no_sleep) == 2
+    assert DB_RETRIES.value({"operation": "op", "reason": "40001"}) == before + 1
+
+async def test_gives_up_after_max_attempts():
+    operation = flaky([db_error("40001")] * 5)
+    before = DB_RETRIES_EXHAUSTED.value({"operation": "op"})
+    with pytest.raises(DBAPIError):
+        await RetryPolicy(max_attempts=3).call(operation, operation="op")
+    assert len(operation.calls) == 3
+    assert DB_RETRIES_EXHAUSTED.value({"operation": "op"}) == before + 1
+
+async def test_permanent_error_is_not_retried():
+    operation = flaky([db_error("23505")])
+    with pytest.raises(DBAPIError):
+        await RetryPolicy().call(operation)
+    assert len(operation.calls) == 1
+
+async def test_non_idempotent_operation_not_replayed_after_lost_connection():
+    operation = flaky([db_error("08006")])
+    with pytest.raises(DBAPIError):
+        await RetryPolicy(idempotent=False).call(operation)
+    assert len(operation.calls) == 1
+
+def test_backoff_is_jittered_and_capped():
+    policy = RetryPolicy(base_delay=0.1, max_delay=0.3)
+    delays = [policy.backoff(attempt) for attempt in range(1, 10) for _ in range(20)]
+    assert all(0 <= delay <= 0.3 for delay in delays)
+    assert len(set(delays)) > 1
+
+async def test_deadline_bounds_the_retries():
+    operation = flaky([db_error("40001")] * 5)
+    policy = RetryPolicy(max_attempts=10, base_delay=1.0, max_delay=1.0, max_elapsed=60.0)
+    with deadline_scope(0.0):
+        with pytest.raises(DBAPIError):
+            await policy.call(operation)
+    assert len(operation.calls) == 1
+
+async def test_no_retry_inside_unit_of_work():
+    operation = flaky([db_error("40001")])
+    async with UnitOfWork():
+        with pytest.raises(DBAPIError):
+            await RetryPolicy().call(operation)
+    assert len(operation.calls) == 1
+
+async def test_decorator_keeps_the_signature():
+    calls = []
+
+    @RetryPolicy()
+    async def read(value):
+        calls.append(value)
+        if len(calls) == 1:
+            raise db_error("40001")
+        return value * 2
+
+    assert await read(21) == 42
+    assert read.__name__ == "read"
+    assert calls == [21, 21]
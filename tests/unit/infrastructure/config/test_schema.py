@@ -0,0 +1,75 @@
+import pytest
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import create_async_engine
+from src.infrastructure.config import schema
+from alembic import command
+from src.infrastructure.config.schema import SchemaVersionError, alembic_config, check_schema_version, expected_heads
+
+HEAD = "009_create_tasks_archive"
+
+@pytest.fixture
+async def engine(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'schema.db'}")
+    yield engine
+    await engine.dispose()
+
+async def stamp(engine, revision):
+    async with engine.begin() as conn:
+        await conn.execute(text("CREATE TABLE IF NOT EXISTS alembic_version (version_num VARCHAR(32) NOT NULL)"))
+        await conn.execute(text("DELETE FROM alembic_version"))
+        await conn.execute(text("INSERT INTO alembic_version VALUES (:revision)"), {"revision": revision})
+
+def test_expected_head_is_single():
+    """Les migrations forment une seule branche"""
+    assert expected_heads() == {HEAD}
+
+async def test_up_to_date_schema_costs_one_query(engine):
+    """Une base à jour n'est vérifiée que par une requête"""
+    await stamp(engine, HEAD)
+    statements = []
+    event.listen(engine.sync_engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    await check_schema_version(engine)
+    assert statements == ["SELECT version_num FROM alembic_version"]
+
+async def test_empty_database_fails_fast(engine, monkeypatch):
+    """Une base vierge fait échouer le démarrage sans migration automatique"""
+    upgrades = []
+    monkeypatch.setattr(schema, "_upgrade", lambda connection: upgrades.append(connection))
+
+    with pytest.raises(SchemaVersionError) as exc_info:
+        await check_schema_version(engine)
+    assert exc_info.value.current == set()
+    assert "DB_AUTO_MIGRATE" in exc_info.value.message
+    assert upgrades == []
+
+async def test_outdated_schema_is_migrated_when_enabled(engine, monkeypatch):
+    """La migration automatique applique les révisions manquantes puis revérifie"""
+    await stamp(engine, "003_create_stream_tables")
+
+    def fake_upgrade(connection):
+        connection.execute(text("UPDATE alembic_version SET version_num = :head"), {"head": HEAD})
+    monkeypatch.setattr(schema, "_upgrade", fake_upgrade)
+
+    await check_schema_version(engine, auto_migrate=True)
+    assert await schema.get_current_revisions(engine) == {HEAD}
+
+async def test_unknown_revision_is_never_migrated(engine, monkeypatch):
+    """Une base plus récente que le code fait toujours échouer le démarrage"""
+    await stamp(engine, "999_from_the_future")
+    monkeypatch.setattr(schema, "_upgrade", lambda connection: pytest.fail("migration inattendue"))
+
+    with pytest.raises(SchemaVersionError, match="999_from_the_future"):
+        await check_schema_version(engine, auto_migrate=True)
+
+async def test_baseline_revision_creates_member_tables(engine):
+    """Une base vierge reçoit les tables autrefois créées par create_all"""
+    def upgrade(connection):
+        command.upgrade(alembic_config(connection), "000_create_member_tables")
+
+    async with engine.begin() as conn:
+        await conn.run_sync(upgrade)
+        tables = await conn.run_sync(lambda sync: set(sync.dialect.get_table_names(sync)))
+
+    assert {"guild_members", "users"} <= tables
+    assert await schema.get_current_revisions(engine) == {"000_create_member_tables"}
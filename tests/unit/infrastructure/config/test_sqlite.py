@@ -0,0 +1,74 @@
+import asyncio
+import pytest
+from types import SimpleNamespace
+from sqlalchemy import select, text
+from sqlalchemy.exc import OperationalError
+from src.domain.entities.task import TaskList
+from src.infrastructure.config import database
+from src.infrastructure.config.database import get_session, init_db
+from src.infrastructure.config.retry import transient_reason
+from src.infrastructure.config.sqlite import create_sqlite_engines, create_sqlite_schema
+from src.infrastructure.repositories.fast_task_repository import FastTaskRepository
+from src.application.services.task_service import TaskService
+
+@pytest.fixture
+async def engines(tmp_path):
+    writer, reader = create_sqlite_engines(f"sqlite:///{tmp_path / 'embarquee.db'}", {"pool_size": 3})
+    await create_sqlite_schema(writer)
+    yield writer, reader
+    await writer.dispose()
+    await reader.dispose()
+
+async def pragma(engine, name):
+    async with engine.connect() as conn:
+        return (await conn.execute(text(f"PRAGMA {name}"))).scalar()
+
+async def test_pragmas(engines):
+    writer, reader = engines
+    assert await pragma(writer, "journal_mode") == "wal"
+    assert await pragma(writer, "foreign_keys") == 1
+    assert await pragma(writer, "synchronous") == 1  # NORMAL
+    assert await pragma(writer, "query_only") == 0
+    assert await pragma(reader, "query_only") == 1
+
+async def test_single_writer_and_read_only_reader(engines):
+    writer, reader = engines
+    assert writer.pool.size() == 1 and writer.pool._max_overflow == 0
+    assert reader.pool.size() == 3
+    async with reader.connect() as conn:
+        with pytest.raises(OperationalError):
+            await conn.execute(text("INSERT INTO task_lists (name, user_discord_id) VALUES ('x', 1)"))
+
+def test_memory_database_rejected():
+    with pytest.raises(ValueError):
+        create_sqlite_engines("sqlite:///:memory:")
+
+def test_busy_database_is_transient():
+    import sqlite3
+    error = OperationalError("INSERT", {}, sqlite3.OperationalError("database is locked"))
+    assert transient_reason(error, idempotent=False) == "sqlite_busy"
+
+async def test_init_db_embedded_backend(tmp_path, monkeypatch):
+    for name in ("engine", "async_session", "read_engine", "read_session", "replica_health", "ready"):
+        monkeypatch.setattr(database, name, getattr(database, name))
+    config = SimpleNamespace(url=f"sqlite:///{tmp_path / 'bot.db'}", pool_min_size=1)
+    await init_db(config)
+    try:
+        assert database.ready is True
+        assert database.engine.url.drivername == "sqlite+aiosqlite"
+        assert database.read_engine is not None
+
+        # Écritures concurrentes : mises en file sur l'écrivain, sans « database is locked »
+        service = TaskService()
+        results = await asyncio.gather(*(service.create_list(n % 3, f"Liste {n}") for n in range(20)))
+        assert all(success for success, _, _ in results)
+        repository = FastTaskRepository()
+        tasks = await asyncio.gather(*(repository.add_task(f"Tâche {n}", 1) for n in range(20)))
+        assert all(task is not None for task in tasks)
+
+        assert len(await service.get_user_lists(0)) == 7
+        async with get_session() as session:
+            assert len((await session.execute(select(TaskList))).scalars().all()) == 20
+    finally:
+        await database.engine.dispose()
+        await database.read_engine.dispose()
@@ -0,0 +1,120 @@
+import pytest
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from src.infrastructure.config import database
+from src.infrastructure.config.database import Base, get_session
+from src.infrastructure.config.sqlite import configure_sqlite
+from src.infrastructure.config.unit_of_work import UnitOfWork, current_unit_of_work, unit_of_work
+from src.domain.entities.task import TaskList
+
+@pytest.fixture
+async def sqlite_db(tmp_path, monkeypatch):
+    """Base SQLite temporaire installée comme moteur global, avec compteur d'emprunts au pool"""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'uow.db'}")
+    configure_sqlite(engine.sync_engine)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    checkouts = []
+    event.listen(engine.sync_engine, "checkout", lambda *args: checkouts.append(1))
+    monkeypatch.setattr(database, "engine", engine)
+    monkeypatch.setattr(database, "async_session", sessionmaker(engine, class_=AsyncSession, expire_on_commit=False))
+    yield checkouts
+    await engine.dispose()
+
+async def add_list(name):
+    """Écrit comme les services : session, add, commit"""
+    async with get_session() as session:
+        session.add(TaskList(name=name, user_discord_id=1))
+        await session.commit()
+
+async def list_names():
+    async with get_session() as session:
+        result = await session.execute(select(TaskList.name).order_by(TaskList.name))
+        return list(result.scalars().all())
+
+@pytest.mark.asyncio
+async def test_unit_of_work_shares_one_connection(sqlite_db):
+    """Test que tous les appels d'une unité partagent une seule connexion du pool"""
+    checkouts = sqlite_db
+
+    async with UnitOfWork() as unit:
+        await add_list("a")
+        async with get_session() as first, get_session() as second:
+            assert first is second is unit.session
+        assert await list_names() == ["a"]
+
+    assert len(checkouts) == 1
+    assert current_unit_of_work() is None
+    assert await list_names() == ["a"]
+
+@pytest.mark.asyncio
+async def test_unit_of_work_rolls_back_on_exception(sqlite_db):
+    """Test que les commit() des services ne valident rien avant la sortie de l'unité"""
+    with pytest.raises(RuntimeError):
+        async with UnitOfWork():
+            await add_list("a")
+            raise RuntimeError("boom")
+
+    assert await list_names() == []
+
+@pytest.mark.asyncio
+async def test_nested_unit_reuses_outer_unit(sqlite_db):
+    """Test qu'une unité imbriquée réutilise l'unité englobante"""
+    checkouts = sqlite_db
+
+    @unit_of_work
+    async def handler():
+        await add_list("b")
+        return current_unit_of_work()
+
+    async with UnitOfWork() as outer:
+        assert await handler() is outer
+        await add_list("a")
+
+    assert len(checkouts) == 1
+    assert await list_names() == ["a", "b"]
+
+@pytest.mark.asyncio
+async def test_unit_without_database_access_borrows_no_connection(sqlite_db):
+    """Test que la connexion n'est empruntée qu'au premier accès à la base"""
+    checkouts = sqlite_db
+
+    async with UnitOfWork() as unit:
+        pass
+
+    assert unit.connection is None
+    assert checkouts == []
+
+@pytest.mark.asyncio
+async def test_failed_step_only_rolls_back_its_own_writes(sqlite_db):
+    """Test qu'une étape en échec dans un SAVEPOINT ne fait pas perdre les précédentes"""
+    async with UnitOfWork():
+        await add_list("a")
+        try:
+            async with get_session(savepoint=True) as session:
+                session.add(TaskList(name="b", user_discord_id=1))
+                await session.flush()
+                raise RuntimeError("boom")
+        except RuntimeError:
+            pass
+        await add_list("c")
+
+    assert await list_names() == ["a", "c"]
+
+@pytest.mark.asyncio
+async def test_session_scope_uses_no_savepoint_by_default(sqlite_db):
+    """Test que le SAVEPOINT n'est créé qu'à la demande"""
+    statements = []
+    event.listen(database.engine.sync_engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    async with UnitOfWork():
+        await add_list("a")
+        await add_list("b")
+    assert not any("SAVEPOINT" in statement for statement in statements)
+
+    async with UnitOfWork():
+        async with get_session(savepoint=True) as session:
+            session.add(TaskList(name="c", user_discord_id=1))
+    assert any("SAVEPOINT" in statement for statement in statements)
+    assert await list_names() == ["a", "b", "c"]
@@ -0,0 +1,58 @@
+import pytest
+from sqlalchemy import event, func, select
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from src.domain.entities.task import Task
+from src.infrastructure.config.database import Base
+from src.infrastructure.config.warmup import READ_QUERIES, WRITE_QUERIES, warm_up_pool
+
+@pytest.fixture
+async def engine(tmp_path):
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'warmup.db'}",
+        poolclass=AsyncAdaptedQueuePool,
+        pool_size=3,
+        max_overflow=5
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    await engine.dispose()
+    yield engine
+    await engine.dispose()
+
+async def test_opens_connections_and_primes_queries(engine):
+    """Les connexions minimales restent ouvertes dans le pool, requêtes déjà exécutées"""
+    connects, statements = [], []
+    event.listen(engine.sync_engine, "connect", lambda *args: connects.append(1))
+    event.listen(engine.sync_engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    await warm_up_pool(engine, 2)
+
+    assert len(connects) == 2
+    assert engine.pool.checkedin() == 2
+    assert len(statements) == 2 * (len(READ_QUERIES) + len(WRITE_QUERIES))
+
+async def test_priming_writes_nothing(engine):
+    await warm_up_pool(engine, 1)
+    async with engine.connect() as conn:
+        assert (await conn.execute(select(func.count()).select_from(Task))).scalar() == 0
+
+async def test_size_is_bounded_by_pool_size(engine):
+    """Le préchauffage n'ouvre pas de connexions de débordement"""
+    await warm_up_pool(engine, 10)
+    assert engine.pool.checkedin() == 3
+    assert engine.pool.overflow() <= 0
+
+async def test_replica_skips_writes(engine):
+    statements = []
+    event.listen(engine.sync_engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    await warm_up_pool(engine, 1, include_writes=False)
+    assert len(statements) == len(READ_QUERIES)
+
+async def test_unreachable_database_does_not_raise(tmp_path):
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'absent' / 'warmup.db'}",
+        poolclass=AsyncAdaptedQueuePool
+    )
+    await warm_up_pool(engine, 2)
+    await engine.dispose()
@@ -0,0 +1,31 @@
+import asyncio
+import logging
+from datetime import UTC, datetime
+from types import SimpleNamespace
+from src.infrastructure.commands.base import CorrelatedCommandTree, CorrelatedModal, CorrelatedView
+from src.infrastructure.config.deadline import remaining
+from src.infrastructure.logging.correlation import get_correlation_id, set_correlation_id
+
+async def test_views_and_commands_bind_interaction_id():
+    """Chaque interaction (commande, vue, formulaire) définit l'identifiant et l'échéance de sa tâche"""
+    async def handle(check, interaction_id):
+        assert await check(SimpleNamespace(id=interaction_id, created_at=datetime.now(UTC))) is True
+        assert remaining() > 0
+        return get_correlation_id()
+
+    view = CorrelatedView(timeout=None)
+    modal = CorrelatedModal(title="Test")
+    tree = CorrelatedCommandTree.__new__(CorrelatedCommandTree)
+    results = await asyncio.gather(
+        asyncio.create_task(handle(view.interaction_check, 1)),
+        asyncio.create_task(handle(modal.interaction_check, 2)),
+        asyncio.create_task(handle(tree.interaction_check, 3))
+    )
+    assert results == ["1", "2", "3"]
+    # Les tâches des interactions ne modifient pas le contexte appelant
+    assert get_correlation_id() == "N/A"
+    assert remaining() is None
+
+def test_correlation_id_defaults_outside_interaction():
+    set_correlation_id(None)
+    assert get_correlation_id() == "N/A"
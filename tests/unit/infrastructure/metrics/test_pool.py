@@ -0,0 +1,93 @@
+import pytest
+from sqlalchemy import exc, text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, StaticPool
+from src.infrastructure.metrics.pool import (
+    POOL_CHECKOUT_WAIT,
+    POOL_IDLE,
+    POOL_IN_USE,
+    POOL_OVERFLOW,
+    POOL_OVERFLOW_OPENED,
+    POOL_TIMEOUTS,
+    checkout_timer,
+    instrument_pool
+)
+
+LABELS = {"pool": "test"}
+
+@pytest.fixture
+async def engine(tmp_path):
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}",
+        poolclass=AsyncAdaptedQueuePool,
+        pool_logging_name="test",
+        pool_size=1,
+        max_overflow=1,
+        pool_timeout=0.1
+    )
+    instrument_pool(engine.sync_engine)
+    yield engine
+    await engine.dispose()
+
+async def connect(engine):
+    with checkout_timer(engine):
+        connection = await engine.connect()
+    await connection.execute(text("SELECT 1"))
+    return connection
+
+async def test_pool_gauges_follow_checkouts(engine):
+    """Les jauges reflètent les connexions empruntées, libres et en débordement"""
+    overflow_before = POOL_OVERFLOW_OPENED.value(LABELS)
+    waits_before = POOL_CHECKOUT_WAIT.count(LABELS)
+
+    first = await connect(engine)
+    second = await connect(engine)
+    assert POOL_IN_USE.value(LABELS) == 2
+    assert POOL_OVERFLOW.value(LABELS) == 1
+    assert POOL_OVERFLOW_OPENED.value(LABELS) == overflow_before + 1
+
+    await second.close()
+    await first.close()
+    assert POOL_IN_USE.value(LABELS) == 0
+    assert POOL_IDLE.value(LABELS) == 1
+    assert POOL_OVERFLOW.value(LABELS) == 0
+    assert POOL_CHECKOUT_WAIT.count(LABELS) == waits_before + 2
+
+async def test_pool_timeout_is_counted(engine):
+    """Un emprunt abandonné après pool_timeout est compté"""
+    timeouts_before = POOL_TIMEOUTS.value(LABELS)
+    first = await connect(engine)
+    second = await connect(engine)
+
+    with pytest.raises(exc.TimeoutError):
+        await connect(engine)
+    assert POOL_TIMEOUTS.value(LABELS) == timeouts_before + 1
+
+    await second.close()
+    await first.close()
+
+async def test_listeners_follow_recreated_pool(engine):
+    """Les métriques restent justes après un dispose() du moteur"""
+    await engine.dispose()
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+        assert POOL_IN_USE.value(LABELS) == 1
+    assert POOL_IN_USE.value(LABELS) == 0
+
+@pytest.mark.parametrize("poolclass", [NullPool, StaticPool])
+async def test_any_pool_class_is_measured(tmp_path, poolclass):
+    """Pool délégué (NullPool) ou connexion unique (StaticPool) : mêmes métriques"""
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}", poolclass=poolclass, pool_logging_name="test"
+    )
+    instrument_pool(engine.sync_engine)
+    waits_before = POOL_CHECKOUT_WAIT.count(LABELS)
+
+    connection = await connect(engine)
+    assert POOL_IN_USE.value(LABELS) == 1
+    await connection.close()
+    assert POOL_IN_USE.value(LABELS) == 0
+    assert POOL_IDLE.value(LABELS) == (1 if poolclass is StaticPool else 0)
+    assert POOL_OVERFLOW.value(LABELS) == 0
+    assert POOL_CHECKOUT_WAIT.count(LABELS) == waits_before + 1
+    await engine.dispose()
@@ -0,0 +1,45 @@
+import pytest
+from src.infrastructure.metrics import MetricsRegistry
+
+def test_counter_and_gauge_render():
+    """Test l'export des compteurs et jauges au format Prometheus"""
+    # Arrange
+    registry = MetricsRegistry()
+    counter = registry.counter("requests_total", "Requêtes")
+    gauge = registry.gauge("budget", "Budget restant")
+
+    # Act
+    counter.inc(labels={"endpoint": "streams"})
+    counter.inc(2, labels={"endpoint": "streams"})
+    gauge.set(42)
+    output = registry.render()
+
+    # Assert
+    assert 'requests_total{endpoint="streams"} 3.0' in output
+    assert "budget 42.0" in output
+    assert "# TYPE requests_total counter" in output
+
+def test_histogram_buckets_are_cumulative():
+    """Test que les seaux d'un histogramme sont cumulés"""
+    # Arrange
+    registry = MetricsRegistry()
+    histogram = registry.histogram("latency", "Latence", buckets=(0.1, 1.0))
+
+    # Act
+    histogram.observe(0.05)
+    histogram.observe(0.5)
+    histogram.observe(5)
+    output = registry.render()
+
+    # Assert
+    assert 'latency_bucket{le="0.1"} 1' in output
+    assert 'latency_bucket{le="1.0"} 2' in output
+    assert 'latency_bucket{le="+Inf"} 3' in output
+    assert histogram.count() == 3
+
+def test_registry_reuses_metric_and_rejects_type_conflict():
+    """Test que le registre réutilise une métrique existante"""
+    registry = MetricsRegistry()
+    assert registry.counter("a", "A") is registry.counter("a", "A")
+    with pytest.raises(ValueError):
+        registry.gauge("a", "A")
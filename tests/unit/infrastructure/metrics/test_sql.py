@@ -0,0 +1,54 @@
+import asyncio
+import logging
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import create_async_engine
+from src.infrastructure.logging.correlation import set_correlation_id
+from src.infrastructure.metrics.sql import QUERY_DURATION, instrument_queries, normalize_statement
+
+@pytest.mark.parametrize("statement, expected", [
+    ("SELECT * FROM tasks WHERE id = $1::INTEGER", "SELECT * FROM tasks WHERE id = ?"),
+    ("SELECT * FROM t WHERE name = 'l''été' AND n = 42", "SELECT * FROM t WHERE name = ? AND n = ?"),
+    ("SELECT id FROM tasks WHERE task_list_id IN (?, ?, ?)", "SELECT id FROM tasks WHERE task_list_id IN (?)"),
+    ("UPDATE t SET a=%(a)s\n   WHERE id=%(id_1)s", "UPDATE t SET a=? WHERE id=?"),
+    ("INSERT INTO t VALUES ($1::TIMESTAMP WITH TIME ZONE, :name)", "INSERT INTO t VALUES (?, ?)"),
+])
+def test_normalize_statement(statement, expected):
+    assert normalize_statement(statement) == expected
+
+@pytest.fixture
+async def engine(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'sql.db'}")
+    yield engine
+    await engine.dispose()
+
+async def test_latency_is_recorded_by_normalized_statement(engine):
+    instrument_queries(engine.sync_engine, slow_query_seconds=60)
+    labels = {"statement": "SELECT ? + ?"}
+    before = QUERY_DURATION.count(labels)
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1 + 1"))
+        await conn.execute(text("SELECT 2 + :n"), {"n": 3})
+    assert QUERY_DURATION.count(labels) == before + 2
+
+async def test_slow_queries_are_logged_with_correlation_id(engine, caplog):
+    instrument_queries(engine.sync_engine, slow_query_seconds=0)
+
+    async def interaction():
+        set_correlation_id("1234")
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 42"))
+
+    with caplog.at_level(logging.WARNING, logger="src.infrastructure.metrics.sql.slow"):
+        await asyncio.create_task(interaction())
+    record = next(r for r in caplog.records if "SELECT ?" in r.getMessage())
+    assert record.correlation_id == "1234"
+
+async def test_failed_query_does_not_skew_timings(engine):
+    instrument_queries(engine.sync_engine, slow_query_seconds=60)
+    async with engine.connect() as conn:
+        with pytest.raises(OperationalError):
+            await conn.execute(text("SELECT * FROM absente"))
+        await conn.execute(text("SELECT 1"))
+        assert conn.sync_connection.info["query_started_at"] == []
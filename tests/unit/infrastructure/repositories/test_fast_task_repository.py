@@ -0,0 +1,173 @@
+import pytest
+from sqlalchemy import event, select, update
+from src.application.services.task_service import TaskService
+from src.domain.entities.task import Task, TaskList
+from src.infrastructure.config import database
+from src.infrastructure.config.database import get_session
+from src.infrastructure.config.unit_of_work import UnitOfWork
+from src.infrastructure.repositories.fast_task_repository import (
+    FastTaskRepository,
+    TaskListRow,
+    TaskRow,
+    task_repository_backend
+)
+
+@pytest.fixture
+async def task_db(database_backend, seed_rows):
+    """Deux listes pour l'utilisateur 1 et une pour l'utilisateur 2, sur chaque backend"""
+    await seed_rows(TaskList, [
+        {"id": 1, "name": "Courses", "user_discord_id": 1},
+        {"id": 2, "name": "Vide", "user_discord_id": 1},
+        {"id": 3, "name": "Autre", "user_discord_id": 2}
+    ])
+    await seed_rows(Task, [
+        {"id": 1, "description": "Pain", "completed": False, "task_list_id": 1},
+        {"id": 2, "description": "Lait", "completed": True, "task_list_id": 1},
+        {"id": 3, "description": "Ailleurs", "completed": False, "task_list_id": 3}
+    ])
+    # Connexions empruntées au moteur principal (écrivain)
+    checkouts = []
+    event.listen(database.engine.sync_engine, "checkout", lambda *args: checkouts.append(1))
+    return checkouts
+
+async def test_get_user_lists_groups_tasks(task_db):
+    """Les listes d'un utilisateur sont chargées avec leurs tâches en une requête"""
+    lists = await FastTaskRepository().get_user_lists(1)
+
+    assert [lst.name for lst in lists] == ["Courses", "Vide"]
+    assert isinstance(lists[0], TaskListRow)
+    assert [(t.id, t.description, t.completed) for t in lists[0].tasks] == [(1, "Pain", False), (2, "Lait", True)]
+    assert lists[1].tasks == []
+    assert await FastTaskRepository().get_user_lists(999) == []
+
+async def test_toggle_task(task_db):
+    """La bascule inverse l'état et renvoie la tâche à jour"""
+    repository = FastTaskRepository()
+
+    task = await repository.toggle_task(1)
+    assert isinstance(task, TaskRow)
+    assert task.completed is True and task.task_list_id == 1
+    assert (await repository.toggle_task(1)).completed is False
+    assert await repository.toggle_task(999) is None
+
+async def test_add_task(task_db):
+    """L'ajout renvoie la tâche créée, ou None si la liste n'existe pas"""
+    repository = FastTaskRepository()
+
+    task = await repository.add_task("Beurre", 2)
+    assert task.description == "Beurre" and task.completed is False and task.created_at is not None
+    assert await repository.add_task("Perdue", 999) is None
+
+    lists = await repository.get_user_lists(1)
+    assert [t.description for t in lists[1].tasks] == ["Beurre"]
+
+async def test_shares_unit_of_work_transaction(task_db):
+    """Dans une UnitOfWork, le chemin rapide voit les écritures de l'ORM et annule avec elle"""
+    repository = FastTaskRepository()
+    with pytest.raises(RuntimeError):
+        async with UnitOfWork():
+            async with get_session() as session:
+                loaded = (await session.execute(select(Task).filter_by(id=1))).scalar_one()
+                session.add(TaskList(id=4, name="Nouvelle", user_discord_id=1))
+                await session.commit()
+            await repository.add_task("Dans la nouvelle", 4)
+            await repository.toggle_task(1)
+            assert [lst.name for lst in await repository.get_user_lists(1)][-1] == "Nouvelle"
+            async with get_session() as session:
+                # L'entité chargée avant la bascule est rafraîchie
+                await session.refresh(loaded)
+                assert loaded.completed is True
+            raise RuntimeError("annulation")
+
+    assert len(task_db) == 1
+    lists = await repository.get_user_lists(1)
+    assert [lst.name for lst in lists] == ["Courses", "Vide"]
+    assert lists[0].tasks[0].completed is False
+
+def test_backend_selection(monkeypatch):
+    """TASK_REPOSITORY choisit le backend ; une valeur inconnue revient à l'ORM"""
+    monkeypatch.delenv("TASK_REPOSITORY", raising=False)
+    assert task_repository_backend() == "orm"
+    assert TaskService().fast_repository is None
+
+    monkeypatch.setenv("TASK_REPOSITORY", "fast")
+    assert isinstance(TaskService().fast_repository, FastTaskRepository)
+
+    monkeypatch.setenv("TASK_REPOSITORY", "raw")
+    assert task_repository_backend() == "orm"
+
+async def test_service_uses_fast_path(task_db, monkeypatch):
+    """Le service renvoie les objets du chemin rapide pour les opérations fréquentes"""
+    monkeypatch.setenv("TASK_REPOSITORY", "fast")
+    service = TaskService()
+
+    assert (await service.toggle_task(2)).completed is False
+    assert isinstance(await service.add_task("Œufs", 1), TaskRow)
+    lists = await service.get_user_lists(1)
+    assert [t.description for t in lists[0].tasks] == ["Pain", "Lait", "Œufs"]
+
+async def test_snowflake_user_ids(task_db, seed_rows):
+    """Les ID Discord (entiers 64 bits) sont stockés et comparés comme des entiers"""
+    snowflake = 1234567890123456789
+    await seed_rows(TaskList, [{"id": 10, "name": "Snowflake", "user_discord_id": snowflake}])
+
+    lists = await FastTaskRepository().get_user_lists(snowflake)
+    assert [(lst.name, lst.user_discord_id) for lst in lists] == [("Snowflake", snowflake)]
+    async with get_session() as session:
+        stored = (await session.execute(select(TaskList).filter_by(id=10))).scalar_one()
+        assert stored.user_discord_id == snowflake
+
+async def test_get_user_list_headers(task_db):
+    """Les en-têtes portent les compteurs tenus par les triggers, sans les tâches"""
+    headers = await FastTaskRepository().get_user_list_headers(1)
+
+    assert [(lst.name, lst.total_count, lst.completed_count) for lst in headers] == [("Courses", 2, 1), ("Vide", 0, 0)]
+    assert all(lst.tasks == [] for lst in headers)
+
+async def test_counters_follow_every_write_path(task_db, monkeypatch):
+    """Chemin rapide, ORM et suppression en masse tiennent les compteurs à jour"""
+    repository = FastTaskRepository()
+    await repository.add_task("Beurre", 1)
+    await repository.toggle_task(1)
+
+    monkeypatch.setenv("TASK_REPOSITORY", "orm")
+    service = TaskService()
+    await service.add_task("Oeufs", 2)
+    await service.toggle_task(2)
+    await service.delete_task(3)
+    assert await service.delete_completed_tasks(1)
+
+    async with get_session() as session:
+        lists = (await session.execute(select(TaskList).order_by(TaskList.id))).scalars().all()
+        actual = {
+            lst.id: (
+                len((await session.execute(select(Task).filter_by(task_list_id=lst.id))).scalars().all()),
+                len((await session.execute(select(Task).filter_by(task_list_id=lst.id, completed=True))).scalars().all())
+            )
+            for lst in lists
+        }
+    assert {lst.id: (lst.total_count, lst.completed_count) for lst in lists} == actual == {1: (2, 0), 2: (1, 0), 3: (0, 0)}
+
+async def test_counters_follow_bulk_updates(task_db):
+    """Un UPDATE multi-lignes déplace les compteurs ; les lignes inchangées ne comptent pas"""
+    async with database.engine.begin() as conn:
+        await conn.execute(update(Task).values(description="Renommée"))
+        await conn.execute(update(Task).where(Task.task_list_id == 1).values(task_list_id=2, completed=True))
+
+    headers = await FastTaskRepository().get_user_list_headers(1)
+    assert [(lst.name, lst.total_count, lst.completed_count) for lst in headers] == [("Courses", 0, 0), ("Vide", 2, 2)]
+
+@pytest.mark.parametrize("backend", ["orm", "fast"])
+async def test_toggle_tracks_completion_date(task_db, monkeypatch, backend):
+    """La date de complétion, base de l'archivage, suit l'état de la tâche"""
+    monkeypatch.setenv("TASK_REPOSITORY", backend)
+    service = TaskService()
+
+    async def completed_at():
+        async with get_session() as session:
+            return (await session.execute(select(Task.completed_at).filter_by(id=1))).scalar_one()
+
+    await service.toggle_task(1)
+    assert await completed_at() is not None
+    await service.toggle_task(1)
+    assert await completed_at() is None
@@ -60,17 +60,19 @@ async def test_create_list_duplicate_name():
     repo = TaskRepository()
     name = "Test List"
     user_discord_id = "123456789"
-    existing_list = TaskList(name=name, user_discord_id=user_discord_id)
 
     mock_session = AsyncMock(spec=AsyncSession)
-    mock_result = AsyncMock()
-    mock_result.scalar_one_or_none.return_value = existing_list
+    mock_result = Mock()
+    # INSERT ... ON CONFLICT DO NOTHING : aucune ligne renvoyée pour un doublon
+    mock_result.scalar_one_or_none.return_value = None
     mock_session.execute.return_value = mock_result
     repo._db = mock_session
 
     # Act & Assert
     with pytest.raises(ValueError, match=f"Une liste avec le nom '{name}' existe déjà"):
         await repo.create_list(name, user_discord_id)
+    mock_session.execute.assert_awaited_once()
+    mock_session.commit.assert_not_awaited()
 
 @pytest.mark.asyncio
 async def test_add_task_success():
@@ -337,4 +339,20 @@ async def test_delete_task_sql_error():
     # Act & Assert
     with pytest.raises(SQLAlchemyError):
         await repo.delete_task(1)
-    mock_session.rollback.assert_awaited_once() 
\ No newline at end of file
+    mock_session.rollback.assert_awaited_once() 
+
+
+async def test_create_list_relies_on_unique_constraint(database_backend, assert_max_queries):
+    """Un nom déjà pris est détecté par la contrainte unique, sans requête préalable"""
+    from src.infrastructure.config import database
+
+    async with database.async_session() as session:
+        repo = TaskRepository(session)
+        with assert_max_queries(database.engine, 1):
+            created = await repo.create_list("Courses", 1)
+        assert created.id is not None and created.tasks == []
+
+        with pytest.raises(ValueError, match="existe déjà"):
+            await repo.create_list("Courses", 1)
+        # Le même nom reste libre pour un autre utilisateur
+        assert (await repo.create_list("Courses", 2)).user_discord_id == 2
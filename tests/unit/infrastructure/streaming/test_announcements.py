@@ -0,0 +1,192 @@
+import asyncio
+import pytest
+from unittest.mock import MagicMock
+import discord
+from src.infrastructure.streaming.announcements import (
+    AnnouncementTracker, EditCoalescer, build_live_embed, build_ended_embed
+)
+
+def make_stream(login="alice", stream_id="1", viewers=10, title="Raid"):
+    return {
+        "id": stream_id,
+        "user_login": login,
+        "user_name": login.capitalize(),
+        "title": title,
+        "game_name": "Star Wars: The Old Republic",
+        "viewer_count": viewers,
+        "thumbnail_url": "https://img/{width}x{height}.jpg"
+    }
+
+def make_message(channel_id=10, message_id=100):
+    message = MagicMock()
+    message.id = message_id
+    message.channel.id = channel_id
+    return message
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def test_reconcile_detects_started_updated_and_ended():
+    """Test la classification des streams d'un sondage"""
+    # Arrange
+    tracker = AnnouncementTracker()
+    tracker.record(make_stream("alice"), make_message(message_id=1))
+    tracker.record(make_stream("bob", "2"), make_message(message_id=2))
+    tracker.record(make_stream("carol", "3"), make_message(message_id=3))
+
+    # Act
+    started, updated, ended = tracker.reconcile(
+        [make_stream("alice", viewers=42), make_stream("dave", "4")],
+        polled_logins=["alice", "bob", "dave"]
+    )
+
+    # Assert
+    assert [s["user_login"] for s in started] == ["dave"]
+    assert [a.login for a, _ in updated] == ["alice"]
+    assert [a.login for a in ended] == ["bob"]
+    assert "carol" in tracker.announcements
+
+def test_reconcile_ignores_unchanged_stream():
+    """Test qu'un stream inchangé ne produit pas d'édition"""
+    tracker = AnnouncementTracker()
+    tracker.record(make_stream(), make_message())
+
+    started, updated, ended = tracker.reconcile([make_stream()])
+
+    assert (started, updated, ended) == ([], [], [])
+
+def test_reconcile_new_stream_id_restarts_announcement():
+    """Test qu'un nouveau stream du même streamer termine l'ancienne annonce"""
+    tracker = AnnouncementTracker()
+    tracker.record(make_stream(stream_id="1"), make_message())
+
+    started, updated, ended = tracker.reconcile([make_stream(stream_id="2")])
+
+    assert [s["id"] for s in started] == ["2"]
+    assert [a.stream_id for a in ended] == ["1"]
+
+@pytest.mark.asyncio
+async def test_coalescer_keeps_only_latest_edit_per_message():
+    """Test que seule la dernière édition d'un message est envoyée"""
+    # Arrange
+    coalescer = EditCoalescer(clock=FakeClock())
+    sent = []
+
+    async def edit(channel_id, message_id, embed):
+        sent.append((channel_id, message_id, embed.fields[1].value))
+
+    # Act
+    coalescer.schedule(10, 100, build_live_embed(make_stream(viewers=1)))
+    coalescer.schedule(10, 100, build_live_embed(make_stream(viewers=2)))
+    await coalescer.flush(edit)
+
+    # Assert
+    assert sent == [(10, 100, "2")]
+
+@pytest.mark.asyncio
+async def test_coalescer_respects_channel_budget():
+    """Test que le budget d'éditions est appliqué par canal"""
+    # Arrange
+    clock = FakeClock()
+    coalescer = EditCoalescer(edits_per_window=2, window=5.0, clock=clock)
+    sent = []
+
+    async def edit(channel_id, message_id, embed):
+        sent.append((channel_id, message_id))
+
+    for message_id in range(3):
+        coalescer.schedule(10, message_id, build_ended_embed(make_stream()))
+    coalescer.schedule(20, 99, build_ended_embed(make_stream()))
+
+    # Act
+    first = await coalescer.flush(edit)
+    second = await coalescer.flush(edit)
+    clock.now += 5.0
+    third = await coalescer.flush(edit)
+
+    # Assert
+    assert (first, second, third) == (3, 0, 1)
+    assert sent[-1] == (10, 2)
+    assert coalescer.pending_count == 0
+
+@pytest.mark.asyncio
+async def test_coalescer_skips_deleted_messages():
+    """Test qu'un message supprimé n'interrompt pas le flush"""
+    coalescer = EditCoalescer(clock=FakeClock())
+
+    async def edit(channel_id, message_id, embed):
+        raise discord.NotFound(MagicMock(status=404), "Unknown Message")
+
+    coalescer.schedule(10, 100, build_ended_embed(make_stream()))
+
+    assert await coalescer.flush(edit) == 0
+    assert coalescer.pending_count == 0
+
+@pytest.mark.asyncio
+async def test_coalescer_serializes_concurrent_flushes():
+    """Test que des flushs concurrents ne dépassent pas le budget ni ne perdent d'édition"""
+    # Arrange
+    coalescer = EditCoalescer(edits_per_window=2, window=5.0, clock=FakeClock())
+    release = asyncio.Event()
+    sent = []
+
+    async def edit(channel_id, message_id, embed):
+        await release.wait()
+        sent.append(message_id)
+
+    for message_id in range(3):
+        coalescer.schedule(10, message_id, build_ended_embed(make_stream()))
+
+    # Act
+    flushes = [asyncio.create_task(coalescer.flush(edit)) for _ in range(3)]
+    await asyncio.sleep(0)
+    release.set()
+    counts = await asyncio.gather(*flushes)
+
+    # Assert
+    assert sorted(counts) == [0, 0, 2]
+    assert sent == [0, 1]
+    assert coalescer.pending_count == 1
+
+@pytest.mark.asyncio
+async def test_coalescer_requeues_edit_on_unexpected_error():
+    """Test qu'une erreur inattendue remet l'édition en attente"""
+    # Arrange
+    clock = FakeClock()
+    coalescer = EditCoalescer(clock=clock)
+    sent = []
+
+    async def failing(channel_id, message_id, embed):
+        raise RuntimeError("boom")
+
+    async def edit(channel_id, message_id, embed):
+        sent.append(message_id)
+
+    coalescer.schedule(10, 100, build_ended_embed(make_stream()))
+
+    # Act
+    with pytest.raises(RuntimeError):
+        await coalescer.flush(failing)
+
+    # Assert
+    assert coalescer.pending_count == 1
+    assert await coalescer.flush(edit) == 1
+    assert sent == [100]
+
+def test_reconcile_adopts_helix_id_for_presence_announcement():
+    """Test qu'une annonce issue de la présence récupère l'identifiant Helix sans être republiée"""
+    # Arrange
+    tracker = AnnouncementTracker()
+    tracker.record(make_stream(stream_id="presence:alice"), make_message())
+
+    # Act
+    started, updated, ended = tracker.reconcile([make_stream(stream_id="987")])
+
+    # Assert
+    assert started == [] and ended == []
+    assert [a.stream_id for a, _ in updated] == ["987"]
+    assert tracker.announcements["alice"].provisional is False
@@ -0,0 +1,78 @@
+import pytest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+from src.infrastructure.streaming.game_filters import GameFilterCache, GuildGameFilter
+from src.infrastructure.streaming.games import GameCache
+
+SWTOR = {"id": "21090", "name": "Star Wars: The Old Republic", "box_art_url": ""}
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def make_cache(rows, clock=None):
+    helix = AsyncMock()
+    helix.get_games.return_value = [SWTOR]
+    repository = AsyncMock()
+    repository.get_for_guild.return_value = rows
+    cache = GameFilterCache(repository, GameCache(helix), ttl=60, clock=clock or FakeClock())
+    return cache, repository, helix
+
+@pytest.mark.asyncio
+async def test_guild_without_filter_announces_all_games():
+    """Test qu'un serveur sans filtre n'a pas de restriction"""
+    cache, _, helix = make_cache([])
+
+    assert await cache.get(1) is None
+    helix.get_games.assert_not_awaited()
+
+@pytest.mark.asyncio
+async def test_unresolved_names_are_resolved_once_and_persisted():
+    """Test la résolution unique des noms de jeux vers leur game_id"""
+    # Arrange
+    clock = FakeClock()
+    row = SimpleNamespace(game_name="Star Wars: The Old Republic", game_id=None)
+    cache, repository, helix = make_cache([row], clock)
+
+    # Act
+    first = await cache.get(1)
+    second = await cache.get(1)
+
+    # Assert
+    assert first.game_ids == ("21090",)
+    assert second is first
+    repository.get_for_guild.assert_awaited_once_with(1)
+    repository.add.assert_awaited_once_with(1, "Star Wars: The Old Republic", "21090")
+    helix.get_games.assert_awaited_once()
+
+    clock.now = 61
+    await cache.get(1)
+    assert repository.get_for_guild.await_count == 2
+    helix.get_games.assert_awaited_once()
+
+@pytest.mark.asyncio
+async def test_add_rejects_unknown_game_and_invalidates_guild():
+    """Test l'ajout d'un jeu : inconnu refusé, connu enregistré sous son nom officiel"""
+    cache, repository, helix = make_cache([])
+    await cache.get(1)
+
+    helix.get_games.return_value = []
+    assert await cache.add(1, "Jeu inexistant") is None
+
+    helix.get_games.return_value = [SWTOR]
+    assert await cache.add(1, "star wars: the old republic") == SWTOR
+    repository.add.assert_awaited_once_with(1, "Star Wars: The Old Republic", "21090")
+
+    await cache.get(1)
+    assert repository.get_for_guild.await_count == 2
+
+def test_filter_allows_names_case_insensitively():
+    """Test la correspondance d'un jeu de présence Discord avec le filtre"""
+    game_filter = GuildGameFilter(names=("Star Wars: The Old Republic",), game_ids=("21090",))
+
+    assert game_filter.allows("star wars: the old republic")
+    assert not game_filter.allows("Elden Ring")
+    assert not game_filter.allows(None)
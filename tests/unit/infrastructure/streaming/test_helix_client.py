@@ -0,0 +1,134 @@
+import time
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from src.infrastructure.errors.exceptions import APIError
+from src.infrastructure.streaming import HelixClient, HelixRateLimiter
+from benchmarks.fake_helix import FakeTwitch
+
+@pytest.fixture
+async def helix_server():
+    """Serveur Helix minimal : jeton, streams paginés et 429 à la demande"""
+    state = {"token_calls": 0, "stream_calls": 0, "throttle": 0}
+
+    async def token(request):
+        state["token_calls"] += 1
+        return web.json_response({"access_token": f"token{state['token_calls']}", "expires_in": 3600})
+
+    async def streams(request):
+        state["stream_calls"] += 1
+        headers = {
+            "Ratelimit-Limit": "800",
+            "Ratelimit-Remaining": "799",
+            "Ratelimit-Reset": str(int(time.time()) + 60)
+        }
+        if state["throttle"]:
+            state["throttle"] -= 1
+            headers["Ratelimit-Remaining"] = "0"
+            headers["Ratelimit-Reset"] = str(int(time.time()))
+            return web.json_response({"message": "Too Many Requests"}, status=429, headers=headers)
+        logins = request.query.getall("user_login", [])
+        data = [{"id": login, "user_login": login} for login in logins]
+        if request.query.get("after") is None and len(data) > 1:
+            return web.json_response({"data": data[:1], "pagination": {"cursor": "next"}}, headers=headers)
+        if request.query.get("after"):
+            data = data[1:]
+        return web.json_response({"data": data, "pagination": {}}, headers=headers)
+
+    app = web.Application()
+    app.router.add_post("/oauth2/token", token)
+    app.router.add_get("/helix/streams", streams)
+    server = TestServer(app)
+    await server.start_server()
+    yield server, state
+    await server.close()
+
+def make_client(server, **kwargs):
+    return HelixClient(
+        "id", "secret",
+        api_url=str(server.make_url("/helix")),
+        token_url=str(server.make_url("/oauth2/token")),
+        **kwargs
+    )
+
+@pytest.mark.asyncio
+async def test_get_streams_follows_pagination(helix_server):
+    """Test la récupération paginée des streams"""
+    # Arrange
+    server, state = helix_server
+    client = make_client(server)
+
+    # Act
+    streams = await client.get_streams(["Alice", "bob", "alice"])
+    await client.close()
+
+    # Assert
+    assert [s["user_login"] for s in streams] == ["alice", "bob"]
+    assert state["token_calls"] == 1
+    assert client.rate_limiter.remaining == 799
+
+@pytest.mark.asyncio
+async def test_request_retries_after_429(helix_server):
+    """Test la nouvelle tentative après une réponse 429"""
+    # Arrange
+    server, state = helix_server
+    state["throttle"] = 1
+    client = make_client(server, rate_limiter=HelixRateLimiter(base_backoff=0.01))
+
+    # Act
+    streams = await client.get_streams(["alice"])
+    await client.close()
+
+    # Assert
+    assert len(streams) == 1
+    assert state["stream_calls"] == 2
+
+@pytest.mark.asyncio
+async def test_request_gives_up_after_max_retries(helix_server):
+    """Test l'abandon après trop de réponses 429"""
+    # Arrange
+    server, state = helix_server
+    state["throttle"] = 5
+    client = make_client(server, rate_limiter=HelixRateLimiter(base_backoff=0.01), max_retries=1)
+
+    # Act & Assert
+    with pytest.raises(APIError):
+        await client.get_streams(["alice"])
+    await client.close()
+
+@pytest.mark.asyncio
+async def test_get_streams_against_fake_twitch():
+    """Test le sondage de milliers de comptes : lots, pagination et jeton révoqué"""
+    # Arrange
+    fake = FakeTwitch(broadcasters=2000, live_ratio=0.2, page_size=20, token_max_uses=10)
+    server = TestServer(fake.make_app())
+    await server.start_server()
+    client = make_client(server)
+
+    # Act
+    streams = await client.get_streams(fake.logins)
+    await client.close()
+    await server.close()
+
+    # Assert
+    assert {s["user_login"] for s in streams} == set(fake.live)
+    assert fake.stats["streams"] > 2000 // 100
+    assert fake.stats["token"] > 1
+
+@pytest.mark.asyncio
+async def test_get_streams_filters_by_game_server_side():
+    """Test le filtrage par jeu via le paramètre game_id"""
+    # Arrange
+    fake = FakeTwitch(broadcasters=500, live_ratio=0.5)
+    server = TestServer(fake.make_app())
+    await server.start_server()
+    client = make_client(server)
+
+    # Act
+    streams = await client.get_streams(fake.logins, game_ids=["1"])
+    await client.close()
+    await server.close()
+
+    # Assert
+    expected = {login for login, stream in fake.live.items() if stream["game_id"] == "1"}
+    assert expected and {s["user_login"] for s in streams} == expected
@@ -0,0 +1,110 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+import discord
+from src.infrastructure.streaming.games import GameCache
+from src.infrastructure.streaming.presence import (
+    STARTED, ENDED, detect_transition, find_twitch_activity, stream_from_presence
+)
+
+def make_member(member_id=1, activities=()):
+    member = MagicMock(spec=discord.Member)
+    member.id = member_id
+    member.display_name = "Alice"
+    member.activities = tuple(activities)
+    return member
+
+def twitch_activity(login="alice"):
+    return discord.Streaming(
+        name="Raid cauchemar",
+        url=f"https://www.twitch.tv/{login}",
+        state="Star Wars: The Old Republic",
+        platform="Twitch"
+    )
+
+def test_find_twitch_activity_ignores_other_activities():
+    """Test que seules les activités de streaming Twitch sont retenues"""
+    youtube = discord.Streaming(name="Live", url="https://youtube.com/watch?v=1", platform="YouTube")
+    member = make_member(activities=[discord.Game("SWTOR"), youtube])
+
+    assert find_twitch_activity(member) is None
+
+def test_detect_transition_started_for_opted_in_member():
+    """Test la détection du début d'un stream d'un membre inscrit"""
+    # Arrange
+    before = make_member()
+    after = make_member(activities=[twitch_activity("Alice")])
+
+    # Act
+    transition = detect_transition(before, after, {1: "alice"})
+
+    # Assert
+    assert transition[0] == STARTED
+    assert transition[1] == "alice"
+
+def test_detect_transition_ended():
+    """Test la détection de la fin d'un stream"""
+    before = make_member(activities=[twitch_activity()])
+    after = make_member()
+
+    assert detect_transition(before, after, {1: "alice"}) == (ENDED, "alice", None)
+
+def test_detect_transition_ignores_members_not_opted_in():
+    """Test que les membres non inscrits sont ignorés"""
+    before = make_member(member_id=2)
+    after = make_member(member_id=2, activities=[twitch_activity()])
+
+    assert detect_transition(before, after, {1: "alice"}) is None
+
+def test_detect_transition_ignores_other_channels():
+    """Test qu'un membre relayant la chaîne d'un autre n'est pas annoncé"""
+    before = make_member()
+    after = make_member(activities=[twitch_activity("bob")])
+
+    assert detect_transition(before, after, {1: "Alice"}) is None
+    assert detect_transition(after, before, {1: "Alice"}) is None
+    assert detect_transition(before, make_member(activities=[twitch_activity("ALICE")]), {1: "Alice"})[1] == "alice"
+
+def test_detect_transition_deduplicates_across_guilds():
+    """Test qu'un membre vu sur deux guildes ne produit qu'un début et une fin"""
+    offline, streaming = make_member(), make_member(activities=[twitch_activity()])
+    live = set()
+
+    started = [detect_transition(offline, streaming, {1: "alice"}, live) for _guild in range(2)]
+    assert [t and t[0] for t in started] == [STARTED, None]
+    assert live == {"alice"}
+
+    ended = [detect_transition(streaming, offline, {1: "alice"}, live) for _guild in range(2)]
+    assert ended == [(ENDED, "alice", None), None]
+    assert live == set()
+
+def test_stream_from_presence_builds_provisional_payload():
+    """Test la construction d'un payload provisoire depuis la présence"""
+    member = make_member()
+
+    stream = stream_from_presence(member, twitch_activity("Alice"))
+
+    assert stream["id"] == "presence:alice"
+    assert stream["title"] == "Raid cauchemar"
+    assert stream["game_name"] == "Star Wars: The Old Republic"
+    assert stream["viewer_count"] is None
+    assert "live_user_alice-{width}x{height}" in stream["thumbnail_url"]
+
+@pytest.mark.asyncio
+async def test_game_cache_memoizes_lookups():
+    """Test que chaque jeu n'est recherché qu'une fois, même inconnu"""
+    # Arrange
+    helix = MagicMock()
+    helix.get_games = AsyncMock(return_value=[
+        {"id": "1234", "name": "Star Wars: The Old Republic", "box_art_url": "https://art/{width}x{height}.jpg"}
+    ])
+    cache = GameCache(helix)
+
+    # Act
+    first = await cache.box_art_url("Star Wars: The Old Republic")
+    second = await cache.box_art_url("star wars: the old republic")
+    await cache.resolve(["Jeu inconnu"])
+    await cache.resolve(["Jeu inconnu"])
+
+    # Assert
+    assert first == second == "https://art/144x192.jpg"
+    assert helix.get_games.await_count == 2
@@ -0,0 +1,99 @@
+import asyncio
+import random
+import pytest
+from src.infrastructure.streaming.rate_limiter import HelixRateLimiter, RequestPriority
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+@pytest.mark.asyncio
+async def test_acquire_consumes_tokens():
+    """Test que chaque acquisition consomme un jeton"""
+    # Arrange
+    limiter = HelixRateLimiter(capacity=3)
+
+    # Act
+    await limiter.acquire()
+    await limiter.acquire()
+
+    # Assert
+    assert limiter.remaining == 1
+
+@pytest.mark.asyncio
+async def test_update_from_headers_syncs_bucket():
+    """Test la synchronisation du seau depuis les en-têtes Ratelimit"""
+    # Arrange
+    clock = FakeClock()
+    limiter = HelixRateLimiter(capacity=800, clock=clock, wall_clock=lambda: 5000.0)
+
+    # Act
+    limiter.update_from_headers({
+        "Ratelimit-Limit": "120",
+        "Ratelimit-Remaining": "7",
+        "Ratelimit-Reset": "5030"
+    })
+
+    # Assert
+    assert limiter.capacity == 120
+    assert limiter.remaining == 7
+    clock.now += 31
+    assert limiter.remaining == 120
+
+@pytest.mark.asyncio
+async def test_user_requests_are_served_before_reconciliation():
+    """Test que les recherches utilisateur passent devant les sondages"""
+    # Arrange
+    limiter = HelixRateLimiter(capacity=1, refill_period=0.05)
+    await limiter.acquire()
+    order = []
+
+    async def worker(name, priority):
+        await limiter.acquire(priority)
+        order.append(name)
+
+    # Act
+    poll = asyncio.create_task(worker("poll", RequestPriority.RECONCILIATION))
+    await asyncio.sleep(0)
+    user = asyncio.create_task(worker("user", RequestPriority.USER))
+    await asyncio.sleep(0)
+    limiter.update_from_headers({"Ratelimit-Remaining": "2"})
+    await asyncio.wait_for(asyncio.gather(poll, user), timeout=1)
+
+    # Assert
+    assert order == ["user", "poll"]
+
+@pytest.mark.asyncio
+async def test_backoff_is_jittered_and_honours_reset():
+    """Test que le backoff après un 429 est aléatoire et respecte la réinitialisation"""
+    # Arrange
+    clock = FakeClock()
+    limiter = HelixRateLimiter(clock=clock, wall_clock=lambda: 0.0, base_backoff=1.0, rng=random.Random(1))
+
+    # Act
+    delay = limiter.backoff(2)
+    delay_with_reset = limiter.backoff(0, {"Ratelimit-Remaining": "0", "Ratelimit-Reset": "12"})
+
+    # Assert
+    assert 0 <= delay <= 4
+    assert delay_with_reset >= 12
+    assert limiter.remaining == 0
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_leaves_queue():
+    """Test qu'une attente annulée libère sa place dans la file"""
+    # Arrange
+    limiter = HelixRateLimiter(capacity=0, refill_period=60)
+    task = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+
+    # Act
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    # Assert
+    assert limiter.queue_depth == 0
@@ -0,0 +1,87 @@
+import asyncio
+import pytest
+from src.infrastructure.streaming.providers.base import PartialPollError, StreamProvider
+from src.infrastructure.streaming.scheduler import PollScheduler
+
+class FakeProvider(StreamProvider):
+    def __init__(self, name, batch_size, live=(), failing=(), delay=0.01, partial=()):
+        self.name = name
+        self.batch_size = batch_size
+        self.live = set(live)
+        self.failing = set(failing)
+        self.partial = set(partial)
+        self.delay = delay
+        self.batches = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.shared = None
+
+    async def get_tracked_channels(self):
+        return []
+
+    async def fetch_live(self, channels):
+        self.batches.append(list(channels))
+        counter = self.shared if self.shared is not None else self
+        counter.in_flight += 1
+        counter.max_in_flight = max(counter.max_in_flight, counter.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            if self.failing & set(channels):
+                raise RuntimeError("boom")
+            streams = [{"id": c, "user_login": c} for c in channels if c in self.live and c not in self.partial]
+            if self.partial & set(channels):
+                raise PartialPollError(streams, [c for c in channels if c in self.partial])
+            return streams
+        finally:
+            counter.in_flight -= 1
+
+@pytest.mark.asyncio
+async def test_poll_splits_channels_by_provider_batch_size():
+    """Test le découpage des chaînes selon la taille de lot de la plateforme"""
+    provider = FakeProvider("twitch", batch_size=3, live={"c1", "c5"})
+    channels = [f"c{i}" for i in range(7)]
+
+    result = await PollScheduler().poll(provider, channels)
+
+    assert sorted(len(batch) for batch in provider.batches) == [1, 3, 3]
+    assert {s["user_login"] for s in result.streams} == {"c1", "c5"}
+    assert sorted(result.polled) == sorted(channels)
+
+@pytest.mark.asyncio
+async def test_poll_all_enforces_global_concurrency_limit():
+    """Test que la limite de lots simultanés vaut pour toutes les plateformes"""
+    shared = FakeProvider("shared", batch_size=1)
+    twitch = FakeProvider("twitch", batch_size=1)
+    youtube = FakeProvider("youtube", batch_size=2)
+    twitch.shared = youtube.shared = shared
+
+    results = await PollScheduler(max_concurrency=2).poll_all({
+        twitch: [f"t{i}" for i in range(5)],
+        youtube: [f"y{i}" for i in range(6)]
+    })
+
+    assert shared.max_in_flight == 2
+    assert len(twitch.batches) == 5 and len(youtube.batches) == 3
+    assert set(results) == {"twitch", "youtube"}
+
+@pytest.mark.asyncio
+async def test_failed_batch_is_excluded_from_polled():
+    """Test qu'un lot en échec n'empêche pas les autres et n'est pas considéré vérifié"""
+    provider = FakeProvider("twitch", batch_size=2, live={"a", "c"}, failing={"b"})
+
+    result = await PollScheduler().poll(provider, ["a", "b", "c", "d"])
+
+    assert result.failed == ["a", "b"]
+    assert result.polled == ["c", "d"]
+    assert [s["user_login"] for s in result.streams] == ["c"]
+
+@pytest.mark.asyncio
+async def test_poll_excludes_only_failed_channels_of_partial_batch():
+    """Test qu'un lot vérifié en partie garde ses streams et n'exclut que les chaînes en échec"""
+    provider = FakeProvider("youtube", batch_size=3, live={"c0", "c1"}, partial={"c1"})
+
+    result = await PollScheduler().poll(provider, ["c0", "c1", "c2"])
+
+    assert [s["user_login"] for s in result.streams] == ["c0"]
+    assert result.polled == ["c0", "c2"]
+    assert result.failed == ["c1"]
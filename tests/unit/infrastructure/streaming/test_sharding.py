@@ -0,0 +1,82 @@
+import pytest
+from unittest.mock import AsyncMock
+from src.infrastructure.streaming.sharding import HashRing, ShardCoordinator
+
+LOGINS = [f"streamer{i}" for i in range(500)]
+
+def make_repository(live):
+    repository = AsyncMock()
+    repository.get_live_replicas.return_value = live
+    return repository
+
+def test_hash_ring_assigns_each_key_to_one_node():
+    """Test que chaque streamer a exactement un propriétaire, stable d'un anneau à l'autre"""
+    ring = HashRing(["a", "b", "c"])
+    same = HashRing(["c", "b", "a"])
+
+    owners = {login: ring.owner(login) for login in LOGINS}
+
+    assert set(owners.values()) == {"a", "b", "c"}
+    assert all(same.owner(login) == owner for login, owner in owners.items())
+
+def test_hash_ring_only_moves_keys_of_departed_node():
+    """Test que seuls les streamers de l'instance disparue changent de propriétaire"""
+    before = HashRing(["a", "b", "c"])
+    after = HashRing(["a", "b"])
+
+    for login in LOGINS:
+        if before.owner(login) != "c":
+            assert after.owner(login) == before.owner(login)
+
+def test_empty_ring_has_no_owner():
+    """Test qu'un anneau vide n'attribue aucun streamer"""
+    assert HashRing().owner("alice") is None
+
+@pytest.mark.asyncio
+async def test_coordinator_owns_nothing_before_first_heartbeat():
+    """Test qu'aucun streamer n'est sondé avant le premier heartbeat"""
+    coordinator = ShardCoordinator("a", make_repository(["a"]))
+
+    assert coordinator.filter(LOGINS) == []
+
+@pytest.mark.asyncio
+async def test_replicas_partition_logins_without_overlap():
+    """Test que les instances se partagent les streamers sans doublon ni oubli"""
+    coordinators = [ShardCoordinator(name, make_repository(["a", "b", "c"])) for name in "abc"]
+    for coordinator in coordinators:
+        assert await coordinator.heartbeat() is True
+
+    slices = [set(coordinator.filter(LOGINS)) for coordinator in coordinators]
+
+    assert sum(len(part) for part in slices) == len(LOGINS)
+    assert set().union(*slices) == set(LOGINS)
+
+@pytest.mark.asyncio
+async def test_heartbeat_rebalances_when_replica_expires():
+    """Test qu'une instance expirée voit sa part reprise par les survivantes"""
+    repository = make_repository(["a", "b"])
+    coordinator = ShardCoordinator("a", repository, ttl=30)
+    await coordinator.heartbeat()
+    owned_before = set(coordinator.filter(LOGINS))
+
+    assert await coordinator.heartbeat() is False
+
+    repository.get_live_replicas.return_value = []
+    assert await coordinator.heartbeat() is True
+
+    repository.heartbeat.assert_awaited_with("a")
+    repository.get_live_replicas.assert_awaited_with(30)
+    assert coordinator.replicas == ["a"]
+    assert owned_before < set(coordinator.filter(LOGINS)) == set(LOGINS)
+
+@pytest.mark.asyncio
+async def test_leave_removes_replica():
+    """Test qu'une instance arrêtée se retire et ne possède plus rien"""
+    repository = make_repository(["a"])
+    coordinator = ShardCoordinator("a", repository)
+    await coordinator.heartbeat()
+
+    await coordinator.leave()
+
+    repository.remove.assert_awaited_once_with("a")
+    assert not coordinator.owns("alice")
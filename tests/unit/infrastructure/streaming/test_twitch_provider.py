@@ -0,0 +1,53 @@
+import pytest
+from unittest.mock import MagicMock
+from src.infrastructure.streaming.game_filters import GuildGameFilter
+from src.infrastructure.streaming.providers import PartialPollError, TwitchProvider
+
+class FakeHelix:
+    def __init__(self, live):
+        self.live = live
+        self.calls = []
+
+    async def get_streams(self, user_logins, priority=None, game_ids=None):
+        self.calls.append((list(user_logins), game_ids))
+        return [
+            {"id": login, "user_login": login, "game_id": game_id}
+            for login, game_id in self.live.items()
+            if login in user_logins and (game_ids is None or game_id in game_ids)
+        ]
+
+def make_provider(live, game_ids=("21090",)):
+    helix = FakeHelix(live)
+    provider = TwitchProvider(helix, MagicMock(), MagicMock())
+    provider.game_filter = GuildGameFilter(names=("Star Wars: The Old Republic",), game_ids=game_ids)
+    return provider, helix
+
+@pytest.mark.asyncio
+async def test_announced_streamer_stays_live_after_switching_game():
+    """Test qu'un streamer déjà annoncé reste suivi s'il passe à un jeu non filtré"""
+    # Arrange
+    provider, helix = make_provider({"alice": "999", "bob": "999", "carol": "21090"})
+    provider.announced = {"alice": object()}
+
+    # Act
+    streams = await provider.fetch_live(["alice", "bob", "carol"])
+
+    # Assert
+    assert [s["user_login"] for s in streams] == ["alice", "carol"]
+    assert helix.calls == [(["alice"], None), (["bob", "carol"], ("21090",))]
+
+@pytest.mark.asyncio
+async def test_unresolved_filter_does_not_mark_channels_polled():
+    """Test qu'un filtre sans jeu résolu ne compte pas les chaînes comme vérifiées"""
+    # Arrange
+    provider, helix = make_provider({"alice": "999"}, game_ids=())
+    provider.announced = {"alice"}
+
+    # Act
+    with pytest.raises(PartialPollError) as error:
+        await provider.fetch_live(["alice", "bob"])
+
+    # Assert
+    assert [s["user_login"] for s in error.value.streams] == ["alice"]
+    assert error.value.failed == ["bob"]
+    assert helix.calls == [(["alice"], None)]
@@ -0,0 +1,116 @@
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from src.infrastructure.streaming.providers import PartialPollError, YouTubeProvider
+from src.infrastructure.streaming.providers.youtube import parse_feed
+
+def feed(*video_ids):
+    entries = "".join(f"<entry><yt:videoId>{video_id}</yt:videoId></entry>" for video_id in video_ids)
+    return (
+        '<feed xmlns:yt="http://www.youtube.com/xml/schemas/2015" '
+        f'xmlns="http://www.w3.org/2005/Atom">{entries}</feed>'
+    )
+
+def video(video_id, channel_id, status, viewers=None):
+    item = {
+        "id": video_id,
+        "snippet": {
+            "channelId": channel_id,
+            "channelTitle": f"Chaîne {channel_id}",
+            "title": f"Vidéo {video_id}",
+            "liveBroadcastContent": status,
+            "thumbnails": {"high": {"url": f"https://i.ytimg.com/vi/{video_id}/hqdefault.jpg"}}
+        }
+    }
+    if viewers is not None:
+        item["liveStreamingDetails"] = {"concurrentViewers": str(viewers)}
+    return item
+
+@pytest.fixture
+async def youtube_server():
+    """Flux RSS et API Data minimaux"""
+    state = {"feeds": 0, "videos": []}
+    feeds = {"UC1": feed("v1", "v2"), "UC2": feed("v3")}
+    videos = {
+        "v1": video("v1", "UC1", "live", viewers=42),
+        "v2": video("v2", "UC1", "none"),
+        "v3": video("v3", "UC2", "upcoming")
+    }
+
+    async def feed_handler(request):
+        state["feeds"] += 1
+        channel_id = request.query["channel_id"]
+        if channel_id not in feeds:
+            return web.Response(status=404, text="not found")
+        return web.Response(text=feeds[channel_id], content_type="application/atom+xml")
+
+    async def videos_handler(request):
+        ids = request.query["id"].split(",")
+        state["videos"].append(ids)
+        return web.json_response({"items": [videos[i] for i in ids if i in videos]})
+
+    app = web.Application()
+    app.router.add_get("/feeds/videos.xml", feed_handler)
+    app.router.add_get("/youtube/v3/videos", videos_handler)
+    server = TestServer(app)
+    await server.start_server()
+    yield server, state
+    await server.close()
+
+def test_parse_feed_keeps_most_recent_videos():
+    """Test l'extraction des vidéos récentes d'un flux RSS"""
+    assert parse_feed(feed("a", "b", "c"), limit=2) == ["a", "b"]
+
+@pytest.mark.asyncio
+async def test_fetch_live_checks_whole_batch_in_one_api_call(youtube_server):
+    """Test la vérification groupée : un flux par chaîne, une seule requête videos.list"""
+    # Arrange
+    server, state = youtube_server
+    provider = YouTubeProvider(
+        "key", ["UC1", "UC2"],
+        feed_url=str(server.make_url("/feeds/videos.xml")),
+        api_url=str(server.make_url("/youtube/v3"))
+    )
+
+    # Act
+    streams = await provider.fetch_live(await provider.get_tracked_channels())
+    await provider.close()
+
+    # Assert
+    assert state["feeds"] == 2
+    assert state["videos"] == [["v1", "v2", "v3"]]
+    assert streams == [{
+        "id": "v1",
+        "user_login": "UC1",
+        "user_name": "Chaîne UC1",
+        "title": "Vidéo v1",
+        "game_name": None,
+        "viewer_count": 42,
+        "thumbnail_url": "https://i.ytimg.com/vi/v1/hqdefault.jpg",
+        "url": "https://www.youtube.com/watch?v=v1"
+    }]
+    assert provider.build_live_embed(streams[0]).url == "https://www.youtube.com/watch?v=v1"
+
+@pytest.mark.asyncio
+async def test_fetch_live_reports_channels_with_unreadable_feed(youtube_server):
+    """Test qu'une chaîne au flux en échec est signalée avec les streams des autres"""
+    # Arrange
+    server, _ = youtube_server
+    provider = YouTubeProvider(
+        "key", ["UC1", "UC404"],
+        feed_url=str(server.make_url("/feeds/videos.xml")),
+        api_url=str(server.make_url("/youtube/v3"))
+    )
+
+    # Act
+    with pytest.raises(PartialPollError) as error:
+        await provider.fetch_live(await provider.get_tracked_channels())
+    await provider.close()
+
+    # Assert
+    assert error.value.failed == ["UC404"]
+    assert [s["user_login"] for s in error.value.streams] == ["UC1"]
+
+def test_batch_size_bounded_by_videos_per_request():
+    """Test que la taille des lots respecte la limite de 50 vidéos par requête"""
+    assert YouTubeProvider("key", [], batch_size=40, recent_videos=5).batch_size == 10